@@ -0,0 +1,324 @@
+import argparse  # Importa argparse para a linha de comando
+import datetime  # Importa datetime para registrar quando o benchmark rodou
+import fnmatch  # Importa fnmatch para selecionar etapas por padrão (ex.: "metrica_*")
+import json  # Importa json para gravar e comparar os resultados
+import os  # Importa os para caminhos e diretórios temporários
+import platform  # Importa platform para registrar a máquina
+import resource  # Importa resource para o pico de memória do processo (RSS)
+import shutil  # Importa shutil para copiar o dataset e remover o cache antigo
+import subprocess  # Importa subprocess para descobrir o commit atual
+import sys  # Importa sys para a versão do Python e o código de saída
+import tempfile  # Importa tempfile para o dataset e as figuras temporárias
+import time  # Importa time para medir tempo real e de CPU
+import tracemalloc  # Importa tracemalloc para o pico de memória alocada em cada etapa
+
+import matplotlib  # Importa Matplotlib para registrar a versão e usar o backend sem janela
+import matplotlib.pyplot as plt  # Importa pyplot para trocar o backend
+import networkx as nx  # Importa NetworkX para registrar a versão
+import numpy as np  # Importa NumPy para registrar a versão
+import scipy  # Importa SciPy para registrar a versão
+
+from helpers.load_dataset import load_dataset, caminho_cache  # Importa o carregamento do dataset
+from grafos.matrizes import construir_matriz_incidencia, projecao_sem_diagonal, similaridade_em_blocos  # Importa as construções de matrizes
+from grafos.construcao import adjacencia_de_matriz, adjacencia_bipartida, grafo_de_matriz, grafo_bipartido  # Importa as construções de grafos
+from grafos.metricas import grafo_networkx, diametro, autovetor, densidade  # Importa as métricas
+from grafos.intermediacao import intermediacao  # Importa a intermediação (betweenness)
+from grafos.aglomeracao import aglomeracao  # Importa a aglomeração ponderada (triângulos por produtos esparsos)
+from grafos.lote import ANALISES, FIGURAS  # Importa as análises e as figuras do modo em lote
+from grafos.bipartido import estatisticas_bipartidas, metricas_bipartidas  # Importa as estatísticas e métricas do grafo bipartido
+from grafos.estatisticas import estatisticas_basicas  # Importa as estatísticas básicas calculadas na adjacência CSR
+from grafos.minhash import similaridade_minhash  # Importa a similaridade aproximada (MinHash/LSH)
+from grafos.similaridade_paralela import similaridade_paralela  # Importa a similaridade exata em fragmentos (pool de processos)
+from grafos.incremental import AnaliseIncremental  # Importa a atualização incremental das três análises
+from grafos.comunidades import louvain, grafo_condensado  # Importa a detecção de comunidades e o grafo condensado
+from .gerador import gerar_dataset  # Importa o gerador de datasets sintéticos
+
+# Benchmark de todas as etapas (carga do dataset, matrizes, grafos, métricas e figuras) sobre um dataset
+# sintético ou real, medindo tempo real, tempo de CPU e memória, com resultados em JSON para comparar commits
+# Uso (na raiz do repositório): python -m benchmarks.executar --pessoas 20000 --generos 300 --sem-memoria --pular 'figura_similaridade_*' --saida base.json
+
+VERSAO_RESULTADOS = 1  # Incrementar quando o formato do JSON mudar
+AMOSTRA_INTERMEDIACAO_PADRAO = 100  # Pivôs da intermediação (a exata, O(n·m), não termina nos tamanhos de benchmark)
+TOLERANCIA_PADRAO = 0.2  # Etapa 20% mais lenta que a referência conta como regressão
+MINIMO_SEGUNDOS_COMPARACAO = 0.05  # Etapas mais rápidas que isso são ruído e não entram na comparação
+
+
+# Executa as etapas selecionadas e guarda as medições
+class Benchmark:
+    def __init__(self, selecionar=("*",), pular=(), medir_memoria=True):  # Recebe os padrões de etapas e se mede memória
+        self.selecionar = selecionar  # Padrões das etapas executadas
+        self.pular = pular  # Padrões das etapas ignoradas
+        self.medir_memoria = medir_memoria  # tracemalloc deixa etapas com muitos objetos Python mais lentas
+        self.etapas = []  # Medições na ordem de execução
+        self.nomes = nomes_etapas()  # Todas as etapas conhecidas
+
+    def selecionada(self, nome):  # Indica se a etapa deve rodar
+        escolhida = any(fnmatch.fnmatch(nome, padrao) for padrao in self.selecionar)
+        return escolhida and not any(fnmatch.fnmatch(nome, padrao) for padrao in self.pular)
+
+    def alguma_selecionada(self, padrao):  # Indica se alguma etapa com o padrão pode rodar (decide dependências)
+        return any(self.selecionada(nome) for nome in self.nomes if fnmatch.fnmatch(nome, padrao))
+
+    # Executa funcao(*argumentos) como a etapa "nome" e devolve o resultado (None se ignorada ou se falhar)
+    # Etapas que dependem de um resultado ausente (None) são registradas como ignoradas
+    # necessario: resultado usado por outras etapas selecionadas (calculado sem medir se a etapa não foi selecionada)
+    def medir(self, nome, funcao, *argumentos, necessario=False):
+        faltando = any(argumento is None for argumento in argumentos)  # Depende de uma etapa ignorada ou que falhou
+        if not self.selecionada(nome):  # Fora da seleção
+            return funcao(*argumentos) if necessario and not faltando else None
+        if faltando:
+            self.etapas.append({"nome": nome, "estado": "ignorada"})
+            return None
+
+        if self.medir_memoria:  # Pico medido a partir da memória atual
+            tracemalloc.reset_peak()
+            memoria_inicial = tracemalloc.get_traced_memory()[0]
+        inicio_cpu = time.process_time()  # Tempo de CPU do processo
+        inicio = time.perf_counter()  # Tempo real
+        try:
+            resultado = funcao(*argumentos)
+            estado, erro = "ok", None
+        except Exception as excecao:  # Falha em uma etapa não interrompe as outras
+            resultado, estado, erro = None, "falhou", f"{type(excecao).__name__}: {excecao}"
+        registro = {
+            "nome": nome,
+            "estado": estado,
+            "segundos": time.perf_counter() - inicio,  # Tempo real da etapa
+            "segundos_cpu": time.process_time() - inicio_cpu,  # CPU do processo principal (sem os trabalhadores)
+            "pico_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # Pico do processo até aqui (Linux: KiB)
+        }
+        if self.medir_memoria:  # Memória alocada pela etapa
+            memoria_final, pico = tracemalloc.get_traced_memory()
+            registro["pico_alocado_mib"] = (pico - memoria_inicial) / 2**20  # Maior uso extra durante a etapa
+            registro["retido_mib"] = (memoria_final - memoria_inicial) / 2**20  # Memória que continuou alocada
+        if erro is not None:
+            registro["erro"] = erro
+        self.etapas.append(registro)
+        print(f"  {nome:<40} {estado:<8} {registro['segundos']:9.3f} s", file=sys.stderr)  # Progresso
+        return resultado
+
+
+# Nomes de todas as etapas, na ordem de execução (para --etapas e --pular)
+def nomes_etapas():
+    nomes = ["carregar_dataset_json", "carregar_dataset_gravando_cache", "carregar_dataset_cache", "matriz_incidencia",
+             "grafo_incidencia", "adjacencia_incidencia", "estatisticas_incidencia", "metricas_bipartidas_incidencia"]
+    for nome in ("coocorrencia", "similaridade"):  # Grafos simples
+        nomes += [f"produto_{nome}"] + (["produto_similaridade_paralelo", "produto_similaridade_minhash"] if nome == "similaridade" else []) + [f"grafo_{nome}", f"adjacencia_{nome}", f"estatisticas_{nome}"]
+        nomes += [f"metrica_{nome}_{metrica}" for metrica in ("densidade", "grafo_networkx", "aglomeracao", "diametro", "autovetor", "intermediacao")]
+        nomes += [f"comunidades_{nome}", f"condensado_{nome}"]
+    nomes += ["incremental_construcao", "incremental_lote"]
+    for nome in ANALISES:  # Figuras de cada análise
+        nomes += [f"analise_{nome}"] + [f"figura_{nome}_{figura}" for figura in FIGURAS]
+    return nomes
+
+
+# Etapas de uma análise de grafo simples (coocorrência ou similaridade): grafo, adjacência e cada métrica
+def _medir_grafo(benchmark, nome, matriz, nomes, tipo, amostra_intermediacao, processos, amostra_aglomeracao=None):
+    benchmark.medir(f"grafo_{nome}", grafo_de_matriz, matriz, nomes, tipo)  # Grafo NetworkX usado nas figuras
+    adjacencia = benchmark.medir(  # Adjacência CSR das métricas
+        f"adjacencia_{nome}", adjacencia_de_matriz, matriz, nomes, necessario=(benchmark.alguma_selecionada(f"metrica_{nome}_*") or benchmark.selecionada(f"estatisticas_{nome}"))
+    )
+    benchmark.medir(f"estatisticas_{nome}", estatisticas_basicas, adjacencia)  # Graus, forças, densidade, pesos e distribuição (sem NetworkX)
+    benchmark.medir(f"metrica_{nome}_densidade", densidade, adjacencia)
+    benchmark.medir(f"metrica_{nome}_grafo_networkx", grafo_networkx, adjacencia)  # Grafo NetworkX reconstruído da adjacência
+    benchmark.medir(
+        f"metrica_{nome}_aglomeracao",
+        lambda adjacencia: aglomeracao(adjacencia, amostra=amostra_aglomeracao, processos=processos)["media"],
+        adjacencia,
+    )
+    benchmark.medir(f"metrica_{nome}_diametro", diametro, adjacencia)
+    benchmark.medir(f"metrica_{nome}_autovetor", autovetor, adjacencia)
+    benchmark.medir(
+        f"metrica_{nome}_intermediacao",
+        lambda adjacencia: intermediacao(adjacencia, amostra=amostra_intermediacao, processos=processos),
+        adjacencia,
+    )
+    rotulos = benchmark.medir(f"comunidades_{nome}", lambda matriz: louvain(matriz)[0], matriz, necessario=benchmark.selecionada(f"condensado_{nome}"))  # Louvain
+    benchmark.medir(f"condensado_{nome}", grafo_condensado, matriz, rotulos)  # Supernós com os pesos somados
+
+
+# Lote sintético para a atualização incremental: uma fração das interações removidas e a mesma quantidade de
+# interações novas (pessoa e gênero já existentes, sorteados com a semente)
+def lote_incremental(data, pessoas, generos, fracao=0.01, semente=42):
+    gerador = np.random.default_rng(semente)  # Sorteio reprodutível
+    quantidade = max(1, int(len(data) * fracao))  # Interações de cada lado do lote
+    removidas = gerador.choice(len(data), size=min(quantidade, len(data)), replace=False)  # Interações existentes
+    novas_pessoas = gerador.integers(len(pessoas), size=quantidade)  # Pessoas das interações novas
+    novos_generos = gerador.integers(len(generos), size=quantidade)  # Gêneros das interações novas
+    return {
+        "removidas": [{"from": pessoas[data.origem[indice]], "to": generos[data.destino[indice]], "weight": int(data.peso[indice])} for indice in removidas.tolist()],
+        "adicionadas": [{"from": pessoas[pessoa], "to": generos[genero], "weight": 1} for pessoa, genero in zip(novas_pessoas.tolist(), novos_generos.tolist())],
+    }
+
+
+# Executa todas as etapas sobre o arquivo do dataset e devolve a lista de medições
+def executar_etapas(caminho_dataset, diretorio_figuras, benchmark, amostra_intermediacao=None, processos=1, amostra_aglomeracao=None):
+    cache = caminho_cache(caminho_dataset)  # Cache binário ao lado do dataset
+    if os.path.isdir(cache):  # Carga "fria" sempre a partir do JSON
+        shutil.rmtree(cache)
+
+    benchmark.medir("carregar_dataset_json", lambda: load_dataset(caminho_dataset, usar_cache=False))  # Leitura incremental do JSON
+    benchmark.medir("carregar_dataset_gravando_cache", lambda: load_dataset(caminho_dataset))  # JSON + gravação do cache binário
+    data, pessoas, generos = benchmark.medir("carregar_dataset_cache", lambda: load_dataset(caminho_dataset), necessario=True)  # Cache mapeado em memória
+    matriz_incidencia = benchmark.medir("matriz_incidencia", construir_matriz_incidencia, data, pessoas, generos, necessario=True)  # Base de todas as etapas seguintes
+
+    # Incidência: grafo bipartido e adjacência
+    benchmark.medir("grafo_incidencia", grafo_bipartido, matriz_incidencia, pessoas, generos)
+    benchmark.medir("adjacencia_incidencia", adjacencia_bipartida, matriz_incidencia, pessoas, generos)
+    benchmark.medir("estatisticas_incidencia", estatisticas_bipartidas, matriz_incidencia)  # Densidade, distribuições, graus e forças (sem NetworkX)
+    benchmark.medir("metricas_bipartidas_incidencia", metricas_bipartidas, matriz_incidencia)  # Conjunto padrão do relatório: densidade, graus, forças e centralidade de grau
+
+    # Produtos de matrizes e os grafos e métricas de cada projeção
+    coocorrencia = benchmark.medir(
+        "produto_coocorrencia", lambda: projecao_sem_diagonal(matriz_incidencia.T, matriz_incidencia), necessario=benchmark.alguma_selecionada("*_coocorrencia*")
+    )
+    _medir_grafo(benchmark, "coocorrencia", coocorrencia, generos, "genero", amostra_intermediacao, processos, amostra_aglomeracao)
+    similaridade = benchmark.medir(
+        "produto_similaridade", similaridade_em_blocos, matriz_incidencia, necessario=benchmark.alguma_selecionada("*_similaridade*")
+    )
+    benchmark.medir(  # Mesmo produto dividido em fragmentos entre --processos processos
+        "produto_similaridade_paralelo", lambda: similaridade_paralela(matriz_incidencia, processos=processos)
+    )
+    benchmark.medir("produto_similaridade_minhash", similaridade_minhash, matriz_incidencia)  # k-NN aproximado (comparar com o produto exato)
+    _medir_grafo(benchmark, "similaridade", similaridade, pessoas, "pessoa", amostra_intermediacao, processos, amostra_aglomeracao)
+
+    # Atualização incremental: estado inicial (matrizes e métricas baratas) e um lote de 1% das interações
+    analise_incremental = benchmark.medir(
+        "incremental_construcao", AnaliseIncremental, pessoas, generos, matriz_incidencia, necessario=benchmark.selecionada("incremental_lote")
+    )
+    benchmark.medir("incremental_lote", lambda analise: analise.aplicar(**lote_incremental(data, pessoas, generos)), analise_incremental)
+
+    # Figuras gravadas em arquivo pelas próprias análises (layout, mapa de calor e gravação do PNG)
+    for nome, construtor in ANALISES.items():  # Loop que mede cada análise
+        funcoes = benchmark.medir(  # Construção da análise
+            f"analise_{nome}", lambda construtor: construtor(None, pessoas, generos, matriz_incidencia), construtor,
+            necessario=benchmark.alguma_selecionada(f"figura_{nome}_*"),
+        )
+        for figura, funcao in zip(FIGURAS, funcoes or (None,) * len(FIGURAS)):  # Loop que mede cada figura
+            caminho = os.path.join(diretorio_figuras, f"{nome}_{figura}")  # Arquivo da figura (sem extensão)
+            benchmark.medir(f"figura_{nome}_{figura}", lambda funcao, caminho: funcao(caminho), funcao, caminho)
+    return benchmark.etapas
+
+
+# Commit atual (ou None fora de um repositório git)
+def _commit_atual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Máquina e versões das bibliotecas (resultados só são comparáveis no mesmo ambiente)
+def ambiente():
+    return {
+        "commit": _commit_atual(),
+        "data": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "nucleos": os.cpu_count(),
+        "bibliotecas": {"numpy": np.__version__, "scipy": scipy.__version__, "networkx": nx.__version__, "matplotlib": matplotlib.__version__},
+    }
+
+
+# Compara as etapas com um resultado anterior; devolve a lista de (etapa, segundos antes, segundos agora, razão)
+# e a lista das regressões (razão acima de 1 + tolerância)
+def comparar(resultado, referencia, tolerancia=TOLERANCIA_PADRAO):
+    anteriores = {etapa["nome"]: etapa for etapa in referencia["etapas"] if etapa["estado"] == "ok"}  # Etapas da referência
+    linhas, regressoes = [], []
+    for etapa in resultado["etapas"]:  # Loop que compara cada etapa medida nas duas execuções
+        anterior = anteriores.get(etapa["nome"])
+        if etapa["estado"] != "ok" or anterior is None:
+            continue
+        if max(anterior["segundos"], etapa["segundos"]) < MINIMO_SEGUNDOS_COMPARACAO:  # Rápida demais para comparar
+            continue
+        razao = etapa["segundos"] / max(anterior["segundos"], 1e-9)  # > 1: mais lenta
+        linhas.append((etapa["nome"], anterior["segundos"], etapa["segundos"], razao))
+        if razao > 1 + tolerancia:
+            regressoes.append(etapa["nome"])
+    return linhas, regressoes
+
+
+def ler_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark das etapas de análise (tempo e memória), com resultados em JSON.")
+    parser.add_argument("--dataset", help="dataset existente (padrão: gera um dataset sintético)")
+    parser.add_argument("--pessoas", type=int, default=5000, help="pessoas do dataset sintético (padrão: 5000)")
+    parser.add_argument("--generos", type=int, default=200, help="gêneros do dataset sintético (padrão: 200)")
+    parser.add_argument("--densidade", type=float, default=0.05, help="fração média de gêneros por pessoa (padrão: 0.05)")
+    parser.add_argument("--expoente", type=float, default=1.0, help="expoente da popularidade dos gêneros (padrão: 1.0)")
+    parser.add_argument("--semente", type=int, default=42, help="semente do dataset sintético (padrão: 42)")
+    parser.add_argument("--etapas", nargs="+", default=["*"], help="padrões das etapas executadas (ex.: 'produto_*' 'metrica_*')")
+    parser.add_argument("--pular", nargs="+", default=[], help="padrões das etapas ignoradas (ex.: 'figura_similaridade_*')")
+    parser.add_argument("--amostra-intermediacao", type=int, default=AMOSTRA_INTERMEDIACAO_PADRAO, help=f"pivôs da intermediação aproximada; 0 = exata, só para grafos pequenos (padrão: {AMOSTRA_INTERMEDIACAO_PADRAO})")
+    parser.add_argument("--amostra-aglomeracao", type=int, default=None, help="nós sorteados para estimar a aglomeração (padrão: exata)")
+    parser.add_argument("--processos", type=int, default=1, help="processos das métricas paralelas e do produto em fragmentos (padrão: 1)")
+    parser.add_argument("--sem-memoria", action="store_true", help="não usa o tracemalloc (tempos sem a sobrecarga da medição de memória)")
+    parser.add_argument("--saida", default="benchmark.json", help="arquivo JSON dos resultados (padrão: benchmark.json)")
+    parser.add_argument("--listar", action="store_true", help="lista as etapas e sai")
+    parser.add_argument("--comparar", help="resultado anterior (JSON) para comparar os tempos")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_PADRAO, help="aumento de tempo tolerado na comparação (padrão: 0.2)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    argumentos = ler_argumentos(argv)
+    argumentos.amostra_intermediacao = argumentos.amostra_intermediacao or None  # 0 = intermediação exata (todas as fontes)
+    if argumentos.listar:  # Apenas os nomes das etapas
+        print("\n".join(nomes_etapas()))
+        return 0
+    plt.switch_backend("Agg")  # Figuras só em arquivo
+    benchmark = Benchmark(argumentos.etapas, argumentos.pular, medir_memoria=not argumentos.sem_memoria)
+
+    with tempfile.TemporaryDirectory(prefix="benchmark_") as temporario:  # Dataset sintético, cache e figuras descartados no fim
+        parametros = {  # Parâmetros que mudam os tempos (comparações só valem entre execuções iguais)
+            "amostra_intermediacao": argumentos.amostra_intermediacao,
+            "amostra_aglomeracao": argumentos.amostra_aglomeracao,
+            "processos": argumentos.processos,
+            "medir_memoria": benchmark.medir_memoria,  # O tracemalloc deixa o código Python bem mais lento
+        }
+        if argumentos.dataset:  # Dataset real (copiado para não tocar no cache ao lado do original)
+            caminho_dataset = os.path.join(temporario, os.path.basename(argumentos.dataset))
+            shutil.copyfile(argumentos.dataset, caminho_dataset)
+            parametros["dataset"] = argumentos.dataset
+        else:  # Dataset sintético
+            caminho_dataset = os.path.join(temporario, "sintetico.jsonl")
+            parametros.update(pessoas=argumentos.pessoas, generos=argumentos.generos, densidade=argumentos.densidade,
+                              expoente=argumentos.expoente, semente=argumentos.semente)
+            interacoes = gerar_dataset(caminho_dataset, argumentos.pessoas, argumentos.generos, argumentos.densidade,
+                                       argumentos.expoente, semente=argumentos.semente)
+            print(f"Dataset sintético: {interacoes} interações.", file=sys.stderr)
+
+        if benchmark.medir_memoria:  # Rastreia as alocações a partir daqui
+            tracemalloc.start()
+        executar_etapas(caminho_dataset, temporario, benchmark, argumentos.amostra_intermediacao, argumentos.processos, argumentos.amostra_aglomeracao)
+        if benchmark.medir_memoria:
+            tracemalloc.stop()
+
+        data, pessoas, generos = load_dataset(caminho_dataset)  # Tamanho efetivo do dataset (do cache)
+        parametros["tamanho"] = {"interacoes": len(data), "pessoas": len(pessoas), "generos": len(generos)}
+
+    resultado = {"versao": VERSAO_RESULTADOS, "ambiente": ambiente(), "parametros": parametros, "etapas": benchmark.etapas}
+    with open(argumentos.saida, "w", encoding="utf-8") as arquivo:  # Resultados legíveis por máquina
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+    print(f"Resultados gravados em '{argumentos.saida}'.", file=sys.stderr)
+
+    codigo = 1 if any(etapa["estado"] == "falhou" for etapa in benchmark.etapas) else 0  # Alguma etapa falhou
+    if argumentos.comparar:  # Comparação com um commit anterior
+        with open(argumentos.comparar, "r", encoding="utf-8") as arquivo:
+            referencia = json.load(arquivo)
+        if referencia.get("parametros") != parametros:  # Datasets ou parâmetros diferentes
+            print("Aviso: parâmetros diferentes da referência; a comparação pode não ser válida.", file=sys.stderr)
+        linhas, regressoes = comparar(resultado, referencia, argumentos.tolerancia)
+        for nome, antes, agora, razao in linhas:  # Tabela da comparação
+            marca = "  <- regressão" if nome in regressoes else ""
+            print(f"  {nome:<40} {antes:9.3f} s -> {agora:9.3f} s  ({razao:5.2f}x){marca}")
+        if regressoes:
+            print(f"{len(regressoes)} etapa(s) mais lentas que a referência (tolerância {argumentos.tolerancia:.0%}).")
+            codigo = 2
+    return codigo
+
+
+if __name__ == "__main__":
+    sys.exit(main())
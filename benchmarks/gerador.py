@@ -0,0 +1,82 @@
+import argparse  # Importa argparse para a linha de comando
+import json  # Importa json para escrever os registros
+
+import numpy as np  # Importa NumPy para sortear as interações de forma vetorizada
+
+# Gerador de datasets sintéticos pessoa–gênero com popularidade dos gêneros em lei de potência (Zipf),
+# no mesmo formato do dataset.json (JSON Lines com "from", "to" e "weight"), para os benchmarks
+
+EXPOENTE_PADRAO = 1.0  # Expoente da lei de potência da popularidade dos gêneros (0 = uniforme)
+TAMANHO_LOTE_ESCRITA = 100_000  # Registros formatados por vez ao gravar o arquivo
+
+
+# Sorteia as interações: cada pessoa escolhe em média densidade × gêneros gêneros, sem repetir,
+# com probabilidade proporcional a 1 / (posição do gênero + 1) ^ expoente
+# Devolve (origem, destino, peso) como vetores de ids, ordenados por pessoa e gênero
+def gerar_interacoes(quantidade_pessoas, quantidade_generos, densidade=0.05, expoente=EXPOENTE_PADRAO, peso_maximo=1, semente=42):
+    if quantidade_pessoas < 1 or quantidade_generos < 1:  # Dataset vazio não exercita nada
+        raise ValueError("O dataset precisa de pelo menos uma pessoa e um gênero.")
+    if not 0 < densidade <= 1:  # Fração de pares pessoa–gênero ligados
+        raise ValueError(f"Densidade inválida: {densidade} (use um valor em (0, 1]).")
+    gerador = np.random.default_rng(semente)  # Sorteios reprodutíveis
+
+    popularidade = 1.0 / np.arange(1, quantidade_generos + 1) ** expoente  # Lei de potência pela posição
+    popularidade /= popularidade.sum()  # Distribuição de probabilidade
+    media = densidade * quantidade_generos  # Gêneros por pessoa em média
+    gostos = np.clip(gerador.poisson(media, quantidade_pessoas), 1, quantidade_generos)  # Gêneros de cada pessoa (pelo menos um)
+
+    # Sorteia com reposição um pouco além do necessário e descarta os pares repetidos
+    pessoas_sorteios = np.repeat(np.arange(quantidade_pessoas, dtype=np.int64), gostos)  # Pessoa de cada sorteio
+    generos_sorteios = gerador.choice(quantidade_generos, size=len(pessoas_sorteios), p=popularidade)  # Gênero de cada sorteio
+    pares = np.unique(pessoas_sorteios * quantidade_generos + generos_sorteios)  # Pares distintos, ordenados
+    origem = (pares // quantidade_generos).astype(np.int32)  # Id da pessoa
+    destino = (pares % quantidade_generos).astype(np.int32)  # Id do gênero
+    peso = gerador.integers(1, peso_maximo + 1, size=len(pares), dtype=np.int64)  # Peso de cada interação
+    return origem, destino, peso
+
+
+# Nomes com largura fixa (mantém a ordem alfabética igual à ordem dos ids)
+def nomes(prefixo, quantidade):
+    largura = len(str(max(quantidade - 1, 0)))  # Dígitos do maior id
+    return [f"{prefixo}{indice:0{largura}d}" for indice in range(quantidade)]
+
+
+# Grava as interações em JSON Lines (um registro por linha), formatando em lotes
+def gravar_dataset(caminho, origem, destino, peso, nomes_pessoas, nomes_generos):
+    pessoas_json = [json.dumps(nome, ensure_ascii=False) for nome in nomes_pessoas]  # Nomes já escapados
+    generos_json = [json.dumps(nome, ensure_ascii=False) for nome in nomes_generos]
+    with open(caminho, "w", encoding="utf-8") as arquivo:  # Abre arquivo para escrita com codificação UTF-8
+        for inicio in range(0, len(origem), TAMANHO_LOTE_ESCRITA):  # Loop que grava cada lote
+            fim = inicio + TAMANHO_LOTE_ESCRITA  # Fim do lote
+            arquivo.writelines(
+                f'{{"from": {pessoas_json[pessoa]}, "to": {generos_json[genero]}, "weight": {valor}}}\n'
+                for pessoa, genero, valor in zip(origem[inicio:fim].tolist(), destino[inicio:fim].tolist(), peso[inicio:fim].tolist())
+            )
+    return len(origem)  # Quantidade de registros gravados
+
+
+# Gera e grava um dataset sintético; devolve a quantidade de interações
+def gerar_dataset(caminho, quantidade_pessoas, quantidade_generos, densidade=0.05, expoente=EXPOENTE_PADRAO, peso_maximo=1, semente=42):
+    origem, destino, peso = gerar_interacoes(quantidade_pessoas, quantidade_generos, densidade, expoente, peso_maximo, semente)
+    return gravar_dataset(caminho, origem, destino, peso, nomes("pessoa", quantidade_pessoas), nomes("genero", quantidade_generos))
+
+
+def ler_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Gera um dataset sintético pessoa–gênero (JSON Lines).")
+    parser.add_argument("saida", help="arquivo gerado (ex.: sintetico.jsonl)")
+    parser.add_argument("--pessoas", type=int, default=10_000, help="quantidade de pessoas (padrão: 10000)")
+    parser.add_argument("--generos", type=int, default=200, help="quantidade de gêneros (padrão: 200)")
+    parser.add_argument("--densidade", type=float, default=0.05, help="fração média de gêneros por pessoa (padrão: 0.05)")
+    parser.add_argument("--expoente", type=float, default=EXPOENTE_PADRAO, help="expoente da popularidade dos gêneros (padrão: 1.0)")
+    parser.add_argument("--peso-maximo", type=int, default=1, help="pesos sorteados entre 1 e este valor (padrão: 1)")
+    parser.add_argument("--semente", type=int, default=42, help="semente dos sorteios (padrão: 42)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    argumentos = ler_argumentos()
+    quantidade = gerar_dataset(
+        argumentos.saida, argumentos.pessoas, argumentos.generos, argumentos.densidade,
+        argumentos.expoente, argumentos.peso_maximo, argumentos.semente,
+    )
+    print(f"{quantidade} interações gravadas em '{argumentos.saida}'.")
@@ -0,0 +1,62 @@
+import argparse  # Importa argparse para a linha de comando
+import sys  # Importa sys para o código de saída
+import time  # Importa time para medir os dois métodos
+
+import scipy.sparse as sp  # Importa SciPy para montar a matriz de incidência
+
+from grafos.matrizes import similaridade_em_blocos  # Importa a similaridade exata
+from grafos.minhash import avaliar_minhash, limiar_lsh, similaridade_minhash  # Importa a aproximação e a avaliação
+from .gerador import gerar_interacoes  # Importa o gerador de datasets sintéticos
+
+# Conferência da similaridade aproximada (MinHash/LSH) contra a exata em um dataset sintético pequeno:
+# tempo dos dois métodos e revocação/precisão das arestas k-NN para cada quantidade de bandas
+
+
+def ler_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Compara a similaridade MinHash/LSH com a exata em um dataset sintético.")
+    parser.add_argument("--pessoas", type=int, default=3000, help="pessoas do dataset sintético (padrão: 3000)")
+    parser.add_argument("--generos", type=int, default=200, help="gêneros do dataset sintético (padrão: 200)")
+    parser.add_argument("--densidade", type=float, default=0.05, help="fração média de gêneros por pessoa (padrão: 0.05)")
+    parser.add_argument("--expoente", type=float, default=1.0, help="expoente da popularidade dos gêneros (padrão: 1.0)")
+    parser.add_argument("--top-k", type=int, default=10, help="vizinhos por pessoa (padrão: 10)")
+    parser.add_argument("--hashes", type=int, default=128, help="tamanho da assinatura MinHash (padrão: 128)")
+    parser.add_argument("--bandas", type=int, nargs="+", default=[16, 32, 64], help="quantidades de bandas comparadas (padrão: 16 32 64)")
+    parser.add_argument("--revocacao-minima", type=float, default=None, help="código de saída 1 se a maior quantidade de bandas ficar abaixo desta revocação (com empates)")
+    parser.add_argument("--semente", type=int, default=42, help="semente do dataset e dos hashes (padrão: 42)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    argumentos = ler_argumentos(argv)
+    origem, destino, peso = gerar_interacoes(argumentos.pessoas, argumentos.generos, argumentos.densidade, argumentos.expoente, semente=argumentos.semente)
+    matriz_incidencia = sp.csr_matrix((peso.astype(float), (origem, destino)), shape=(argumentos.pessoas, argumentos.generos))  # Pessoas × gêneros
+
+    inicio = time.perf_counter()
+    exata = similaridade_em_blocos(matriz_incidencia, top_k=argumentos.top_k)  # Referência
+    segundos_exata = time.perf_counter() - inicio
+    print(f"Exata: {sp.triu(exata, k=1).nnz} arestas em {segundos_exata:.3f} s")
+    print(f"{'Bandas':>6} {'Linhas':>6} {'Limiar J':>8} {'Arestas':>8} {'Tempo (s)':>10} {'Revocação':>10} {'Precisão':>9} {'Rev. emp.':>10} {'Prec. emp.':>10}")
+
+    revocacao = None  # Revocação (com empates) da última configuração
+    for bandas in argumentos.bandas:  # Loop que avalia cada quantidade de bandas
+        if argumentos.hashes % bandas:  # Bandas precisam dividir os hashes
+            print(f"{bandas:>6} ignorada: não divide {argumentos.hashes} hashes", file=sys.stderr)
+            continue
+        inicio = time.perf_counter()
+        aproximada = similaridade_minhash(matriz_incidencia, top_k=argumentos.top_k, quantidade_hashes=argumentos.hashes,
+                                          bandas=bandas, semente=argumentos.semente)
+        segundos = time.perf_counter() - inicio
+        avaliacao = avaliar_minhash(matriz_incidencia, aproximada, top_k=argumentos.top_k)
+        linhas_por_banda = argumentos.hashes // bandas
+        print(f"{bandas:>6} {linhas_por_banda:>6} {limiar_lsh(bandas, linhas_por_banda):>8.3f} {avaliacao['arestas_aproximadas']:>8} "
+              f"{segundos:>10.3f} {avaliacao['revocacao']:>10.3f} {avaliacao['precisao']:>9.3f} "
+              f"{avaliacao['revocacao_com_empates']:>10.3f} {avaliacao['precisao_com_empates']:>10.3f}")
+        revocacao = avaliacao["revocacao_com_empates"]
+
+    if argumentos.revocacao_minima is not None and (revocacao is None or revocacao < argumentos.revocacao_minima):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+import os  # Importa os para descobrir quantos núcleos existem
+from concurrent.futures import ProcessPoolExecutor  # Importa pool de processos para executar métricas ao mesmo tempo
+
+from .construcao import AdjacenciaCSR  # Importa a representação leve de adjacência
+from helpers.easy_log import etapa  # Importa medição das etapas (tempo e memória)
+
+# Agendador de métricas: executa tarefas independentes em um pool de processos,
+# enviando a adjacência CSR uma única vez para cada processo trabalhador
+
+MINIMO_NOS_PARALELO = 1000  # Abaixo disso o custo de criar processos supera o ganho (quando processos não é informado)
+
+_adjacencia_processo = None  # Adjacência recebida pelo processo trabalhador no inicializador
+_derivados = {"adjacencia": None, "valores": {}}  # Estruturas derivadas da última adjacência usada neste processo
+
+
+# Inicializador do processo trabalhador: reconstrói a adjacência a partir dos vetores CSR
+def _inicializar_trabalhador(indptr, indices, pesos, nomes):
+    global _adjacencia_processo  # Variável compartilhada pelas tarefas deste processo
+    _adjacencia_processo = AdjacenciaCSR(indptr, indices, pesos, nomes)  # Mesma adjacência do processo principal
+
+
+# Executa uma tarefa no processo trabalhador com a adjacência já recebida
+def _executar_tarefa(funcao, argumentos):
+    return funcao(_adjacencia_processo, **argumentos)  # Toda tarefa recebe a adjacência como primeiro argumento
+
+
+# Devolve uma estrutura derivada da adjacência (listas Python, grafo NetworkX...), construída uma vez por processo
+def derivado(adjacencia, chave, construtor):
+    if _derivados["adjacencia"] is not adjacencia:  # Outra adjacência: descarta os derivados antigos
+        _derivados["adjacencia"] = adjacencia  # Passa a guardar derivados desta adjacência
+        _derivados["valores"] = {}  # Limpa os valores anteriores
+    if chave not in _derivados["valores"]:  # Ainda não construído neste processo
+        _derivados["valores"][chave] = construtor(adjacencia)  # Constrói e guarda
+    return _derivados["valores"][chave]  # Estrutura pronta
+
+
+# Quantidade de processos a usar: automático só paraleliza grafos grandes
+def processos_padrao(quantidade_nos, processos=None):
+    if processos is None:  # Não informado
+        return (os.cpu_count() or 1) if quantidade_nos >= MINIMO_NOS_PARALELO else 1  # Todos os núcleos para grafos grandes
+    return max(1, processos)  # Pelo menos um processo
+
+
+# Executa as tarefas (nome, funcao, argumentos) e devolve {nome: [resultados na ordem de envio]}
+# Cada funcao é chamada como funcao(adjacencia, **argumentos) e deve estar definida no nível do módulo
+def executar_tarefas(adjacencia, tarefas, processos=None):
+    processos = min(processos_padrao(adjacencia.quantidade_nos(), processos), max(1, len(tarefas)))  # Não abre mais processos que tarefas
+    resultados = {nome: [] for nome, _, _ in tarefas}  # Resultados agrupados pelo nome da tarefa
+
+    if processos == 1:  # Execução no próprio processo (sem custo de criar o pool)
+        for nome, funcao, argumentos in tarefas:  # Loop que executa as tarefas em sequência
+            with etapa(nome):  # Cada métrica medida separadamente (no pool só o total é medido)
+                resultados[nome].append(funcao(adjacencia, **argumentos))  # Guarda o resultado
+        return resultados, processos  # Resultados e processos usados
+
+    with ProcessPoolExecutor(  # Pool de processos trabalhadores
+        max_workers=processos,  # Quantidade de processos
+        initializer=_inicializar_trabalhador,  # Recebe a adjacência compacta uma única vez
+        initargs=(adjacencia.indptr, adjacencia.indices, adjacencia.pesos, adjacencia.nomes),  # Vetores CSR e nomes
+    ) as pool:
+        # Tarefas mais caras devem ser enviadas primeiro; o pool as distribui conforme os processos ficam livres
+        futuros = [(nome, pool.submit(_executar_tarefa, funcao, argumentos)) for nome, funcao, argumentos in tarefas]  # Envia todas as tarefas
+        for nome, futuro in futuros:  # Loop que recolhe os resultados
+            resultados[nome].append(futuro.result())  # Aguarda e guarda o resultado (exceções são repassadas)
+    return resultados, processos  # Resultados e processos usados
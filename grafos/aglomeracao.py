@@ -0,0 +1,110 @@
+import numpy as np  # Importa NumPy para operações vetorizadas
+import scipy.sparse as sp  # Importa SciPy para os produtos esparsos
+
+from .agendador import derivado, executar_tarefas, processos_padrao  # Importa o agendador de tarefas em processos
+
+# Triângulos e coeficiente de aglomeração ponderado (média geométrica, o mesmo do networkx.clustering com weight)
+# por produtos de matrizes esparsas: com Ŵ = (W / max W)^(1/3), a soma dos triângulos ponderados de i é
+# (Ŵ Ŵ Ŵ)_ii e a aglomeração é (Ŵ³)_ii / (grau (grau - 1)). Os nós são processados em blocos de linhas
+# (memória limitada ao produto de um bloco), os blocos são tarefas do agendador e, em grafos muito grandes,
+# uma amostra de nós sorteados estima a média. Grafos quase completos (como a similaridade sem poda) usam
+# produtos densos (BLAS): o produto esparso de linhas quase cheias é muito mais lento.
+
+TAMANHO_BLOCO_PADRAO = 1024  # Nós por bloco do produto (limita a memória de cada produto parcial)
+DENSIDADE_MINIMA_DENSA = 0.1  # A partir desta fração de pares ligados o produto denso é mais rápido que o esparso
+MAXIMO_BYTES_DENSO = 512 * 1024 * 1024  # Memória máxima das duas matrizes densas somadas em todos os processos (acima disso continua esparso)
+
+
+# Ŵ: pesos divididos pelo maior peso e elevados a 1/3, e a mesma estrutura com peso 1 (triângulos sem peso)
+# maximo_bytes_denso: memória permitida às duas matrizes densas neste processo
+def _matrizes_triangulos(adjacencia, maximo_bytes_denso=MAXIMO_BYTES_DENSO):
+    matriz = adjacencia.matriz()  # Adjacência ponderada (sem diagonal)
+    maior_peso = matriz.data.max() if matriz.nnz else 1.0  # Mesmo fator de normalização do NetworkX
+    raiz_cubica = sp.csr_matrix((np.cbrt(matriz.data / maior_peso), matriz.indices, matriz.indptr), shape=matriz.shape)
+    estrutura = sp.csr_matrix((np.ones(matriz.nnz), matriz.indices, matriz.indptr), shape=matriz.shape)
+    quantidade_nos = matriz.shape[0]  # Número de nós
+    if quantidade_nos and matriz.nnz >= DENSIDADE_MINIMA_DENSA * quantidade_nos ** 2 and 2 * 8 * quantidade_nos ** 2 <= maximo_bytes_denso:
+        return raiz_cubica.toarray(), estrutura.toarray()  # Grafo denso e pequeno o bastante: produtos densos
+    return raiz_cubica, estrutura
+
+
+# Diagonal de M³ só nas linhas pedidas: como M é simétrica, (M³)_ii = soma_j (M_i M)_j M_ij
+def _diagonal_cubo(matriz, nos):
+    linhas = matriz[nos]  # Linhas do bloco
+    if isinstance(matriz, np.ndarray):  # Matriz densa
+        return np.einsum("ij,ij->i", linhas @ matriz, linhas)
+    return np.asarray((linhas @ matriz).multiply(linhas).sum(axis=1)).ravel()
+
+
+# Tarefa do agendador: triângulos e soma dos triângulos ponderados dos nós recebidos, bloco a bloco
+# processos: trabalhadores do pool; cada um monta as próprias matrizes, então o limite denso é dividido entre eles
+def aglomeracao_parcial(adjacencia, nos, tamanho_bloco=TAMANHO_BLOCO_PADRAO, processos=1):
+    raiz_cubica, estrutura = derivado(  # Construídas uma vez por processo
+        adjacencia, "triangulos", lambda adjacencia: _matrizes_triangulos(adjacencia, MAXIMO_BYTES_DENSO // max(1, processos))
+    )
+    nos = np.asarray(nos, dtype=np.int64)
+    triangulos = np.zeros(len(nos))  # Triângulos de cada nó
+    ponderados = np.zeros(len(nos))  # (Ŵ³)_ii de cada nó
+    for inicio in range(0, len(nos), tamanho_bloco):  # Loop que percorre os nós em blocos
+        bloco = nos[inicio:inicio + tamanho_bloco]
+        triangulos[inicio:inicio + len(bloco)] = _diagonal_cubo(estrutura, bloco) / 2  # Cada triângulo aparece nos dois sentidos
+        ponderados[inicio:inicio + len(bloco)] = _diagonal_cubo(raiz_cubica, bloco)
+    return nos, triangulos, ponderados
+
+
+# Nós usados no cálculo: todos (exato) ou uma amostra sorteada com a semente (estimativa da média)
+def sortear_nos(quantidade_nos, amostra=None, semente=42):
+    if amostra is not None and amostra < 1:  # Pelo menos um nó é necessário
+        raise ValueError("A amostra da aglomeração deve ter pelo menos 1 nó.")
+    if amostra is None or amostra >= quantidade_nos:  # Sem amostragem: todos os nós
+        return np.arange(quantidade_nos), False
+    nos = np.sort(np.random.default_rng(semente).choice(quantidade_nos, size=amostra, replace=False))  # Sorteio reprodutível, sem repetição
+    return nos, True
+
+
+# Tarefas do agendador para a aglomeração: os nós divididos em partes intercaladas (equilibra nós de grau alto e baixo)
+# processos: tamanho do pool que vai executá-las (limita a memória das matrizes densas de cada trabalhador)
+def tarefas_aglomeracao(nos, partes, tamanho_bloco=TAMANHO_BLOCO_PADRAO, processos=1):
+    partes = max(1, min(partes, len(nos)))  # Não cria partes vazias
+    argumentos = {"tamanho_bloco": tamanho_bloco, "processos": processos}  # Iguais em todas as partes
+    return [("aglomeracao", aglomeracao_parcial, {"nos": nos[indice::partes], **argumentos}) for indice in range(partes)]
+
+
+# Junta as partes: aglomeração e triângulos por nó (NaN nos nós fora da amostra), média e parâmetros usados
+def finalizar_aglomeracao(partes, adjacencia, amostrada, semente, processos):
+    quantidade_nos = adjacencia.quantidade_nos()  # Número de nós
+    graus = adjacencia.graus().astype(float)  # Vizinhos de cada nó (sem laços)
+    triangulos = np.full(quantidade_nos, np.nan)  # Triângulos de cada nó calculado
+    valores = np.full(quantidade_nos, np.nan)  # Aglomeração de cada nó calculado
+    for nos, triangulos_parte, ponderados in partes:  # Loop que junta as partes
+        triangulos[nos] = triangulos_parte
+        pares = graus[nos] * (graus[nos] - 1)  # Pares ordenados de vizinhos
+        valores[nos] = np.divide(ponderados, pares, out=np.zeros(len(nos)), where=(pares > 0) & (ponderados != 0))  # 0 com grau < 2
+    calculados = valores[~np.isnan(valores)]  # Nós exatos ou sorteados
+    media = float(calculados.mean()) if len(calculados) else 0.0  # Média sobre todos os nós (zeros incluídos), como o NetworkX
+    parametros = {  # Parâmetros usados (informados no relatório)
+        "aproximada": amostrada,  # Se houve amostragem
+        "amostra": len(calculados),  # Quantidade de nós calculados
+        "semente": semente if amostrada else None,  # Semente do sorteio
+        "erro_padrao": float(calculados.std(ddof=1) / np.sqrt(len(calculados))) if amostrada and len(calculados) > 1 else None,  # Incerteza da média estimada
+        "processos": processos,  # Processos usados
+    }
+    return {"media": media, "valores": valores, "triangulos": triangulos, "parametros": parametros}
+
+
+# Aglomeração ponderada e triângulos de todos os nós da adjacência CSR (ou de uma amostra de nós)
+# amostra: quantidade de nós sorteados (None = exata); semente: semente do sorteio; processos: núcleos usados
+def aglomeracao(adjacencia, amostra=None, semente=42, processos=None, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    quantidade_nos = adjacencia.quantidade_nos()  # Número de nós
+    nos, amostrada = sortear_nos(quantidade_nos, amostra, semente)  # Nós do cálculo
+    processos = processos_padrao(quantidade_nos, processos)  # Processos disponíveis
+    tarefas = tarefas_aglomeracao(nos, processos * 4, tamanho_bloco, processos)  # Várias partes por processo equilibram a carga
+    resultados, processos = executar_tarefas(adjacencia, tarefas, processos)  # Executa as partes no pool
+    return finalizar_aglomeracao(resultados.get("aglomeracao", []), adjacencia, amostrada, semente, processos)
+
+
+# Texto com os parâmetros da aglomeração, para o relatório de métricas (vazio no cálculo exato)
+def descrever_aglomeracao(parametros):
+    if not parametros["aproximada"]:  # Cálculo exato: o relatório fica como sempre foi
+        return ""
+    return f" (estimada com {parametros['amostra']} nós sorteados, semente={parametros['semente']}, erro padrão {parametros['erro_padrao'] or 0.0:.4f})"
@@ -0,0 +1,60 @@
+import networkx as nx  # Importa NetworkX apenas para reutilizar sua exceção de não convergência
+import numpy as np  # Importa NumPy para operações vetorizadas
+import scipy.sparse as sp  # Importa SciPy para matrizes esparsas
+from scipy.sparse.linalg import ArpackNoConvergence, eigsh  # Importa ARPACK para o maior autovetor
+
+# Centralidade de autovetor sobre a adjacência esparsa ponderada (iteração de potência ou ARPACK),
+# com vetor inicial opcional para recalcular rapidamente após pequenas mudanças no dataset
+
+
+# Vetor inicial: o resultado anterior (vetor ou dicionário nome -> valor) ou o vetor uniforme
+def _vetor_inicial(quantidade_nos, vetor_inicial, nomes):
+    if isinstance(vetor_inicial, dict):  # Resultado anterior por nome (sobrevive a mudanças no vocabulário)
+        media = float(np.mean(list(vetor_inicial.values()))) if vetor_inicial else 1.0  # Valor para nós novos
+        vetor = np.array([vetor_inicial.get(nome, media) for nome in nomes], dtype=float)  # Alinha pelos nomes atuais
+    elif vetor_inicial is not None and len(vetor_inicial) == quantidade_nos:  # Vetor anterior do mesmo tamanho
+        vetor = np.asarray(vetor_inicial, dtype=float).copy()  # Cópia para não alterar o original
+    else:  # Sem vetor inicial utilizável
+        vetor = np.ones(quantidade_nos)  # Vetor uniforme
+
+    vetor = np.abs(vetor)  # Autovetor de Perron é não negativo
+    soma = vetor.sum()  # Normalização pela soma (mesma do NetworkX)
+    return vetor / soma if soma > 0 else np.full(quantidade_nos, 1.0 / quantidade_nos)  # Vetor normalizado
+
+
+# Iteração de potência com (A + I), igual à do NetworkX, mas com produto matriz-vetor esparso
+def _iteracao_potencia(matriz, vetor, tolerancia, max_iter):
+    quantidade_nos = matriz.shape[0]  # Número de nós
+    for iteracao in range(1, max_iter + 1):  # Loop de iterações
+        anterior = vetor  # Vetor da iteração anterior
+        vetor = anterior + matriz @ anterior  # (A + I) x: a identidade evita oscilação em grafos bipartidos
+        norma = np.linalg.norm(vetor) or 1.0  # Norma euclidiana (evita divisão por zero)
+        vetor = vetor / norma  # Normaliza
+        if np.abs(vetor - anterior).sum() < quantidade_nos * tolerancia:  # Critério de parada do NetworkX
+            return vetor, iteracao  # Convergiu
+    raise nx.PowerIterationFailedConvergence(max_iter)  # Mesma exceção do NetworkX
+
+
+# Maior autovetor pelo ARPACK (Lanczos), partindo do vetor inicial
+def _arpack(matriz, vetor, tolerancia, max_iter):
+    _, autovetores = eigsh(matriz.astype(float), k=1, which="LA", v0=vetor, tol=tolerancia, maxiter=max_iter)  # Maior autovalor algébrico
+    vetor = np.abs(autovetores[:, 0])  # Sinal do autovetor é arbitrário
+    return vetor / (np.linalg.norm(vetor) or 1.0), None  # Normalizado pela norma euclidiana
+
+
+# Centralidade de autovetor ponderada, vetor na ordem das linhas da matriz (norma euclidiana 1)
+# metodo: "potencia" (resultado igual ao do NetworkX) ou "arpack"; vetor_inicial: resultado anterior para partida a quente
+def centralidade_autovetor(matriz, tolerancia=1e-6, max_iter=1000, vetor_inicial=None, metodo="potencia", nomes=None):
+    matriz = sp.csr_matrix(matriz, dtype=float)  # Adjacência ponderada em CSR
+    quantidade_nos = matriz.shape[0]  # Número de nós
+    if quantidade_nos == 0:  # Grafo sem nós
+        raise nx.NetworkXPointlessConcept("não é possível calcular a centralidade de um grafo vazio")  # Mesma exceção do NetworkX
+
+    vetor = _vetor_inicial(quantidade_nos, vetor_inicial, nomes or [])  # Vetor de partida
+    if metodo == "arpack" and quantidade_nos > 2 and matriz.nnz > 0:  # ARPACK exige k < n e ao menos uma aresta
+        try:  # Tenta o ARPACK
+            vetor, iteracoes = _arpack(matriz, vetor, tolerancia, max_iter)
+            return vetor, iteracoes  # Resultado do ARPACK
+        except ArpackNoConvergence:  # Sem convergência: usa a iteração de potência
+            pass
+    return _iteracao_potencia(matriz, vetor, tolerancia, max_iter)  # Resultado e número de iterações
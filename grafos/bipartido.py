@@ -0,0 +1,187 @@
+import numpy as np  # Importa NumPy para operações vetorizadas
+import scipy.sparse as sp  # Importa SciPy para matrizes esparsas
+from scipy.sparse import csgraph  # Importa rotinas de grafos do SciPy (BFS em C)
+
+from .estatisticas import distribuicao_graus  # Importa resumo da distribuição de graus de cada lado
+
+# Métricas do grafo bipartido pessoas–gêneros calculadas direto na matriz de incidência esparsa, com os mesmos
+# resultados do networkx.algorithms.bipartite. Densidade, graus, forças e centralidade de grau são reduções de
+# linhas e colunas em O(nnz) e formam o conjunto padrão; aglomeração e redundância percorrem as projeções em
+# blocos de linhas (nunca guardadas inteiras) e a proximidade faz BFS de todas as fontes em lotes, por isso só
+# são calculadas quando pedidas (METRICAS_OPCIONAIS). Os vetores seguem a ordem pessoas e depois gêneros, a mesma
+# de adjacencia_bipartida.
+
+MAXIMO_CELULAS_LOTE = 1 << 22  # Máximo de distâncias (lote × nós) calculadas de uma vez na proximidade
+METRICAS_OPCIONAIS = ("proximidade", "aglomeracao", "redundancia")  # Métricas por nó acima de O(nnz), desligadas por padrão
+
+
+# Matriz binária (1 onde há interação), em CSR, sem zeros explícitos
+def _binaria(matriz_incidencia):
+    binaria = sp.csr_matrix(matriz_incidencia, dtype=np.int64, copy=True)  # Cópia (os dados são trocados por 1)
+    binaria.eliminate_zeros()  # Células que somaram zero não são arestas
+    binaria.data[:] = 1  # Conta vizinhos, não pesos
+    return binaria
+
+
+# Densidade bipartida: arestas existentes / arestas possíveis entre as duas partes (pessoas × gêneros)
+def densidade_bipartida(matriz_incidencia):
+    quantidade_pessoas, quantidade_generos = matriz_incidencia.shape  # Tamanho de cada parte
+    if quantidade_pessoas == 0 or quantidade_generos == 0:  # Sem pares possíveis
+        return 0.0
+    return _binaria(matriz_incidencia).nnz / (quantidade_pessoas * quantidade_generos)
+
+
+# Grau (vizinhos) e força (soma dos pesos) de cada lado: (graus_pessoas, graus_generos, forcas_pessoas, forcas_generos)
+def graus_bipartidos(matriz_incidencia):
+    matriz_incidencia = sp.csr_matrix(matriz_incidencia)  # Garante formato CSR
+    binaria = _binaria(matriz_incidencia)  # Arestas sem peso
+    return (
+        np.diff(binaria.indptr),  # Gêneros de cada pessoa (tamanho de cada linha)
+        np.bincount(binaria.indices, minlength=binaria.shape[1]),  # Pessoas de cada gênero (contagem das colunas)
+        np.asarray(matriz_incidencia.sum(axis=1)).ravel(),  # Peso total de cada pessoa
+        np.asarray(matriz_incidencia.sum(axis=0)).ravel(),  # Peso total de cada gênero
+    )
+
+
+# Centralidade de grau bipartida: grau normalizado pelo tamanho da outra parte (pessoas, gêneros)
+def centralidade_grau_bipartida(matriz_incidencia):
+    graus_pessoas, graus_generos = graus_bipartidos(matriz_incidencia)[:2]  # Graus de cada lado
+    quantidade_pessoas, quantidade_generos = matriz_incidencia.shape  # Tamanho de cada parte
+    return graus_pessoas / max(quantidade_generos, 1), graus_generos / max(quantidade_pessoas, 1)
+
+
+# Aglomeração de Latapy (modo "dot") das linhas de uma matriz binária: média, sobre os vizinhos de segunda ordem u
+# de v, de |N(u) ∩ N(v)| / |N(u) ∪ N(v)|; a projeção linhas × linhas é calculada em blocos e descartada
+def _aglomeracao_linhas(binaria, tamanho_bloco):
+    quantidade = binaria.shape[0]  # Número de linhas (nós deste lado)
+    graus = np.diff(binaria.indptr)  # Vizinhos de cada nó
+    transposta = binaria.T.tocsr()  # Transposta calculada uma única vez
+    aglomeracao = np.zeros(quantidade)  # Coeficiente de cada nó (0 sem vizinhos de segunda ordem)
+    for inicio in range(0, quantidade, tamanho_bloco):  # Loop que percorre os nós em blocos
+        fim = min(inicio + tamanho_bloco, quantidade)  # Última linha (exclusiva) do bloco
+        bloco = (binaria[inicio:fim] @ transposta).tocoo()  # Vizinhos em comum com cada nó (projeção do bloco)
+        linhas = bloco.row + inicio  # Linha global
+        manter = linhas != bloco.col  # Sem o próprio nó
+        linhas, colunas, comuns = linhas[manter], bloco.col[manter], bloco.data[manter]
+        jaccard = comuns / (graus[linhas] + graus[colunas] - comuns)  # Sobreposição de cada par de segunda ordem
+        somas = np.bincount(linhas - inicio, weights=jaccard, minlength=fim - inicio)  # Soma por nó do bloco
+        quantidades = np.bincount(linhas - inicio, minlength=fim - inicio)  # Vizinhos de segunda ordem por nó
+        aglomeracao[inicio:fim] = np.divide(somas, quantidades, out=np.zeros(fim - inicio), where=quantidades > 0)
+    return aglomeracao
+
+
+# Aglomeração bipartida de Latapy (modo "dot") de cada pessoa e de cada gênero
+# As pessoas usam a projeção pessoas × pessoas (em blocos): é a parte cara em datasets com muitas pessoas
+def aglomeracao_bipartida(matriz_incidencia, tamanho_bloco=2048):
+    binaria = _binaria(matriz_incidencia)  # Arestas sem peso
+    return _aglomeracao_linhas(binaria, tamanho_bloco), _aglomeracao_linhas(binaria.T.tocsr(), tamanho_bloco)
+
+
+# Redundância das linhas de uma matriz binária: fração dos pares de vizinhos (u, w) de v que têm outro vizinho
+# em comum além de v, ou seja, |N(u) ∩ N(w)| >= 2. Com Q = pares (u < w) da projeção das colunas com valor >= 2,
+# a sobreposição de v é sum_{u,w} B[v,u] Q[u,w] B[v,w]: a linha v de (B @ Q) ∘ B, somada, com Q montada em blocos
+# de colunas u. Nós com menos de dois vizinhos ficam com NaN (a redundância não é definida)
+def _redundancia_linhas(binaria, tamanho_bloco):
+    quantidade_colunas = binaria.shape[1]  # Nós do outro lado
+    transposta = binaria.T.tocsr()  # Colunas × linhas
+    sobreposicao = np.zeros(binaria.shape[0])  # Pares de vizinhos sobrepostos de cada nó
+    for inicio in range(0, quantidade_colunas, tamanho_bloco):  # Loop que percorre as colunas u em blocos
+        fim = min(inicio + tamanho_bloco, quantidade_colunas)  # Última coluna (exclusiva) do bloco
+        pares = (transposta[inicio:fim] @ binaria).tocoo()  # Vizinhos em comum entre u (do bloco) e cada w
+        manter = (pares.data >= 2) & (pares.col > pares.row + inicio)  # Sobrepostos além de v, cada par uma vez (u < w)
+        bloco_q = sp.csr_matrix(
+            (np.ones(int(manter.sum())), (pares.row[manter], pares.col[manter])), shape=(fim - inicio, quantidade_colunas)
+        )  # Linhas u do bloco de Q
+        caminhos = binaria[:, inicio:fim] @ bloco_q  # (B[:, U] @ Q[U, :])[v, w] = pares (u, w) de v com u no bloco
+        sobreposicao += np.asarray(caminhos.multiply(binaria).sum(axis=1)).ravel()  # Só os w que também são vizinhos de v
+    graus = np.diff(binaria.indptr).astype(float)  # Vizinhos de cada nó
+    possiveis = graus * (graus - 1) / 2  # Pares de vizinhos
+    return np.divide(sobreposicao, possiveis, out=np.full(len(graus), np.nan), where=graus >= 2)
+
+
+# Redundância de cada pessoa e de cada gênero (NaN para nós com menos de dois vizinhos)
+# A redundância dos gêneros usa a projeção pessoas × pessoas (em blocos), a parte cara em datasets grandes
+def redundancia_bipartida(matriz_incidencia, tamanho_bloco=2048):
+    binaria = _binaria(matriz_incidencia)  # Arestas sem peso
+    return _redundancia_linhas(binaria, tamanho_bloco), _redundancia_linhas(binaria.T.tocsr(), tamanho_bloco)
+
+
+# Centralidade de proximidade bipartida (normalizada como no NetworkX): (m + 2(n - 1)) / soma das distâncias,
+# com n o tamanho da parte do nó e m o da outra, multiplicada pela fração de nós alcançáveis
+# BFS de todas as fontes em lotes (custo O(nós × arestas): é a métrica cara desta lista)
+def proximidade_bipartida(matriz_incidencia):
+    binaria = _binaria(matriz_incidencia)  # Arestas sem peso
+    quantidade_pessoas, quantidade_generos = binaria.shape  # Tamanho de cada parte
+    quantidade_nos = quantidade_pessoas + quantidade_generos  # Nós do grafo bipartido
+    bloco = sp.bmat([[None, binaria], [binaria.T, None]], format="csr")  # Adjacência [[0, M], [M^T, 0]]
+    somas = np.zeros(quantidade_nos)  # Soma das distâncias de cada nó
+    alcancaveis = np.zeros(quantidade_nos)  # Nós alcançáveis (incluindo o próprio)
+    tamanho_lote = max(1, MAXIMO_CELULAS_LOTE // max(1, quantidade_nos))  # Fontes por lote
+    for inicio in range(0, quantidade_nos, tamanho_lote):  # Loop que percorre as fontes em lotes
+        fontes = np.arange(inicio, min(inicio + tamanho_lote, quantidade_nos))  # Fontes do lote
+        distancias = csgraph.shortest_path(bloco, method="D", directed=False, unweighted=True, indices=fontes)  # BFS das fontes
+        finitas = np.isfinite(distancias)  # Nós alcançados
+        somas[fontes] = np.where(finitas, distancias, 0).sum(axis=1)
+        alcancaveis[fontes] = finitas.sum(axis=1)
+
+    tamanho_parte = np.r_[np.full(quantidade_pessoas, quantidade_pessoas), np.full(quantidade_generos, quantidade_generos)]  # n
+    tamanho_outra = quantidade_nos - tamanho_parte  # m
+    proximidade = np.zeros(quantidade_nos)  # Nós isolados ficam com 0
+    if quantidade_nos > 1:
+        validos = somas > 0  # Nós que alcançam alguém
+        proximidade[validos] = (tamanho_outra[validos] + 2 * (tamanho_parte[validos] - 1)) / somas[validos]
+        proximidade[validos] *= (alcancaveis[validos] - 1) / (quantidade_nos - 1)  # Normalização pela parte alcançável
+    return proximidade[:quantidade_pessoas], proximidade[quantidade_pessoas:]
+
+
+# Estatísticas básicas do grafo bipartido (só reduções em O(nnz)): densidade, distribuição dos graus de cada lado
+# e grau e força de cada nó (pessoas e depois gêneros, na ordem de adjacencia_bipartida)
+def estatisticas_bipartidas(matriz_incidencia):
+    matriz_incidencia = sp.csr_matrix(matriz_incidencia)  # Garante formato CSR
+    graus_pessoas, graus_generos, forcas_pessoas, forcas_generos = graus_bipartidos(matriz_incidencia)
+    return {
+        "densidade": densidade_bipartida(matriz_incidencia),
+        "distribuicao_pessoas": distribuicao_graus(graus_pessoas),
+        "distribuicao_generos": distribuicao_graus(graus_generos),
+        "colunas": {
+            "grau": np.r_[graus_pessoas, graus_generos],
+            "forca": np.r_[forcas_pessoas, forcas_generos],
+        },
+    }
+
+
+# Métricas bipartidas: as de custo O(nnz) (densidade, distribuições, graus, forças e centralidade de grau) e as
+# opcionais pedidas em opcionais (nomes de METRICAS_OPCIONAIS), com as médias de cada uma; vetores por nó na ordem
+# de adjacencia_bipartida (pessoas e depois gêneros)
+def metricas_bipartidas(matriz_incidencia, tamanho_bloco=2048, opcionais=()):
+    desconhecidas = sorted(set(opcionais) - set(METRICAS_OPCIONAIS))  # Nomes fora da lista
+    if desconhecidas:
+        raise ValueError(f"Métrica bipartida inválida: {', '.join(desconhecidas)} (use {', '.join(METRICAS_OPCIONAIS)}).")
+    matriz_incidencia = sp.csr_matrix(matriz_incidencia)  # Garante formato CSR
+    estatisticas = estatisticas_bipartidas(matriz_incidencia)  # Densidade, distribuições, graus e forças
+    grau_pessoas, grau_generos = centralidade_grau_bipartida(matriz_incidencia)
+
+    def _media(valores):  # Média ignorando NaN (0 se não houver valores)
+        valores = valores[~np.isnan(valores)]
+        return float(valores.mean()) if len(valores) else 0.0
+
+    resultado = {
+        "densidade": estatisticas["densidade"],
+        "distribuicao_pessoas": estatisticas["distribuicao_pessoas"],
+        "distribuicao_generos": estatisticas["distribuicao_generos"],
+        "colunas": {**estatisticas["colunas"], "centralidade_grau": np.r_[grau_pessoas, grau_generos]},
+    }
+    if "proximidade" in opcionais:  # BFS de todas as fontes: O(nós × arestas)
+        resultado["colunas"]["proximidade"] = np.r_[proximidade_bipartida(matriz_incidencia)]
+    if "aglomeracao" in opcionais:  # Projeções pessoas × pessoas e gêneros × gêneros em blocos
+        aglomeracao_pessoas, aglomeracao_generos = aglomeracao_bipartida(matriz_incidencia, tamanho_bloco)
+        resultado["colunas"]["aglomeracao"] = np.r_[aglomeracao_pessoas, aglomeracao_generos]
+        resultado["aglomeracao_media"] = _media(resultado["colunas"]["aglomeracao"])  # Igual a networkx.bipartite.average_clustering
+        resultado["aglomeracao_media_pessoas"] = _media(aglomeracao_pessoas)
+        resultado["aglomeracao_media_generos"] = _media(aglomeracao_generos)
+    if "redundancia" in opcionais:  # Idem, com os pares de vizinhos sobrepostos
+        redundancia_pessoas, redundancia_generos = redundancia_bipartida(matriz_incidencia, tamanho_bloco)
+        resultado["colunas"]["redundancia"] = np.r_[redundancia_pessoas, redundancia_generos]
+        resultado["redundancia_media_pessoas"] = _media(redundancia_pessoas)  # Só nós com dois ou mais vizinhos
+        resultado["redundancia_media_generos"] = _media(redundancia_generos)
+    return resultado
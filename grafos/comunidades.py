@@ -0,0 +1,241 @@
+import numpy as np  # Importa NumPy para operações vetorizadas
+import scipy.sparse as sp  # Importa SciPy para matrizes esparsas
+from scipy.sparse.csgraph import connected_components  # Importa componentes conexas do grafo condensado
+import networkx as nx  # Importa NetworkX para desenhar o grafo condensado
+
+from .construcao import adjacencia_de_matriz, grafo_de_matriz  # Importa construtores do grafo condensado
+from .layout import posicoes_grafo  # Importa motor de layout com cache de posições
+
+# Detecção de comunidades (Louvain) na adjacência esparsa ponderada e resumo do grafo em comunidades:
+# cada nível move os nós, um a um, para a comunidade vizinha de maior ganho de modularidade e depois
+# agrega cada comunidade em um supernó (P^T A P, vetorizado); repete até nenhum nó mudar de comunidade.
+# O grafo condensado (supernós com os pesos somados) é pequeno e serve para desenhar e medir grafos grandes.
+
+MAXIMO_NIVEIS = 20  # Níveis de agregação do Louvain (na prática poucos níveis bastam)
+MAXIMO_PASSADAS = 50  # Passadas de movimentação local por nível
+MAXIMO_MEMBROS_RELATORIO = 5  # Membros listados por comunidade no relatório (os de maior força interna)
+PESO_ANCORA = 0.5  # Peso (relativo à maior ligação) que prende cada componente solta à maior comunidade no layout
+SUPERNOS_TAMANHO_CHEIO = 20  # Até esta quantidade de supernós a maior bolha tem a área cheia; acima, as áreas diminuem
+
+
+# Matriz de pertinência (nós × comunidades) com um 1 por linha
+def _pertinencia(rotulos, quantidade_comunidades):
+    quantidade_nos = len(rotulos)  # Número de nós
+    return sp.csr_matrix((np.ones(quantidade_nos), (np.arange(quantidade_nos), rotulos)), shape=(quantidade_nos, quantidade_comunidades))
+
+
+# Renumera os rótulos como 0..k-1 (comunidades maiores primeiro; empate pelo menor nó)
+def _renumerar(rotulos):
+    _, inversos, tamanhos = np.unique(rotulos, return_inverse=True, return_counts=True)  # Rótulos consecutivos e tamanhos
+    primeiro = np.full(len(tamanhos), len(rotulos))  # Primeiro nó de cada comunidade
+    np.minimum.at(primeiro, inversos, np.arange(len(rotulos)))
+    ordem = np.lexsort((primeiro, -tamanhos))  # Maiores primeiro
+    novo = np.empty(len(tamanhos), dtype=np.int64)
+    novo[ordem] = np.arange(len(tamanhos))
+    return novo[inversos]
+
+
+# Modularidade (com resolução) de uma partição: soma, por comunidade, de interno / 2m - resolucao (total / 2m)²
+# Mesmo valor de networkx.community.modularity para grafos não-direcionados ponderados
+def modularidade(matriz, rotulos, resolucao=1.0):
+    matriz = sp.csr_matrix(matriz)  # Garante formato CSR
+    dobro_pesos = matriz.sum()  # 2m (cada aresta aparece nos dois sentidos)
+    if dobro_pesos == 0:  # Grafo sem arestas
+        return 0.0
+    rotulos = np.asarray(rotulos)
+    quantidade_comunidades = int(rotulos.max()) + 1 if len(rotulos) else 0
+    pertinencia = _pertinencia(rotulos, quantidade_comunidades)  # Nós × comunidades
+    internos = (pertinencia.T @ matriz @ pertinencia).diagonal()  # Peso dentro de cada comunidade (dos dois sentidos)
+    totais = np.bincount(rotulos, weights=np.asarray(matriz.sum(axis=1)).ravel(), minlength=quantidade_comunidades)  # Grau total
+    return float(internos.sum() / dobro_pesos - resolucao * ((totais / dobro_pesos) ** 2).sum())
+
+
+# Movimentação local de um nível: percorre os nós em ordem aleatória e move cada um para a comunidade vizinha
+# de maior ganho (k_i,c - resolucao * total_c * k_i / 2m); devolve os rótulos e se algum nó mudou
+def _mover_nos(matriz, resolucao, gerador):
+    quantidade_nos = matriz.shape[0]  # Nós deste nível
+    graus = np.asarray(matriz.sum(axis=1)).ravel()  # Grau ponderado de cada nó (inclui o laço dos supernós)
+    dobro_pesos = float(graus.sum())  # 2m
+    indptr, indices, pesos = matriz.indptr.tolist(), matriz.indices.tolist(), matriz.data.tolist()  # Listas Python: acesso rápido no loop
+    graus_lista = graus.tolist()
+    rotulos = list(range(quantidade_nos))  # Cada nó começa sozinho
+    totais = graus_lista[:]  # Grau total de cada comunidade
+    fator = resolucao / dobro_pesos  # Termo do modelo nulo
+    algum_movimento = False  # Algum nó mudou de comunidade neste nível
+    ordem = gerador.permutation(quantidade_nos).tolist()  # Ordem aleatória (reprodutível) das visitas
+
+    pendentes = [True] * quantidade_nos  # Nós a revisitar: na passada seguinte, só os vizinhos de quem mudou
+    for _ in range(MAXIMO_PASSADAS):  # Passadas até estabilizar
+        movimentos = 0  # Nós movidos nesta passada
+        for no in ordem:  # Loop que visita cada nó
+            if not pendentes[no]:  # Vizinhança inalterada desde a última visita: a escolha seria a mesma
+                continue
+            pendentes[no] = False
+            atual = rotulos[no]  # Comunidade atual
+            grau = graus_lista[no]
+            vizinhas = {}  # Comunidade vizinha -> peso das arestas do nó até ela
+            for posicao in range(indptr[no], indptr[no + 1]):  # Loop que percorre os vizinhos
+                vizinho = indices[posicao]
+                if vizinho != no:  # O laço não conta como ligação a outra comunidade
+                    comunidade = rotulos[vizinho]
+                    vizinhas[comunidade] = vizinhas.get(comunidade, 0.0) + pesos[posicao]
+            totais[atual] -= grau  # Tira o nó da sua comunidade
+            melhor = atual  # Comunidade escolhida (fica se nenhuma for melhor)
+            melhor_ganho = vizinhas.get(atual, 0.0) - totais[atual] * grau * fator  # Ganho de voltar para a atual
+            for comunidade, peso in vizinhas.items():  # Loop que avalia cada comunidade vizinha
+                ganho = peso - totais[comunidade] * grau * fator
+                if ganho > melhor_ganho + 1e-12:  # Só troca com ganho de verdade (evita oscilar entre empates)
+                    melhor, melhor_ganho = comunidade, ganho
+            totais[melhor] += grau  # Coloca o nó na comunidade escolhida
+            if melhor != atual:
+                rotulos[no] = melhor
+                movimentos += 1
+                for posicao in range(indptr[no], indptr[no + 1]):  # Os vizinhos fora da nova comunidade voltam à fila
+                    vizinho = indices[posicao]
+                    if rotulos[vizinho] != melhor:
+                        pendentes[vizinho] = True
+        if movimentos == 0:  # Nenhum nó mudou: nível estável
+            break
+        algum_movimento = True
+    return np.asarray(rotulos, dtype=np.int64), algum_movimento
+
+
+# Louvain na matriz de adjacência simétrica ponderada (CSR, sem diagonal): devolve os rótulos das comunidades
+# (0 = maior comunidade) e a modularidade final; resolucao > 1 gera comunidades menores, < 1 maiores
+def louvain(matriz, resolucao=1.0, semente=42):
+    matriz = sp.csr_matrix(matriz, dtype=float)  # Pesos em ponto flutuante
+    quantidade_nos = matriz.shape[0]  # Número de nós
+    rotulos = np.arange(quantidade_nos)  # Comunidade de cada nó original
+    if quantidade_nos == 0 or matriz.nnz == 0:  # Sem arestas: cada nó é a sua comunidade
+        return rotulos, 0.0
+    gerador = np.random.default_rng(semente)  # Ordem das visitas reprodutível
+    nivel = matriz  # Grafo do nível atual (supernós a partir do segundo)
+    for _ in range(MAXIMO_NIVEIS):  # Loop que percorre os níveis
+        rotulos_nivel, mudou = _mover_nos(nivel, resolucao, gerador)  # Comunidade de cada supernó
+        if not mudou:  # Partição estável
+            break
+        _, rotulos_nivel = np.unique(rotulos_nivel, return_inverse=True)  # Rótulos consecutivos
+        rotulos = rotulos_nivel[rotulos]  # Leva os nós originais para as novas comunidades
+        pertinencia = _pertinencia(rotulos_nivel, int(rotulos_nivel.max()) + 1)
+        nivel = (pertinencia.T @ nivel @ pertinencia).tocsr()  # Agrega cada comunidade em um supernó (o peso interno vira laço)
+    rotulos = _renumerar(rotulos)  # 0 = maior comunidade
+    return rotulos, modularidade(matriz, rotulos, resolucao)
+
+
+# Grafo condensado: supernós (comunidades) ligados pela soma dos pesos entre elas
+# Devolve (matriz k × k sem diagonal, peso interno de cada comunidade, quantidade de membros)
+def grafo_condensado(matriz, rotulos):
+    rotulos = np.asarray(rotulos)
+    quantidade_comunidades = int(rotulos.max()) + 1 if len(rotulos) else 0
+    pertinencia = _pertinencia(rotulos, quantidade_comunidades)  # Nós × comunidades
+    agregada = (pertinencia.T @ sp.csr_matrix(matriz, dtype=float) @ pertinencia).tocsr()  # Pesos somados entre comunidades
+    internos = agregada.diagonal() / 2  # Cada aresta interna aparece nos dois sentidos
+    agregada.setdiag(0)  # Laços não viram arestas do grafo condensado
+    agregada.eliminate_zeros()
+    agregada.sort_indices()
+    return agregada, internos, np.bincount(rotulos, minlength=quantidade_comunidades)
+
+
+# Resumo de cada comunidade: membros, peso interno e externo, densidade interna, condutância
+# e os membros de maior força interna (nomes na ordem das linhas da matriz)
+def resumo_comunidades(matriz, rotulos, nomes, maximo_membros=MAXIMO_MEMBROS_RELATORIO):
+    matriz = sp.csr_matrix(matriz, dtype=float)  # Garante formato CSR
+    rotulos = np.asarray(rotulos)
+    condensada, internos, tamanhos = grafo_condensado(matriz, rotulos)
+    externos = np.asarray(condensada.sum(axis=1)).ravel()  # Peso das arestas que saem da comunidade
+    volumes = 2 * internos + externos  # Grau total da comunidade
+    dobro_pesos = volumes.sum()  # 2m
+    coo = matriz.tocoo()
+    mesma = rotulos[coo.row] == rotulos[coo.col]  # Arestas internas
+    arestas_internas = np.bincount(rotulos[coo.row[mesma]], minlength=len(tamanhos)) / 2  # Arestas (não pesos) internas
+    forca_interna = np.bincount(coo.row[mesma], weights=coo.data[mesma], minlength=matriz.shape[0])  # Força de cada nó dentro da sua comunidade
+
+    ordem = np.lexsort((np.arange(len(rotulos)), -forca_interna, rotulos))  # Por comunidade, força interna decrescente
+    inicio = np.r_[0, np.cumsum(tamanhos)]  # Onde começa cada comunidade em ordem
+    resumo = []
+    for comunidade in range(len(tamanhos)):  # Loop que resume cada comunidade (k é pequeno)
+        tamanho = int(tamanhos[comunidade])
+        possiveis = tamanho * (tamanho - 1) / 2  # Pares de membros
+        menor_volume = min(volumes[comunidade], dobro_pesos - volumes[comunidade])
+        resumo.append({
+            "comunidade": comunidade,
+            "membros": tamanho,
+            "peso_interno": float(internos[comunidade]),
+            "peso_externo": float(externos[comunidade]),
+            "densidade": float(arestas_internas[comunidade] / possiveis) if possiveis else 0.0,
+            "condutancia": float(externos[comunidade] / menor_volume) if menor_volume > 0 else 0.0,  # Fração do volume que sai
+            "principais": [nomes[no] for no in ordem[inicio[comunidade]:inicio[comunidade] + min(tamanho, maximo_membros)].tolist()],  # Só membros desta comunidade
+        })
+    return resumo
+
+
+# Desenha o grafo condensado em um eixo: supernós com área proporcional aos membros, arestas com largura
+# proporcional ao peso entre as comunidades e rótulo "C<n> (membros)" com o membro de maior força interna
+def desenhar_grafo_condensado(ax, matriz, rotulos, nomes, cor="lightblue", layout="auto", semente=42):
+    resumo = resumo_comunidades(matriz, rotulos, nomes, maximo_membros=1)  # Tamanhos e membro principal
+    condensada = grafo_condensado(matriz, rotulos)[0]  # Pesos entre as comunidades
+    if condensada.nnz:  # Pesos relativos à maior ligação: somas grandes colapsariam o spring layout (o peso é a atração)
+        condensada = condensada / condensada.max()
+    nomes_comunidades = [
+        f"C{linha['comunidade']} ({linha['membros']})\n{linha['principais'][0]}" if linha["principais"] else f"C{linha['comunidade']}"
+        for linha in resumo
+    ]
+    grafo = grafo_de_matriz(condensada, nomes_comunidades, tipo="comunidade")  # Grafo NetworkX dos supernós
+
+    # Componentes desconexas se afastam sem limite no spring layout e espremem as outras: no layout (só nele)
+    # o primeiro supernó de cada componente solta ganha uma ligação fraca com a maior comunidade
+    quantidade_componentes, componente = connected_components(condensada, directed=False)
+    primeiros = np.unique(componente, return_index=True)[1]  # Primeiro supernó de cada componente
+    ancoras = primeiros[componente[primeiros] != componente[0]]  # Componentes sem a comunidade 0
+    ligacoes = sp.csr_matrix((np.full(len(ancoras), PESO_ANCORA), (ancoras, np.zeros(len(ancoras), dtype=np.int64))), shape=condensada.shape)
+    matriz_layout = (condensada + ligacoes + ligacoes.T).tocsr()
+    grafo_layout = grafo_de_matriz(matriz_layout, nomes_comunidades, tipo="comunidade") if len(ancoras) else grafo
+    adjacencia = adjacencia_de_matriz(matriz_layout, nomes_comunidades)
+    posicoes = posicoes_grafo(adjacencia, grafo_layout, metodo=layout, iteracoes=100, semente=semente)  # Supernós: poucos nós
+
+    membros = np.array([linha["membros"] for linha in resumo], dtype=float)
+    fator_area = min(1.0, SUPERNOS_TAMANHO_CHEIO / max(len(membros), 1))  # Muitas bolhas: áreas menores para não se sobreporem
+    tamanhos_nos = (fator_area * (300 + 2700 * membros / membros.max())).tolist() if len(membros) else []  # Área proporcional aos membros
+    pesos = [dados["weight"] for _, _, dados in grafo.edges(data=True)]
+    larguras = [0.5 + 6 * peso for peso in pesos]  # Largura relativa à maior ligação
+
+    nx.draw_networkx_nodes(grafo, posicoes, node_size=tamanhos_nos, node_color=cor, edgecolors="black", ax=ax)
+    nx.draw_networkx_edges(grafo, posicoes, width=larguras, alpha=0.6, edge_color="gray", ax=ax)
+    nx.draw_networkx_labels(grafo, posicoes, font_size=8, ax=ax)
+    ax.margins(0.1)  # Supernós grandes não são cortados na borda
+    ax.axis("off")
+    return len(resumo)  # Quantidade de supernós desenhados
+
+
+# Linhas da seção de comunidades dos relatórios de métricas: modularidade, grafo condensado e uma linha por comunidade
+# top_n: lista só as top_n maiores comunidades (None = todas); a tabela completa fica nas colunas por nó (colunas_comunidades)
+def linhas_relatorio_comunidades(matriz, rotulos, valor_modularidade, nomes, resolucao=1.0, top_n=None):
+    resumo = resumo_comunidades(matriz, rotulos, nomes)  # Uma entrada por comunidade
+    condensada = grafo_condensado(matriz, rotulos)[0]  # Ligações entre as comunidades
+    linhas = ["\nComunidades (Louvain):"]
+    linhas.append(f"  Resolução: {resolucao}")
+    linhas.append(f"  Modularidade: {valor_modularidade:.4f}")
+    linhas.append(f"  Número de comunidades: {len(resumo)}")
+    linhas.append(f"  Grafo condensado: {len(resumo)} supernós, {condensada.nnz // 2} arestas")
+    maiores = sorted(resumo, key=lambda linha: -linha["membros"])[:top_n]  # Maiores comunidades primeiro
+    if len(maiores) < len(resumo):  # Texto resumido: as outras só nas colunas por nó
+        linhas.append(f"  {len(maiores)} maiores comunidades (as outras {len(resumo) - len(maiores)} estão no arquivo de valores por nó):")
+    for linha in maiores:  # Loop que descreve cada comunidade listada
+        linhas.append(
+            f"  C{linha['comunidade']}: {linha['membros']} membros, peso interno {linha['peso_interno']:.4f}, "
+            f"peso externo {linha['peso_externo']:.4f}, densidade {linha['densidade']:.4f}, "
+            f"condutância {linha['condutancia']:.4f}; principais: {', '.join(map(str, linha['principais']))}"
+        )
+    return linhas
+
+
+# Tabela completa das comunidades como colunas por nó: a comunidade de cada nó e os valores dela (membros,
+# pesos interno e externo, densidade e condutância), para o arquivo colunar e o armazém de resultados
+def colunas_comunidades(matriz, rotulos, nomes):
+    resumo = resumo_comunidades(matriz, rotulos, nomes, maximo_membros=0)  # Uma entrada por comunidade (sem os principais)
+    rotulos = np.asarray(rotulos)
+    colunas = {"comunidade": rotulos}
+    for chave in ("membros", "peso_interno", "peso_externo", "densidade", "condutancia"):  # Loop que espalha cada valor pelos membros
+        valores = np.array([linha[chave] for linha in resumo], dtype=np.int64 if chave == "membros" else float)
+        colunas[f"{chave}_comunidade"] = valores[rotulos]
+    return colunas
@@ -0,0 +1,92 @@
+from collections import namedtuple  # Importa namedtuple para a representação leve de adjacência
+
+import numpy as np  # Importa NumPy para operações vetorizadas
+import scipy.sparse as sp  # Importa SciPy para matrizes esparsas
+import networkx as nx  # Importa NetworkX para trabalhar com grafos
+
+# Construtores de grafos a partir das matrizes esparsas (sem laços aninhados sobre índices)
+
+
+# Adjacência em formato CSR: vizinhos do nó i são indices[indptr[i]:indptr[i + 1]], com os pesos alinhados
+class AdjacenciaCSR(namedtuple("AdjacenciaCSR", ["indptr", "indices", "pesos", "nomes"])):
+    __slots__ = ()  # Sem dicionário por instância (mantém o objeto leve)
+
+    # Quantidade de nós
+    def quantidade_nos(self):
+        return len(self.indptr) - 1  # Uma posição de indptr a mais que o número de nós
+
+    # Quantidade de arestas (cada aresta aparece duas vezes na adjacência simétrica)
+    def quantidade_arestas(self):
+        return len(self.indices) // 2  # Metade das entradas não nulas
+
+    # Grau de cada nó (número de vizinhos)
+    def graus(self):
+        return np.diff(self.indptr)  # Tamanho de cada linha CSR
+
+    # Grau ponderado (força) de cada nó
+    def forcas(self):
+        return np.asarray(self.matriz().sum(axis=1)).ravel()  # Soma dos pesos de cada linha
+
+    # Visão SciPy da mesma adjacência (sem copiar os vetores)
+    def matriz(self):
+        quantidade = self.quantidade_nos()  # Número de nós
+        return sp.csr_matrix((self.pesos, self.indices, self.indptr), shape=(quantidade, quantidade))  # Matriz CSR compartilhando a memória
+
+    # Arestas não duplicadas (triângulo superior) como vetores origem, destino e peso
+    def arestas(self):
+        triangulo_superior = sp.triu(self.matriz(), k=1).tocoo()  # Mantém só i < j
+        return triangulo_superior.row, triangulo_superior.col, triangulo_superior.data  # Vetores alinhados
+
+
+# Cria a adjacência CSR de uma matriz quadrada simétrica (coocorrência ou similaridade)
+def adjacencia_de_matriz(matriz, nomes):
+    matriz = sp.csr_matrix(matriz, copy=True)  # Cópia CSR para não alterar a matriz original
+    matriz.setdiag(0)  # Remove auto-conexões
+    matriz.eliminate_zeros()  # Remove células nulas da estrutura
+    matriz.sort_indices()  # Vizinhos em ordem crescente de índice
+    return AdjacenciaCSR(matriz.indptr, matriz.indices, matriz.data, list(nomes))  # Empacota os vetores CSR com os nomes
+
+
+# Cria a adjacência CSR do grafo bipartido a partir da matriz de incidência (pessoas primeiro, gêneros depois)
+def adjacencia_bipartida(matriz_incidencia, nomes_linhas, nomes_colunas):
+    matriz_incidencia = sp.csr_matrix(matriz_incidencia)  # Garante formato CSR
+    bloco = sp.bmat([[None, matriz_incidencia], [matriz_incidencia.T, None]], format="csr")  # Matriz [[0, M], [M^T, 0]]
+    bloco.eliminate_zeros()  # Remove células nulas
+    bloco.sort_indices()  # Vizinhos em ordem crescente de índice
+    return AdjacenciaCSR(bloco.indptr, bloco.indices, bloco.data, list(nomes_linhas) + list(nomes_colunas))  # Empacota com os nomes das duas partes
+
+
+# Cria grafo NetworkX a partir de uma matriz quadrada simétrica, carregando todas as arestas de uma vez
+def grafo_de_matriz(matriz, nomes, tipo):
+    grafo = nx.Graph()  # Cria um grafo vazio não-direcionado
+    grafo.add_nodes_from(nomes, tipo=tipo)  # Adiciona todos os nós com o atributo de tipo
+
+    triangulo_superior = sp.triu(matriz, k=1).tocoo()  # Células acima da diagonal (evita duplicar arestas)
+    positivas = triangulo_superior.data > 0  # Apenas células com peso positivo viram arestas
+    nomes_array = np.asarray(nomes, dtype=object)  # Vetor de nomes para indexação vetorizada
+    grafo.add_weighted_edges_from(  # Carrega todas as arestas com peso em uma única chamada
+        zip(
+            nomes_array[triangulo_superior.row[positivas]],  # Nós de origem
+            nomes_array[triangulo_superior.col[positivas]],  # Nós de destino
+            triangulo_superior.data[positivas].tolist(),  # Pesos das arestas (convertidos para números Python)
+        )
+    )
+    return grafo  # Retorna o grafo montado
+
+
+# Cria grafo bipartido NetworkX (linhas × colunas) a partir da matriz de incidência
+def grafo_bipartido(matriz_incidencia, nomes_linhas, nomes_colunas, tipo_linhas="pessoa", tipo_colunas="genero"):
+    grafo = nx.Graph()  # Cria um grafo vazio não-direcionado
+    grafo.add_nodes_from(nomes_linhas, tipo=tipo_linhas, bipartite=0)  # Nós do grupo 0 (linhas da matriz)
+    grafo.add_nodes_from(nomes_colunas, tipo=tipo_colunas, bipartite=1)  # Nós do grupo 1 (colunas da matriz)
+
+    celulas = sp.csr_matrix(matriz_incidencia).tocoo()  # Células não nulas em ordem de linha
+    positivas = celulas.data > 0  # Apenas células com peso positivo viram arestas
+    grafo.add_weighted_edges_from(  # Carrega todas as arestas com peso em uma única chamada
+        zip(
+            np.asarray(nomes_linhas, dtype=object)[celulas.row[positivas]],  # Nós de origem (linhas)
+            np.asarray(nomes_colunas, dtype=object)[celulas.col[positivas]],  # Nós de destino (colunas)
+            celulas.data[positivas].tolist(),  # Pesos das arestas (convertidos para números Python)
+        )
+    )
+    return grafo  # Retorna o grafo montado
@@ -1,101 +1,116 @@
-import numpy as np  # Importa NumPy para operações com matrizes
+import os  # Importa os para o nome do arquivo colunar no relatório
+from itertools import islice  # Importa islice para as primeiras arestas sem listar todas
+
 import networkx as nx  # Importa NetworkX para trabalhar com grafos
 import matplotlib.pyplot as plt  # Importa Matplotlib para criar gráficos
 
+from .matrizes import construir_matriz_incidencia, matriz_coocorrencia as calcular_matriz_coocorrencia  # Importa núcleo compartilhado de matrizes esparsas
+from .construcao import adjacencia_de_matriz, grafo_de_matriz  # Importa construtores vetorizados de grafos
+from .intermediacao import descrever_parametros  # Importa descrição dos parâmetros da intermediação
+from .aglomeracao import descrever_aglomeracao  # Importa descrição da aglomeração estimada por amostra
+from .metricas import calcular_metricas_topologicas  # Importa métricas executadas em paralelo pelo agendador
+from .estatisticas import estatisticas_basicas, arestas_nomeadas, linhas_distribuicao_graus, resultado_estatisticas  # Importa estatísticas básicas calculadas na adjacência CSR
+from .renderizacao import desenhar_mapa_calor  # Importa mapa de calor escalável
+from .layout import posicoes_grafo  # Importa motor de layout com cache de posições
+from .comunidades import louvain, colunas_comunidades, desenhar_grafo_condensado, linhas_relatorio_comunidades  # Importa detecção de comunidades e grafo condensado
+from .figuras import FORMATOS_PADRAO, finalizar_figura  # Importa destino das figuras (janela ou arquivo)
+from helpers.easy_log import etapa  # Importa medição das etapas (tempo e memória)
+from helpers.relatorio import TOP_N_PADRAO, EscritorRelatorio, registrar_arquivos, reaproveitar_relatorio  # Importa gravação do relatório linha a linha
+
 # Guilherme - Responsável pelo módulo de coocorrência
-def gerar_coocorrencia(data, pessoas, generos):  # Define função principal que recebe dados, lista de pessoas e lista de gêneros
-    # Obtém quantidade de pessoas e gêneros do dataset
-    quantidade_pessoas = len(pessoas)  # Conta quantas pessoas existem
-    quantidade_generos = len(generos)  # Conta quantos gêneros existem
-
-    # Cria mapeamento nome -> índice para acesso rápido à matriz
-    indice_por_pessoa = {pessoa: indice for indice, pessoa in enumerate(pessoas)}  # Dicionário que mapeia nome da pessoa para seu índice numérico
-    indice_por_genero = {genero: indice for indice, genero in enumerate(generos)}  # Dicionário que mapeia nome do gênero para seu índice numérico
-
-    # Inicializa matriz de incidência (pessoas × gêneros)
-    matriz_incidencia = np.zeros((quantidade_pessoas, quantidade_generos), dtype=int)  # Cria matriz zerada com linhas=pessoas e colunas=gêneros
-
-    # Preenche matriz com pesos das relações pessoa-gênero
-    for relacao in data:  # Loop que percorre cada relação no dataset
-        nome_pessoa = relacao["from"]  # Pega o nome da pessoa desta relação
-        nome_genero = relacao["to"]  # Pega o nome do gênero desta relação
-        peso_relacao = int(relacao.get("weight", 1))  # Pega o peso da relação (ou 1 se não existir)
-
-        indice_pessoa = indice_por_pessoa[nome_pessoa]  # Busca o índice da linha correspondente a esta pessoa
-        indice_genero = indice_por_genero[nome_genero]  # Busca o índice da coluna correspondente a este gênero
-
-        # Incrementa célula com peso da relação
-        matriz_incidencia[indice_pessoa, indice_genero] += peso_relacao  # Adiciona o peso na célula [pessoa, gênero]
-
-    # Calcula matriz de coocorrência: quantas pessoas compartilham cada par de gêneros
-    matriz_coocorrencia = matriz_incidencia.T @ matriz_incidencia  # Multiplica transposta da matriz pela matriz original (M^T @ M)
-    # Remove diagonal principal (gênero com ele mesmo)
-    np.fill_diagonal(matriz_coocorrencia, 0)  # Zera a diagonal para remover auto-conexões
-
-    # Cria grafo onde nós são gêneros e arestas são coocorrências
-    grafo_coocorrencia = nx.Graph()  # Cria um grafo vazio não-direcionado
-
-    # Adiciona cada gênero como nó do grafo
-    for nome_genero in generos:  # Loop que percorre cada gênero
-        grafo_coocorrencia.add_node(nome_genero, tipo="genero")  # Adiciona nó com atributo tipo="genero"
-
-    # Conecta gêneros que aparecem juntos com peso de coocorrência
-    quantidade_generos = len(generos)  # Conta quantos gêneros existem
-    for indice_genero_origem, genero_origem in enumerate(generos):  # Loop que percorre gêneros com seus índices
-        for indice_genero_destino in range(indice_genero_origem + 1, quantidade_generos):  # Loop aninhado que percorre gêneros seguintes (evita duplicar arestas)
-            genero_destino = generos[indice_genero_destino]  # Pega o gênero de destino pela posição
-            peso_coocorrencia = int(matriz_coocorrencia[indice_genero_origem, indice_genero_destino])  # Pega o valor da matriz nesta posição
-
-            # Adiciona aresta apenas se houver coocorrência
-            if peso_coocorrencia > 0:  # Se houver pessoas que compartilham esses dois gêneros
-                grafo_coocorrencia.add_edge(  # Adiciona aresta (conexão) ao grafo
-                    genero_origem,  # Nó de origem
-                    genero_destino,  # Nó de destino
-                    weight=peso_coocorrencia  # Peso da aresta (quantas pessoas compartilham)
-                )
+@etapa("analise_coocorrencia")  # Construção da análise (matriz e grafo)
+def gerar_coocorrencia(data, pessoas, generos, matriz_incidencia=None, normalizacao=None, limiar=None, minimo_coocorrencias=None, significancia=None, comunidades=False, resolucao_comunidades=1.0, ao_crescer=None, matriz_coocorrencia=None):  # Define função principal que recebe dados, lista de pessoas, lista de gêneros, (opcionalmente) a matriz de incidência e a de coocorrência já prontas, a normalização/filtros das arestas, se as comunidades (Louvain) entram no desenho e no relatório e (opcionalmente) a função chamada quando a análise cresce
+    # Reaproveita a matriz de incidência esparsa (pessoas × gêneros) se ela já foi construída
+    if matriz_incidencia is None:  # Se nenhuma matriz foi recebida
+        matriz_incidencia = construir_matriz_incidencia(data, pessoas, generos)  # Constrói matriz CSR em uma única passada vetorizada
+
+    # Avisa quem guarda a análise (ex.: o cache da sessão) que ela cresceu: grafo, relatórios e comunidades construídos sob demanda
+    avisar_crescimento = ao_crescer if ao_crescer is not None else (lambda: None)  # Sem cache: nada a avisar
+
+    # Reaproveita a matriz de coocorrência se ela já foi calculada com os mesmos parâmetros (ex.: pelo modo em lote, que também a grava)
+    if matriz_coocorrencia is None:  # Se nenhuma matriz foi recebida
+        with etapa("matriz"):  # Produto esparso da projeção
+            # Calcula matriz de coocorrência: quantas pessoas compartilham cada par de gêneros
+            # Remove diagonal principal (gênero com ele mesmo) e, se pedido, normaliza (Jaccard, cosseno, PMI...) e filtra as arestas
+            matriz_coocorrencia = calcular_matriz_coocorrencia(  # Multiplica transposta da matriz pela matriz original (M^T @ M) e zera a diagonal
+                matriz_incidencia,  # Matriz de incidência esparsa
+                normalizacao=normalizacao,  # None = contagens brutas
+                limiar=limiar,  # Peso mínimo da aresta (None = qualquer valor positivo)
+                minimo_coocorrencias=minimo_coocorrencias,  # Contagem mínima do par (None = sem mínimo)
+                significancia=significancia,  # Valor-p máximo do teste hipergeométrico (None = sem teste)
+            )
+
+    with etapa("grafo"):  # Adjacência CSR
+        # Adjacência leve em arrays (CSR) usada nas métricas sem passar pelo NetworkX
+        adjacencia_coocorrencia = adjacencia_de_matriz(matriz_coocorrencia, generos)  # Nós na mesma ordem do grafo
+
+    # Pesos normalizados ficam entre 0 e poucas unidades: escala o desenho para o maior peso ter a largura de uma contagem 5
+    maior_peso = matriz_coocorrencia.data.max() if matriz_coocorrencia.nnz else 1  # Maior peso de aresta
+    escala_desenho = 1.0 if normalizacao is None else 5.0 / maior_peso  # Contagens brutas mantêm a escala original
+    formato_peso = None if normalizacao is None else "{:.2f}"  # Pesos normalizados com duas casas
+
+    grafos_construidos = {}  # Grafo NetworkX, construído só quando um desenho precisa dele (métricas e estatísticas usam a adjacência)
+
+    # Grafo NetworkX de gêneros (nós) e coocorrências (arestas), construído uma única vez por análise
+    def _grafo():  # Define função interna que devolve o grafo
+        if "grafo" not in grafos_construidos:  # Primeiro desenho nesta análise
+            with etapa("grafo_networkx"):  # Arestas do triângulo superior carregadas de uma vez
+                grafos_construidos["grafo"] = grafo_de_matriz(matriz_coocorrencia, generos, tipo="genero")  # Adiciona nós com atributo tipo="genero" e arestas com peso
+            avisar_crescimento()  # O maior objeto da análise passa a contar no orçamento do cache
+        return grafos_construidos["grafo"]
+
+    particao = {}  # Comunidades (rótulos e modularidade) calculadas na primeira vez em que são usadas
+
+    # Comunidades (Louvain) do grafo, calculadas uma única vez por análise
+    def _comunidades():  # Define função interna que devolve (rótulos, modularidade)
+        if "rotulos" not in particao:  # Primeiro uso nesta análise
+            with etapa("comunidades"):  # Louvain na matriz esparsa ponderada
+                particao["rotulos"], particao["modularidade"] = louvain(matriz_coocorrencia, resolucao=resolucao_comunidades)
+            avisar_crescimento()  # Rótulos guardados na análise
+        return particao["rotulos"], particao["modularidade"]
 
     # Desenha matriz de coocorrência em um eixo matplotlib
-    def _desenhar_matriz(ax):  # Define função interna para desenhar matriz
+    def _desenhar_matriz(ax, ordenacao="auto", agregacao="max", rasterizar=None):  # Define função interna para desenhar matriz
         ax.set_title("Matriz de Coocorrência entre Gêneros")  # Define título do gráfico
-        # Cria heatmap com colormap azul
-        mapa = ax.imshow(matriz_coocorrencia, cmap="Blues", aspect="auto")  # Cria mapa de calor da matriz
-        ax.set_xticks(np.arange(quantidade_generos))  # Define posições das marcações no eixo X
-        ax.set_yticks(np.arange(quantidade_generos))  # Define posições das marcações no eixo Y
-        ax.set_xticklabels(generos, rotation=90)  # Define rótulos do eixo X (gêneros) rotacionados 90°
-        ax.set_yticklabels(generos)  # Define rótulos do eixo Y (gêneros)
+        # Cria heatmap com colormap azul: células anotadas só em matrizes pequenas, matrizes grandes agregadas em blocos
+        mapa = desenhar_mapa_calor(  # Cria mapa de calor da matriz esparsa (sem convertê-la inteira em densa)
+            ax,  # Eixo onde desenhar
+            matriz_coocorrencia,  # Matriz esparsa
+            generos,  # Rótulos das linhas
+            generos,  # Rótulos das colunas
+            cmap="Blues",  # Mapa de cores
+            ordenacao=ordenacao,  # Ordem das linhas e colunas ("auto", None, "grau" ou "cuthill_mckee")
+            agregacao=agregacao,  # Agregação dos blocos em matrizes grandes ("max" ou "media")
+            rasterizar=rasterizar,  # Rasterização em saídas vetoriais (None = pelo tamanho)
+            formato_valor=formato_peso,  # Valores normalizados com casas decimais
+        )
         ax.set_xlabel("Gênero destino")  # Define texto do eixo X
         ax.set_ylabel("Gênero origem")  # Define texto do eixo Y
 
-        # Adiciona valores numéricos nas células da matriz
-        for indice_genero_origem in range(quantidade_generos):  # Loop que percorre cada linha (gênero de origem)
-            for indice_genero_destino in range(quantidade_generos):  # Loop aninhado que percorre cada coluna (gênero de destino)
-                valor_celula = matriz_coocorrencia[indice_genero_origem, indice_genero_destino]  # Pega valor da célula atual
-                ax.text(  # Adiciona texto no gráfico
-                    indice_genero_destino,  # Posição X (coluna)
-                    indice_genero_origem,  # Posição Y (linha)
-                    str(int(valor_celula)),  # Texto a exibir (valor convertido para string)
-                    ha="center",  # Alinhamento horizontal centralizado
-                    va="center",  # Alinhamento vertical centralizado
-                    color="black",  # Cor do texto
-                    fontsize=8,  # Tamanho da fonte
-                )
-
         return mapa  # Retorna objeto do mapa para criar barra de cores 
 
     # Desenha grafo de coocorrência em um eixo matplotlib
-    def _desenhar_grafo(ax):  # Define função interna para desenhar grafo
+    def _desenhar_grafo(ax, layout="auto", condensado=None):  # Define função interna para desenhar grafo (condensado=None segue a opção comunidades)
+        if condensado is None:  # Sem escolha explícita: grafo condensado só se as comunidades foram pedidas
+            condensado = comunidades
+        if condensado:  # Desenha as comunidades (supernós) em vez do grafo inteiro
+            rotulos, valor_modularidade = _comunidades()  # Comunidade de cada nó
+            quantidade_comunidades = desenhar_grafo_condensado(ax, matriz_coocorrencia, rotulos, generos, cor="lightblue", layout=layout)  # Supernós com os pesos somados
+            ax.set_title(f"Grafo de Coocorrência entre Gêneros: {quantidade_comunidades} comunidades (Louvain)\n(Peso = soma dos pesos entre as comunidades; modularidade = {valor_modularidade:.4f})")  # Define título do gráfico
+            return
+        grafo_coocorrencia = _grafo()  # Grafo NetworkX (construído no primeiro desenho)
+
         # Tamanho dos nós proporcional ao grau ponderado (força)
-        graus_ponderados = dict(grafo_coocorrencia.degree(weight="weight"))  # Cria dicionário com grau ponderado de cada nó
-        tamanhos_nos = [graus_ponderados.get(genero, 0) * 200 for genero in grafo_coocorrencia.nodes()]  # Cria lista com tamanho proporcional ao grau de cada nó
+        tamanhos_nos = (adjacencia_coocorrencia.forcas() * 200 * escala_desenho).tolist()  # Tamanho proporcional ao grau ponderado, na mesma ordem dos nós do grafo
 
         # Largura das arestas proporcional ao peso de coocorrência
         larguras_arestas = [  # Cria lista com larguras das arestas
-            dados_aresta["weight"] * 0.4  # Multiplica peso por fator de escala 0.4
+            dados_aresta["weight"] * 0.4 * escala_desenho  # Multiplica peso por fator de escala 0.4
             for (_, _, dados_aresta) in grafo_coocorrencia.edges(data=True)  # Loop que percorre arestas com dados
         ]
 
-        # Calcula posição dos nós usando algoritmo spring layout
-        posicao_nos = nx.spring_layout(grafo_coocorrencia, k=0.7, iterations=100, seed=42)  # Calcula posições dos nós usando algoritmo de molas
+        # Calcula posição dos nós com o motor de layout ("auto", "spring" ou "forcas")
+        posicao_nos = posicoes_grafo(adjacencia_coocorrencia, grafo_coocorrencia, metodo=layout, iteracoes=100, k=0.7, semente=42)  # Posições dos nós (spring layout nos grafos pequenos, forças em grade nos grandes), reaproveitadas do cache se o grafo não mudou
 
         # Desenha nós com tamanho e cores variáveis
         nx.draw_networkx_nodes(  # Função que desenha os nós do grafo
@@ -128,6 +143,8 @@ def gerar_coocorrencia(data, pessoas, generos):  # Define função principal que
 
         # Adiciona pesos das arestas como rótulos
         rotulos_arestas = nx.get_edge_attributes(grafo_coocorrencia, "weight")  # Pega dicionário com pesos de todas as arestas
+        if formato_peso is not None:  # Pesos normalizados com duas casas
+            rotulos_arestas = {aresta: formato_peso.format(peso) for aresta, peso in rotulos_arestas.items()}
         nx.draw_networkx_edge_labels(  # Função que adiciona rótulos nas arestas
             grafo_coocorrencia,  # Grafo a ser desenhado
             posicao_nos,  # Dicionário com posições dos nós
@@ -136,107 +153,175 @@ def gerar_coocorrencia(data, pessoas, generos):  # Define função principal que
             ax=ax,  # Eixo onde desenhar
         )
 
-        ax.set_title("Grafo de Coocorrência entre Gêneros\n(Peso = pessoas que compartilham o par)")  # Define título do gráfico
+        descricao_peso = "pessoas que compartilham o par" if normalizacao is None else normalizacao  # O que o peso da aresta mede
+        ax.set_title(f"Grafo de Coocorrência entre Gêneros\n(Peso = {descricao_peso})")  # Define título do gráfico
         ax.axis("off")  # Desliga exibição dos eixos
 
     # Exibe apenas a matriz de coocorrência
-    def gerar_matriz():  # Define função pública para mostrar só a matriz
+    @etapa("figura_coocorrencia_matriz")  # Desenho (e gravação) da figura
+    def gerar_matriz(caminho_saida=None, formatos=FORMATOS_PADRAO):  # Define função pública para mostrar (ou gravar) só a matriz
         figura, eixo_matriz = plt.subplots(1, 1, figsize=(10, 8))  # Cria figura com 1 subplot de 10x8 polegadas
         mapa = _desenhar_matriz(eixo_matriz)  # Chama função para desenhar matriz
         figura.colorbar(mapa, ax=eixo_matriz, fraction=0.046, pad=0.04)  # Adiciona barra de cores lateral
 
         plt.tight_layout()  # Ajusta espaçamento automático
-        plt.show()  # Abre janela mostrando o gráfico
+        return finalizar_figura(figura, caminho_saida, formatos)  # Abre janela mostrando o gráfico ou grava em arquivo
 
     # Exibe apenas o grafo de coocorrência
-    def gerar_grafo():  # Define função pública para mostrar só o grafo
-        _, eixo_grafo = plt.subplots(1, 1, figsize=(10, 8))  # Cria figura com 1 subplot de 10x8 polegadas
-        _desenhar_grafo(eixo_grafo)  # Chama função para desenhar grafo
+    @etapa("figura_coocorrencia_grafo")  # Desenho (e gravação) da figura
+    def gerar_grafo(caminho_saida=None, formatos=FORMATOS_PADRAO, layout="auto", condensado=None):  # Define função pública para mostrar (ou gravar) só o grafo
+        figura, eixo_grafo = plt.subplots(1, 1, figsize=(10, 8))  # Cria figura com 1 subplot de 10x8 polegadas
+        _desenhar_grafo(eixo_grafo, layout, condensado)  # Chama função para desenhar grafo
         plt.tight_layout()  # Ajusta espaçamento automático
-        plt.show()  # Abre janela mostrando o gráfico
+        return finalizar_figura(figura, caminho_saida, formatos)  # Abre janela mostrando o gráfico ou grava em arquivo
 
     # Exibe matriz e grafo lado a lado
-    def gerar_matriz_e_grafo():  # Define função pública para mostrar matriz E grafo
+    @etapa("figura_coocorrencia_matriz_e_grafo")  # Desenho (e gravação) da figura
+    def gerar_matriz_e_grafo(caminho_saida=None, formatos=FORMATOS_PADRAO, layout="auto", condensado=None):  # Define função pública para mostrar (ou gravar) matriz E grafo
         figura, (eixo_matriz, eixo_grafo) = plt.subplots(1, 2, figsize=(20, 8))  # Cria figura com 2 subplots lado a lado
 
         mapa = _desenhar_matriz(eixo_matriz)  # Desenha matriz no primeiro eixo
         figura.colorbar(mapa, ax=eixo_matriz, fraction=0.046, pad=0.04)  # Adiciona barra de cores na matriz
 
-        _desenhar_grafo(eixo_grafo)  # Desenha grafo no segundo eixo
+        _desenhar_grafo(eixo_grafo, layout, condensado)  # Desenha grafo no segundo eixo
 
         plt.tight_layout()  # Ajusta espaçamento automático
-        plt.show()  # Abre janela mostrando ambos os gráficos
+        return finalizar_figura(figura, caminho_saida, formatos)  # Abre janela mostrando ambos os gráficos ou grava em arquivo
+
+    relatorios_calculados = {}  # Arquivos do relatório (texto e colunas) e métricas estruturadas já calculados nesta análise, por parâmetros (o grafo não muda)
+    ultimo_autovetor = {}  # Último resultado da centralidade de autovetor (nome -> valor), usado como partida a quente
 
     # Calcula e exibe métricas topológicas do grafo
-    def calcular_metricas(caminho_arquivo="metricas_coocorrencia.txt"):
-        linhas_relatorio = []
-
-        linhas_relatorio.append("MÉTRICAS TOPOLOGICAS - GRAFO DE COOCORRÊNCIA (GÊNEROS) \n")
-
-        # Extrai vértices e conta número total
-        vertices = list(grafo_coocorrencia.nodes())
-        quantidade_vertices = grafo_coocorrencia.number_of_nodes()
-        # Extrai arestas com dados e conta número total
-        arestas = list(grafo_coocorrencia.edges(data=True))
-        quantidade_arestas = grafo_coocorrencia.number_of_edges()
-
-        linhas_relatorio.append("Vértices (gêneros):")
-        linhas_relatorio.append(str(vertices))
-        linhas_relatorio.append(f"\nNúmero de vértices (|V|): {quantidade_vertices}\n")
-
-        linhas_relatorio.append("Algumas arestas (primeiras 5):")
-        linhas_relatorio.append(str(arestas[:5]))
-        linhas_relatorio.append(f"Número de arestas (|E|): {quantidade_arestas}\n")
-
-        # Obtém grau simples e ponderado de cada gênero
-        graus = dict(grafo_coocorrencia.degree())  # Cria dicionário com grau simples de cada vértice
-        graus_ponderados = dict(grafo_coocorrencia.degree(weight="weight"))  # Cria dicionário com grau ponderado de cada vértice
-
-        linhas_relatorio.append("Grau (degree) por gênero:")  # Adiciona título da seção
-        for genero, grau in graus.items():  # Loop que percorre cada gênero e seu grau
-            linhas_relatorio.append(f"  {genero}: {grau}")  # Adiciona linha com nome e grau
-
-        linhas_relatorio.append("\nGrau ponderado (strength) por gênero:")  # Adiciona título da seção
-        for genero, grau_p in graus_ponderados.items():  # Loop que percorre cada gênero e seu grau ponderado
-            linhas_relatorio.append(f"  {genero}: {grau_p}")  # Adiciona linha com nome e grau ponderado
-
-        # Calcula média dos graus
-        grau_medio = float(np.mean(list(graus.values()))) if graus else 0.0  # Calcula média aritmética dos graus simples
-        grau_ponderado_medio = float(np.mean(list(graus_ponderados.values()))) if graus_ponderados else 0.0  # Calcula média aritmética dos graus ponderados
-
-        linhas_relatorio.append(f"\nGrau médio: {grau_medio:.4f}")  # Adiciona grau médio formatado com 4 casas decimais
-        linhas_relatorio.append(f"Grau ponderado médio: {grau_ponderado_medio:.4f}\n")  # Adiciona grau ponderado médio formatado
-
-        # Calcula centralidades usando pesos das arestas
-        centralidade_intermediacao = nx.betweenness_centrality(grafo_coocorrencia, weight="weight")  # Calcula centralidade de intermediação (betweenness) ponderada
-        centralidade_autovetor = nx.eigenvector_centrality(grafo_coocorrencia, weight="weight", max_iter=1000)  # Calcula centralidade de autovetor (eigenvector) ponderada
-
-        linhas_relatorio.append("Centralidade de intermediação (betweenness):")  # Adiciona título da seção
-        for genero, valor in centralidade_intermediacao.items():  # Loop que percorre cada gênero e sua centralidade
-            linhas_relatorio.append(f"  {genero}: {valor:.4f}")  # Adiciona linha com nome e valor formatado
-
-        linhas_relatorio.append("\nCentralidade de autovetor (eigenvector):")  # Adiciona título da seção
-        for genero, valor in centralidade_autovetor.items():  # Loop que percorre cada gênero e sua centralidade
-            linhas_relatorio.append(f"  {genero}: {valor:.4f}")  # Adiciona linha com nome e valor formatado
-
-        # Calcula métricas globais do grafo
-        densidade = nx.density(grafo_coocorrencia)  # Calcula densidade do grafo (0 a 1)
-        coeficiente_aglomeracao = nx.average_clustering(grafo_coocorrencia, weight="weight")  # Calcula coeficiente de aglomeração médio ponderado
-
-        # Tenta calcular diâmetro (falha se grafo não é conexo)
-        try:  # Tenta executar bloco de código
-            diametro = nx.diameter(grafo_coocorrencia)  # Calcula diâmetro do grafo (maior distância entre dois nós)
-        except nx.NetworkXError:  # Se houver erro (grafo não conexo)
-            diametro = "Não conexo"  # Define mensagem indicando que grafo não é conexo
-
-        linhas_relatorio.append("\nMétricas globais:")  # Adiciona título da seção
-        linhas_relatorio.append(f"  Densidade do grafo: {densidade:.4f}")  # Adiciona densidade formatada
-        linhas_relatorio.append(f"  Coeficiente de aglomeração médio (ponderado): {coeficiente_aglomeracao:.4f}")  # Adiciona coeficiente formatado
-        linhas_relatorio.append(f"  Diâmetro do grafo: {diametro}")  # Adiciona diâmetro
-
-        # Grava métricas em arquivo
-        with open(caminho_arquivo, "w", encoding="utf-8") as arquivo:  # Abre arquivo para escrita com codificação UTF-8
-            arquivo.write("\n".join(linhas_relatorio))  # Junta todas as linhas com quebra e escreve no arquivo
+    # O relatório é gravado linha a linha; em grafos grandes (ou com detalhado=False) o texto traz só resumos e os
+    # top_n maiores valores, e os valores de cada nó vão para metricas_coocorrencia_nos.csv (formato_colunas: "csv", "jsonl", "npz" ou None)
+    @etapa("metricas_coocorrencia")  # Cálculo do relatório de métricas
+    def calcular_metricas(caminho_arquivo="metricas_coocorrencia.txt", amostra_intermediacao=None, semente=42, processos=None, tolerancia_autovetor=1e-6, autovetor_inicial=None, metodo_autovetor="potencia", amostra_aglomeracao=None,
+                          detalhado=None, top_n=TOP_N_PADRAO, formato_colunas="auto", apenas_estatisticas=False):
+        chave_relatorio = (amostra_intermediacao, semente, processos, tolerancia_autovetor, metodo_autovetor, amostra_aglomeracao, detalhado, top_n, formato_colunas, apenas_estatisticas)  # Parâmetros que mudam o resultado
+        if autovetor_inicial is None and chave_relatorio in relatorios_calculados:  # Já calculado com os mesmos parâmetros
+            registro, resultado = relatorios_calculados[chave_relatorio]  # Arquivos gravados e métricas estruturadas
+            if reaproveitar_relatorio(registro, caminho_arquivo):  # Copia os arquivos sem recalcular (se não mudaram desde então)
+                return resultado  # Métricas estruturadas já calculadas
+
+        # Estatísticas básicas (graus, forças, densidade e pesos) por reduções na adjacência CSR, sem o grafo NetworkX
+        estatisticas = estatisticas_basicas(adjacencia_coocorrencia)  # Vértices, arestas, graus, forças, médias e distribuição dos graus
+        quantidade_vertices = estatisticas["vertices"]  # Quantidade de nós
+        quantidade_arestas = estatisticas["arestas"]  # Quantidade de arestas
+        nomes = adjacencia_coocorrencia.nomes  # Nós na ordem das colunas
+
+        with EscritorRelatorio(caminho_arquivo, quantidade_vertices, detalhado=detalhado, top_n=top_n, formato_colunas=formato_colunas) as relatorio:  # Grava cada linha assim que ela é produzida
+            relatorio.linha("MÉTRICAS TOPOLOGICAS - GRAFO DE COOCORRÊNCIA (GÊNEROS) \n")
+            if normalizacao is not None or limiar is not None or minimo_coocorrencias is not None or significancia is not None:  # Arestas normalizadas ou filtradas
+                relatorio.linha(f"Pesos das arestas: {normalizacao or 'contagens'} (limiar: {limiar}, mínimo de coocorrências: {minimo_coocorrencias}, significância: {significancia})\n")
+            if relatorio.caminho_colunas():  # Texto resumido: os valores de cada gênero ficam no arquivo colunar
+                relatorio.linha(f"Valores por gênero: {os.path.basename(relatorio.caminho_colunas())} (texto com resumos e as {top_n} maiores)\n")
+
+            relatorio.linha("Vértices (gêneros):")
+            relatorio.nomes(nomes)  # Lista de vértices (resumida em grafos grandes)
+            relatorio.linha(f"\nNúmero de vértices (|V|): {quantidade_vertices}\n")
+
+            relatorio.linha("Algumas arestas (primeiras 5):")
+            relatorio.linha(str([(origem, destino, {"weight": peso}) for origem, destino, peso in islice(arestas_nomeadas(adjacencia_coocorrencia), 5)]))  # Primeiras 5 arestas (sem listar as outras)
+            relatorio.linha(f"Número de arestas (|E|): {quantidade_arestas}\n")
+
+            # Obtém grau simples e ponderado de cada gênero
+            # Graus calculados direto dos arrays CSR (tamanho e soma de cada linha da adjacência)
+            graus = estatisticas["graus"]  # Grau simples de cada vértice
+            graus_ponderados = estatisticas["forcas"]  # Grau ponderado de cada vértice
+
+            relatorio.linha("Grau (degree) por gênero:")  # Adiciona título da seção
+            relatorio.por_no(nomes, graus)  # Uma linha por gênero (ou resumo e maiores)
+
+            relatorio.linha("\nGrau ponderado (strength) por gênero:")  # Adiciona título da seção
+            relatorio.por_no(nomes, graus_ponderados)  # Uma linha por gênero (ou resumo e maiores)
+
+            # Calcula média dos graus
+            grau_medio = estatisticas["grau_medio"]  # Média aritmética dos graus simples
+            grau_ponderado_medio = estatisticas["forca_media"]  # Média aritmética dos graus ponderados
+
+            relatorio.linha(f"\nGrau médio: {grau_medio:.4f}")  # Adiciona grau médio formatado com 4 casas decimais
+            relatorio.linha(f"Grau ponderado médio: {grau_ponderado_medio:.4f}\n")  # Adiciona grau ponderado médio formatado
+
+            if apenas_estatisticas:  # Só as estatísticas básicas: centralidades, aglomeração, diâmetro e comunidades não são calculadas
+                relatorio.linhas(linhas_distribuicao_graus("gêneros", estatisticas["distribuicao"], resumido=not relatorio.detalhado))  # Resumo e histograma dos graus
+                relatorio.linha("Métricas globais:")  # Adiciona título da seção
+                relatorio.linha(f"  Densidade do grafo: {estatisticas['densidade']:.4f}")  # Adiciona densidade formatada
+                relatorio.linha(f"  Peso total das arestas: {estatisticas['peso_total']}")  # Adiciona peso total
+                relatorio.linha(f"  Peso médio das arestas: {estatisticas['peso_medio']:.4f}")  # Adiciona peso médio formatado
+                resultado = resultado_estatisticas(estatisticas, nomes)  # Escalares e colunas das estatísticas básicas
+            else:
+                # Calcula centralidades e métricas globais ao mesmo tempo em um pool de processos (a adjacência é enviada uma vez por processo)
+                metricas = calcular_metricas_topologicas(  # Intermediação (exata ou por k pivôs), autovetor, aglomeração, diâmetro e densidade
+                    adjacencia_coocorrencia,  # Adjacência CSR do grafo
+                    amostra_intermediacao=amostra_intermediacao,  # Quantidade de pivôs da intermediação (None = todas as fontes)
+                    semente=semente,  # Semente do sorteio dos pivôs
+                    processos=processos,  # Quantidade de processos (None = automático)
+                    tolerancia_autovetor=tolerancia_autovetor,  # Critério de parada do autovetor
+                    autovetor_inicial=autovetor_inicial if autovetor_inicial is not None else ultimo_autovetor.get("valores"),  # Partida a quente com o resultado anterior
+                    metodo_autovetor=metodo_autovetor,  # "potencia" (igual ao NetworkX) ou "arpack"
+                    amostra_aglomeracao=amostra_aglomeracao,  # Nós sorteados para estimar a aglomeração (None = todos)
+                )
+                parametros_intermediacao = metricas["parametros_intermediacao"]  # Parâmetros usados na intermediação
+                ultimo_autovetor["valores"] = dict(zip(nomes, metricas["autovetor"].tolist()))  # Guarda para a próxima chamada convergir em poucas iterações
+
+                relatorio.linha("Centralidade de intermediação (betweenness):")  # Adiciona título da seção
+                relatorio.linha(f"  (cálculo: {descrever_parametros(parametros_intermediacao)})")  # Informa se foi exata ou aproximada e os parâmetros usados
+                relatorio.por_no(nomes, metricas["intermediacao"], "{:.4f}")  # Centralidade de intermediação (betweenness) ponderada
+
+                relatorio.linha("\nCentralidade de autovetor (eigenvector):")  # Adiciona título da seção
+                relatorio.por_no(nomes, metricas["autovetor"], "{:.4f}")  # Centralidade de autovetor (eigenvector) ponderada
+
+                # Métricas globais já calculadas pelo agendador
+                densidade = metricas["densidade"]  # Densidade do grafo (0 a 1)
+                coeficiente_aglomeracao = metricas["aglomeracao"]  # Coeficiente de aglomeração médio ponderado
+                diametro = metricas["diametro"]  # Diâmetro do grafo (ou diâmetro de cada componente, se não for conexo)
+
+                relatorio.linha("\nMétricas globais:")  # Adiciona título da seção
+                relatorio.linha(f"  Densidade do grafo: {densidade:.4f}")  # Adiciona densidade formatada
+                relatorio.linha(f"  Coeficiente de aglomeração médio (ponderado): {coeficiente_aglomeracao:.4f}{descrever_aglomeracao(metricas['parametros_aglomeracao'])}")  # Adiciona coeficiente formatado
+                relatorio.linha(f"  Diâmetro do grafo: {diametro}")  # Adiciona diâmetro
+
+                if comunidades:  # Seção das comunidades (Louvain) e do grafo condensado
+                    rotulos, valor_modularidade = _comunidades()  # Comunidade de cada nó
+                    relatorio.linhas(linhas_relatorio_comunidades(  # Só as maiores no texto resumido (todas nas colunas por nó)
+                        matriz_coocorrencia, rotulos, valor_modularidade, nomes, resolucao_comunidades, top_n=None if relatorio.detalhado else relatorio.top_n
+                    ))
+
+                # Métricas estruturadas (escalares e colunas por nó) para o armazém de resultados
+                resultado = {
+                    "nomes": nomes,  # Ordem dos nós nas colunas
+                    "escalares": {
+                        "vertices": quantidade_vertices,
+                        "arestas": quantidade_arestas,
+                        "grau_medio": grau_medio,
+                        "grau_ponderado_medio": grau_ponderado_medio,
+                        "densidade": densidade,
+                        "aglomeracao": coeficiente_aglomeracao,
+                        "diametro": diametro,
+                        "diametro_componentes": metricas["diametro_componentes"],
+                        "parametros_intermediacao": parametros_intermediacao,
+                        "parametros_aglomeracao": metricas["parametros_aglomeracao"],
+                    },
+                    "colunas": {
+                        "grau": graus,
+                        "grau_ponderado": graus_ponderados,
+                        "intermediacao": metricas["intermediacao"],
+                        "autovetor": metricas["autovetor"],
+                        "aglomeracao": metricas["aglomeracao_nos"],
+                        "triangulos": metricas["triangulos"],
+                    },
+                }
+                if comunidades:  # Partição junto das métricas estruturadas
+                    resultado["escalares"].update(modularidade=valor_modularidade, comunidades=int(rotulos.max()) + 1 if len(rotulos) else 0)
+                    resultado["colunas"].update(colunas_comunidades(matriz_coocorrencia, rotulos, nomes))  # Comunidade de cada nó e a tabela completa das comunidades
+
+            arquivos = relatorio.gravar_colunas(nomes, resultado["colunas"])  # Valores por nó no arquivo colunar (se houver)
+
+        if autovetor_inicial is None:  # Vetor inicial explícito não entra no cache
+            relatorios_calculados[chave_relatorio] = (registrar_arquivos(arquivos), resultado)  # Guarda para as próximas chamadas
+            avisar_crescimento()  # Métricas estruturadas guardadas na análise
+
+        return resultado  # Métricas estruturadas
 
     # Retorna tupla de funções para o menu chamar
     return gerar_matriz, gerar_grafo, gerar_matriz_e_grafo, calcular_metricas  # Retorna as 4 funções públicas
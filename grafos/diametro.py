@@ -0,0 +1,121 @@
+import numpy as np  # Importa NumPy para operações vetorizadas
+import scipy.sparse as sp  # Importa SciPy para matrizes esparsas
+from scipy.sparse import csgraph  # Importa rotinas de grafos do SciPy (BFS em C)
+
+# Diâmetro exato (sem pesos) por componente conexa: limites inferiores por varredura dupla (double-sweep)
+# e limites superiores do iFUB, evitando calcular a excentricidade de todos os nós
+
+MAXIMO_CELULAS_LOTE = 1 << 22  # Máximo de distâncias (lote × nós) calculadas de uma vez
+LIMITE_COMPONENTE_PEQUENA = 64  # Componentes até este tamanho são resolvidas em lote, sem iFUB
+LIMITE_NOS_LOTE = 2048  # Nós por lote de componentes pequenas (matriz de distâncias de até 2048 × 2048)
+
+
+# Distâncias em saltos a partir de um conjunto de fontes (linhas: fontes; colunas: nós)
+def _distancias(matriz, fontes, predecessores=False):
+    return csgraph.shortest_path(matriz, method="D", directed=False, unweighted=True, indices=fontes, return_predecessors=predecessores)
+
+
+# Maior excentricidade entre os nós informados, processados em lotes para limitar a memória
+def _maior_excentricidade(matriz, nos):
+    tamanho_lote = max(1, MAXIMO_CELULAS_LOTE // max(1, matriz.shape[0]))  # Fontes por lote
+    maior = 0  # Maior excentricidade encontrada
+    for inicio in range(0, len(nos), tamanho_lote):  # Loop que percorre os nós em lotes
+        distancias = _distancias(matriz, nos[inicio:inicio + tamanho_lote])  # BFS de todas as fontes do lote
+        maior = max(maior, int(distancias.max()))  # Componente conexa: não há distâncias infinitas
+    return maior  # Excentricidade máxima do conjunto
+
+
+# Diâmetro exato de um grafo conexo (iFUB a partir do nó central da varredura dupla)
+def _diametro_conexo(matriz):
+    quantidade_nos = matriz.shape[0]  # Número de nós
+    if quantidade_nos <= 2:  # Um nó (diâmetro 0) ou dois nós ligados (diâmetro 1)
+        return quantidade_nos - 1
+
+    # Varredura dupla: BFS a partir do nó de maior grau e depois a partir do nó mais distante encontrado
+    graus = np.diff(matriz.indptr)  # Grau de cada nó
+    inicio = int(np.argmax(graus))  # Nó de maior grau
+    ponta_a = int(np.argmax(_distancias(matriz, inicio)))  # Nó mais distante do início
+    distancias_a, predecessores_a = _distancias(matriz, ponta_a, predecessores=True)  # BFS a partir da ponta a
+    ponta_b = int(np.argmax(distancias_a))  # Nó mais distante de a
+    limite_inferior = int(distancias_a[ponta_b])  # Excentricidade de a é um limite inferior do diâmetro
+
+    # Nó central: ponto médio do caminho a -> b
+    centro = ponta_b  # Começa na ponta b
+    for _ in range(limite_inferior // 2):  # Volta metade do caminho
+        centro = int(predecessores_a[centro])  # Predecessor no caminho mínimo a partir de a
+
+    # iFUB: processa os nós por nível de distância ao centro, do mais distante para o mais próximo
+    niveis = _distancias(matriz, centro).astype(np.int64)  # Distância de cada nó ao centro
+    excentricidade_centro = int(niveis.max())  # Excentricidade do centro
+    limite_inferior = max(limite_inferior, excentricidade_centro)  # Também é um limite inferior
+    limite_superior = 2 * excentricidade_centro  # Dois caminhos passando pelo centro
+    nivel = excentricidade_centro  # Nível atual
+    while limite_superior > limite_inferior and nivel > 0:  # Enquanto os limites não se encontrarem
+        franja = np.flatnonzero(niveis == nivel)  # Nós no nível atual
+        limite_inferior = max(limite_inferior, _maior_excentricidade(matriz, franja))  # Excentricidades da franja
+        if limite_inferior > 2 * (nivel - 1):  # Nenhum par restante pode superar este valor
+            return limite_inferior
+        limite_superior = 2 * (nivel - 1)  # Pares restantes ficam a no máximo 2 × (nível - 1)
+        nivel -= 1  # Próximo nível
+    return limite_inferior  # Limites coincidiram
+
+
+# Diâmetro de cada componente conexa, da maior para a menor: lista de (quantidade de nós, diâmetro)
+def diametro_por_componente(matriz):
+    matriz = sp.csr_matrix(matriz)  # Garante formato CSR
+    matriz = sp.csr_matrix((np.ones_like(matriz.data, dtype=np.int8), matriz.indices, matriz.indptr), shape=matriz.shape)  # Apenas a estrutura (sem pesos)
+    quantidade_componentes, rotulos = csgraph.connected_components(matriz, directed=False)  # Rótulo da componente de cada nó
+    tamanhos = np.bincount(rotulos, minlength=quantidade_componentes)  # Quantidade de nós de cada componente
+    ordem_componentes = np.argsort(-tamanhos, kind="stable")  # Componentes da maior para a menor
+    tamanhos = tamanhos[ordem_componentes]  # Tamanhos na ordem do resultado
+    inicios = np.concatenate(([0], np.cumsum(tamanhos)[:-1])).astype(np.int64)  # Primeira linha de cada componente na matriz reordenada
+    diametros = tamanhos - 1  # Componentes com até dois nós já ficam resolvidas (0 ou 1)
+    com_busca = int(np.count_nonzero(tamanhos > 2))  # Componentes que precisam de BFS (as primeiras da lista)
+
+    if com_busca:
+        # Nós agrupados por componente uma única vez (argsort dos rótulos na ordem do resultado):
+        # cada componente vira um bloco contíguo da diagonal, recortado sem varrer todos os nós
+        posicao = np.empty(quantidade_componentes, dtype=np.int64)  # Posição de cada rótulo na ordem do resultado
+        posicao[ordem_componentes] = np.arange(quantidade_componentes)
+        ordem = np.argsort(posicao[rotulos], kind="stable")  # Nós ordenados pela componente
+        agrupada = matriz[ordem][:, ordem]  # Reordena linhas e colunas
+
+        # Componentes grandes: iFUB em cada uma
+        grandes = int(np.count_nonzero(tamanhos[:com_busca] > LIMITE_COMPONENTE_PEQUENA))  # Quantidade de componentes grandes
+        for indice in range(grandes):  # Loop que percorre as componentes grandes
+            inicio, fim = inicios[indice], inicios[indice] + tamanhos[indice]  # Linhas do bloco
+            diametros[indice] = _diametro_conexo(agrupada[inicio:fim, inicio:fim])  # Diâmetro do subgrafo induzido
+
+        # Componentes pequenas: blocos consecutivos resolvidos com uma única BFS de todos os nós, evitando o
+        # custo fixo de várias chamadas ao SciPy por componente (grafos com milhares de componentes minúsculas)
+        indice = grandes  # Primeira componente pequena
+        while indice < com_busca:  # Loop que percorre as componentes pequenas em lotes
+            fim_lote = indice + 1  # Componentes do lote: [indice, fim_lote)
+            while fim_lote < com_busca and inicios[fim_lote] + tamanhos[fim_lote] - inicios[indice] <= LIMITE_NOS_LOTE:
+                fim_lote += 1  # Acrescenta componentes enquanto couberem no lote
+            inicio, fim = inicios[indice], inicios[fim_lote - 1] + tamanhos[fim_lote - 1]  # Linhas do lote
+            distancias = _distancias(agrupada[inicio:fim, inicio:fim], None)  # Distâncias entre todos os nós do lote
+            distancias[np.isinf(distancias)] = 0  # Pares de componentes diferentes não contam
+            excentricidades = distancias.max(axis=1)  # Excentricidade de cada nó na sua componente
+            diametros[indice:fim_lote] = np.maximum.reduceat(excentricidades, inicios[indice:fim_lote] - inicio)  # Maior por componente
+            indice = fim_lote  # Próximo lote
+
+    return [(int(tamanho), int(diametro)) for tamanho, diametro in zip(tamanhos, diametros)]  # Lista ordenada por tamanho
+
+
+# Diâmetro da maior componente conexa (None para grafo vazio)
+def diametro_maior_componente(matriz):
+    componentes = diametro_por_componente(matriz)  # Diâmetros de todas as componentes
+    return componentes[0][1] if componentes else None  # Primeira é a maior
+
+
+# Texto para o relatório: o diâmetro se o grafo for conexo, ou o resumo por componente
+def descrever_diametro(componentes, maximo_listadas=10):
+    if not componentes:  # Grafo sem nós
+        return "Grafo vazio"
+    if len(componentes) == 1:  # Grafo conexo
+        return str(componentes[0][1])
+    listadas = ", ".join(f"{tamanho} nós: {diametro}" for tamanho, diametro in componentes[:maximo_listadas])  # Maiores componentes
+    restantes = len(componentes) - maximo_listadas  # Componentes não listadas
+    sufixo = f", ... (+{restantes} componentes)" if restantes > 0 else ""  # Indica que a lista foi truncada
+    return f"Não conexo ({len(componentes)} componentes; maior componente: {componentes[0][1]}; por componente: {listadas}{sufixo})"
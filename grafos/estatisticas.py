@@ -0,0 +1,126 @@
+import numpy as np  # Importa NumPy para as reduções vetorizadas
+
+# Estatísticas básicas dos grafos (grau, força, densidade, arestas, pesos e distribuição dos graus) calculadas por
+# reduções direto nos vetores CSR da adjacência, sem montar o grafo NetworkX nem dicionários por nó. As arestas
+# saem na mesma ordem do NetworkX (triângulo superior, linha a linha), para os relatórios continuarem iguais.
+
+ENTRADAS_POR_LOTE = 65536  # Entradas da adjacência convertidas de uma vez ao listar arestas (limita a memória das listas Python)
+FAIXAS_HISTOGRAMA = 20  # Faixas de graus do histograma resumido (relatórios de grafos grandes)
+
+
+# Densidade de um grafo simples não-direcionado: arestas existentes / arestas possíveis
+def densidade(adjacencia):
+    quantidade_nos = adjacencia.quantidade_nos()  # Número de nós
+    if quantidade_nos < 2:  # Sem pares possíveis
+        return 0.0  # Mesma convenção do NetworkX
+    return 2 * adjacencia.quantidade_arestas() / (quantidade_nos * (quantidade_nos - 1))  # Proporção de pares conectados
+
+
+# Resumo da distribuição de graus: mínimo, máximo, média, mediana, desvio padrão e histograma
+# (lista de (grau, quantidade de nós com esse grau), só com os graus presentes)
+def distribuicao_graus(graus):
+    graus = np.asarray(graus)  # Vetor de graus
+    if len(graus) == 0:  # Sem nós
+        return {"minimo": 0, "maximo": 0, "media": 0.0, "mediana": 0.0, "desvio": 0.0, "histograma": []}
+    contagem = np.bincount(graus)  # Quantidade de nós por grau
+    presentes = np.flatnonzero(contagem)  # Graus que aparecem
+    return {
+        "minimo": int(graus.min()),
+        "maximo": int(graus.max()),
+        "media": float(graus.mean()),
+        "mediana": float(np.median(graus)),
+        "desvio": float(graus.std()),
+        "histograma": list(zip(presentes.tolist(), contagem[presentes].tolist())),
+    }
+
+
+# Soma dos pesos das arestas (cada aresta aparece duas vezes na adjacência simétrica); inteiro se os pesos forem inteiros
+def peso_total(adjacencia):
+    soma = adjacencia.pesos.sum().item() if len(adjacencia.pesos) else 0  # Número Python (como os pesos do NetworkX)
+    return soma // 2 if isinstance(soma, int) else soma / 2
+
+
+# Estatísticas básicas de uma adjacência CSR, todas em O(nós + arestas)
+def estatisticas_basicas(adjacencia):
+    graus = adjacencia.graus()  # Vizinhos de cada nó (tamanho de cada linha)
+    forcas = adjacencia.forcas()  # Soma dos pesos de cada linha
+    quantidade_arestas = adjacencia.quantidade_arestas()  # Cada aresta uma vez
+    total = peso_total(adjacencia)  # Soma dos pesos das arestas
+    return {
+        "vertices": adjacencia.quantidade_nos(),
+        "arestas": quantidade_arestas,
+        "graus": graus,
+        "forcas": forcas,
+        "grau_medio": float(np.mean(graus)) if len(graus) else 0.0,
+        "forca_media": float(np.mean(forcas)) if len(forcas) else 0.0,
+        "densidade": densidade(adjacencia),
+        "peso_total": total,
+        "peso_medio": total / quantidade_arestas if quantidade_arestas else 0.0,
+        "distribuicao": distribuicao_graus(graus),
+    }
+
+
+# Arestas (nome de origem, nome de destino, peso) na ordem do NetworkX, geradas aos poucos: só um lote de linhas
+# (com até ENTRADAS_POR_LOTE entradas) vira lista Python por vez, então islice(arestas_nomeadas(adjacencia), 5)
+# não percorre o grafo inteiro
+def arestas_nomeadas(adjacencia):
+    indptr, indices, pesos, nomes = adjacencia  # Vetores CSR e nomes
+    quantidade_nos = adjacencia.quantidade_nos()  # Número de nós
+    inicio = 0  # Primeira linha do lote
+    while inicio < quantidade_nos:  # Loop que percorre as linhas em lotes
+        fim = max(inicio + 1, int(np.searchsorted(indptr, indptr[inicio] + ENTRADAS_POR_LOTE, side="right")) - 1)  # Linhas que cabem no lote (pelo menos uma)
+        fim = min(fim, quantidade_nos)
+        trecho = slice(indptr[inicio], indptr[fim])  # Entradas das linhas do lote
+        linhas = np.repeat(np.arange(inicio, fim), np.diff(indptr[inicio:fim + 1]))  # Linha de cada entrada
+        colunas = indices[trecho]  # Coluna de cada entrada
+        superior = colunas > linhas  # Cada aresta uma vez (i < j)
+        for origem, destino, peso in zip(linhas[superior].tolist(), colunas[superior].tolist(), pesos[trecho][superior].tolist()):
+            yield nomes[origem], nomes[destino], peso
+        inicio = fim
+
+
+# Histograma agrupado em faixas de graus de mesma largura: lista de (menor grau, maior grau, quantidade de nós)
+def histograma_em_faixas(histograma, faixas=FAIXAS_HISTOGRAMA):
+    graus = np.array([grau for grau, _ in histograma])  # Graus presentes
+    quantidades = np.array([quantidade for _, quantidade in histograma])  # Nós com cada grau
+    largura = -(-(int(graus[-1]) - int(graus[0]) + 1) // faixas)  # Divisão arredondada para cima
+    faixa = (graus - graus[0]) // largura  # Faixa de cada grau
+    somas = np.bincount(faixa, weights=quantidades, minlength=faixas).astype(np.int64)  # Nós de cada faixa
+    return [(int(graus[0]) + indice * largura, int(graus[0]) + (indice + 1) * largura - 1, total) for indice, total in enumerate(somas.tolist()) if total]
+
+
+# Linhas do relatório com a distribuição dos graus (resumo e histograma); com resumido=True, histogramas com
+# muitos graus diferentes são agrupados em faixas (o texto dos grafos grandes não cresce com o número de nós)
+def linhas_distribuicao_graus(titulo, distribuicao, resumido=False):
+    histograma = distribuicao["histograma"]  # (grau, quantidade) dos graus presentes
+    if resumido and len(histograma) > FAIXAS_HISTOGRAMA:  # Graus agrupados em faixas
+        texto = ", ".join(f"graus {menor}-{maior}: {quantidade}" for menor, maior, quantidade in histograma_em_faixas(histograma))
+    else:
+        texto = ", ".join(f"grau {grau}: {quantidade}" for grau, quantidade in histograma)
+    return [
+        f"Distribuição dos graus ({titulo}):",
+        f"  mínimo {distribuicao['minimo']}, máximo {distribuicao['maximo']}, média {distribuicao['media']:.4f}, "
+        f"mediana {distribuicao['mediana']:.1f}, desvio padrão {distribuicao['desvio']:.4f}",
+        "  " + texto + "\n",
+    ]
+
+
+# Métricas estruturadas (escalares e colunas por nó) só com as estatísticas básicas, para o armazém de resultados
+def resultado_estatisticas(estatisticas, nomes):
+    return {
+        "nomes": nomes,  # Ordem dos nós nas colunas
+        "escalares": {
+            "vertices": estatisticas["vertices"],
+            "arestas": estatisticas["arestas"],
+            "grau_medio": estatisticas["grau_medio"],
+            "grau_ponderado_medio": estatisticas["forca_media"],
+            "densidade": estatisticas["densidade"],
+            "peso_total": estatisticas["peso_total"],
+            "peso_medio": estatisticas["peso_medio"],
+            "distribuicao": estatisticas["distribuicao"],
+        },
+        "colunas": {
+            "grau": estatisticas["graus"],
+            "grau_ponderado": estatisticas["forcas"],
+        },
+    }
@@ -0,0 +1,31 @@
+import os  # Importa os para criar o diretório de saída
+
+import matplotlib.pyplot as plt  # Importa Matplotlib para exibir, gravar e fechar as figuras
+
+from helpers.easy_log import etapa  # Importa medição das etapas (tempo e memória)
+
+# Destino das figuras: janela interativa (plt.show) ou arquivos (modo em lote, sem interface gráfica)
+
+FORMATOS_PADRAO = ("png",)  # Formatos gravados quando nenhum é informado
+RESOLUCAO_PADRAO = 150  # Pontos por polegada das imagens rasterizadas
+
+
+# Exibe a figura ou, se caminho_saida for informado, grava um arquivo por formato e fecha a figura
+# caminho_saida: caminho sem extensão (ex.: "saida/similaridade_grafo"); devolve a lista de arquivos gravados
+def finalizar_figura(figura, caminho_saida=None, formatos=FORMATOS_PADRAO, resolucao=RESOLUCAO_PADRAO):
+    if caminho_saida is None:  # Modo interativo
+        plt.show()  # Abre janela mostrando o gráfico
+        return []  # Nenhum arquivo gravado
+
+    diretorio = os.path.dirname(caminho_saida)  # Diretório de destino
+    if diretorio:  # Caminho com diretório
+        os.makedirs(diretorio, exist_ok=True)  # Cria o diretório se ainda não existir
+
+    arquivos = []  # Arquivos gravados
+    with etapa("gravar"):  # Rasterização e escrita dos arquivos
+        for formato in formatos:  # Loop que grava a figura em cada formato pedido
+            arquivo = f"{caminho_saida}.{formato.lstrip('.').lower()}"  # Caminho com a extensão do formato
+            figura.savefig(arquivo, dpi=resolucao, bbox_inches="tight")  # Grava a imagem
+            arquivos.append(arquivo)  # Registra o arquivo gravado
+    plt.close(figura)  # Libera a memória da figura (importante em execuções longas)
+    return arquivos  # Lista de arquivos gravados
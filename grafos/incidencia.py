@@ -1,97 +1,75 @@
-import numpy as np  # Importa NumPy para operações com matrizes
+import os  # Importa os para o nome do arquivo colunar no relatório
+from itertools import islice  # Importa islice para as primeiras arestas sem listar todas
+
 import networkx as nx  # Importa NetworkX para trabalhar com grafos
 import matplotlib.pyplot as plt  # Importa Matplotlib para criar gráficos
 
+from .matrizes import construir_matriz_incidencia  # Importa construtor compartilhado da matriz de incidência esparsa
+from .construcao import adjacencia_bipartida, grafo_bipartido  # Importa construtores vetorizados de grafos
+from .bipartido import METRICAS_OPCIONAIS, estatisticas_bipartidas, metricas_bipartidas  # Importa métricas bipartidas calculadas na matriz esparsa
+from .estatisticas import estatisticas_basicas, arestas_nomeadas, linhas_distribuicao_graus  # Importa estatísticas básicas calculadas na adjacência CSR
+from .renderizacao import desenhar_mapa_calor  # Importa mapa de calor escalável
+from .layout import posicoes_grafo  # Importa motor de layout com cache de posições
+from .figuras import FORMATOS_PADRAO, finalizar_figura  # Importa destino das figuras (janela ou arquivo)
+from helpers.easy_log import etapa  # Importa medição das etapas (tempo e memória)
+from helpers.relatorio import TOP_N_PADRAO, EscritorRelatorio, registrar_arquivos, reaproveitar_relatorio  # Importa gravação do relatório linha a linha
+
 # Vanessa - Responsável pelo módulo de incidência
-def gerar_incidencia(data, pessoas, generos):  # Define função principal que recebe dados, lista de pessoas e lista de gêneros
-    # Obtém quantidade de pessoas e gêneros do dataset
+@etapa("analise_incidencia")  # Construção da análise (matriz e grafo)
+def gerar_incidencia(data, pessoas, generos, matriz_incidencia=None, ao_crescer=None):  # Define função principal que recebe dados, lista de pessoas, lista de gêneros, (opcionalmente) a matriz de incidência já pronta e (opcionalmente) a função chamada quando a análise cresce
+    # Quantidade de pessoas: tamanho do primeiro lado no layout bipartido
     quantidade_pessoas = len(pessoas)  # Conta quantas pessoas existem
-    quantidade_generos = len(generos)  # Conta quantos gêneros existem
-
-    # Cria mapeamento nome -> índice para rápido acesso à matriz
-    indice_por_pessoa = {pessoa: indice for indice, pessoa in enumerate(pessoas)}  # Dicionário que mapeia nome da pessoa para seu índice numérico
-    indice_por_genero = {genero: indice for indice, genero in enumerate(generos)}  # Dicionário que mapeia nome do gênero para seu índice numérico
-
-    # Inicializa matriz de incidência (pessoas × gêneros)
-    matriz_incidencia = np.zeros((quantidade_pessoas, quantidade_generos), dtype=int)  # Cria matriz zerada com linhas=pessoas e colunas=gêneros
-
-    # Preenche matriz com pesos das relações pessoa-gênero
-    for relacao in data:  # Loop que percorre cada relação no dataset
-        nome_pessoa = relacao["from"]  # Pega o nome da pessoa desta relação
-        nome_genero = relacao["to"]  # Pega o nome do gênero desta relação
-        peso_relacao = int(relacao.get("weight", 1))  # Pega o peso da relação (ou 1 se não existir)
 
-        indice_pessoa = indice_por_pessoa[nome_pessoa]  # Busca o índice da linha correspondente a esta pessoa
-        indice_genero = indice_por_genero[nome_genero]  # Busca o índice da coluna correspondente a este gênero
+    # Reaproveita a matriz de incidência esparsa (pessoas × gêneros) se ela já foi construída
+    if matriz_incidencia is None:  # Se nenhuma matriz foi recebida
+        matriz_incidencia = construir_matriz_incidencia(data, pessoas, generos)  # Constrói matriz CSR em uma única passada vetorizada
 
-        # Incrementa célula com peso da relação
-        matriz_incidencia[indice_pessoa, indice_genero] += peso_relacao  # Adiciona o peso na célula [pessoa, gênero]
+    # Avisa quem guarda a análise (ex.: o cache da sessão) que ela cresceu: grafo e relatórios construídos sob demanda
+    avisar_crescimento = ao_crescer if ao_crescer is not None else (lambda: None)  # Sem cache: nada a avisar
 
-    # Cria grafo bipartido com nós de pessoas e gêneros
-    grafo_incidencia = nx.Graph()  # Cria um grafo vazio não-direcionado
+    with etapa("grafo"):  # Adjacência CSR
+        # Adjacência leve em arrays (CSR) usada nas métricas sem passar pelo NetworkX
+        adjacencia_incidencia = adjacencia_bipartida(matriz_incidencia, pessoas, generos)  # Nós na mesma ordem do grafo: pessoas e depois gêneros
 
-    # Adiciona nós de pessoas com atributo de tipo
-    for nome_pessoa in pessoas:  # Loop que percorre cada pessoa
-        grafo_incidencia.add_node(  # Adiciona um nó (vértice) ao grafo
-            nome_pessoa,  # Nome do nó
-            tipo="pessoa",  # Atributo indicando que é uma pessoa
-            bipartite=0  # Atributo indicando grupo 0 do grafo bipartido
-        )
+    grafos_construidos = {}  # Grafo NetworkX, construído só quando um desenho precisa dele (métricas e estatísticas usam a matriz)
 
-    # Adiciona nós de gêneros com atributo de tipo
-    for nome_genero in generos:  # Loop que percorre cada gênero
-        grafo_incidencia.add_node(  # Adiciona um nó (vértice) ao grafo
-            nome_genero,  # Nome do nó
-            tipo="genero",  # Atributo indicando que é um gênero
-            bipartite=1  # Atributo indicando grupo 1 do grafo bipartido
-        )
-
-    # Conecta pessoas a gêneros com peso baseado na matriz
-    for indice_pessoa, nome_pessoa in enumerate(pessoas):  # Loop que percorre pessoas com seus índices
-        for indice_genero, nome_genero in enumerate(generos):  # Loop aninhado que percorre gêneros com seus índices
-            peso_conexao = matriz_incidencia[indice_pessoa, indice_genero]  # Pega o valor da matriz nesta posição
-            # Adiciona aresta apenas se houver peso positivo
-            if peso_conexao > 0:  # Se houver relação entre pessoa e gênero
-                grafo_incidencia.add_edge(  # Adiciona aresta (conexão) ao grafo
-                    nome_pessoa,  # Nó de origem (pessoa)
-                    nome_genero,  # Nó de destino (gênero)
-                    weight=int(peso_conexao)  # Peso da aresta
-                )
+    # Grafo bipartido com nós de pessoas (grupo 0) e gêneros (grupo 1), construído uma única vez por análise
+    def _grafo():  # Define função interna que devolve o grafo
+        if "grafo" not in grafos_construidos:  # Primeiro desenho nesta análise
+            with etapa("grafo_networkx"):  # Arestas carregadas de uma vez da matriz esparsa
+                grafos_construidos["grafo"] = grafo_bipartido(matriz_incidencia, pessoas, generos, tipo_linhas="pessoa", tipo_colunas="genero")  # Pessoa ↔ gênero com peso da célula
+            avisar_crescimento()  # O maior objeto da análise passa a contar no orçamento do cache
+        return grafos_construidos["grafo"]
 
     # Desenha matriz de incidência em um eixo matplotlib
-    def _desenhar_matriz(ax):  # Define função interna para desenhar matriz
+    def _desenhar_matriz(ax, ordenacao="auto", agregacao="max", rasterizar=None):  # Define função interna para desenhar matriz
         ax.set_title("Matriz de Incidência (Pessoas e Gêneros)")  # Define título do gráfico
-        # Cria heatmap com colormap amarelo-verde-azul
-        mapa = ax.imshow(matriz_incidencia, cmap="YlGnBu", aspect="auto")  # Cria mapa de calor da matriz
-        ax.set_xticks(np.arange(quantidade_generos))  # Define posições das marcações no eixo X
-        ax.set_yticks(np.arange(quantidade_pessoas))  # Define posições das marcações no eixo Y
-        ax.set_xticklabels(generos, rotation=45, ha="right")  # Define rótulos do eixo X (gêneros) rotacionados 45°
-        ax.set_yticklabels(pessoas)  # Define rótulos do eixo Y (pessoas)
+        # Cria heatmap com colormap amarelo-verde-azul: células anotadas só em matrizes pequenas, matrizes grandes agregadas em blocos
+        mapa = desenhar_mapa_calor(  # Cria mapa de calor da matriz esparsa (sem convertê-la inteira em densa)
+            ax,  # Eixo onde desenhar
+            matriz_incidencia,  # Matriz esparsa
+            pessoas,  # Rótulos das linhas
+            generos,  # Rótulos das colunas
+            cmap="YlGnBu",  # Mapa de cores
+            ordenacao=ordenacao,  # Ordem das linhas e colunas ("auto", None, "grau" ou "cuthill_mckee")
+            agregacao=agregacao,  # Agregação dos blocos em matrizes grandes ("max" ou "media")
+            rasterizar=rasterizar,  # Rasterização em saídas vetoriais (None = pelo tamanho)
+            rotacao_colunas=45,  # Rótulos do eixo X (gêneros) rotacionados 45°
+            alinhamento_colunas="right",  # Alinhados à direita
+            cor_texto=lambda valor_celula: "white" if valor_celula > 0 else "gray",  # Branco se tem valor, cinza se zero
+            negrito=True,  # Texto em negrito
+        )
         ax.set_xlabel("Gêneros")  # Define texto do eixo X
         ax.set_ylabel("Pessoas")  # Define texto do eixo Y
 
-        # Adiciona valores numéricos nas células da matriz
-        for indice_pessoa in range(quantidade_pessoas):  # Loop que percorre cada linha (pessoa)
-            for indice_genero in range(quantidade_generos):  # Loop aninhado que percorre cada coluna (gênero)
-                valor_celula = matriz_incidencia[indice_pessoa, indice_genero]  # Pega valor da célula atual
-                cor_texto = "white" if valor_celula > 0 else "gray"  # Define cor do texto: branco se tem valor, cinza se zero
-                ax.text(  # Adiciona texto no gráfico
-                    indice_genero,  # Posição X (coluna)
-                    indice_pessoa,  # Posição Y (linha)
-                    str(valor_celula),  # Texto a exibir (valor convertido para string)
-                    ha="center",  # Alinhamento horizontal centralizado
-                    va="center",  # Alinhamento vertical centralizado
-                    color=cor_texto,  # Cor do texto
-                    fontsize=8,  # Tamanho da fonte
-                    fontweight="bold",  # Texto em negrito
-                )
-
         return mapa  # Retorna objeto do mapa para criar barra de cores
 
     # Desenha grafo de incidência em um eixo matplotlib
-    def _desenhar_grafo(ax):  # Define função interna para desenhar grafo
-        # Calcula posição dos nós usando algoritmo spring layout
-        posicao_nos = nx.spring_layout(grafo_incidencia, seed=42)  # Calcula posições dos nós usando algoritmo de molas
+    def _desenhar_grafo(ax, layout="auto"):  # Define função interna para desenhar grafo
+        grafo_incidencia = _grafo()  # Grafo NetworkX (construído no primeiro desenho)
+
+        # Calcula posição dos nós com o motor de layout ("auto", "spring", "forcas" ou "bipartido")
+        posicao_nos = posicoes_grafo(adjacencia_incidencia, grafo_incidencia, metodo=layout, semente=42, particao=quantidade_pessoas)  # Posições dos nós (spring layout nos grafos pequenos, forças em grade nos grandes), reaproveitadas do cache se o grafo não mudou
 
         # Extrai pesos das arestas para ajustar largura das linhas
         pesos_arestas = [  # Cria lista com pesos das arestas
@@ -116,83 +94,160 @@ def gerar_incidencia(data, pessoas, generos):  # Define função principal que r
         ax.axis("off")  # Desliga exibição dos eixos
 
     # Exibe apenas a matriz de incidência
-    def gerar_matriz():  # Define função pública para mostrar só a matriz
+    @etapa("figura_incidencia_matriz")  # Desenho (e gravação) da figura
+    def gerar_matriz(caminho_saida=None, formatos=FORMATOS_PADRAO):  # Define função pública para mostrar (ou gravar) só a matriz
         figura, eixo_matriz = plt.subplots(1, 1, figsize=(10, 8))  # Cria figura com 1 subplot de 10x8 polegadas
         mapa = _desenhar_matriz(eixo_matriz)  # Chama função para desenhar matriz
         figura.colorbar(mapa, ax=eixo_matriz, fraction=0.046, pad=0.04)  # Adiciona barra de cores lateral
 
         plt.tight_layout()  # Ajusta espaçamento automático
-        plt.show()  # Abre janela mostrando o gráfico
+        return finalizar_figura(figura, caminho_saida, formatos)  # Abre janela mostrando o gráfico ou grava em arquivo
 
     # Exibe apenas o grafo de incidência
-    def gerar_grafo():  # Define função pública para mostrar só o grafo
-        _, eixo_grafo = plt.subplots(1, 1, figsize=(10, 8))  # Cria figura com 1 subplot de 10x8 polegadas
-        _desenhar_grafo(eixo_grafo)  # Chama função para desenhar grafo
+    @etapa("figura_incidencia_grafo")  # Desenho (e gravação) da figura
+    def gerar_grafo(caminho_saida=None, formatos=FORMATOS_PADRAO, layout="auto"):  # Define função pública para mostrar (ou gravar) só o grafo
+        figura, eixo_grafo = plt.subplots(1, 1, figsize=(10, 8))  # Cria figura com 1 subplot de 10x8 polegadas
+        _desenhar_grafo(eixo_grafo, layout)  # Chama função para desenhar grafo
 
         plt.tight_layout()  # Ajusta espaçamento automático
-        plt.show()  # Abre janela mostrando o gráfico
+        return finalizar_figura(figura, caminho_saida, formatos)  # Abre janela mostrando o gráfico ou grava em arquivo
 
     # Exibe matriz e grafo lado a lado
-    def gerar_matriz_e_grafo():  # Define função pública para mostrar matriz E grafo
+    @etapa("figura_incidencia_matriz_e_grafo")  # Desenho (e gravação) da figura
+    def gerar_matriz_e_grafo(caminho_saida=None, formatos=FORMATOS_PADRAO, layout="auto"):  # Define função pública para mostrar (ou gravar) matriz E grafo
         figura, (eixo_matriz, eixo_grafo) = plt.subplots(1, 2, figsize=(18, 8))  # Cria figura com 2 subplots lado a lado
 
         mapa = _desenhar_matriz(eixo_matriz)  # Desenha matriz no primeiro eixo
         figura.colorbar(mapa, ax=eixo_matriz, fraction=0.046, pad=0.04)  # Adiciona barra de cores na matriz
 
-        _desenhar_grafo(eixo_grafo)  # Desenha grafo no segundo eixo
+        _desenhar_grafo(eixo_grafo, layout)  # Desenha grafo no segundo eixo
 
         plt.tight_layout()  # Ajusta espaçamento automático
-        plt.show()  # Abre janela mostrando ambos os gráficos
+        return finalizar_figura(figura, caminho_saida, formatos)  # Abre janela mostrando ambos os gráficos ou grava em arquivo
+
+    relatorios_calculados = {}  # Arquivos do relatório (texto e colunas) e métricas estruturadas já calculados nesta análise, por parâmetros (o grafo não muda)
 
     # Calcula e exibe métricas topológicas do grafo
-    def calcular_metricas(caminho_arquivo="metricas_incidencia.txt"):  # Define função pública para calcular métricas
-        linhas_relatorio = []  # Cria lista vazia para acumular linhas do relatório
-
-        linhas_relatorio.append("MÉTRICAS TOPOLOGICAS - GRAFO DE INCIDÊNCIA (PESSOAS E GÊNEROS) \n")  # Adiciona cabeçalho
-
-        # Extrai vértices e conta número total
-        vertices = list(grafo_incidencia.nodes())  # Pega lista de todos os nós do grafo
-        quantidade_vertices = grafo_incidencia.number_of_nodes()  # Conta quantos nós existem
-        # Extrai arestas com dados e conta número total
-        arestas = list(grafo_incidencia.edges(data=True))  # Pega lista de todas as arestas com seus dados
-        quantidade_arestas = grafo_incidencia.number_of_edges()  # Conta quantas arestas existem
-
-        linhas_relatorio.append("Vértices (nós):")  # Adiciona título da seção
-        linhas_relatorio.append(str(vertices))  # Adiciona lista de vértices convertida para string
-        linhas_relatorio.append(f"\nNúmero de vértices (|V|): {quantidade_vertices}\n")  # Adiciona contagem de vértices
-
-        linhas_relatorio.append("Algumas arestas (primeiras 5):")  # Adiciona título da seção
-        linhas_relatorio.append(str(arestas[:5]))  # Adiciona primeiras 5 arestas convertidas para string
-        linhas_relatorio.append(f"Número de arestas (|E|): {quantidade_arestas}\n")  # Adiciona contagem de arestas
-
-        # Obtém grau de cada vértice (número de conexões)
-        graus_vertices = dict(grafo_incidencia.degree())  # Cria dicionário com grau de cada vértice
-        linhas_relatorio.append("Graus dos vértices (degree):")  # Adiciona título da seção
-        for nome_vertice, grau_vertice in graus_vertices.items():  # Loop que percorre cada vértice e seu grau
-            linhas_relatorio.append(f"  {nome_vertice}: {grau_vertice}")  # Adiciona linha com nome e grau
-        # Calcula média dos graus
-        grau_medio = float(np.mean(list(graus_vertices.values()))) if graus_vertices else 0.0  # Calcula média aritmética dos graus
-        linhas_relatorio.append(f"\nGrau médio: {grau_medio:.4f}\n")  # Adiciona grau médio formatado com 4 casas decimais
-
-        # Extrai pesos de todas as arestas
-        pesos_dict = nx.get_edge_attributes(grafo_incidencia, "weight")  # Pega dicionário com pesos de todas as arestas
-        pesos_valores = list(pesos_dict.values())  # Converte valores do dicionário para lista
-        # Calcula soma e média dos pesos
-        peso_total = sum(pesos_valores) if pesos_valores else 0  # Soma todos os pesos
-        peso_medio = float(np.mean(pesos_valores)) if pesos_valores else 0.0  # Calcula média dos pesos
-
-        linhas_relatorio.append("Pesos das arestas (weight):")  # Adiciona título da seção
-        linhas_relatorio.append(str(pesos_dict))  # Adiciona dicionário de pesos convertido para string
-        linhas_relatorio.append(f"Peso total das arestas: {peso_total}")  # Adiciona peso total
-        linhas_relatorio.append(f"Peso médio das arestas: {peso_medio:.4f}\n")  # Adiciona peso médio formatado
-
-        # Calcula densidade (proporção de arestas existentes)
-        densidade = nx.density(grafo_incidencia)  # Calcula densidade do grafo (0 a 1)
-        linhas_relatorio.append(f"Densidade da rede: {densidade:.4f}")  # Adiciona densidade formatada
-
-        # Grava métricas em arquivo
-        with open(caminho_arquivo, "w", encoding="utf-8") as arquivo:  # Abre arquivo para escrita com codificação UTF-8
-            arquivo.write("\n".join(linhas_relatorio))  # Junta todas as linhas com quebra e escreve no arquivo
+    # O relatório é gravado linha a linha; em grafos grandes (ou com detalhado=False) o texto traz só resumos e os
+    # top_n maiores valores, e os valores de cada nó vão para metricas_incidencia_nos.csv (formato_colunas: "csv", "jsonl", "npz" ou None)
+    @etapa("metricas_incidencia")  # Cálculo do relatório de métricas
+    def calcular_metricas(caminho_arquivo="metricas_incidencia.txt", metricas_opcionais=(), detalhado=None, top_n=TOP_N_PADRAO, formato_colunas="auto", apenas_estatisticas=False):  # Define função pública para calcular métricas (metricas_opcionais acrescenta proximidade, aglomeração e/ou redundância, que não são O(nnz); apenas_estatisticas=True fica só com graus, pesos, densidade e distribuições)
+        metricas_opcionais = tuple(nome for nome in METRICAS_OPCIONAIS if nome in metricas_opcionais)  # Ordem fixa (chave do cache); nomes inválidos são recusados por metricas_bipartidas
+        chave_relatorio = (metricas_opcionais, detalhado, top_n, formato_colunas, apenas_estatisticas)  # Parâmetros que mudam o resultado
+        if chave_relatorio in relatorios_calculados:  # Já calculado com os mesmos parâmetros
+            registro, resultado = relatorios_calculados[chave_relatorio]  # Arquivos gravados e métricas estruturadas
+            if reaproveitar_relatorio(registro, caminho_arquivo):  # Copia os arquivos sem recalcular (se não mudaram desde então)
+                return resultado  # Métricas estruturadas já calculadas
+
+        # Estatísticas básicas (graus, pesos e médias) por reduções na adjacência CSR, sem o grafo NetworkX
+        estatisticas = estatisticas_basicas(adjacencia_incidencia)  # Vértices, arestas, graus, médias e pesos
+        quantidade_vertices = estatisticas["vertices"]  # Quantidade de nós
+        quantidade_arestas = estatisticas["arestas"]  # Quantidade de arestas
+        nomes = adjacencia_incidencia.nomes  # Nós na ordem das colunas (pessoas e depois gêneros)
+
+        with EscritorRelatorio(caminho_arquivo, quantidade_vertices, detalhado=detalhado, top_n=top_n, formato_colunas=formato_colunas) as relatorio:  # Grava cada linha assim que ela é produzida
+            relatorio.linha("MÉTRICAS TOPOLOGICAS - GRAFO DE INCIDÊNCIA (PESSOAS E GÊNEROS) \n")  # Adiciona cabeçalho
+            if relatorio.caminho_colunas():  # Texto resumido: os valores de cada nó ficam no arquivo colunar
+                relatorio.linha(f"Valores por nó: {os.path.basename(relatorio.caminho_colunas())} (texto com resumos e os {top_n} maiores)\n")
+
+            relatorio.linha("Vértices (nós):")  # Adiciona título da seção
+            relatorio.nomes(nomes)  # Adiciona lista de vértices (resumida em grafos grandes)
+            relatorio.linha(f"\nNúmero de vértices (|V|): {quantidade_vertices}\n")  # Adiciona contagem de vértices
+
+            relatorio.linha("Algumas arestas (primeiras 5):")  # Adiciona título da seção
+            relatorio.linha(str([(origem, destino, {"weight": peso}) for origem, destino, peso in islice(arestas_nomeadas(adjacencia_incidencia), 5)]))  # Adiciona primeiras 5 arestas (sem listar as outras)
+            relatorio.linha(f"Número de arestas (|E|): {quantidade_arestas}\n")  # Adiciona contagem de arestas
+
+            # Obtém grau de cada vértice (número de conexões)
+            graus_vertices = estatisticas["graus"]  # Grau de cada vértice (tamanho de cada linha CSR)
+            relatorio.linha("Graus dos vértices (degree):")  # Adiciona título da seção
+            relatorio.por_no(nomes, graus_vertices)  # Uma linha por vértice (ou resumo e maiores)
+            # Calcula média dos graus
+            grau_medio = estatisticas["grau_medio"]  # Média aritmética dos graus
+            relatorio.linha(f"\nGrau médio: {grau_medio:.4f}\n")  # Adiciona grau médio formatado com 4 casas decimais
+
+            # Soma e média dos pesos de todas as arestas
+            peso_total = estatisticas["peso_total"]  # Soma todos os pesos (número Python, como os pesos do grafo)
+            peso_medio = estatisticas["peso_medio"]  # Média dos pesos
+
+            relatorio.linha("Pesos das arestas (weight):")  # Adiciona título da seção
+            if relatorio.detalhado:  # Dicionário completo de pesos só em grafos pequenos
+                relatorio.linha(str({(origem, destino): peso for origem, destino, peso in arestas_nomeadas(adjacencia_incidencia)}))  # Adiciona dicionário de pesos convertido para string
+            elif quantidade_arestas:  # Resumo dos pesos
+                relatorio.linha(f"  {quantidade_arestas} arestas; mínimo {adjacencia_incidencia.pesos.min().item()}, máximo {adjacencia_incidencia.pesos.max().item()}")
+            relatorio.linha(f"Peso total das arestas: {peso_total}")  # Adiciona peso total
+            relatorio.linha(f"Peso médio das arestas: {peso_medio:.4f}\n")  # Adiciona peso médio formatado
+
+            # Métricas bipartidas direto da matriz de incidência (densidade, graus por lado, centralidade de grau e as opcionais pedidas)
+            if apenas_estatisticas:  # Só as reduções em O(nnz): densidade, distribuições, graus e forças
+                bipartidas = estatisticas_bipartidas(matriz_incidencia)
+            else:
+                bipartidas = metricas_bipartidas(matriz_incidencia, opcionais=metricas_opcionais)  # Mesmos valores do networkx.algorithms.bipartite
+            colunas_bipartidas = bipartidas["colunas"]  # Vetores por nó (pessoas e depois gêneros, a ordem da adjacência)
+
+            # Densidade bipartida: arestas possíveis são só as pessoa–gênero (nx.density contaria pares dentro de cada lado)
+            densidade = bipartidas["densidade"]  # Densidade do grafo bipartido (0 a 1)
+            relatorio.linha(f"Densidade da rede (bipartida, |E| / (pessoas × gêneros)): {densidade:.4f}\n")  # Adiciona densidade formatada
+
+            # Distribuição dos graus de cada lado
+            for titulo, chave in (("pessoas", "distribuicao_pessoas"), ("gêneros", "distribuicao_generos")):  # Loop que percorre os dois lados
+                relatorio.linhas(linhas_distribuicao_graus(titulo, bipartidas[chave], resumido=not relatorio.detalhado))  # Adiciona resumo e histograma
+
+            # Métricas por nó: nome da seção, coluna e formato
+            secoes = [
+                ("Centralidade de grau bipartida (grau / tamanho da outra parte):", "centralidade_grau"),
+                ("Centralidade de proximidade bipartida (closeness):", "proximidade"),
+                ("Coeficiente de aglomeração bipartido (Latapy, modo dot):", "aglomeracao"),
+                ("Redundância (pares de vizinhos com outro vizinho em comum; só nós com grau >= 2):", "redundancia"),
+            ]
+            for titulo, coluna in secoes:  # Loop que percorre cada métrica por nó
+                if coluna not in colunas_bipartidas:  # Métrica não pedida (metricas_opcionais) ou apenas_estatisticas=True
+                    continue
+                relatorio.linha(titulo)  # Adiciona título da seção
+                relatorio.por_no(nomes, colunas_bipartidas[coluna], "{:.4f}", ignorar_nan=True)  # Redundância indefinida (grau < 2) não é listada
+                relatorio.linha("")  # Linha em branco entre seções
+
+            if "aglomeracao_media" in bipartidas or "redundancia_media_pessoas" in bipartidas:  # Médias das métricas opcionais calculadas
+                relatorio.linha("Métricas bipartidas globais:")  # Adiciona título da seção
+                if "aglomeracao_media" in bipartidas:  # Aglomeração pedida
+                    relatorio.linha(f"  Aglomeração média (todos os nós): {bipartidas['aglomeracao_media']:.4f}")
+                    relatorio.linha(f"  Aglomeração média (pessoas / gêneros): {bipartidas['aglomeracao_media_pessoas']:.4f} / {bipartidas['aglomeracao_media_generos']:.4f}")
+                if "redundancia_media_pessoas" in bipartidas:  # Redundância pedida
+                    relatorio.linha(f"  Redundância média (pessoas / gêneros): {bipartidas['redundancia_media_pessoas']:.4f} / {bipartidas['redundancia_media_generos']:.4f}")
+
+            # Métricas estruturadas (escalares e colunas por nó) para o armazém de resultados
+            resultado = {
+                "nomes": nomes,  # Ordem dos nós nas colunas
+                "escalares": {
+                    "vertices": quantidade_vertices,
+                    "arestas": quantidade_arestas,
+                    "grau_medio": grau_medio,
+                    "peso_total": peso_total,
+                    "peso_medio": peso_medio,
+                    "densidade": densidade,
+                    "distribuicao_pessoas": bipartidas["distribuicao_pessoas"],
+                    "distribuicao_generos": bipartidas["distribuicao_generos"],
+                },
+                "colunas": {"grau": graus_vertices, **colunas_bipartidas},
+            }
+            if "aglomeracao_media" in bipartidas:  # Médias da aglomeração bipartida
+                resultado["escalares"].update(
+                    aglomeracao=bipartidas["aglomeracao_media"],
+                    aglomeracao_pessoas=bipartidas["aglomeracao_media_pessoas"],
+                    aglomeracao_generos=bipartidas["aglomeracao_media_generos"],
+                )
+            if "redundancia_media_pessoas" in bipartidas:  # Médias da redundância
+                resultado["escalares"].update(
+                    redundancia_pessoas=bipartidas["redundancia_media_pessoas"],
+                    redundancia_generos=bipartidas["redundancia_media_generos"],
+                )
+
+            arquivos = relatorio.gravar_colunas(nomes, resultado["colunas"])  # Valores por nó no arquivo colunar (se houver)
+
+        relatorios_calculados[chave_relatorio] = (registrar_arquivos(arquivos), resultado)  # Guarda para as próximas chamadas
+        avisar_crescimento()  # Métricas estruturadas guardadas na análise
+
+        return resultado  # Métricas estruturadas
 
     # Retorna tupla de funções para o menu chamar
     return gerar_matriz, gerar_grafo, gerar_matriz_e_grafo, calcular_metricas  # Retorna as 4 funções públicas
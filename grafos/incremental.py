@@ -0,0 +1,272 @@
+import numpy as np  # Importa NumPy para operações vetorizadas
+import scipy.sparse as sp  # Importa SciPy para matrizes esparsas
+
+from .matrizes import projecao_sem_diagonal  # Importa projeção esparsa sem diagonal
+from .construcao import adjacencia_bipartida, adjacencia_de_matriz, grafo_bipartido, grafo_de_matriz  # Importa construtores de grafos
+from .bipartido import densidade_bipartida  # Importa densidade do grafo bipartido (pessoa–gênero)
+
+# Atualização incremental das três análises: um lote de interações adicionadas ou removidas altera só as linhas
+# das pessoas envolvidas, e as matrizes, os grafos e as métricas baratas são corrigidos a partir dessas linhas.
+# Os grafos NetworkX só são montados quando pedidos (grafo()); depois disso, cada lote corrige só as arestas alteradas
+
+CHAVES_REGISTRO = ("from", "to", "weight")  # Campos de cada interação (mesmos do dataset)
+
+
+# Troca as linhas (e colunas, por simetria) indicadas de uma matriz quadrada pelas linhas novas
+def _substituir_linhas_simetricas(matriz, linhas, novas_linhas):
+    quantidade = matriz.shape[0]  # Número de nós
+    manter = np.ones(quantidade, dtype=matriz.dtype)  # 1 para as linhas mantidas, 0 para as substituídas (mesmo tipo: pesos inteiros continuam inteiros)
+    manter[linhas] = 0
+    mascara = sp.diags(manter, dtype=matriz.dtype)  # Diagonal que zera as linhas/colunas substituídas
+    restante = mascara @ matriz @ mascara  # Matriz sem as linhas e colunas alteradas
+
+    celulas = novas_linhas.tocoo()  # Células das linhas novas (linha local)
+    blocos = sp.csr_matrix((celulas.data, (linhas[celulas.row], celulas.col)), shape=matriz.shape)  # Linhas novas nas posições certas
+    cruzamento = blocos @ sp.diags(1 - manter, dtype=matriz.dtype)  # Parte das linhas novas que cai nas colunas alteradas (somaria duas vezes)
+    return (restante + blocos + blocos.T - cruzamento).tocsr()  # Linhas e colunas novas, sem duplicar o cruzamento
+
+
+# Lista de células (i, j, peso novo) que mudaram entre duas matrizes, apenas no triângulo superior (i < j)
+def _celulas_alteradas(antes, depois, linhas=None):
+    if linhas is not None:  # Só as linhas indicadas podem ter mudado
+        diferenca = (depois[linhas] - antes[linhas]).tocoo()  # Diferença restrita às linhas
+        origem = np.asarray(linhas)[diferenca.row]  # Linha global de cada célula
+    else:  # Diferença completa
+        diferenca = (depois - antes).tocoo()
+        origem = diferenca.row
+    destino = diferenca.col  # Coluna de cada célula
+    mudou = (diferenca.data != 0) & (origem != destino)  # Valor diferente fora da diagonal
+    origem, destino = origem[mudou], destino[mudou]  # Células alteradas
+    i, j = np.minimum(origem, destino), np.maximum(origem, destino)  # Cada par uma vez (i < j)
+    pares = np.unique(np.column_stack((i, j)), axis=0) if len(i) else np.zeros((0, 2), dtype=np.int64)  # Sem pares repetidos
+    valores = np.asarray(depois[pares[:, 0], pares[:, 1]]).ravel() if len(pares) else np.zeros(0)  # Peso novo de cada par
+    return pares[:, 0], pares[:, 1], valores  # Vetores alinhados
+
+
+# Aplica as células alteradas ao grafo NetworkX: peso positivo atualiza a aresta, peso zero remove
+def _atualizar_arestas(grafo, nomes_origem, nomes_destino, origem, destino, valores):
+    nomes_origem = np.asarray(nomes_origem, dtype=object)  # Vetor de nomes para indexação vetorizada
+    nomes_destino = np.asarray(nomes_destino, dtype=object)
+    positivas = valores > 0  # Arestas que existem depois do lote
+    grafo.add_weighted_edges_from(  # Cria ou atualiza as arestas em uma única chamada
+        zip(nomes_origem[origem[positivas]], nomes_destino[destino[positivas]], valores[positivas].tolist())
+    )
+    grafo.remove_edges_from(  # Remove as arestas que zeraram (ignora as que não existiam)
+        (u, v) for u, v in zip(nomes_origem[origem[~positivas]], nomes_destino[destino[~positivas]]) if grafo.has_edge(u, v)
+    )
+
+
+# Métricas baratas de um grafo simples a partir da matriz de adjacência: grau, força, arestas e densidade
+class MetricasBasicas:
+    __slots__ = ("graus", "forcas", "quantidade_arestas")  # Sem dicionário por instância
+
+    def __init__(self, matriz):  # Calcula tudo uma vez a partir da matriz simétrica sem diagonal
+        self.graus = np.diff(matriz.indptr).astype(np.int64)  # Vizinhos de cada nó
+        self.forcas = np.asarray(matriz.sum(axis=1), dtype=float).ravel()  # Soma dos pesos de cada nó
+        self.quantidade_arestas = matriz.nnz // 2  # Cada aresta aparece duas vezes
+
+    # Estende os vetores para nós novos (sem vizinhos)
+    def estender(self, quantidade_nos):
+        novos = quantidade_nos - len(self.graus)  # Nós acrescentados
+        if novos > 0:
+            self.graus = np.concatenate((self.graus, np.zeros(novos, dtype=np.int64)))
+            self.forcas = np.concatenate((self.forcas, np.zeros(novos)))
+
+    # Recalcula apenas os nós afetados pelo lote
+    def atualizar(self, matriz, afetados):
+        linhas = matriz[afetados]  # Linhas dos nós afetados
+        self.graus[afetados] = np.diff(linhas.indptr)  # Grau novo
+        self.forcas[afetados] = np.asarray(linhas.sum(axis=1), dtype=float).ravel()  # Força nova
+        self.quantidade_arestas = matriz.nnz // 2  # nnz é mantido pela matriz CSR
+
+    # Densidade: arestas existentes / arestas possíveis
+    def densidade(self):
+        quantidade_nos = len(self.graus)  # Número de nós
+        return 2 * self.quantidade_arestas / (quantidade_nos * (quantidade_nos - 1)) if quantidade_nos > 1 else 0.0
+
+
+# Estado das três análises que pode receber lotes de interações sem reconstruir tudo
+# Pessoas e gêneros novos entram no fim dos vocabulários (os índices existentes não mudam)
+class AnaliseIncremental:
+    def __init__(self, pessoas, generos, matriz_incidencia):  # Recebe os vocabulários e a matriz de incidência inicial
+        self.pessoas = list(pessoas)  # Vocabulário de pessoas (linhas)
+        self.generos = list(generos)  # Vocabulário de gêneros (colunas)
+        self._indice_pessoa = {pessoa: indice for indice, pessoa in enumerate(self.pessoas)}  # Nome -> linha
+        self._indice_genero = {genero: indice for indice, genero in enumerate(self.generos)}  # Nome -> coluna
+
+        self.incidencia = sp.csr_matrix(matriz_incidencia, dtype=np.int64, copy=True)  # Pessoas × gêneros
+        self.coocorrencia = projecao_sem_diagonal(self.incidencia.T, self.incidencia)  # Gêneros × gêneros
+        self.similaridade = projecao_sem_diagonal(self.incidencia, self.incidencia.T)  # Pessoas × pessoas
+
+        self._grafos = {}  # Nome da análise -> grafo NetworkX já montado (os demais ficam só nas matrizes)
+
+        self.metricas_coocorrencia = MetricasBasicas(self.coocorrencia)  # Grau, força e densidade dos gêneros
+        self.metricas_similaridade = MetricasBasicas(self.similaridade)  # Grau, força e densidade das pessoas
+        self.graus_incidencia = np.concatenate((  # Grau no grafo bipartido: pessoas e depois gêneros
+            np.diff(self.incidencia.indptr), np.bincount(self.incidencia.indices, minlength=len(self.generos))
+        )).astype(np.int64)
+
+    # Grafo NetworkX de uma análise ("incidencia", "coocorrencia" ou "similaridade"), montado das matrizes atuais
+    # no primeiro pedido e mantido em dia pelos lotes seguintes
+    def grafo(self, nome):
+        if nome not in self._grafos:  # Primeiro pedido
+            if nome == "incidencia":  # Pessoa ↔ gênero
+                self._grafos[nome] = grafo_bipartido(self.incidencia, self.pessoas, self.generos)
+            elif nome == "coocorrencia":  # Gênero ↔ gênero
+                self._grafos[nome] = grafo_de_matriz(self.coocorrencia, self.generos, tipo="genero")
+            elif nome == "similaridade":  # Pessoa ↔ pessoa
+                self._grafos[nome] = grafo_de_matriz(self.similaridade, self.pessoas, tipo="pessoa")
+            else:  # Análise desconhecida
+                raise ValueError(f"Análise inválida: {nome!r} (use 'incidencia', 'coocorrencia' ou 'similaridade').")
+        return self._grafos[nome]
+
+    # Acrescenta nomes novos ao vocabulário e devolve o índice de cada nome pedido
+    def _indices(self, nomes, vocabulario, indice_por_nome):
+        indices = np.empty(len(nomes), dtype=np.int64)  # Índice de cada registro
+        for posicao, nome in enumerate(nomes):  # Loop que percorre os nomes do lote
+            indice = indice_por_nome.get(nome)  # Índice existente
+            if indice is None:  # Nome novo: entra no fim
+                indice = indice_por_nome[nome] = len(vocabulario)
+                vocabulario.append(nome)
+            indices[posicao] = indice
+        return indices  # Vetor de índices
+
+    # Matriz pessoas × gêneros com a soma dos pesos de um lote (sinal negativo para remoções)
+    def _matriz_lote(self, registros, sinal, novos_nomes):
+        registros = list(registros)  # Permite percorrer duas vezes
+        for registro in registros:  # Valida os campos como o carregador do dataset
+            faltando = [chave for chave in CHAVES_REGISTRO[:2] if chave not in registro]
+            if faltando:
+                raise ValueError(f"Registro sem o campo {faltando[0]!r}: {registro!r}")
+        pessoas = [registro["from"] for registro in registros]  # Pessoa de cada registro
+        generos = [registro["to"] for registro in registros]  # Gênero de cada registro
+        if not novos_nomes:  # Remoções só podem citar nomes conhecidos
+            desconhecidos = [nome for nome in pessoas if nome not in self._indice_pessoa] + [nome for nome in generos if nome not in self._indice_genero]
+            if desconhecidos:
+                raise ValueError(f"Remoção de interação com nome desconhecido: {desconhecidos[0]!r}")
+        linhas = self._indices(pessoas, self.pessoas, self._indice_pessoa)  # Linhas (pode estender o vocabulário)
+        colunas = self._indices(generos, self.generos, self._indice_genero)  # Colunas (pode estender o vocabulário)
+        pesos = np.fromiter((sinal * int(registro.get("weight", 1)) for registro in registros), dtype=np.int64, count=len(registros))  # Pesos com sinal
+        return linhas, colunas, pesos  # Coordenadas do lote
+
+    # Aplica um lote de interações adicionadas e/ou removidas ({"from", "to", "weight"}) e devolve um resumo
+    def aplicar(self, adicionadas=(), removidas=()):
+        pessoas_antes, generos_antes = len(self.pessoas), len(self.generos)  # Tamanhos antes do lote
+        try:  # Lote inválido não pode deixar o estado pela metade
+            return self._aplicar(adicionadas, removidas, pessoas_antes, generos_antes)
+        except Exception:  # Desfaz a extensão dos vocabulários (as matrizes e grafos só mudam no fim)
+            for nome in self.pessoas[pessoas_antes:]:
+                del self._indice_pessoa[nome]
+            for nome in self.generos[generos_antes:]:
+                del self._indice_genero[nome]
+            del self.pessoas[pessoas_antes:], self.generos[generos_antes:]
+            raise
+
+    def _aplicar(self, adicionadas, removidas, pessoas_antes, generos_antes):
+        linhas_r, colunas_r, pesos_r = self._matriz_lote(removidas, -1, novos_nomes=False)  # Remoções
+        linhas_a, colunas_a, pesos_a = self._matriz_lote(adicionadas, 1, novos_nomes=True)  # Adições
+        quantidade_pessoas, quantidade_generos = len(self.pessoas), len(self.generos)  # Tamanhos depois do lote
+        forma = (quantidade_pessoas, quantidade_generos)  # Dimensão nova da incidência
+
+        delta = sp.csr_matrix(  # Variação da incidência (pesos somados por célula)
+            (np.concatenate((pesos_a, pesos_r)), (np.concatenate((linhas_a, linhas_r)), np.concatenate((colunas_a, colunas_r)))),
+            shape=forma, dtype=np.int64,
+        )
+        delta.sum_duplicates()  # Soma registros da mesma célula
+        delta.eliminate_zeros()  # Adição e remoção que se anulam
+
+        incidencia = self.incidencia.copy()  # Trabalha em uma cópia até validar o lote
+        incidencia.resize(forma)  # Linhas e colunas novas (vazias)
+        afetadas = np.unique(delta.tocoo().row)  # Pessoas cujas linhas mudaram
+        linhas_antigas = incidencia[afetadas]  # Linhas r antes do lote
+        nova = incidencia + delta  # Incidência depois do lote
+        if nova.nnz and nova.data.min() < 0:  # Remoção maior que o peso existente
+            raise ValueError("O lote remove mais peso do que existe em alguma célula da incidência.")
+        nova.eliminate_zeros()  # Células que zeraram saem da estrutura
+        nova.sort_indices()
+        linhas_novas = nova[afetadas]  # Linhas r' depois do lote
+
+        # Coocorrência (A^T A): cada linha alterada muda a soma por r'^T r' - r^T r
+        variacao_coocorrencia = (linhas_novas.T @ linhas_novas - linhas_antigas.T @ linhas_antigas).tocsr()  # Soma das variações de posto 1
+        variacao_coocorrencia.eliminate_zeros()  # Termos que se anularam
+        coocorrencia_antes = self.coocorrencia.copy()  # Para descobrir as arestas alteradas
+        coocorrencia_antes.resize((quantidade_generos, quantidade_generos))  # Gêneros novos
+        coocorrencia = coocorrencia_antes + variacao_coocorrencia  # Aplica a variação
+        coocorrencia.setdiag(0)  # Sem auto-conexões
+        coocorrencia.eliminate_zeros()
+        coocorrencia.sort_indices()
+
+        # Similaridade (A A^T): só as linhas/colunas das pessoas alteradas mudam, e a linha nova é r' @ A'^T
+        similaridade_antes = self.similaridade.copy()  # Para descobrir as arestas alteradas
+        similaridade_antes.resize((quantidade_pessoas, quantidade_pessoas))  # Pessoas novas
+        similaridade = _substituir_linhas_simetricas(similaridade_antes, afetadas, (linhas_novas @ nova.T).tocsr())  # Troca as linhas alteradas
+        similaridade.setdiag(0)  # Sem auto-conexões
+        similaridade.eliminate_zeros()
+        similaridade.sort_indices()
+
+        # Células alteradas em cada análise (usadas nos grafos já montados e nas métricas)
+        celulas = delta.tocoo()  # Células da incidência tocadas pelo lote
+        origem_c, destino_c, valores_c = _celulas_alteradas(coocorrencia_antes, coocorrencia, np.unique(variacao_coocorrencia.tocoo().row))  # Pares de gêneros alterados
+        origem_s, destino_s, valores_s = _celulas_alteradas(similaridade_antes, similaridade, afetadas)  # Pares de pessoas alterados
+
+        # Grafos já montados: nós novos e apenas as arestas que mudaram
+        if "incidencia" in self._grafos:
+            self._grafos["incidencia"].add_nodes_from(self.pessoas[pessoas_antes:], tipo="pessoa", bipartite=0)  # Pessoas novas
+            self._grafos["incidencia"].add_nodes_from(self.generos[generos_antes:], tipo="genero", bipartite=1)  # Gêneros novos
+            valores_incidencia = np.asarray(nova[celulas.row, celulas.col]).ravel()  # Peso novo de cada célula
+            _atualizar_arestas(self._grafos["incidencia"], self.pessoas, self.generos, celulas.row, celulas.col, valores_incidencia)
+        if "coocorrencia" in self._grafos:
+            self._grafos["coocorrencia"].add_nodes_from(self.generos[generos_antes:], tipo="genero")
+            _atualizar_arestas(self._grafos["coocorrencia"], self.generos, self.generos, origem_c, destino_c, valores_c)
+        if "similaridade" in self._grafos:
+            self._grafos["similaridade"].add_nodes_from(self.pessoas[pessoas_antes:], tipo="pessoa")
+            _atualizar_arestas(self._grafos["similaridade"], self.pessoas, self.pessoas, origem_s, destino_s, valores_s)
+
+        # Métricas baratas: só os nós afetados
+        self.metricas_coocorrencia.estender(quantidade_generos)
+        self.metricas_coocorrencia.atualizar(coocorrencia, np.unique(np.concatenate((origem_c, destino_c))).astype(np.int64))
+        self.metricas_similaridade.estender(quantidade_pessoas)
+        self.metricas_similaridade.atualizar(similaridade, np.unique(np.concatenate((origem_s, destino_s))).astype(np.int64))
+        self.graus_incidencia = np.concatenate((  # Pessoas e depois gêneros (os gêneros novos deslocam o bloco)
+            self.graus_incidencia[:pessoas_antes], np.zeros(quantidade_pessoas - pessoas_antes, dtype=np.int64),
+            self.graus_incidencia[pessoas_antes:], np.zeros(quantidade_generos - generos_antes, dtype=np.int64),
+        ))
+        colunas_afetadas = np.unique(celulas.col)  # Gêneros cujas colunas mudaram
+        self.graus_incidencia[afetadas] = np.diff(nova[afetadas].indptr)  # Grau novo das pessoas
+        self.graus_incidencia[quantidade_pessoas + colunas_afetadas] = np.diff(nova.T.tocsr()[colunas_afetadas].indptr)  # Grau novo dos gêneros
+
+        self.incidencia, self.coocorrencia, self.similaridade = nova, coocorrencia, similaridade  # Publica as matrizes novas
+        return {  # Resumo do lote
+            "pessoas_novas": self.pessoas[pessoas_antes:],
+            "generos_novos": self.generos[generos_antes:],
+            "pessoas_alteradas": len(afetadas),
+            "arestas_coocorrencia_alteradas": len(valores_c),
+            "arestas_similaridade_alteradas": len(valores_s),
+        }
+
+    # Adjacências CSR atuais (para as métricas topológicas e o desenho)
+    def adjacencias(self):
+        return {
+            "incidencia": adjacencia_bipartida(self.incidencia, self.pessoas, self.generos),
+            "coocorrencia": adjacencia_de_matriz(self.coocorrencia, self.generos),
+            "similaridade": adjacencia_de_matriz(self.similaridade, self.pessoas),
+        }
+
+    # Métricas baratas das três análises, sem percorrer os grafos
+    def metricas_basicas(self):
+        return {
+            "incidencia": {
+                "graus": dict(zip(self.pessoas + self.generos, self.graus_incidencia.tolist())),
+                "densidade": densidade_bipartida(self.incidencia),  # |E| / (pessoas × gêneros), a mesma do relatório de incidência
+            },
+            "coocorrencia": {
+                "graus": dict(zip(self.generos, self.metricas_coocorrencia.graus.tolist())),
+                "forcas": dict(zip(self.generos, self.metricas_coocorrencia.forcas.tolist())),
+                "densidade": self.metricas_coocorrencia.densidade(),
+            },
+            "similaridade": {
+                "graus": dict(zip(self.pessoas, self.metricas_similaridade.graus.tolist())),
+                "forcas": dict(zip(self.pessoas, self.metricas_similaridade.forcas.tolist())),
+                "densidade": self.metricas_similaridade.densidade(),
+            },
+        }
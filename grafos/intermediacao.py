@@ -0,0 +1,172 @@
+import math  # Importa math para o valor NaN da reescala
+import random  # Importa random para sortear os nós pivôs
+from collections import deque  # Importa deque para a busca em largura
+from heapq import heappop, heappush  # Importa heap para o algoritmo de Dijkstra
+from itertools import count  # Importa contador para desempate estável no heap
+
+import numpy as np  # Importa NumPy para somar os resultados parciais
+
+from .agendador import derivado, executar_tarefas, processos_padrao  # Importa o agendador de tarefas em processos
+
+# Centralidade de intermediação (betweenness) pelo algoritmo de Brandes sobre a adjacência CSR,
+# exata (todas as fontes) ou aproximada (k fontes sorteadas), com as fontes divididas entre processos
+
+
+# Converte os vetores CSR em listas Python (acesso elemento a elemento mais rápido que em arrays NumPy)
+def _listas_adjacencia(adjacencia):
+    return adjacencia.indptr.tolist(), adjacencia.indices.tolist(), adjacencia.pesos.tolist()  # Três listas alinhadas
+
+
+# Caminhos mínimos sem peso (BFS) a partir da fonte s: ordem de visita, predecessores e contagem de caminhos
+def _caminhos_bfs(s, indptr, indices, quantidade_nos):
+    ordem = []  # Nós na ordem em que foram finalizados
+    predecessores = {}  # Predecessores de cada nó nos caminhos mínimos
+    sigma = [0.0] * quantidade_nos  # Quantidade de caminhos mínimos de s até cada nó
+    distancia = {s: 0}  # Distância de s até cada nó visitado
+    sigma[s] = 1.0  # Um caminho de s até ele mesmo
+    fila = deque([s])  # Fila da busca em largura
+    while fila:  # Enquanto houver nós a visitar
+        v = fila.popleft()  # Próximo nó
+        ordem.append(v)  # Finaliza o nó
+        distancia_v = distancia[v]  # Distância até v
+        sigma_v = sigma[v]  # Caminhos até v
+        for posicao in range(indptr[v], indptr[v + 1]):  # Loop que percorre os vizinhos de v
+            w = indices[posicao]  # Vizinho
+            if w not in distancia:  # Primeira visita ao vizinho
+                fila.append(w)  # Agenda a visita
+                distancia[w] = distancia_v + 1  # Distância em saltos
+            if distancia[w] == distancia_v + 1:  # Caminho mínimo passando por v
+                sigma[w] += sigma_v  # Soma os caminhos
+                predecessores.setdefault(w, []).append(v)  # Registra v como predecessor
+    return ordem, predecessores, sigma  # Estruturas usadas na acumulação
+
+
+# Caminhos mínimos ponderados (Dijkstra) a partir da fonte s, com o peso da aresta como distância
+def _caminhos_dijkstra(s, indptr, indices, pesos, quantidade_nos):
+    ordem = []  # Nós na ordem em que foram finalizados
+    predecessores = {}  # Predecessores de cada nó nos caminhos mínimos
+    sigma = [0.0] * quantidade_nos  # Quantidade de caminhos mínimos de s até cada nó
+    finalizados = {}  # Distância definitiva dos nós já finalizados
+    sigma[s] = 1.0  # Um caminho de s até ele mesmo
+    vistos = {s: 0}  # Melhor distância conhecida até cada nó
+    contador = count()  # Desempate estável no heap
+    heap = [(0, next(contador), s, s)]  # (distância, desempate, predecessor, nó)
+    while heap:  # Enquanto houver nós a finalizar
+        distancia_v, _, predecessor, v = heappop(heap)  # Nó mais próximo ainda não finalizado
+        if v in finalizados:  # Entrada antiga do heap
+            continue  # Ignora
+        if predecessor != v:  # A fonte não soma caminhos dela mesma
+            sigma[v] += sigma[predecessor]  # Soma os caminhos vindos do predecessor
+        ordem.append(v)  # Finaliza o nó
+        finalizados[v] = distancia_v  # Distância definitiva
+        for posicao in range(indptr[v], indptr[v + 1]):  # Loop que percorre os vizinhos de v
+            w = indices[posicao]  # Vizinho
+            distancia_w = distancia_v + pesos[posicao]  # Distância passando por v
+            if w not in finalizados and (w not in vistos or distancia_w < vistos[w]):  # Caminho estritamente melhor
+                vistos[w] = distancia_w  # Atualiza a melhor distância
+                heappush(heap, (distancia_w, next(contador), v, w))  # Agenda o vizinho
+                sigma[w] = 0.0  # Caminhos anteriores deixam de ser mínimos
+                predecessores[w] = [v]  # v passa a ser o único predecessor
+            elif distancia_w == vistos[w]:  # Outro caminho mínimo de mesmo comprimento
+                sigma[w] += sigma[v]  # Soma os caminhos
+                predecessores[w].append(v)  # Registra v como predecessor
+    return ordem, predecessores, sigma  # Estruturas usadas na acumulação
+
+
+# Calcula a contribuição de uma lista de fontes para a intermediação de todos os nós
+def _acumular_fontes(fontes, indptr, indices, pesos, ponderado):
+    quantidade_nos = len(indptr) - 1  # Número de nós
+    intermediacao = [0.0] * quantidade_nos  # Soma parcial de cada nó
+    for s in fontes:  # Loop que percorre cada fonte
+        if ponderado:  # Distâncias pelos pesos das arestas
+            ordem, predecessores, sigma = _caminhos_dijkstra(s, indptr, indices, pesos, quantidade_nos)
+        else:  # Distâncias em número de saltos
+            ordem, predecessores, sigma = _caminhos_bfs(s, indptr, indices, quantidade_nos)
+
+        # Acumulação de dependências em ordem reversa de distância (Brandes)
+        delta = dict.fromkeys(ordem, 0.0)  # Dependência de s em cada nó
+        while ordem:  # Do nó mais distante para o mais próximo
+            w = ordem.pop()  # Nó atual
+            coeficiente = (1.0 + delta[w]) / sigma[w]  # Parcela repassada a cada caminho
+            for v in predecessores.get(w, ()):  # Loop que percorre os predecessores de w
+                delta[v] += sigma[v] * coeficiente  # Repasse proporcional aos caminhos que passam por v
+            if w != s:  # A fonte não acumula intermediação dela mesma
+                intermediacao[w] += delta[w]  # Soma a dependência
+    return intermediacao  # Soma parcial das fontes recebidas
+
+
+# Tarefa do agendador: soma parcial de uma parte das fontes (as listas são convertidas uma vez por processo)
+def intermediacao_parcial(adjacencia, fontes, ponderado=True):
+    indptr, indices, pesos = derivado(adjacencia, "listas", _listas_adjacencia)  # Listas Python da adjacência
+    return np.asarray(_acumular_fontes(fontes, indptr, indices, pesos, ponderado))  # Soma parcial destas fontes
+
+
+# Divide a lista de fontes em partes de tamanho parecido
+def _dividir(fontes, partes):
+    partes = max(1, min(partes, len(fontes)))  # Não cria partes vazias
+    return [fontes[indice::partes] for indice in range(partes)]  # Distribuição intercalada (equilibra nós caros e baratos)
+
+
+# Reescala igual à do NetworkX (normalizado, grafo não-direcionado, sem extremidades)
+def _reescalar(intermediacao, quantidade_nos, fontes_sorteadas):
+    pares = quantidade_nos - 1  # Possíveis alvos de cada fonte
+    if pares < 2:  # Grafo pequeno: intermediação é sempre zero
+        return intermediacao  # Nada a reescalar
+
+    if fontes_sorteadas is None:  # Cálculo exato
+        return intermediacao / (pares * (pares - 1))  # Divide pelo número de pares (s, t) possíveis
+
+    k = len(fontes_sorteadas)  # Quantidade de pivôs
+    escala_fonte = 1 / ((k - 1) * (pares - 1)) if k > 1 else math.nan  # Pivôs não podem passar por eles mesmos
+    escala_outros = 1 / (k * (pares - 1))  # Demais nós
+    escala = np.full(quantidade_nos, escala_outros)  # Escala de cada nó
+    escala[list(fontes_sorteadas)] = escala_fonte  # Ajuste dos pivôs
+    return intermediacao * escala  # Aplica a escala
+
+
+# Fontes usadas no cálculo: todas (exata) ou k pivôs sorteados com a semente (aproximada)
+def sortear_fontes(quantidade_nos, amostra=None, semente=42):
+    if amostra is not None and amostra < 1:  # Pelo menos um pivô é necessário
+        raise ValueError("A amostra da intermediação deve ter pelo menos 1 nó.")
+    if amostra is None or amostra >= quantidade_nos:  # Sem amostragem: todas as fontes
+        return list(range(quantidade_nos)), None  # Cálculo exato
+    fontes = random.Random(semente).sample(range(quantidade_nos), amostra)  # Sorteio reprodutível
+    return fontes, fontes  # As fontes sorteadas são usadas também na reescala
+
+
+# Tarefas do agendador para a intermediação: as fontes divididas em partes independentes
+def tarefas_intermediacao(fontes, partes, ponderado=True):
+    return [("intermediacao", intermediacao_parcial, {"fontes": parte, "ponderado": ponderado}) for parte in _dividir(fontes, partes)]
+
+
+# Junta as somas parciais, normaliza e descreve os parâmetros usados
+def finalizar_intermediacao(somas, quantidade_nos, fontes, fontes_sorteadas, semente, processos):
+    soma = np.zeros(quantidade_nos)  # Soma dos resultados parciais
+    for parcial in somas:  # Loop que junta as partes
+        soma += parcial  # Soma a contribuição da parte
+    valores = _reescalar(soma, quantidade_nos, fontes_sorteadas)  # Normaliza como o NetworkX
+    parametros = {  # Parâmetros usados (informados no relatório)
+        "aproximada": fontes_sorteadas is not None,  # Se houve amostragem
+        "amostra": len(fontes),  # Quantidade de fontes usadas
+        "semente": semente if fontes_sorteadas is not None else None,  # Semente do sorteio
+        "processos": processos,  # Processos usados
+    }
+    return valores, parametros  # Vetor na ordem dos nós da adjacência e parâmetros usados
+
+
+# Intermediação normalizada de todos os nós da adjacência CSR
+# amostra: quantidade k de pivôs sorteados (None = exata); semente: semente do sorteio; processos: núcleos usados
+def intermediacao(adjacencia, amostra=None, semente=42, processos=None, ponderado=True):
+    quantidade_nos = adjacencia.quantidade_nos()  # Número de nós
+    fontes, fontes_sorteadas = sortear_fontes(quantidade_nos, amostra, semente)  # Fontes do cálculo
+    processos = processos_padrao(quantidade_nos, processos)  # Processos disponíveis
+    tarefas = tarefas_intermediacao(fontes, processos * 4, ponderado)  # Várias partes por processo equilibram a carga
+    resultados, processos = executar_tarefas(adjacencia, tarefas, processos)  # Executa as partes no pool
+    return finalizar_intermediacao(resultados.get("intermediacao", []), quantidade_nos, fontes, fontes_sorteadas, semente, processos)
+
+
+# Texto com os parâmetros da intermediação, para o relatório de métricas
+def descrever_parametros(parametros):
+    if not parametros["aproximada"]:  # Cálculo exato
+        return f"exata, {parametros['amostra']} fontes, {parametros['processos']} processo(s)"
+    return f"aproximada por pivôs, k={parametros['amostra']}, semente={parametros['semente']}, {parametros['processos']} processo(s)"
@@ -0,0 +1,209 @@
+import hashlib  # Importa hashlib para identificar o grafo no cache de posições
+import os  # Importa os para gravar o cache de posições em disco
+
+import networkx as nx  # Importa NetworkX para o spring layout dos grafos pequenos
+import numpy as np  # Importa NumPy para operações vetorizadas
+from scipy import fft  # Importa FFT do SciPy para a repulsão em grade
+
+from .construcao import grafo_de_matriz  # Importa construtor vetorizado de grafos
+from helpers.easy_log import etapa  # Importa medição das etapas (tempo e memória)
+from helpers.cache_sessao import CacheSessao  # Importa cache com orçamento de memória e descarte LRU
+
+# Posições dos nós para desenhar os grafos: spring layout do NetworkX nos grafos pequenos,
+# layout de forças em grade (vetorizado em NumPy) nos grandes e layout bipartido em duas colunas,
+# com cache das posições na sessão (com orçamento de memória) e em disco, pela assinatura do grafo
+
+MAXIMO_NOS_SPRING = 1000  # Acima disso o spring layout do NetworkX (O(n²) por iteração) fica lento demais
+DIRETORIO_CACHE = "layouts.cache"  # Diretório padrão do cache de posições em disco
+VERSAO_CACHE = 1  # Muda quando o formato ou os algoritmos mudam (invalida o cache antigo)
+
+ORCAMENTO_POSICOES = 64 * 1024 * 1024  # Memória máxima das posições guardadas na sessão (64 MiB, cerca de 4 milhões de nós)
+
+_cache_sessao = CacheSessao(ORCAMENTO_POSICOES)  # Assinatura -> posições já calculadas nesta sessão (descarta as menos usadas)
+
+
+# Esquece as posições guardadas na sessão (ex.: dataset recarregado); as gravadas em disco continuam valendo
+def limpar_cache_posicoes():
+    _cache_sessao.limpar()
+
+
+# Campo de repulsão de uma carga unitária em uma grade de lado 2G-1 (centro na posição G-1), transformado por FFT
+# Repulsão de Fruchterman-Reingold: vetor delta / d² (multiplicado por k² depois)
+def _nucleo_repulsao(tamanho_grade, forma_fft):
+    deslocamentos = np.arange(-(tamanho_grade - 1), tamanho_grade, dtype=float)  # Distâncias em células
+    dx, dy = np.meshgrid(deslocamentos, deslocamentos, indexing="ij")  # Grade de deslocamentos
+    distancia2 = dx * dx + dy * dy  # Quadrado da distância
+    distancia2[tamanho_grade - 1, tamanho_grade - 1] = np.inf  # Sem força da célula sobre ela mesma
+    return fft.rfft2(dx / distancia2, forma_fft), fft.rfft2(dy / distancia2, forma_fft)  # Núcleos x e y no domínio da frequência
+
+
+# Repulsão aproximada entre todos os nós em O(n + G² log G): as massas são somadas em uma grade G × G
+# e convoluídas com o campo de uma carga (FFT); nós da mesma célula se repelem do centro de massa dos demais
+def _repulsao_grade(posicoes, k, tamanho_grade, nucleos, forma_fft):
+    minimo = posicoes.min(axis=0)  # Canto da caixa que contém os nós
+    lado = float((posicoes.max(axis=0) - minimo).max()) or 1.0  # Lado da caixa quadrada
+    passo = lado / (tamanho_grade - 1)  # Tamanho de uma célula
+    celulas = np.minimum(((posicoes - minimo) / passo).astype(np.int64), tamanho_grade - 1)  # Célula de cada nó
+    indice = celulas[:, 0] * tamanho_grade + celulas[:, 1]  # Índice linear da célula
+    massas = np.bincount(indice, minlength=tamanho_grade * tamanho_grade)  # Nós em cada célula
+
+    # Campo distante: convolução da grade de massas com o núcleo (o núcleo escala com 1 / passo)
+    densidade = fft.rfft2(massas.reshape(tamanho_grade, tamanho_grade).astype(float), forma_fft)  # Massas no domínio da frequência
+    inicio, fim = tamanho_grade - 1, 2 * tamanho_grade - 1  # Recorte "same" da convolução completa
+    campo_x = fft.irfft2(densidade * nucleos[0], forma_fft)[inicio:fim, inicio:fim].ravel()  # Componente x por célula
+    campo_y = fft.irfft2(densidade * nucleos[1], forma_fft)[inicio:fim, inicio:fim].ravel()  # Componente y por célula
+    repulsao = np.column_stack((campo_x[indice], campo_y[indice])) / passo  # Campo na célula de cada nó
+
+    # Campo próximo: repulsão do centro de massa dos outros nós da mesma célula
+    outros = massas[indice] - 1  # Outros nós na mesma célula
+    soma_x = np.bincount(indice, weights=posicoes[:, 0], minlength=len(massas))[indice]  # Soma das posições x da célula
+    soma_y = np.bincount(indice, weights=posicoes[:, 1], minlength=len(massas))[indice]  # Soma das posições y da célula
+    com_vizinhos = outros > 0  # Nós que dividem a célula
+    centro = np.column_stack((soma_x, soma_y))[com_vizinhos] - posicoes[com_vizinhos]  # Soma das posições dos outros
+    delta = posicoes[com_vizinhos] - centro / outros[com_vizinhos, None]  # Vetor a partir do centro de massa dos outros
+    distancia2 = np.maximum((delta * delta).sum(axis=1), (0.01 * k) ** 2)  # Evita divisão por zero
+    repulsao[com_vizinhos] += delta * (outros[com_vizinhos] / distancia2)[:, None]  # Força proporcional à massa dos outros
+    return repulsao * (k * k)  # Escala k² de Fruchterman-Reingold
+
+
+# Layout de forças (Fruchterman-Reingold) vetorizado: atração exata pelas arestas e repulsão aproximada em grade
+# Mesmas convenções do nx.spring_layout: posições iniciais aleatórias pela semente, resfriamento linear e escala [-1, 1]
+def layout_forcas(adjacencia, iteracoes=50, k=None, semente=42, tamanho_grade=None):
+    quantidade_nos = adjacencia.quantidade_nos()  # Número de nós
+    if quantidade_nos <= 1:  # Nada a posicionar
+        return np.zeros((quantidade_nos, 2))  # Nó único no centro
+
+    posicoes = np.random.RandomState(semente).rand(quantidade_nos, 2)  # Posições iniciais reprodutíveis
+    k = k or 1.0 / np.sqrt(quantidade_nos)  # Distância ideal entre nós
+    origem, destino, pesos = adjacencia.arestas()  # Arestas (cada par uma vez) e pesos
+    pesos = pesos.astype(float)  # Pesos como reais
+    tamanho_grade = tamanho_grade or int(np.clip(np.sqrt(quantidade_nos), 16, 256))  # Cerca de um nó por célula
+    forma_fft = [fft.next_fast_len(3 * tamanho_grade - 2, real=True)] * 2  # Tamanho da convolução completa (sem sobreposição circular)
+    nucleos = _nucleo_repulsao(tamanho_grade, forma_fft)  # Calculado uma vez
+
+    temperatura = 0.1  # Deslocamento máximo inicial (mesmo do NetworkX)
+    resfriamento = temperatura / (iteracoes + 1)  # Redução por iteração
+    for _ in range(iteracoes):  # Loop de iterações
+        deslocamento = _repulsao_grade(posicoes, k, tamanho_grade, nucleos, forma_fft)  # Repulsão entre todos os nós
+
+        # Atração pelas arestas: vetor delta × d × peso / k
+        delta = posicoes[origem] - posicoes[destino]  # Vetor de cada aresta
+        distancia = np.maximum(np.sqrt((delta * delta).sum(axis=1)), 0.01)  # Comprimento (limitado como no NetworkX)
+        atracao = delta * (distancia * pesos / k)[:, None]  # Força em cada aresta
+        for eixo in range(2):  # Loop que soma as forças por nó em cada eixo
+            deslocamento[:, eixo] -= np.bincount(origem, weights=atracao[:, eixo], minlength=quantidade_nos)  # Origem puxada para o destino
+            deslocamento[:, eixo] += np.bincount(destino, weights=atracao[:, eixo], minlength=quantidade_nos)  # Destino puxado para a origem
+
+        comprimento = np.maximum(np.sqrt((deslocamento * deslocamento).sum(axis=1)), 0.01)  # Tamanho do deslocamento
+        posicoes += deslocamento * (np.minimum(comprimento, temperatura) / comprimento)[:, None]  # Limita pela temperatura
+        temperatura -= resfriamento  # Resfria
+
+    return _reescalar(posicoes)  # Centraliza e escala como o NetworkX
+
+
+# Layout bipartido: linhas da matriz (primeiros particao nós) à esquerda e colunas à direita,
+# cada lado ordenado pelo baricentro dos vizinhos do outro lado para reduzir cruzamentos
+def layout_bipartido(adjacencia, particao, varreduras=4):
+    quantidade_nos = adjacencia.quantidade_nos()  # Número de nós
+    bloco = adjacencia.matriz()[:particao, particao:]  # Ligações linhas × colunas (pesos)
+    graus_linhas = np.asarray(bloco.sum(axis=1)).ravel()  # Força de cada nó da esquerda
+    graus_colunas = np.asarray(bloco.sum(axis=0)).ravel()  # Força de cada nó da direita
+
+    ordem_linhas = np.arange(particao, dtype=float)  # Posição inicial: ordem original
+    ordem_colunas = np.arange(quantidade_nos - particao, dtype=float)  # Posição inicial: ordem original
+    for _ in range(varreduras):  # Varreduras alternadas (heurística do baricentro)
+        baricentros = np.divide(bloco.T @ ordem_linhas, graus_colunas, out=ordem_colunas.copy(), where=graus_colunas > 0)  # Média das posições dos vizinhos
+        ordem_colunas = np.argsort(np.argsort(baricentros, kind="stable"), kind="stable").astype(float)  # Posição = posto do baricentro
+        baricentros = np.divide(bloco @ ordem_colunas, graus_linhas, out=ordem_linhas.copy(), where=graus_linhas > 0)  # Média das posições dos vizinhos
+        ordem_linhas = np.argsort(np.argsort(baricentros, kind="stable"), kind="stable").astype(float)  # Posição = posto do baricentro
+
+    posicoes = np.zeros((quantidade_nos, 2))  # Posições de todos os nós
+    posicoes[:particao, 0] = -1.0  # Coluna da esquerda
+    posicoes[particao:, 0] = 1.0  # Coluna da direita
+    posicoes[:particao, 1] = 1.0 - 2.0 * ordem_linhas / max(1, particao - 1)  # De cima para baixo em [-1, 1]
+    posicoes[particao:, 1] = 1.0 - 2.0 * ordem_colunas / max(1, quantidade_nos - particao - 1)  # De cima para baixo em [-1, 1]
+    return posicoes  # Vetor (n, 2) na ordem dos nós
+
+
+# Centraliza na origem e escala para [-1, 1] (mesmo que nx.rescale_layout)
+def _reescalar(posicoes):
+    posicoes = posicoes - posicoes.mean(axis=0)  # Centraliza
+    limite = np.abs(posicoes).max()  # Maior coordenada
+    return posicoes / limite if limite > 0 else posicoes  # Escala
+
+
+# Assinatura do grafo e dos parâmetros do layout (nomes, estrutura e pesos)
+def assinatura_layout(adjacencia, metodo, parametros):
+    resumo = hashlib.sha256()  # Hash incremental
+    resumo.update(f"{VERSAO_CACHE}|{metodo}|{sorted(parametros.items())!r}|".encode("utf-8"))  # Método e parâmetros
+    resumo.update("\0".join(map(str, adjacencia.nomes)).encode("utf-8"))  # Nomes dos nós, na ordem
+    for vetor in (adjacencia.indptr, adjacencia.indices, adjacencia.pesos):  # Estrutura e pesos da adjacência CSR
+        resumo.update(np.ascontiguousarray(vetor).tobytes())
+    return resumo.hexdigest()  # Texto hexadecimal
+
+
+# Lê as posições gravadas em disco (None se não houver ou se o arquivo for inválido)
+def _carregar_cache(diretorio_cache, assinatura, quantidade_nos):
+    caminho = os.path.join(diretorio_cache, f"{assinatura}.npy")  # Arquivo das posições
+    try:
+        posicoes = np.load(caminho)  # Vetor (n, 2)
+    except (OSError, ValueError):  # Sem cache ou arquivo corrompido
+        return None
+    return posicoes if posicoes.shape == (quantidade_nos, 2) else None  # Confere o formato
+
+
+# Grava as posições em disco de forma atômica (arquivo temporário + renomeação)
+def _salvar_cache(diretorio_cache, assinatura, posicoes):
+    try:
+        os.makedirs(diretorio_cache, exist_ok=True)  # Cria o diretório se ainda não existir
+        temporario = os.path.join(diretorio_cache, f"{assinatura}.{os.getpid()}.tmp.npy")  # Arquivo temporário por processo
+        np.save(temporario, posicoes)  # Grava
+        os.replace(temporario, os.path.join(diretorio_cache, f"{assinatura}.npy"))  # Publica o arquivo pronto
+    except OSError:  # Sem permissão de escrita: o cache em disco é opcional
+        pass
+
+
+# Posições dos nós (dicionário nome -> [x, y]) para desenhar o grafo, com cache na sessão e em disco
+# metodo: "auto" (spring até MAXIMO_NOS_SPRING nós, forças em grade acima), "spring", "forcas" ou "bipartido"
+# k: distância ideal do spring layout; particao: quantidade de nós do primeiro lado (obrigatória no layout bipartido);
+# diretorio_cache=None desliga o disco
+@etapa("layout")  # Tempo do layout (ou da leitura do cache)
+def posicoes_grafo(adjacencia, grafo=None, metodo="auto", iteracoes=50, k=None, semente=42, particao=None,
+                   diretorio_cache=DIRETORIO_CACHE):
+    quantidade_nos = adjacencia.quantidade_nos()  # Número de nós
+    if metodo == "auto":  # Escolha pelo tamanho
+        metodo = "spring" if quantidade_nos <= MAXIMO_NOS_SPRING else "forcas"
+    if metodo == "bipartido":  # Layout determinístico
+        if particao is None:  # Sem a divisão entre os lados
+            raise ValueError("O layout bipartido exige a quantidade de nós do primeiro lado (particao).")
+        parametros = {"particao": particao}
+    elif metodo == "spring":  # NetworkX
+        parametros = {"iteracoes": iteracoes, "k": k, "semente": semente}
+    elif metodo == "forcas":  # Forças em grade: k ajustado ao tamanho do grafo (o k dos grafos pequenos espalharia demais os nós)
+        parametros = {"iteracoes": iteracoes, "semente": semente}
+    else:  # Método desconhecido
+        raise ValueError(f"Layout inválido: {metodo!r} (use 'auto', 'spring', 'forcas' ou 'bipartido').")
+
+    assinatura = assinatura_layout(adjacencia, metodo, parametros)  # Identifica grafo + layout
+
+    # Posições lidas do disco ou calculadas (só quando não estão no cache da sessão)
+    def _calcular():
+        posicoes = _carregar_cache(diretorio_cache, assinatura, quantidade_nos) if diretorio_cache is not None else None  # Tenta o disco
+        if posicoes is not None:  # Calculadas em outra execução
+            return posicoes
+        if metodo == "spring":  # NetworkX (mesmo resultado de antes para os grafos pequenos)
+            dicionario = nx.spring_layout(  # Fruchterman-Reingold denso
+                grafo if grafo is not None else grafo_de_matriz(adjacencia.matriz(), adjacencia.nomes, tipo=None),  # Grafo com os mesmos nós
+                k=k, iterations=iteracoes, seed=semente,
+            )
+            posicoes = np.array([dicionario[nome] for nome in adjacencia.nomes]).reshape(quantidade_nos, 2)  # Na ordem dos nós
+        elif metodo == "forcas":  # Forças em grade
+            posicoes = layout_forcas(adjacencia, iteracoes=iteracoes, semente=semente)
+        else:  # Duas colunas
+            posicoes = layout_bipartido(adjacencia, particao)
+        if diretorio_cache is not None:  # Persiste para as próximas execuções
+            _salvar_cache(diretorio_cache, assinatura, posicoes)
+        return posicoes
+
+    posicoes = _cache_sessao.obter(assinatura, _calcular)  # Reaproveita nesta sessão (dentro do orçamento de memória)
+    return dict(zip(adjacencia.nomes, posicoes))  # Formato aceito pelas funções de desenho do NetworkX
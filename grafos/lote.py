@@ -0,0 +1,175 @@
+import os  # Importa os para montar os caminhos de saída e contar os núcleos
+import tempfile  # Importa tempfile para o diretório das projeções compartilhadas
+from concurrent.futures import ProcessPoolExecutor  # Importa pool de processos para desenhar as figuras ao mesmo tempo
+
+import matplotlib.pyplot as plt  # Importa Matplotlib para trocar o backend dos processos trabalhadores
+
+from .incidencia import gerar_incidencia  # Importa análise de incidência
+from .coocorrencia import gerar_coocorrencia  # Importa análise de coocorrência
+from .similaridade import gerar_similaridade  # Importa análise de similaridade
+from .figuras import FORMATOS_PADRAO  # Importa formatos padrão das figuras
+from .matrizes import matriz_coocorrencia  # Importa projeções para o armazém de resultados
+from .minhash import projecao_similaridade  # Importa similaridade exata ou aproximada para o armazém de resultados
+from .similaridade_paralela import abrir_csr, gravar_csr  # Importa a gravação das projeções mapeadas pelos trabalhadores
+from .construcao import adjacencia_de_matriz, adjacencia_bipartida  # Importa adjacências para gravar as arestas
+from helpers.easy_log import etapa, incorporar_registros, iniciar_instrumentacao, instrumentacao_ativa, registros  # Importa a medição das etapas
+from helpers.relatorio import caminho_colunas, modo_relatorio  # Importa o modo dos relatórios (texto detalhado ou resumido e arquivo colunar)
+
+# Execução em lote (sem interface gráfica): calcula cada projeção uma vez, grava os relatórios de métricas no
+# processo principal e depois desenha todas as figuras em processos trabalhadores, tudo em um diretório de saída
+
+ANALISES = {  # Nome da análise -> função que a constrói
+    "incidencia": gerar_incidencia,
+    "coocorrencia": gerar_coocorrencia,
+    "similaridade": gerar_similaridade,
+}
+FIGURAS = ("matriz", "grafo", "matriz_e_grafo")  # Figuras geradas por análise (na ordem das funções devolvidas)
+# Opções que só mudam o desenho e o relatório das análises (não a construção da matriz gravada no armazém)
+OPCOES_APRESENTACAO = ("comunidades", "resolucao_comunidades")
+# Parâmetro de cada análise que recebe a matriz da projeção já calculada (a incidência usa a própria matriz de incidência)
+PARAMETROS_PROJECAO = {"coocorrencia": "matriz_coocorrencia", "similaridade": "matriz_similaridade"}
+
+_dados_processo = {}  # Pessoas, gêneros, matriz de incidência, opções, projeções mapeadas e análises já construídas neste processo
+
+
+# Inicializador do processo trabalhador: recebe os dados uma única vez e usa o backend sem janela
+# diretorio_projecoes/formas: projeções gravadas pelo processo principal (nome -> forma), abertas mapeadas
+def _inicializar_trabalhador(pessoas, generos, matriz_incidencia, instrumentar=False, opcoes=None, diretorio_projecoes=None, formas=None):
+    plt.switch_backend("Agg")  # Desenha apenas em memória/arquivo
+    if instrumentar:  # Mede as etapas também no trabalhador (devolvidas ao processo principal com cada figura)
+        iniciar_instrumentacao(resumo=False)
+    projecoes = {nome: abrir_csr(diretorio_projecoes, nome, forma) for nome, forma in (formas or {}).items()}  # Sem copiar para a memória do processo
+    _dados_processo.update(pessoas=pessoas, generos=generos, matriz_incidencia=matriz_incidencia, opcoes=opcoes or {}, projecoes=projecoes, analises={})
+
+
+# Análise construída uma vez por processo e reaproveitada pelas figuras seguintes
+def _analise(nome):
+    analises = _dados_processo["analises"]  # Análises já construídas
+    if nome not in analises:  # Primeira figura desta análise no processo
+        projecoes = _dados_processo["projecoes"]  # Projeções calculadas pelo processo principal
+        projecao = {PARAMETROS_PROJECAO[nome]: projecoes[nome]} if nome in projecoes else {}  # A análise não recalcula a matriz
+        analises[nome] = ANALISES[nome](  # Constrói a partir da matriz de incidência recebida
+            None, _dados_processo["pessoas"], _dados_processo["generos"], _dados_processo["matriz_incidencia"],
+            **_dados_processo["opcoes"].get(nome, {}), **projecao,  # Parâmetros próprios da análise (ex.: normalização da coocorrência)
+        )
+    return analises[nome]  # Tupla (gerar_matriz, gerar_grafo, gerar_matriz_e_grafo, calcular_metricas)
+
+
+# Tarefa do pool: grava uma figura de uma análise e devolve os arquivos gravados e as etapas medidas no trabalhador
+def _renderizar(nome, figura, caminho_saida, formatos):
+    medidas = len(registros())  # Etapas já medidas neste processo (as anteriores foram devolvidas por outras tarefas)
+    funcoes = dict(zip(FIGURAS, _analise(nome)[:3]))  # Figura -> função que a desenha
+    arquivos = funcoes[figura](caminho_saida, formatos)  # Lista de arquivos gravados
+    return arquivos, registros()[medidas:]  # Arquivos e etapas desta tarefa
+
+
+# Matriz da projeção de uma análise (mesma construção dos módulos), calculada uma vez no processo principal para
+# o relatório de métricas, o armazém e as figuras; None na incidência, que não tem projeção
+def _matriz_projecao(nome, matriz_incidencia, opcoes=None):
+    opcoes = {chave: valor for chave, valor in (opcoes or {}).items() if chave not in OPCOES_APRESENTACAO}  # Só os parâmetros da matriz
+    if nome not in PARAMETROS_PROJECAO:  # Sem projeção
+        return None
+    with etapa(f"projecao_{nome}"):  # Produto esparso da projeção
+        if nome == "coocorrencia":  # Gêneros × gêneros
+            return matriz_coocorrencia(matriz_incidencia, **opcoes)  # M^T @ M sem diagonal (normalizada/filtrada se pedido)
+        return projecao_similaridade(matriz_incidencia, **opcoes)  # M @ M^T sem diagonal, em blocos (ou k-NN por MinHash)
+
+
+# Grava no armazém a matriz e as arestas do grafo de uma análise e devolve as entradas gravadas
+# matriz: projeção já calculada por _matriz_projecao (ignorada na incidência)
+def _salvar_estruturas(armazem, nome, pessoas, generos, matriz_incidencia, matriz=None):
+    if nome == "incidencia":  # Matriz pessoas × gêneros e grafo bipartido
+        caminho_matriz = armazem.salvar_matriz(nome, matriz_incidencia, pessoas, generos)
+        adjacencia = adjacencia_bipartida(matriz_incidencia, pessoas, generos)  # Pessoas e depois gêneros
+        grupos = [(len(pessoas), {"tipo": "pessoa", "bipartite": 0}), (len(generos), {"tipo": "genero", "bipartite": 1})]
+    elif nome == "coocorrencia":  # Gêneros × gêneros
+        caminho_matriz = armazem.salvar_matriz(nome, matriz, generos, generos)
+        adjacencia = adjacencia_de_matriz(matriz, generos)
+        grupos = [(len(generos), {"tipo": "genero"})]
+    elif nome == "similaridade":  # Pessoas × pessoas
+        caminho_matriz = armazem.salvar_matriz(nome, matriz, pessoas, pessoas)
+        adjacencia = adjacencia_de_matriz(matriz, pessoas)
+        grupos = [(len(pessoas), {"tipo": "pessoa"})]
+    else:  # Análise sem estruturas a gravar
+        return []
+    origem, destino, pesos = adjacencia.arestas()  # Cada aresta uma vez
+    return [caminho_matriz, armazem.salvar_grafo(nome, origem, destino, pesos, adjacencia.nomes, grupos)]  # Entradas gravadas
+
+
+# Executa todas as análises pedidas: relatórios de métricas no processo principal e depois as figuras em paralelo
+# (em sequência: o agendador das métricas e o pool das figuras usam, cada um, todos os núcleos)
+# Com um armazém (helpers.armazenamento.ArmazemResultados), grava também matrizes, grafos e métricas estruturadas
+# opcoes: parâmetros extras de cada análise, ex.: {"coocorrencia": {"normalizacao": "npmi", "significancia": 0.01}}
+# opcoes_relatorio: parâmetros dos relatórios de métricas, ex.: {"detalhado": False, "formato_colunas": "jsonl"}
+# opcoes_metricas: parâmetros das métricas de cada análise, ex.: {"incidencia": {"metricas_opcionais": ("proximidade",)}}
+# Devolve (arquivos gravados no diretório de saída, entradas gravadas no armazém, falhas), sendo falhas uma lista de (descrição, exceção)
+def executar_lote(pessoas, generos, matriz_incidencia, diretorio_saida, formatos=FORMATOS_PADRAO, processos=None,
+                  analises=tuple(ANALISES), calcular_metricas=True, armazem=None, opcoes=None, opcoes_relatorio=None, opcoes_metricas=None):
+    os.makedirs(diretorio_saida, exist_ok=True)  # Cria o diretório de saída
+    opcoes = opcoes or {}  # Sem parâmetros extras
+    opcoes_relatorio = opcoes_relatorio or {}  # Relatórios no modo automático (pelo tamanho do grafo)
+    opcoes_metricas = opcoes_metricas or {}  # Métricas padrão de cada análise
+    arquivos = []  # Arquivos gravados no diretório de saída
+    entradas_armazem = []  # Entradas gravadas no armazém
+    falhas = []  # Tarefas que falharam
+
+    with tempfile.TemporaryDirectory(prefix="lote_") as compartilhado:  # Projeções mapeadas pelos trabalhadores, removidas no fim
+        # A projeção de cada análise é calculada uma única vez e usada pelo relatório, pelo armazém e pelas figuras
+        projecoes = {}  # Nome -> matriz da projeção
+        for nome in analises:  # Loop que calcula e grava as projeções
+            if nome not in PARAMETROS_PROJECAO:  # Incidência: sem projeção
+                continue
+            try:
+                projecoes[nome] = _matriz_projecao(nome, matriz_incidencia, opcoes.get(nome))
+                gravar_csr(compartilhado, nome, projecoes[nome])  # Vetores .npy abertos mapeados pelos trabalhadores
+            except Exception as erro:  # Sem a projeção a análise não tem relatório nem figuras
+                projecoes.pop(nome, None)
+                falhas.append((f"{nome}/projecao", erro))
+        analises = [nome for nome in analises if nome in projecoes or nome not in PARAMETROS_PROJECAO]  # Análises que podem continuar
+        formas = {nome: matriz.shape for nome, matriz in projecoes.items()}  # Formas para remontar as matrizes nos trabalhadores
+
+        # Métricas primeiro, no processo principal (elas usam o próprio agendador, que ocupa os núcleos)
+        if calcular_metricas:  # Relatórios pedidos
+            for nome in analises:  # Loop que grava o relatório de cada análise
+                caminho_relatorio = os.path.join(diretorio_saida, f"metricas_{nome}.txt")  # Arquivo do relatório
+                try:
+                    projecao = {PARAMETROS_PROJECAO[nome]: projecoes[nome]} if nome in projecoes else {}  # Matriz já calculada
+                    resultado = ANALISES[nome](None, pessoas, generos, matriz_incidencia, **opcoes.get(nome, {}), **projecao)[3](caminho_relatorio, **opcoes_relatorio, **opcoes_metricas.get(nome, {}))  # Calcula e grava
+                    arquivos.append(caminho_relatorio)  # Registra o relatório gravado
+                    _, formato_colunas = modo_relatorio(resultado["escalares"]["vertices"], opcoes_relatorio.get("detalhado"), opcoes_relatorio.get("formato_colunas", "auto"))
+                    if formato_colunas is not None:  # Valores por nó gravados ao lado do relatório
+                        arquivos.append(caminho_colunas(caminho_relatorio, formato_colunas))
+                    if armazem is not None:  # Métricas estruturadas no armazém
+                        entradas_armazem.append(armazem.salvar_metricas(nome, resultado))
+                except Exception as erro:  # Falha em uma análise não interrompe as outras
+                    falhas.append((f"{nome}/metricas", erro))
+
+        if armazem is not None:  # Matrizes e grafos no armazém
+            for nome in analises:  # Loop que grava as estruturas de cada análise
+                try:
+                    entradas_armazem.extend(_salvar_estruturas(armazem, nome, pessoas, generos, matriz_incidencia, projecoes.get(nome)))
+                except Exception as erro:  # Falha em uma análise não interrompe as outras
+                    falhas.append((f"{nome}/armazem", erro))
+        projecoes.clear()  # Libera as projeções: os trabalhadores usam as gravadas
+
+        # Figuras depois das métricas, com todos os núcleos para o pool
+        tarefas = [(nome, figura) for nome in analises for figura in FIGURAS]  # Uma tarefa por figura
+        processos = max(1, min(processos or os.cpu_count() or 1, len(tarefas) or 1))  # Não abre mais processos que tarefas
+        with ProcessPoolExecutor(  # Pool de processos trabalhadores
+            max_workers=processos,  # Quantidade de processos
+            initializer=_inicializar_trabalhador,  # Recebe a matriz esparsa, os nomes e o caminho das projeções uma única vez
+            initargs=(pessoas, generos, matriz_incidencia, instrumentacao_ativa(), opcoes, compartilhado, formas),  # Dados compartilhados pelas tarefas
+        ) as pool:
+            futuros = [  # Envia todas as figuras
+                (f"{nome}/{figura}", pool.submit(_renderizar, nome, figura, os.path.join(diretorio_saida, f"{nome}_{figura}"), formatos))
+                for nome, figura in tarefas
+            ]
+            for descricao, futuro in futuros:  # Loop que recolhe as figuras
+                try:
+                    arquivos_tarefa, etapas_tarefa = futuro.result()  # Arquivos gravados e etapas medidas pela tarefa
+                    arquivos.extend(arquivos_tarefa)
+                    incorporar_registros(etapas_tarefa)  # Entram no resumo e no trace do processo principal
+                except Exception as erro:  # Exceção repassada pelo processo trabalhador
+                    falhas.append((descricao, erro))
+
+    return arquivos, entradas_armazem, falhas  # Arquivos gravados, entradas do armazém e falhas
@@ -0,0 +1,185 @@
+import numpy as np  # Importa NumPy para operações vetorizadas
+import scipy.sparse as sp  # Importa SciPy para matrizes esparsas (CSR/CSC)
+
+# Núcleo compartilhado pelos módulos de incidência, coocorrência e similaridade
+
+
+# Converte as colunas "from"/"to"/"weight" do dataset em vetores de índices inteiros
+def indices_do_dataset(data, pessoas, generos):
+    # Dataset colunar (helpers.load_dataset) já traz os índices inteiros na ordem das listas ordenadas
+    if hasattr(data, "origem"):  # Se os vetores colunares estiverem disponíveis
+        return data.origem, data.destino, data.peso  # Usa os vetores diretamente, sem consultar dicionários
+
+    # Mapeamento nome -> índice (mesma ordem das listas ordenadas de pessoas e gêneros)
+    indice_por_pessoa = {pessoa: indice for indice, pessoa in enumerate(pessoas)}  # Nome da pessoa -> linha
+    indice_por_genero = {genero: indice for indice, genero in enumerate(generos)}  # Nome do gênero -> coluna
+
+    quantidade_relacoes = len(data)  # Número de interações do dataset
+    # np.fromiter preenche os vetores diretamente, sem listas intermediárias de Python
+    linhas = np.fromiter((indice_por_pessoa[relacao["from"]] for relacao in data), dtype=np.int32, count=quantidade_relacoes)  # Índice da pessoa de cada relação
+    colunas = np.fromiter((indice_por_genero[relacao["to"]] for relacao in data), dtype=np.int32, count=quantidade_relacoes)  # Índice do gênero de cada relação
+    pesos = np.fromiter((int(relacao.get("weight", 1)) for relacao in data), dtype=np.int64, count=quantidade_relacoes)  # Peso de cada relação (ou 1 se não existir)
+
+    return linhas, colunas, pesos  # Retorna os três vetores alinhados
+
+
+# Monta a matriz de incidência esparsa (pessoas × gêneros) em uma única passada vetorizada
+def construir_matriz_incidencia(data, pessoas, generos):
+    linhas, colunas, pesos = indices_do_dataset(data, pessoas, generos)  # Vetores de índices e pesos
+
+    # O formato COO soma automaticamente relações repetidas (mesma pessoa e mesmo gênero) ao converter para CSR
+    matriz_incidencia = sp.coo_matrix(  # Cria matriz esparsa a partir das coordenadas
+        (pesos, (linhas, colunas)),  # Valores e posições (linha, coluna)
+        shape=(len(pessoas), len(generos)),  # Dimensão: linhas=pessoas e colunas=gêneros
+    ).tocsr()  # Converte para CSR (linhas contíguas, ideal para produtos e fatias por pessoa)
+    matriz_incidencia.sum_duplicates()  # Garante índices ordenados e sem repetição
+    matriz_incidencia.eliminate_zeros()  # Remove células que somaram zero
+
+    return matriz_incidencia  # Retorna matriz CSR com memória proporcional ao número de interações
+
+
+# Calcula uma projeção (M^T @ M ou M @ M^T) esparsa e sem a diagonal principal
+def projecao_sem_diagonal(matriz_esquerda, matriz_direita):
+    projecao = (matriz_esquerda @ matriz_direita).tocsr()  # Produto esparso
+    projecao.setdiag(0)  # Zera a diagonal para remover auto-conexões
+    projecao.eliminate_zeros()  # Remove a diagonal zerada da estrutura esparsa
+    projecao.sort_indices()  # Ordena colunas de cada linha (mantém a ordem das arestas igual à da matriz densa)
+    return projecao  # Retorna matriz CSR simétrica
+
+
+# Filtra as células de um bloco de linhas: remove a diagonal, aplica o limiar e mantém só os k maiores vizinhos
+def podar_bloco(bloco, deslocamento, top_k=None, limiar=None):
+    celulas = bloco.tocoo()  # Coordenadas das células não nulas do bloco
+    linhas = celulas.row.astype(np.int64) + deslocamento  # Converte linha local do bloco em linha global
+    colunas = celulas.col.astype(np.int64)  # Colunas globais (pessoas vizinhas)
+    valores = celulas.data  # Valores de similaridade
+
+    manter = (linhas != colunas) & (valores > 0)  # Descarta a diagonal (pessoa com ela mesma) e células nulas
+    if limiar is not None:  # Se houver limiar mínimo de similaridade
+        manter &= valores >= limiar  # Mantém apenas arestas com peso igual ou acima do limiar
+    linhas, colunas, valores = linhas[manter], colunas[manter], valores[manter]  # Aplica os filtros
+
+    if top_k is not None and len(valores) > 0:  # Se houver poda pelos k vizinhos mais similares
+        ordem = np.lexsort((colunas, -valores, linhas))  # Ordena por linha, depois peso decrescente (desempate pela coluna)
+        linhas, colunas, valores = linhas[ordem], colunas[ordem], valores[ordem]  # Reordena os vetores
+        inicio_linha = np.r_[0, np.flatnonzero(np.diff(linhas)) + 1]  # Posição onde começa cada linha no vetor ordenado
+        tamanho_linha = np.diff(np.r_[inicio_linha, len(linhas)])  # Quantidade de vizinhos de cada linha
+        posicao_na_linha = np.arange(len(linhas)) - np.repeat(inicio_linha, tamanho_linha)  # Ranking do vizinho dentro da sua linha
+        manter = posicao_na_linha < top_k  # Mantém apenas os k primeiros de cada linha
+        linhas, colunas, valores = linhas[manter], colunas[manter], valores[manter]  # Aplica a poda
+
+    return linhas, colunas, valores  # Retorna a lista de arestas do bloco
+
+
+# Calcula a matriz de similaridade (M @ M^T) em blocos de linhas, sem materializar a matriz pessoas × pessoas densa
+def similaridade_em_blocos(matriz_incidencia, tamanho_bloco=2048, top_k=None, limiar=None):
+    matriz_incidencia = sp.csr_matrix(matriz_incidencia)  # Garante formato CSR (fatias de linhas baratas)
+    quantidade_pessoas = matriz_incidencia.shape[0]  # Número de pessoas (linhas e colunas do resultado)
+    transposta = matriz_incidencia.T.tocsr()  # Transposta calculada uma única vez para todos os blocos
+
+    partes_linhas, partes_colunas, partes_valores = [], [], []  # Arestas acumuladas de cada bloco
+    for inicio in range(0, quantidade_pessoas, tamanho_bloco):  # Loop que percorre as pessoas em blocos de linhas
+        fim = min(inicio + tamanho_bloco, quantidade_pessoas)  # Última linha (exclusiva) do bloco
+        bloco = matriz_incidencia[inicio:fim] @ transposta  # Produto esparso: memória limitada a tamanho_bloco × pessoas
+        linhas, colunas, valores = podar_bloco(bloco, inicio, top_k=top_k, limiar=limiar)  # Remove diagonal e aplica limiar/top-k
+        partes_linhas.append(linhas)  # Guarda as linhas das arestas mantidas
+        partes_colunas.append(colunas)  # Guarda as colunas das arestas mantidas
+        partes_valores.append(valores)  # Guarda os pesos das arestas mantidas
+
+    return juntar_blocos_similaridade(  # Matriz pessoas × pessoas com as arestas de todos os blocos
+        partes_linhas, partes_colunas, partes_valores, quantidade_pessoas, matriz_incidencia.dtype, top_k=top_k
+    )
+
+
+# Junta as arestas podadas dos blocos (listas de vetores alinhados) na matriz de similaridade CSR
+# Também usada pela versão em processos (grafos.similaridade_paralela), que recebe as arestas de cada fragmento
+def juntar_blocos_similaridade(partes_linhas, partes_colunas, partes_valores, quantidade_pessoas, tipo_valores, top_k=None):
+    matriz_similaridade = sp.csr_matrix(  # Junta as arestas de todos os blocos em uma matriz esparsa
+        (
+            np.concatenate(partes_valores) if partes_valores else np.zeros(0, dtype=tipo_valores),  # Pesos
+            (
+                np.concatenate(partes_linhas) if partes_linhas else np.zeros(0, dtype=np.int64),  # Linhas
+                np.concatenate(partes_colunas) if partes_colunas else np.zeros(0, dtype=np.int64),  # Colunas
+            ),
+        ),
+        shape=(quantidade_pessoas, quantidade_pessoas),  # Dimensão pessoas × pessoas
+    )
+
+    if top_k is not None:  # A poda por top-k não é simétrica (A pode estar no top-k de B e não o contrário)
+        matriz_similaridade = matriz_similaridade.maximum(matriz_similaridade.T).tocsr()  # Mantém a aresta se ela estiver no top-k de qualquer uma das pontas
+
+    matriz_similaridade.sort_indices()  # Ordena colunas de cada linha (mantém a ordem das arestas igual à da matriz densa)
+    return matriz_similaridade  # Retorna matriz CSR simétrica, pronta para o grafo de similaridade
+
+
+NORMALIZACOES = ("jaccard", "cosseno", "pmi", "npmi", "lift", "forca_associacao")  # Normalizações aceitas pela coocorrência
+
+
+# Normaliza as células c_ij (i != j) da coocorrência usando a diagonal c_ii (ocorrências de cada gênero)
+# e o total de pessoas; todas as fórmulas são vetorizadas sobre os não nulos
+def _normalizar_celulas(coocorrencias, ocorrencias_i, ocorrencias_j, total, normalizacao):
+    if normalizacao == "jaccard":  # Interseção / união
+        return coocorrencias / (ocorrencias_i + ocorrencias_j - coocorrencias)
+    if normalizacao == "cosseno":  # Cosseno (Salton) entre as colunas da incidência
+        return coocorrencias / np.sqrt(ocorrencias_i * ocorrencias_j)
+    if normalizacao == "lift":  # Observado / esperado se os gêneros fossem independentes
+        return coocorrencias * total / (ocorrencias_i * ocorrencias_j)
+    if normalizacao == "pmi":  # Informação mútua pontual (log do lift)
+        return np.log(coocorrencias * total / (ocorrencias_i * ocorrencias_j))
+    if normalizacao == "npmi":  # PMI normalizada para [-1, 1] pela autoinformação do par
+        conjunta = coocorrencias / total  # Probabilidade conjunta
+        npmi = np.log(conjunta / ((ocorrencias_i / total) * (ocorrencias_j / total))) / -np.log(conjunta)
+        return np.where(conjunta >= 1, 1.0, npmi)  # Par presente em todas as pessoas: associação máxima
+    if normalizacao == "forca_associacao":  # Força de associação (van Eck e Waltman): c_ij / (c_ii c_jj)
+        return coocorrencias / (ocorrencias_i * ocorrencias_j)
+    raise ValueError(f"Normalização inválida: {normalizacao!r} (use {', '.join(NORMALIZACOES)} ou None).")
+
+
+# Probabilidade de duas colunas com ocorrencias_i e ocorrencias_j pessoas coocorrerem pelo menos
+# coocorrencias vezes por acaso (teste hipergeométrico unilateral, sorteando sem reposição entre total pessoas)
+def _valor_p_hipergeometrico(coocorrencias, ocorrencias_i, ocorrencias_j, total):
+    from scipy.stats import hypergeom  # Importa a distribuição apenas quando o filtro é usado
+    return hypergeom.sf(coocorrencias - 1, total, ocorrencias_i, ocorrencias_j)  # P(X >= c_ij)
+
+
+# Matriz de coocorrência (M^T @ M) sem diagonal, opcionalmente normalizada e filtrada
+# normalizacao: None (contagens), "jaccard", "cosseno", "pmi", "npmi", "lift" ou "forca_associacao"
+# limiar: valor mínimo (já normalizado) da aresta; minimo_coocorrencias: contagem mínima do par;
+# significancia: mantém só os pares com valor-p hipergeométrico abaixo dela (ex.: 0.01; conta pessoas, não pesos)
+# PMI e NPMI negativas (pares que coocorrem menos que o esperado) são descartadas: o grafo só tem associações positivas
+def matriz_coocorrencia(matriz_incidencia, normalizacao=None, limiar=None, minimo_coocorrencias=None, significancia=None):
+    matriz_incidencia = sp.csr_matrix(matriz_incidencia)  # Garante formato CSR
+    if normalizacao is None and limiar is None and minimo_coocorrencias is None and significancia is None:  # Contagens brutas
+        return projecao_sem_diagonal(matriz_incidencia.T, matriz_incidencia)
+
+    completa = (matriz_incidencia.T @ matriz_incidencia).tocoo()  # Coocorrências com a diagonal (ocorrências de cada gênero)
+    ocorrencias = completa.diagonal().astype(float)  # c_ii
+    fora_diagonal = completa.row != completa.col  # Só os pares de gêneros diferentes
+    linhas, colunas = completa.row[fora_diagonal], completa.col[fora_diagonal]  # Pares
+    contagens = completa.data[fora_diagonal].astype(float)  # c_ij
+    total = matriz_incidencia.shape[0]  # Pessoas
+    manter = contagens > 0  # Células estruturais nulas
+
+    if minimo_coocorrencias is not None:  # Suporte mínimo do par
+        manter &= contagens >= minimo_coocorrencias
+    if significancia is not None:  # Teste sobre as pessoas que têm cada gênero (independente dos pesos)
+        binaria = matriz_incidencia.copy()  # Incidência 0/1
+        binaria.data = np.ones_like(binaria.data)
+        pessoas_por_genero = np.bincount(binaria.indices, minlength=matriz_incidencia.shape[1])  # Pessoas com cada gênero
+        pares = (binaria.T @ binaria).tocsr()  # Pessoas com os dois gêneros
+        pessoas_pares = np.asarray(pares[linhas, colunas]).ravel()  # Mesma ordem dos pares
+        valores_p = _valor_p_hipergeometrico(pessoas_pares, pessoas_por_genero[linhas], pessoas_por_genero[colunas], total)
+        manter &= valores_p < significancia
+
+    if normalizacao is not None:  # Valores normalizados
+        with np.errstate(divide="ignore", invalid="ignore"):  # Pares descartados logo abaixo
+            valores = _normalizar_celulas(contagens, ocorrencias[linhas], ocorrencias[colunas], total, normalizacao)
+        manter &= np.isfinite(valores) & (valores > 0)  # Só associações positivas
+    else:  # Contagens filtradas
+        valores = contagens
+    if limiar is not None:  # Peso mínimo da aresta
+        manter &= valores >= limiar
+
+    resultado = sp.csr_matrix((valores[manter], (linhas[manter], colunas[manter])), shape=completa.shape)  # Simétrica (pares nos dois sentidos)
+    resultado.sort_indices()  # Mesma ordem de arestas das outras projeções
+    return resultado
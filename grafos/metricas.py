@@ -0,0 +1,84 @@
+import numpy as np  # Importa NumPy para os vetores de resultados
+
+from .autovetor import centralidade_autovetor  # Importa centralidade de autovetor esparsa
+from .agendador import derivado, executar_tarefas, processos_padrao  # Importa o agendador de tarefas em processos
+from .construcao import grafo_de_matriz  # Importa construtor vetorizado de grafos
+from .diametro import descrever_diametro, diametro_por_componente  # Importa diâmetro por componente conexa
+from .intermediacao import finalizar_intermediacao, sortear_fontes, tarefas_intermediacao  # Importa as partes da intermediação
+from .aglomeracao import aglomeracao, finalizar_aglomeracao, sortear_nos, tarefas_aglomeracao  # Importa as partes da aglomeração
+from .estatisticas import densidade  # Importa densidade calculada na adjacência CSR
+
+# Métricas topológicas dos grafos de coocorrência e similaridade, executadas em paralelo pelo agendador
+
+
+# Grafo NetworkX reconstruído a partir da adjacência CSR (uma vez por processo)
+def _grafo_da_adjacencia(adjacencia):
+    return grafo_de_matriz(adjacencia.matriz(), adjacencia.nomes, tipo=None)  # Mesmos nós e arestas, na mesma ordem
+
+
+# Grafo NetworkX da adjacência, reaproveitado entre as tarefas do mesmo processo
+def grafo_networkx(adjacencia):
+    return derivado(adjacencia, "grafo", _grafo_da_adjacencia)  # Construído na primeira chamada
+
+
+# Centralidade de autovetor ponderada sobre a adjacência esparsa, como vetor na ordem dos nós
+def autovetor(adjacencia, tolerancia=1e-6, vetor_inicial=None, metodo="potencia"):
+    vetor, _ = centralidade_autovetor(  # Iteração de potência (ou ARPACK) com produto matriz-vetor esparso
+        adjacencia.matriz(),  # Adjacência ponderada
+        tolerancia=tolerancia,  # Critério de parada
+        max_iter=1000,  # Mesmo limite usado antes com o NetworkX
+        vetor_inicial=vetor_inicial,  # Resultado anterior (partida a quente) ou None
+        metodo=metodo,  # "potencia" ou "arpack"
+        nomes=adjacencia.nomes,  # Alinha um vetor inicial dado por nome
+    )
+    return vetor  # Vetor na ordem dos nós da adjacência
+
+
+# Coeficiente de aglomeração médio ponderado (mesmo valor de nx.average_clustering com weight="weight")
+def aglomeracao_media(adjacencia):
+    return aglomeracao(adjacencia, processos=1)["media"]  # Produtos esparsos em blocos de nós, no próprio processo
+
+
+# Diâmetro de cada componente conexa (varredura dupla + iFUB), lista de (quantidade de nós, diâmetro)
+def diametro(adjacencia):
+    return diametro_por_componente(adjacencia.matriz())  # Poucas BFS por componente em vez de todas as excentricidades
+
+
+# Calcula as métricas caras ao mesmo tempo: as partes da intermediação e da aglomeração, o autovetor e o diâmetro
+# são tarefas independentes no mesmo pool, então o tempo total fica próximo ao da métrica mais lenta
+def calcular_metricas_topologicas(adjacencia, amostra_intermediacao=None, semente=42, processos=None,
+                                  tolerancia_autovetor=1e-6, autovetor_inicial=None, metodo_autovetor="potencia",
+                                  amostra_aglomeracao=None):
+    quantidade_nos = adjacencia.quantidade_nos()  # Número de nós
+    processos = processos_padrao(quantidade_nos, processos)  # Processos disponíveis
+
+    fontes, fontes_sorteadas = sortear_fontes(quantidade_nos, amostra_intermediacao, semente)  # Fontes da intermediação
+    nos_aglomeracao, aglomeracao_amostrada = sortear_nos(quantidade_nos, amostra_aglomeracao, semente)  # Nós da aglomeração
+    tarefas = [  # Tarefas mais caras primeiro
+        ("diametro", diametro, {}),  # Diâmetro
+        ("autovetor", autovetor, {  # Centralidade de autovetor
+            "tolerancia": tolerancia_autovetor,  # Critério de parada
+            "vetor_inicial": autovetor_inicial,  # Partida a quente com o resultado anterior
+            "metodo": metodo_autovetor,  # "potencia" ou "arpack"
+        }),
+    ]
+    tarefas += tarefas_aglomeracao(nos_aglomeracao, processos, processos=processos)  # Aglomeração em blocos de nós (triângulos por produtos esparsos)
+    tarefas += tarefas_intermediacao(fontes, processos * 2)  # Intermediação dividida em partes para ocupar os processos livres
+    resultados, processos = executar_tarefas(adjacencia, tarefas, processos)  # Executa tudo no pool
+
+    valores_intermediacao, parametros_intermediacao = finalizar_intermediacao(  # Junta as partes da intermediação
+        resultados.get("intermediacao", []), quantidade_nos, fontes, fontes_sorteadas, semente, processos
+    )
+    aglomeracao_nos = finalizar_aglomeracao(resultados.get("aglomeracao", []), adjacencia, aglomeracao_amostrada, semente, processos)  # Junta as partes da aglomeração
+    return {  # Resultados no formato usado pelos relatórios
+        "intermediacao": valores_intermediacao,  # Vetor na ordem dos nós
+        "parametros_intermediacao": parametros_intermediacao,  # Parâmetros da intermediação
+        "autovetor": resultados["autovetor"][0],  # Vetor na ordem dos nós
+        "aglomeracao": aglomeracao_nos["media"],  # Número (média exata ou estimada pela amostra)
+        "aglomeracao_nos": aglomeracao_nos["valores"],  # Vetor na ordem dos nós (NaN fora da amostra)
+        "triangulos": aglomeracao_nos["triangulos"],  # Vetor na ordem dos nós (NaN fora da amostra)
+        "parametros_aglomeracao": aglomeracao_nos["parametros"],  # Parâmetros da aglomeração
+        "diametro": descrever_diametro(resultados["diametro"][0]),  # Diâmetro (grafo conexo) ou resumo por componente
+        "diametro_componentes": resultados["diametro"][0],  # Lista de (quantidade de nós, diâmetro) por componente
+        "densidade": densidade(adjacencia),  # Número (barato, calculado no processo principal)
+    }
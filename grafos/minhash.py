@@ -0,0 +1,229 @@
+import numpy as np  # Importa NumPy para operações vetorizadas
+import scipy.sparse as sp  # Importa SciPy para matrizes esparsas
+
+from .matrizes import similaridade_em_blocos  # Importa a similaridade exata (para avaliar a aproximação)
+from .similaridade_paralela import similaridade_paralela  # Importa a similaridade exata em fragmentos (pool de processos)
+
+# Similaridade aproximada entre pessoas por MinHash + LSH: em vez de M @ M^T (quadrático no número de pessoas),
+# cada pessoa recebe uma assinatura MinHash do seu conjunto de gêneros, as assinaturas são divididas em bandas
+# e só os pares que caem no mesmo balde em alguma banda são pontuados (com o valor exato da similaridade)
+# Mais bandas (menos linhas por banda) = mais pares candidatos, maior revocação e mais tempo
+
+TETO_HASH = (1 << 32) - 1  # Valores dos hashes em [0, TETO_HASH); TETO_HASH marca pessoas sem gêneros
+ELEMENTOS_POR_LOTE = 1 << 24  # Hashes × gêneros marcados processados por vez (limita a memória das assinaturas)
+TOP_K_PADRAO = 10  # Vizinhos por pessoa no método aproximado quando top_k não é informado
+METODOS_SIMILARIDADE = ("exato", "minhash")  # Métodos de projecao_similaridade
+JANELA_PADRAO = 20  # Vizinhos pareados dentro de cada balde (baldes enormes de gêneros populares não viram pares quadráticos)
+
+
+# Limiar aproximado de Jaccard a partir do qual um par tende a virar candidato: (1 / bandas) ^ (1 / linhas por banda)
+def limiar_lsh(bandas, linhas_por_banda):
+    return (1.0 / bandas) ** (1.0 / linhas_por_banda)
+
+
+# Valores aleatórios de cada (hash, gênero): os gêneros são poucos, então um valor sorteado por gênero é uma
+# permutação de verdade e não tem o viés dos hashes lineares (a·x + b) sobre ids consecutivos
+def _hashes_generos(quantidade_hashes, quantidade_generos, semente):
+    gerador = np.random.default_rng(semente)  # Sorteio reprodutível dos hashes
+    return gerador.integers(0, TETO_HASH, size=(quantidade_hashes, quantidade_generos), dtype=np.uint32)  # hashes × gêneros
+
+
+# Mínimo de cada linha de hashes_generos sobre os gêneros de cada pessoa (hashes × pessoas, uint32)
+def _assinaturas(matriz_incidencia, hashes_generos):
+    quantidade_hashes = hashes_generos.shape[0]  # Hashes calculados
+    quantidade_pessoas = matriz_incidencia.shape[0]  # Número de pessoas
+    assinaturas = np.full((quantidade_hashes, quantidade_pessoas), TETO_HASH, dtype=np.uint32)  # Pessoas vazias ficam com TETO_HASH
+    indptr, indices = matriz_incidencia.indptr, matriz_incidencia.indices  # Gêneros de cada pessoa
+    limite = max(1, ELEMENTOS_POR_LOTE // max(1, quantidade_hashes))  # Gêneros marcados por lote
+    inicio = 0  # Primeira pessoa do lote
+    while inicio < quantidade_pessoas:  # Loop que percorre as pessoas em lotes de memória limitada
+        fim = int(np.searchsorted(indptr, indptr[inicio] + limite, side="right")) - 1  # Última pessoa que cabe no lote
+        fim = min(max(fim, inicio + 1), quantidade_pessoas)  # Pelo menos uma pessoa por lote
+        tamanhos = np.diff(indptr[inicio:fim + 1])  # Gêneros de cada pessoa do lote
+        ocupadas = np.flatnonzero(tamanhos)  # Pessoas com pelo menos um gênero (o reduceat não aceita grupos vazios)
+        if len(ocupadas):  # Há gêneros no lote
+            valores = hashes_generos[:, indices[indptr[inicio]:indptr[fim]]]  # Hash de cada gênero marcado (hashes × marcados)
+            inicios_grupos = (indptr[inicio:fim] - indptr[inicio])[ocupadas]  # Onde começa cada pessoa não vazia
+            assinaturas[:, inicio + ocupadas] = np.minimum.reduceat(valores, inicios_grupos, axis=1)  # Mínimo por pessoa
+        inicio = fim  # Próximo lote
+    return assinaturas
+
+
+# Assinaturas MinHash (hashes × pessoas, uint32): mínimo de cada hash sobre os gêneros de cada pessoa
+# Pessoas sem gêneros ficam com TETO_HASH em todos os hashes (nunca viram candidatas)
+def assinaturas_minhash(matriz_incidencia, quantidade_hashes=128, semente=42):
+    matriz_incidencia = sp.csr_matrix(matriz_incidencia)  # Garante formato CSR (gêneros de cada pessoa contíguos)
+    return _assinaturas(matriz_incidencia, _hashes_generos(quantidade_hashes, matriz_incidencia.shape[1], semente))
+
+
+# Confere a divisão dos hashes em bandas e devolve as linhas por banda
+def _linhas_por_banda(quantidade_hashes, bandas):
+    if bandas < 1 or quantidade_hashes % bandas:  # Bandas precisam dividir os hashes
+        raise ValueError(f"A quantidade de hashes ({quantidade_hashes}) precisa ser múltipla da quantidade de bandas ({bandas}).")
+    return quantidade_hashes // bandas
+
+
+# Pares (i * pessoas + j, com i < j) que caem no mesmo balde de uma banda (trecho: linhas_por_banda × pessoas)
+# Dentro de cada balde as pessoas são embaralhadas e cada uma é pareada com as janela seguintes:
+# baldes pequenos geram todos os pares; baldes enormes geram janela × tamanho pares em vez de tamanho²
+def _pares_banda(trecho, multiplicadores, janela, gerador):
+    quantidade_pessoas = trecho.shape[1]  # Número de pessoas
+    validas = np.flatnonzero(trecho[0] != TETO_HASH)  # Pessoas com gêneros
+    chaves = (trecho[:, validas].astype(np.uint64) * multiplicadores).sum(axis=0, dtype=np.uint64)  # Chave do balde (módulo 2^64)
+    ordem = np.lexsort((gerador.random(len(validas)), chaves))  # Agrupa por balde, em ordem aleatória dentro dele
+    chaves_ordenadas, pessoas_ordenadas = chaves[ordem], validas[ordem].astype(np.int64)
+    partes = []  # Pares codificados de cada deslocamento
+    for deslocamento in range(1, janela + 1):  # Pareia cada pessoa com as seguintes do mesmo balde
+        mesmo_balde = np.flatnonzero(chaves_ordenadas[deslocamento:] == chaves_ordenadas[:-deslocamento])  # Pares no mesmo balde
+        if len(mesmo_balde) == 0:  # Nenhum balde com mais de deslocamento pessoas
+            break
+        i, j = pessoas_ordenadas[mesmo_balde], pessoas_ordenadas[mesmo_balde + deslocamento]
+        partes.append(np.minimum(i, j) * quantidade_pessoas + np.maximum(i, j))  # Par codificado com i < j
+    return np.unique(np.concatenate(partes)) if partes else np.zeros(0, dtype=np.int64)
+
+
+# Pares candidatos (i < j) que coincidem em pelo menos uma banda das assinaturas, sem repetição
+def pares_candidatos(assinaturas, bandas, janela=JANELA_PADRAO, semente=42):
+    quantidade_hashes, quantidade_pessoas = assinaturas.shape  # Dimensões
+    linhas_por_banda = _linhas_por_banda(quantidade_hashes, bandas)  # Hashes de cada banda
+    gerador = np.random.default_rng(semente)  # Embaralhamento reprodutível dentro dos baldes
+    multiplicadores = gerador.integers(1, 1 << 62, size=(linhas_por_banda, 1), dtype=np.int64).astype(np.uint64) | np.uint64(1)  # Combina os hashes da banda
+    pares = np.zeros(0, dtype=np.int64)  # Pares acumulados (sem repetição a cada banda)
+    for banda in range(bandas):  # Loop que percorre as bandas
+        trecho = assinaturas[banda * linhas_por_banda:(banda + 1) * linhas_por_banda]  # Hashes da banda
+        pares = np.union1d(pares, _pares_banda(trecho, multiplicadores, janela, gerador))
+    return pares // quantidade_pessoas, pares % quantidade_pessoas
+
+
+# Valor exato da similaridade de cada par candidato: gêneros compartilhados (o mesmo de M @ M^T) ou Jaccard
+# Pontua em lotes para não montar de uma vez as duas matrizes de linhas selecionadas
+def _pontuar_pares(matriz_incidencia, linhas, colunas, peso="compartilhados"):
+    if peso not in ("compartilhados", "jaccard"):
+        raise ValueError(f"Peso inválido: {peso!r} (use 'compartilhados' ou 'jaccard').")
+    if peso == "jaccard":  # Interseção / união dos conjuntos de gêneros
+        tamanhos = np.diff(matriz_incidencia.indptr)  # Gêneros de cada pessoa
+        matriz_incidencia = matriz_incidencia.copy()
+        matriz_incidencia.data = np.ones_like(matriz_incidencia.data)  # Conta gêneros, não pesos
+    media = max(1, matriz_incidencia.nnz // max(1, matriz_incidencia.shape[0]))  # Gêneros por pessoa em média
+    passo = max(1, ELEMENTOS_POR_LOTE // media)  # Pares pontuados por lote
+    compartilhados = np.concatenate([np.asarray(
+        matriz_incidencia[linhas[inicio:inicio + passo]].multiply(matriz_incidencia[colunas[inicio:inicio + passo]]).sum(axis=1)
+    ).ravel() for inicio in range(0, len(linhas), passo)]) if len(linhas) else np.zeros(0)  # Produto escalar das linhas
+    if peso == "compartilhados":  # Mesmo peso da similaridade exata
+        return compartilhados
+    return compartilhados / (tamanhos[linhas] + tamanhos[colunas] - compartilhados)
+
+
+# Máscara (na ordem de entrada) das entradas que estão entre as top_k de maior peso da sua linha
+# (desempate pelo índice da coluna, como no corte da similaridade exata)
+def _mascara_top_k(linhas, colunas, valores, top_k):
+    # Por linha, peso decrescente e coluna crescente: três ordenações estáveis saem mais rápidas que um lexsort
+    ordem = np.argsort(linhas * (int(colunas.max()) + 1) + colunas)  # (linha, coluna) é único
+    ordem = ordem[np.argsort(-valores[ordem], kind="stable")]
+    ordem = ordem[np.argsort(linhas[ordem], kind="stable")]
+    linhas_ordenadas = linhas[ordem]
+    inicio_linha = np.r_[0, np.flatnonzero(np.diff(linhas_ordenadas)) + 1]  # Onde começa cada linha
+    posicao = np.arange(len(linhas)) - np.repeat(inicio_linha, np.diff(np.r_[inicio_linha, len(linhas)]))  # Ranking dentro da linha
+    mascara = np.zeros(len(linhas), dtype=bool)
+    mascara[ordem] = posicao < top_k
+    return mascara
+
+
+# Grafo k-NN aproximado de similaridade (pessoas × pessoas, CSR simétrica, sem diagonal), no mesmo formato de
+# similaridade_em_blocos: pronto para grafo_de_matriz / adjacencia_de_matriz
+# quantidade_hashes e bandas controlam revocação × custo (ver limiar_lsh); janela limita os pares por balde;
+# top_k=None mantém todos os candidatos pontuados; limiar descarta pesos abaixo dele
+# As bandas são processadas uma a uma (assinaturas, candidatos e pontuação) e, com top_k, os pares fora do
+# top-k das duas pontas são descartados a cada banda: a memória fica em torno de pessoas × top_k pares
+def similaridade_minhash(matriz_incidencia, top_k=10, quantidade_hashes=128, bandas=64, janela=JANELA_PADRAO,
+                         limiar=None, peso="compartilhados", semente=42):
+    matriz_incidencia = sp.csr_matrix(matriz_incidencia)  # Garante formato CSR
+    quantidade_pessoas, quantidade_generos = matriz_incidencia.shape  # Dimensões
+    linhas_por_banda = _linhas_por_banda(quantidade_hashes, bandas)  # Hashes de cada banda
+    hashes_generos = _hashes_generos(quantidade_hashes, quantidade_generos, semente)  # hashes × gêneros (pequeno)
+    gerador = np.random.default_rng(semente)  # Mesma sequência de pares_candidatos
+    multiplicadores = gerador.integers(1, 1 << 62, size=(linhas_por_banda, 1), dtype=np.int64).astype(np.uint64) | np.uint64(1)
+
+    pares = np.zeros(0, dtype=np.int64)  # Pares mantidos (i * pessoas + j, i < j), ordenados
+    valores = np.zeros(0)  # Peso de cada par mantido
+    tamanho_corte = quantidade_pessoas * (top_k or 0)  # Referência do último corte de top-k
+    for banda in range(bandas):  # Loop que percorre as bandas
+        trecho = _assinaturas(matriz_incidencia, hashes_generos[banda * linhas_por_banda:(banda + 1) * linhas_por_banda])
+        novos = _pares_banda(trecho, multiplicadores, janela, gerador)  # Candidatos da banda
+        novos = novos[~np.isin(novos, pares, assume_unique=True)]  # Só os que ainda não foram pontuados
+        valores_novos = _pontuar_pares(matriz_incidencia, novos // quantidade_pessoas, novos % quantidade_pessoas, peso)
+        manter = valores_novos > 0  # Pares sem gênero em comum (colisões de balde)
+        if limiar is not None:  # Peso mínimo da aresta
+            manter &= valores_novos >= limiar
+        pares, valores = np.r_[pares, novos[manter]], np.r_[valores, valores_novos[manter]]
+        # Descarta os pares fora do top-k das duas pontas quando a lista passa do dobro da referência do último corte
+        # (um par descartado nunca volta ao top-k, então cortar mais ou menos vezes não muda o resultado)
+        if top_k is not None and len(pares) > 2 * tamanho_corte:
+            linhas, colunas = pares // quantidade_pessoas, pares % quantidade_pessoas
+            quantidade = len(pares)
+            mascara = _mascara_top_k(np.r_[linhas, colunas], np.r_[colunas, linhas], np.r_[valores, valores], top_k)
+            manter = mascara[:quantidade] | mascara[quantidade:]  # Regra da simetrização com maximum
+            pares, valores = pares[manter], valores[manter]
+            tamanho_corte = max(len(pares), quantidade_pessoas * top_k)
+        ordem = np.argsort(pares)  # Mantém os pares ordenados para o isin da próxima banda
+        pares, valores = pares[ordem], valores[ordem]
+
+    linhas, colunas = pares // quantidade_pessoas, pares % quantidade_pessoas
+    linhas, colunas, valores = np.r_[linhas, colunas], np.r_[colunas, linhas], np.r_[valores, valores]  # Os dois sentidos
+    if top_k is not None and len(valores):  # k vizinhos mais similares de cada pessoa
+        manter = _mascara_top_k(linhas, colunas, valores, top_k)
+        linhas, colunas, valores = linhas[manter], colunas[manter], valores[manter]
+
+    similaridade = sp.csr_matrix((valores, (linhas, colunas)), shape=(quantidade_pessoas, quantidade_pessoas))
+    if top_k is not None:  # Mantém a aresta se ela estiver no top-k de qualquer uma das pontas (mesma regra da exata)
+        similaridade = similaridade.maximum(similaridade.T).tocsr()
+    similaridade.sort_indices()  # Ordem das arestas igual à das outras projeções
+    return similaridade
+
+
+# Matriz de similaridade entre pessoas pelo método pedido: "exato" (M @ M^T em blocos, em um pool de processos
+# quando há mais de um: ver similaridade_paralela) ou "minhash" (k-NN aproximado)
+# No método aproximado, top_k=None usa TOP_K_PADRAO (sem corte, todos os candidatos pontuados virariam arestas)
+def projecao_similaridade(matriz_incidencia, metodo="exato", top_k=None, limiar=None, tamanho_bloco=2048,
+                          quantidade_hashes=128, bandas=64, semente=42, processos=None):
+    if metodo == "exato":  # Produto esparso completo
+        return similaridade_paralela(matriz_incidencia, tamanho_bloco=tamanho_bloco, top_k=top_k, limiar=limiar, processos=processos)
+    if metodo == "minhash":  # Só os pares candidatos do LSH
+        return similaridade_minhash(matriz_incidencia, top_k=TOP_K_PADRAO if top_k is None else top_k,
+                                    quantidade_hashes=quantidade_hashes, bandas=bandas, limiar=limiar, semente=semente)
+    raise ValueError(f"Método de similaridade inválido: {metodo!r} (use {', '.join(METODOS_SIMILARIDADE)}).")
+
+
+# Compara a aproximação com a similaridade exata (use em dados pequenos): revocação e precisão das arestas
+# As versões "com empates" consideram certo qualquer vizinho com peso igual ou acima do k-ésimo maior peso exato
+# da pessoa (com empates no k-ésimo lugar, a escolha exata dos vizinhos é arbitrária)
+def avaliar_minhash(matriz_incidencia, aproximada, top_k=10):
+    exata = similaridade_em_blocos(matriz_incidencia, top_k=top_k)  # Referência (mesma regra de top-k)
+    aproximada = sp.csr_matrix(aproximada)
+    arestas_exatas = set(zip(*sp.triu(exata, k=1).nonzero()))  # Pares i < j
+    arestas_aproximadas = set(zip(*sp.triu(aproximada, k=1).nonzero()))
+    comuns = len(arestas_exatas & arestas_aproximadas)  # Arestas encontradas pelas duas
+    resultado = {
+        "arestas_exatas": len(arestas_exatas),
+        "arestas_aproximadas": len(arestas_aproximadas),
+        "revocacao": comuns / len(arestas_exatas) if arestas_exatas else 1.0,  # Fração das arestas exatas encontradas
+        "precisao": comuns / len(arestas_aproximadas) if arestas_aproximadas else 1.0,  # Fração das aproximadas que estão na exata
+    }
+    if top_k is None:  # Sem corte: não há empates a considerar
+        return resultado
+
+    completa = similaridade_em_blocos(matriz_incidencia)  # Todos os vizinhos com peso
+    quantidade_pessoas = completa.shape[0]
+    corte = np.full(quantidade_pessoas, np.inf)  # k-ésimo maior peso exato de cada pessoa (infinito: pessoa isolada)
+    esperados = np.minimum(np.diff(completa.indptr), top_k)  # Vizinhos que o top-k exato teria
+    for pessoa in np.flatnonzero(esperados):  # Dados pequenos: loop simples por pessoa
+        pesos_exatos = completa.data[completa.indptr[pessoa]:completa.indptr[pessoa + 1]]
+        corte[pessoa] = np.sort(pesos_exatos)[-esperados[pessoa]]
+
+    aproximada_coo = aproximada.tocoo()  # Vizinhos achados (nos dois sentidos)
+    no_top_k = aproximada_coo.data >= corte[aproximada_coo.row]  # Vizinho estaria no top-k exato da pessoa da linha
+    no_top_k_de_algum = no_top_k | (aproximada_coo.data >= corte[aproximada_coo.col])  # Ou no da outra ponta (regra da simetrização)
+    encontrados = np.minimum(np.bincount(aproximada_coo.row[no_top_k], minlength=quantidade_pessoas), esperados)  # Acertos por pessoa
+    resultado["revocacao_com_empates"] = float(encontrados.sum() / esperados.sum()) if esperados.sum() else 1.0
+    resultado["precisao_com_empates"] = float(no_top_k_de_algum.mean()) if len(no_top_k_de_algum) else 1.0
+    return resultado
@@ -0,0 +1,131 @@
+import numpy as np  # Importa NumPy para operações vetorizadas
+import scipy.sparse as sp  # Importa SciPy para matrizes esparsas
+from scipy.sparse import csgraph  # Importa reordenação de Cuthill-McKee
+
+# Mapa de calor escalável para matrizes esparsas: anota as células só em matrizes pequenas,
+# agrega matrizes grandes em blocos (máximo ou média) antes do imshow e reordena linhas/colunas
+# para que a estrutura continue visível
+
+LIMITE_CELULAS_ANOTADAS = 2500  # Acima disso (ex.: 50 × 50) os valores não são escritos nas células
+LIMITE_ROTULOS = 60  # Acima disso por eixo os nomes não cabem e o eixo mostra os índices
+MAXIMO_BLOCOS = 1000  # Máximo de blocos (pixels da imagem) por eixo
+LIMITE_RASTERIZACAO = 10000  # Acima disso de células o mapa é rasterizado em saídas vetoriais (SVG/PDF)
+
+
+# Ordem das linhas e colunas pelo grau (quantidade de células não nulas), do maior para o menor
+def ordem_por_grau(matriz):
+    matriz = sp.csr_matrix(matriz)  # Garante formato CSR
+    graus_linhas = np.diff(matriz.indptr)  # Não nulos por linha
+    graus_colunas = np.bincount(matriz.indices, minlength=matriz.shape[1])  # Não nulos por coluna
+    return np.argsort(-graus_linhas, kind="stable"), np.argsort(-graus_colunas, kind="stable")  # Desempate pela ordem original
+
+
+# Ordem das linhas e colunas por Cuthill-McKee reverso (aproxima os nós ligados, formando blocos perto da diagonal)
+# Matrizes retangulares são tratadas como o grafo bipartido [[0, M], [M^T, 0]]
+def ordem_cuthill_mckee(matriz):
+    matriz = sp.csr_matrix(matriz)  # Garante formato CSR
+    quantidade_linhas, quantidade_colunas = matriz.shape  # Dimensões
+    if quantidade_linhas == quantidade_colunas:  # Matriz quadrada (adjacência)
+        ordem = csgraph.reverse_cuthill_mckee(matriz, symmetric_mode=True)  # Mesma ordem nos dois eixos
+        return ordem, ordem
+    bipartida = sp.bmat([[None, matriz], [matriz.T, None]], format="csr")  # Linhas e colunas como nós de um único grafo
+    ordem = csgraph.reverse_cuthill_mckee(bipartida, symmetric_mode=True)  # Ordem conjunta
+    return ordem[ordem < quantidade_linhas], ordem[ordem >= quantidade_linhas] - quantidade_linhas  # Separa linhas e colunas
+
+
+# Agrega a matriz em no máximo maximo_blocos × maximo_blocos blocos (máximo ou média de cada bloco)
+# Só os não nulos são percorridos: memória proporcional ao número de blocos, não ao de células
+def agregar_em_blocos(matriz, maximo_blocos=MAXIMO_BLOCOS, agregacao="max"):
+    matriz = sp.coo_matrix(matriz)  # Formato coordenado (linha, coluna, valor)
+    quantidade_linhas, quantidade_colunas = matriz.shape  # Dimensões
+    fator_linhas = max(1, -(-quantidade_linhas // maximo_blocos))  # Linhas por bloco (divisão arredondada para cima)
+    fator_colunas = max(1, -(-quantidade_colunas // maximo_blocos))  # Colunas por bloco
+    blocos_linhas = -(-quantidade_linhas // fator_linhas)  # Quantidade de blocos no eixo das linhas
+    blocos_colunas = -(-quantidade_colunas // fator_colunas)  # Quantidade de blocos no eixo das colunas
+
+    chaves = (matriz.row // fator_linhas).astype(np.int64) * blocos_colunas + matriz.col // fator_colunas  # Bloco de cada não nulo
+    if agregacao == "max":  # Maior valor do bloco (destaca células isoladas)
+        blocos = np.zeros(blocos_linhas * blocos_colunas)  # Blocos sem não nulos ficam em zero
+        np.maximum.at(blocos, chaves, matriz.data.astype(float))  # Máximo por bloco
+    elif agregacao == "media":  # Média do bloco, contando as células zeradas
+        somas = np.bincount(chaves, weights=matriz.data, minlength=blocos_linhas * blocos_colunas)  # Soma por bloco
+        celulas_linhas = np.bincount(np.arange(quantidade_linhas) // fator_linhas, minlength=blocos_linhas)  # Linhas em cada bloco (o último pode ser menor)
+        celulas_colunas = np.bincount(np.arange(quantidade_colunas) // fator_colunas, minlength=blocos_colunas)  # Colunas em cada bloco
+        blocos = somas / np.outer(celulas_linhas, celulas_colunas).ravel()  # Média por bloco
+    else:  # Agregação desconhecida
+        raise ValueError(f"Agregação inválida: {agregacao!r} (use 'max' ou 'media').")
+    return blocos.reshape(blocos_linhas, blocos_colunas), fator_linhas, fator_colunas  # Imagem reduzida e tamanho dos blocos
+
+
+# Desenha a matriz esparsa como mapa de calor no eixo e devolve o objeto do mapa (para a barra de cores)
+# ordenacao: None (ordem original), "grau", "cuthill_mckee" ou "auto" (original se a matriz for anotada, senão Cuthill-McKee)
+# rasterizar: None decide pelo tamanho; True/False força (afeta saídas vetoriais como SVG/PDF)
+# formato_valor: formato dos valores anotados (ex.: "{:.2f}" para matrizes normalizadas); None escreve o valor inteiro
+def desenhar_mapa_calor(ax, matriz, rotulos_linhas, rotulos_colunas, cmap, ordenacao="auto", agregacao="max",
+                        maximo_blocos=MAXIMO_BLOCOS, limite_anotacoes=LIMITE_CELULAS_ANOTADAS, rasterizar=None,
+                        rotacao_colunas=90, alinhamento_colunas="center", cor_texto="black", negrito=False, formato_valor=None):
+    matriz = sp.csr_matrix(matriz)  # Garante formato CSR
+    quantidade_linhas, quantidade_colunas = matriz.shape  # Dimensões
+    anotar = quantidade_linhas * quantidade_colunas <= limite_anotacoes  # Valores escritos nas células só em matrizes pequenas
+
+    if ordenacao == "auto":  # Escolha automática
+        ordenacao = None if anotar else "cuthill_mckee"  # Matrizes pequenas mantêm a ordem (alfabética) dos nomes
+    if ordenacao == "grau":  # Mais conectados primeiro
+        ordem_linhas, ordem_colunas = ordem_por_grau(matriz)
+    elif ordenacao == "cuthill_mckee":  # Agrupa nós ligados
+        ordem_linhas, ordem_colunas = ordem_cuthill_mckee(matriz)
+    elif ordenacao is None:  # Ordem original
+        ordem_linhas, ordem_colunas = np.arange(quantidade_linhas), np.arange(quantidade_colunas)
+    else:  # Ordenação desconhecida
+        raise ValueError(f"Ordenação inválida: {ordenacao!r} (use None, 'auto', 'grau' ou 'cuthill_mckee').")
+    if ordenacao is not None:  # Aplica a permutação
+        matriz = matriz[ordem_linhas][:, ordem_colunas]
+
+    agregada = quantidade_linhas > maximo_blocos or quantidade_colunas > maximo_blocos  # Mais células que pixels úteis
+    if rasterizar is None:  # Decide pelo tamanho
+        rasterizar = quantidade_linhas * quantidade_colunas > LIMITE_RASTERIZACAO
+
+    if agregada:  # Matriz grande: imagem reduzida em blocos, eixos nos índices originais
+        imagem, fator_linhas, fator_colunas = agregar_em_blocos(matriz, maximo_blocos, agregacao)  # Imagem com no máximo maximo_blocos por eixo
+        mapa = ax.imshow(  # Cria mapa de calor dos blocos
+            imagem,  # Valores agregados
+            cmap=cmap,  # Mapa de cores
+            aspect="auto",  # Preenche o eixo
+            interpolation="nearest",  # Sem suavização entre blocos
+            extent=(-0.5, imagem.shape[1] * fator_colunas - 0.5, imagem.shape[0] * fator_linhas - 0.5, -0.5),  # Coordenadas nas células originais
+            rasterized=rasterizar,  # Rasterização em saídas vetoriais
+        )
+        ax.text(  # Informa a agregação no canto do eixo
+            0.99, 0.01, f"blocos de {fator_linhas}×{fator_colunas} ({'máximo' if agregacao == 'max' else 'média'})",
+            transform=ax.transAxes, ha="right", va="bottom", fontsize=7, color="gray",
+        )
+    else:  # Matriz cabe na imagem: uma célula por pixel
+        matriz_densa = matriz.toarray()  # Densa apenas até maximo_blocos × maximo_blocos
+        mapa = ax.imshow(matriz_densa, cmap=cmap, aspect="auto", rasterized=rasterizar)  # Cria mapa de calor da matriz
+
+    # Nomes nos eixos só quando cabem (e na mesma ordem das células)
+    if quantidade_colunas <= LIMITE_ROTULOS and not agregada:  # Colunas legíveis
+        ax.set_xticks(np.arange(quantidade_colunas))  # Define posições das marcações no eixo X
+        ax.set_xticklabels([rotulos_colunas[indice] for indice in ordem_colunas], rotation=rotacao_colunas, ha=alinhamento_colunas)  # Rótulos do eixo X
+    if quantidade_linhas <= LIMITE_ROTULOS and not agregada:  # Linhas legíveis
+        ax.set_yticks(np.arange(quantidade_linhas))  # Define posições das marcações no eixo Y
+        ax.set_yticklabels([rotulos_linhas[indice] for indice in ordem_linhas])  # Rótulos do eixo Y
+
+    # Adiciona valores numéricos nas células da matriz (apenas matrizes pequenas)
+    if anotar and not agregada:  # Quantidade de textos limitada por limite_anotacoes
+        for indice_linha in range(quantidade_linhas):  # Loop que percorre cada linha
+            for indice_coluna in range(quantidade_colunas):  # Loop aninhado que percorre cada coluna
+                valor_celula = matriz_densa[indice_linha, indice_coluna]  # Pega valor da célula atual
+                ax.text(  # Adiciona texto no gráfico
+                    indice_coluna,  # Posição X (coluna)
+                    indice_linha,  # Posição Y (linha)
+                    str(int(valor_celula)) if formato_valor is None else formato_valor.format(valor_celula),  # Texto a exibir (valor convertido para string)
+                    ha="center",  # Alinhamento horizontal centralizado
+                    va="center",  # Alinhamento vertical centralizado
+                    color=cor_texto(valor_celula) if callable(cor_texto) else cor_texto,  # Cor do texto (fixa ou pelo valor)
+                    fontsize=8,  # Tamanho da fonte
+                    fontweight="bold" if negrito else "normal",  # Texto em negrito se pedido
+                    rasterized=rasterizar,  # Rasterização em saídas vetoriais
+                )
+
+    return mapa  # Retorna objeto do mapa para criar barra de cores
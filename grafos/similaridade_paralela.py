@@ -0,0 +1,129 @@
+import os  # Importa os para montar os caminhos dos vetores compartilhados e dos fragmentos
+import tempfile  # Importa tempfile para o diretório temporário dos vetores compartilhados
+from concurrent.futures import ProcessPoolExecutor, as_completed  # Importa pool de processos para calcular os fragmentos ao mesmo tempo
+
+import numpy as np  # Importa NumPy para operações vetorizadas e vetores mapeados em memória
+import scipy.sparse as sp  # Importa SciPy para matrizes esparsas
+
+from .matrizes import podar_bloco, juntar_blocos_similaridade, similaridade_em_blocos  # Importa a poda e a junção dos blocos
+from .agendador import processos_padrao  # Importa a escolha automática da quantidade de processos
+from helpers.easy_log import etapa  # Importa medição das etapas (tempo e memória)
+
+# Similaridade exata (M @ M^T) dividida em fragmentos de pessoas calculados em um pool de processos.
+# A matriz de incidência e a transposta são gravadas uma vez em .npy e abertas com memória mapeada por
+# cada trabalhador (nada é serializado por tarefa; as páginas são compartilhadas pelo sistema operacional).
+# Cada fragmento devolve suas arestas já podadas (limiar/top-k) ao processo principal ou grava-as em arquivos.
+
+FRAGMENTOS_POR_PROCESSO = 4  # Mais fragmentos que processos equilibram a carga (pessoas com gêneros populares custam mais)
+
+_matrizes_processo = {}  # Incidência e transposta mapeadas pelo processo trabalhador
+
+
+# Grava os vetores CSR de uma matriz em diretorio/prefixo_*.npy (também usado pelo modo em lote)
+def gravar_csr(diretorio, prefixo, matriz):
+    for chave in ("data", "indices", "indptr"):  # Loop que grava cada vetor
+        np.save(os.path.join(diretorio, f"{prefixo}_{chave}.npy"), getattr(matriz, chave))
+
+
+# Remonta a matriz CSR sobre os vetores mapeados (sem copiar)
+def abrir_csr(diretorio, prefixo, forma):
+    vetores = [np.load(os.path.join(diretorio, f"{prefixo}_{chave}.npy"), mmap_mode="r") for chave in ("data", "indices", "indptr")]
+    return sp.csr_matrix(tuple(vetores), shape=forma, copy=False)
+
+
+# Inicializador do processo trabalhador: abre a incidência e a transposta gravadas pelo processo principal
+def _inicializar_trabalhador(diretorio, forma):
+    _matrizes_processo["incidencia"] = abrir_csr(diretorio, "incidencia", forma)  # Pessoas × gêneros
+    _matrizes_processo["transposta"] = abrir_csr(diretorio, "transposta", forma[::-1])  # Gêneros × pessoas
+
+
+# Arestas podadas das pessoas [inicio, fim), em blocos de tamanho_bloco linhas (limita a memória do produto)
+def _calcular_fragmento(matriz_incidencia, transposta, inicio, fim, tamanho_bloco, top_k, limiar):
+    partes_linhas, partes_colunas, partes_valores = [], [], []  # Arestas de cada bloco do fragmento
+    for inicio_bloco in range(inicio, fim, tamanho_bloco):  # Loop que percorre o fragmento em blocos
+        fim_bloco = min(inicio_bloco + tamanho_bloco, fim)  # Última linha (exclusiva) do bloco
+        bloco = matriz_incidencia[inicio_bloco:fim_bloco] @ transposta  # Produto esparso do bloco
+        linhas, colunas, valores = podar_bloco(bloco, inicio_bloco, top_k=top_k, limiar=limiar)  # Mesma poda da versão sequencial
+        partes_linhas.append(linhas)
+        partes_colunas.append(colunas)
+        partes_valores.append(valores)
+    tipo_indices = np.int32 if transposta.shape[1] < 2**31 else np.int64  # Índices menores: menos bytes devolvidos ao processo principal
+    return (
+        np.concatenate(partes_linhas).astype(tipo_indices),
+        np.concatenate(partes_colunas).astype(tipo_indices),
+        np.concatenate(partes_valores),
+    )
+
+
+# Tarefa do pool: calcula um fragmento e devolve as arestas ou grava-as em diretorio_fragmentos e devolve os caminhos
+def _executar_fragmento(inicio, fim, tamanho_bloco, top_k, limiar, diretorio_fragmentos):
+    arestas = _calcular_fragmento(
+        _matrizes_processo["incidencia"], _matrizes_processo["transposta"], inicio, fim, tamanho_bloco, top_k, limiar
+    )
+    if diretorio_fragmentos is None:  # Arestas devolvidas pelo próprio pool
+        return arestas
+    caminhos = []  # Arquivos do fragmento
+    for chave, vetor in zip(("linhas", "colunas", "valores"), arestas):  # Loop que grava cada vetor do fragmento
+        caminho = os.path.join(diretorio_fragmentos, f"fragmento_{inicio:012d}_{chave}.npy")
+        np.save(caminho, vetor)
+        caminhos.append(caminho)
+    return tuple(caminhos)
+
+
+# Divide as pessoas em fragmentos contíguos de custo parecido; o custo de uma pessoa é o número de produtos
+# do seu bloco: a soma, sobre os seus gêneros, de quantas pessoas têm aquele gênero
+def dividir_fragmentos(matriz_incidencia, quantidade_fragmentos):
+    quantidade_pessoas = matriz_incidencia.shape[0]  # Número de pessoas
+    popularidade = np.bincount(matriz_incidencia.indices, minlength=matriz_incidencia.shape[1])  # Pessoas de cada gênero
+    pessoa_de_cada = np.repeat(np.arange(quantidade_pessoas), np.diff(matriz_incidencia.indptr))  # Pessoa de cada não nulo
+    custo = np.bincount(pessoa_de_cada, weights=popularidade[matriz_incidencia.indices], minlength=quantidade_pessoas) + 1  # +1 pelo custo fixo da linha
+    acumulado = np.cumsum(custo)  # Custo até cada pessoa
+    alvos = acumulado[-1] * np.arange(1, quantidade_fragmentos) / quantidade_fragmentos  # Custo no fim de cada fragmento
+    cortes = np.unique(np.r_[0, np.searchsorted(acumulado, alvos, side="right"), quantidade_pessoas])  # Limites (sem fragmentos vazios)
+    return list(zip(cortes[:-1].tolist(), cortes[1:].tolist()))  # Lista de (inicio, fim)
+
+
+# Matriz de similaridade (M @ M^T) calculada em fragmentos de pessoas em um pool de processos, com o mesmo
+# resultado de similaridade_em_blocos; processos=None usa todos os núcleos em matrizes grandes (um processo:
+# cálculo sequencial). diretorio_fragmentos grava as arestas de cada fragmento em .npy em vez de devolvê-las
+# pelo pool (útil quando as arestas não cabem em memória duas vezes: os arquivos são lidos mapeados na junção)
+def similaridade_paralela(matriz_incidencia, tamanho_bloco=2048, top_k=None, limiar=None, processos=None, diretorio_fragmentos=None):
+    matriz_incidencia = sp.csr_matrix(matriz_incidencia)  # Garante formato CSR (fatias de linhas baratas)
+    quantidade_pessoas = matriz_incidencia.shape[0]  # Número de pessoas (linhas e colunas do resultado)
+    processos = processos_padrao(quantidade_pessoas, processos)  # Processos disponíveis
+    if processos == 1:  # Sem ganho em abrir o pool
+        return similaridade_em_blocos(matriz_incidencia, tamanho_bloco=tamanho_bloco, top_k=top_k, limiar=limiar)
+
+    fragmentos = dividir_fragmentos(matriz_incidencia, processos * FRAGMENTOS_POR_PROCESSO)  # Lista de (inicio, fim)
+    if diretorio_fragmentos is not None:  # Arestas gravadas em arquivos
+        os.makedirs(diretorio_fragmentos, exist_ok=True)
+
+    partes = {}  # inicio do fragmento -> (linhas, colunas, valores)
+    with tempfile.TemporaryDirectory(prefix="similaridade_") as compartilhado:  # Vetores compartilhados, removidos no fim
+        with etapa("compartilhar"):  # Grava a incidência e a transposta para os trabalhadores
+            gravar_csr(compartilhado, "incidencia", matriz_incidencia)
+            gravar_csr(compartilhado, "transposta", matriz_incidencia.T.tocsr())  # Transposta calculada uma única vez
+        with etapa("fragmentos", fragmentos=len(fragmentos), processos=processos):  # Produtos no pool
+            with ProcessPoolExecutor(  # Pool de processos trabalhadores
+                max_workers=min(processos, len(fragmentos)),  # Não abre mais processos que fragmentos
+                initializer=_inicializar_trabalhador,  # Abre as matrizes mapeadas uma única vez por processo
+                initargs=(compartilhado, matriz_incidencia.shape),  # Só o caminho e a forma são enviados
+            ) as pool:
+                futuros = {
+                    pool.submit(_executar_fragmento, inicio, fim, tamanho_bloco, top_k, limiar, diretorio_fragmentos): inicio
+                    for inicio, fim in fragmentos
+                }
+                for futuro in as_completed(futuros):  # Recolhe cada fragmento assim que ele termina (exceções são repassadas)
+                    resultado = futuro.result()
+                    if diretorio_fragmentos is not None:  # Caminhos dos arquivos: lidos mapeados
+                        resultado = tuple(np.load(caminho, mmap_mode="r") for caminho in resultado)
+                    partes[futuros[futuro]] = resultado
+
+    ordem = sorted(partes)  # Fragmentos na ordem das pessoas
+    with etapa("juntar"):  # Matriz final com as arestas de todos os fragmentos
+        return juntar_blocos_similaridade(
+            [partes[inicio][0].astype(np.int64) for inicio in ordem],
+            [partes[inicio][1].astype(np.int64) for inicio in ordem],
+            [np.asarray(partes[inicio][2]) for inicio in ordem],
+            quantidade_pessoas, matriz_incidencia.dtype, top_k=top_k,
+        )
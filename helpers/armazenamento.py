@@ -0,0 +1,156 @@
+import hashlib  # Importa hashlib para calcular a impressão digital do dataset
+import json  # Importa json para os metadados e as métricas escalares
+import os  # Importa os para montar caminhos e trocar diretórios de forma atômica
+import shutil  # Importa shutil para remover entradas antigas
+
+import numpy as np  # Importa NumPy para gravar e mapear os vetores
+import scipy.sparse as sp  # Importa SciPy para remontar as matrizes esparsas
+
+# Armazém de resultados em disco: matrizes esparsas (vetores CSR), grafos (vetores de arestas) e métricas
+# (escalares em JSON e colunas por nó em .npy), separados pela impressão digital do dataset.
+# Tudo é gravado como .npy para poder ser lido com memória mapeada (o .npz é compactado e não permite mmap).
+
+DIRETORIO_PADRAO = "resultados"  # Diretório raiz padrão do armazém
+VERSAO_ARMAZEM = 1  # Incrementar quando o formato mudar
+TIPOS = ("matrizes", "grafos", "metricas")  # Subdiretórios de cada tipo de entrada
+
+
+# Impressão digital do conteúdo do dataset (interações e vocabulários), independente do caminho do arquivo
+def impressao_digital(data, pessoas, generos):
+    resumo = hashlib.sha256()  # Hash incremental
+    resumo.update(f"{VERSAO_ARMAZEM}|{len(pessoas)}|{len(generos)}|".encode("utf-8"))  # Versão e tamanhos
+    resumo.update("\0".join(pessoas).encode("utf-8"))  # Vocabulário de pessoas
+    resumo.update(b"\1")  # Separador entre os vocabulários
+    resumo.update("\0".join(generos).encode("utf-8"))  # Vocabulário de gêneros
+    if hasattr(data, "origem"):  # Dataset colunar: hash direto dos vetores
+        for vetor in (data.origem, data.destino, data.peso):
+            resumo.update(np.ascontiguousarray(vetor).tobytes())
+    else:  # Lista de dicionários
+        for relacao in data:
+            resumo.update(f"{relacao['from']}\0{relacao['to']}\0{relacao.get('weight', 1)}\n".encode("utf-8"))
+    return resumo.hexdigest()[:16]  # Prefixo curto (suficiente para separar versões do dataset)
+
+
+# Converte valores NumPy em tipos Python aceitos pelo JSON
+def _serializavel(valor):
+    if isinstance(valor, dict):
+        return {str(chave): _serializavel(item) for chave, item in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_serializavel(item) for item in valor]
+    if isinstance(valor, np.generic):  # Escalar NumPy
+        return valor.item()
+    return valor
+
+
+# Resultados de um dataset: cada entrada fica em raiz/impressao/tipo/nome/ (meta.json + vetores .npy)
+class ArmazemResultados:
+    def __init__(self, impressao, raiz=DIRETORIO_PADRAO):  # Recebe a impressão digital do dataset e o diretório raiz
+        self.impressao = impressao  # Identifica o dataset
+        self.diretorio = os.path.join(raiz, impressao)  # Diretório deste dataset
+
+    def _caminho(self, tipo, nome):  # Diretório de uma entrada
+        return os.path.join(self.diretorio, tipo, nome)
+
+    # Grava os vetores e os metadados em um diretório temporário e o troca de uma vez pelo anterior
+    def _gravar(self, tipo, nome, vetores, metadados):
+        destino = self._caminho(tipo, nome)  # Diretório final
+        temporario = f"{destino}.tmp{os.getpid()}"  # Diretório temporário exclusivo deste processo
+        shutil.rmtree(temporario, ignore_errors=True)  # Restos de uma gravação interrompida
+        os.makedirs(temporario)  # Cria o diretório temporário
+        for chave, vetor in vetores.items():  # Loop que grava cada vetor
+            np.save(os.path.join(temporario, f"{chave}.npy"), np.ascontiguousarray(vetor))
+        with open(os.path.join(temporario, "meta.json"), "w", encoding="utf-8") as arquivo:  # Metadados
+            json.dump(_serializavel({"versao": VERSAO_ARMAZEM, "impressao": self.impressao, **metadados}), arquivo, ensure_ascii=False)
+        shutil.rmtree(destino, ignore_errors=True)  # Remove a versão anterior (se existir)
+        os.replace(temporario, destino)  # Publica a entrada nova
+        return destino  # Diretório gravado
+
+    # Lê os metadados e os vetores (memória mapeada por padrão); None se a entrada não existir
+    def _ler(self, tipo, nome, chaves, mmap=True):
+        origem = self._caminho(tipo, nome)  # Diretório da entrada
+        try:
+            with open(os.path.join(origem, "meta.json"), "r", encoding="utf-8") as arquivo:
+                metadados = json.load(arquivo)
+        except (FileNotFoundError, json.JSONDecodeError):  # Entrada inexistente ou incompleta
+            return None
+        if metadados.get("versao") != VERSAO_ARMAZEM:  # Formato antigo
+            return None
+        modo = "r" if mmap else None  # Memória mapeada ou cópia em memória
+        vetores = {chave: np.load(os.path.join(origem, f"{chave}.npy"), mmap_mode=modo) for chave in chaves(metadados)}
+        return metadados, vetores
+
+    # Indica se existe uma entrada gravada
+    def existe(self, tipo, nome):
+        return os.path.exists(os.path.join(self._caminho(tipo, nome), "meta.json"))
+
+    # Nomes das entradas gravadas de cada tipo
+    def entradas(self):
+        resultado = {}  # tipo -> nomes
+        for tipo in TIPOS:
+            diretorio = os.path.join(self.diretorio, tipo)
+            resultado[tipo] = sorted(nome for nome in os.listdir(diretorio) if ".tmp" not in nome) if os.path.isdir(diretorio) else []
+        return resultado
+
+    # Matriz esparsa como vetores CSR (dados, índices, ponteiros) e os rótulos das linhas e colunas
+    def salvar_matriz(self, nome, matriz, rotulos_linhas, rotulos_colunas):
+        matriz = sp.csr_matrix(matriz)  # Garante formato CSR
+        matriz.sort_indices()  # Índices ordenados (leitura sem reordenar)
+        return self._gravar("matrizes", nome, {"data": matriz.data, "indices": matriz.indices, "indptr": matriz.indptr}, {
+            "forma": list(matriz.shape), "linhas": list(rotulos_linhas), "colunas": list(rotulos_colunas),
+        })
+
+    # Devolve (matriz CSR sobre os vetores mapeados, rótulos das linhas, rótulos das colunas) ou None
+    def carregar_matriz(self, nome, mmap=True):
+        lido = self._ler("matrizes", nome, lambda _: ("data", "indices", "indptr"), mmap)
+        if lido is None:
+            return None
+        metadados, vetores = lido
+        matriz = sp.csr_matrix((vetores["data"], vetores["indices"], vetores["indptr"]), shape=tuple(metadados["forma"]), copy=False)  # Sem copiar os vetores
+        return matriz, metadados["linhas"], metadados["colunas"]
+
+    # Grafo como vetores de arestas (cada aresta uma vez) e a lista de nomes dos nós
+    # grupos: lista de (quantidade de nós consecutivos, atributos desses nós), ex.: pessoas e gêneros do grafo bipartido
+    def salvar_grafo(self, nome, origem, destino, pesos, nomes, grupos=()):
+        return self._gravar("grafos", nome, {"origem": origem, "destino": destino, "peso": pesos}, {
+            "nomes": list(nomes), "grupos": [[quantidade, atributos] for quantidade, atributos in grupos],
+        })
+
+    # Devolve (origem, destino, pesos, nomes, grupos) com os vetores mapeados, ou None
+    def carregar_grafo(self, nome, mmap=True):
+        lido = self._ler("grafos", nome, lambda _: ("origem", "destino", "peso"), mmap)
+        if lido is None:
+            return None
+        metadados, vetores = lido
+        return vetores["origem"], vetores["destino"], vetores["peso"], metadados["nomes"], metadados["grupos"]
+
+    # Grafo NetworkX remontado a partir dos vetores de arestas (com os atributos dos grupos de nós)
+    def carregar_grafo_networkx(self, nome):
+        import networkx as nx  # Importa NetworkX apenas quando o grafo é pedido nesse formato
+        lido = self.carregar_grafo(nome)
+        if lido is None:
+            return None
+        origem, destino, pesos, nomes, grupos = lido
+        grafo = nx.Graph()  # Grafo vazio não-direcionado
+        inicio = 0  # Primeiro nó do grupo atual
+        for quantidade, atributos in grupos:  # Nós na ordem gravada, com os atributos do grupo
+            grafo.add_nodes_from(nomes[inicio:inicio + quantidade], **atributos)
+            inicio += quantidade
+        grafo.add_nodes_from(nomes[inicio:])  # Nós fora dos grupos (sem atributos)
+        nomes_array = np.asarray(nomes, dtype=object)  # Vetor de nomes para indexação vetorizada
+        grafo.add_weighted_edges_from(zip(nomes_array[origem], nomes_array[destino], np.asarray(pesos).tolist()))  # Todas as arestas de uma vez
+        return grafo
+
+    # Métricas: escalares em JSON e colunas por nó (vetores alinhados com "nomes") em .npy
+    def salvar_metricas(self, nome, metricas):
+        colunas = {coluna: np.asarray(valores, dtype=float) for coluna, valores in metricas.get("colunas", {}).items()}  # Uma coluna por métrica
+        return self._gravar("metricas", nome, colunas, {
+            "nomes": list(metricas.get("nomes", [])), "escalares": metricas.get("escalares", {}), "colunas": sorted(colunas),
+        })
+
+    # Devolve {"nomes", "escalares", "colunas"} com as colunas mapeadas, ou None
+    def carregar_metricas(self, nome, mmap=True):
+        lido = self._ler("metricas", nome, lambda metadados: metadados["colunas"], mmap)
+        if lido is None:
+            return None
+        metadados, colunas = lido
+        return {"nomes": metadados["nomes"], "escalares": metadados["escalares"], "colunas": colunas}
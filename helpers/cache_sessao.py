@@ -0,0 +1,97 @@
+import sys  # Importa sys para estimar o tamanho de objetos Python
+from collections import OrderedDict  # Importa OrderedDict para manter a ordem de uso (LRU)
+
+import numpy as np  # Importa NumPy para medir vetores
+import scipy.sparse as sp  # Importa SciPy para medir matrizes esparsas
+
+from .easy_log import easy_log  # Importa função de log do módulo easy_log
+
+ORCAMENTO_PADRAO = 512 * 1024 * 1024  # Memória máxima ocupada pelos resultados guardados (512 MiB)
+BYTES_POR_NO = 600  # Estimativa de memória de um nó do NetworkX (dicionários de atributos e adjacência)
+BYTES_POR_ARESTA = 500  # Estimativa de memória de uma aresta do NetworkX (nos dois sentidos, com atributos)
+
+
+# Estimativa de memória de um resultado: vetores, matrizes esparsas, grafos, coleções e o conteúdo das closures
+# Objetos em "ignorar" (ids) não são contados, como o dataset compartilhado por todas as análises
+def tamanho_aproximado(valor, ignorar=None):
+    vistos = set(ignorar or ())  # Objetos já contados (ou compartilhados)
+    pendentes = [valor]  # Objetos a medir
+    total = 0  # Bytes estimados
+    while pendentes:  # Percorre o grafo de objetos sem recursão
+        objeto = pendentes.pop()  # Próximo objeto
+        if id(objeto) in vistos:  # Já contado
+            continue
+        vistos.add(id(objeto))  # Marca como contado
+
+        if isinstance(objeto, np.ndarray):  # Vetor NumPy
+            total += objeto.nbytes
+        elif sp.issparse(objeto):  # Matriz esparsa: dados + índices
+            pendentes.extend(getattr(objeto, nome) for nome in ("data", "indices", "indptr", "row", "col") if hasattr(objeto, nome))
+        elif hasattr(objeto, "number_of_nodes") and hasattr(objeto, "number_of_edges"):  # Grafo NetworkX
+            total += objeto.number_of_nodes() * BYTES_POR_NO + objeto.number_of_edges() * BYTES_POR_ARESTA
+        elif callable(objeto) and getattr(objeto, "__closure__", None):  # Closure: mede as variáveis capturadas
+            pendentes.extend(celula.cell_contents for celula in objeto.__closure__)
+        elif isinstance(objeto, dict):  # Dicionário: chaves e valores
+            total += sys.getsizeof(objeto)
+            pendentes.extend(objeto.keys())
+            pendentes.extend(objeto.values())
+        elif isinstance(objeto, (list, tuple, set, frozenset)):  # Coleções
+            total += sys.getsizeof(objeto)
+            pendentes.extend(objeto)
+        elif hasattr(objeto, "__slots__") and not callable(objeto):  # Objetos leves (ex.: Interacoes)
+            pendentes.extend(getattr(objeto, nome) for nome in objeto.__slots__ if hasattr(objeto, nome))
+        elif not callable(objeto):  # Números, textos e demais objetos simples
+            total += sys.getsizeof(objeto)
+    return total  # Bytes estimados
+
+
+# Cache dos resultados da sessão (análises construídas, métricas...) com orçamento de memória e descarte LRU
+class CacheSessao:
+    def __init__(self, orcamento=ORCAMENTO_PADRAO, compartilhados=()):  # Recebe o orçamento em bytes e os objetos não contados
+        self.orcamento = orcamento  # Memória máxima
+        self.compartilhados = {id(objeto) for objeto in compartilhados}  # Objetos de todas as análises (ex.: dataset)
+        self._itens = OrderedDict()  # chave -> (valor, tamanho), do menos para o mais recentemente usado
+        self.ocupado = 0  # Memória estimada em uso
+
+    def __contains__(self, chave):  # Permite "chave in cache"
+        return chave in self._itens
+
+    def __len__(self):  # Quantidade de resultados guardados
+        return len(self._itens)
+
+    # Devolve o resultado guardado ou o constrói (uma vez) com construtor()
+    def obter(self, chave, construtor):
+        if chave in self._itens:  # Já construído
+            self._itens.move_to_end(chave)  # Passa a ser o mais recente
+            return self._itens[chave][0]
+        valor = construtor()  # Constrói
+        self.guardar(chave, valor)  # Guarda (descartando os mais antigos se passar do orçamento)
+        return valor
+
+    # Guarda um resultado e descarta os menos usados até caber no orçamento (o mais recente sempre fica)
+    def guardar(self, chave, valor):
+        self.descartar(chave)  # Substitui o valor anterior, se houver
+        tamanho = tamanho_aproximado(valor, self.compartilhados)  # Memória estimada
+        self._itens[chave] = (valor, tamanho)  # Mais recente no fim
+        self.ocupado += tamanho  # Atualiza o uso
+        while self.ocupado > self.orcamento and len(self._itens) > 1:  # Passou do orçamento
+            antiga, (_, tamanho_antigo) = self._itens.popitem(last=False)  # Menos recentemente usado
+            self.ocupado -= tamanho_antigo  # Libera a memória
+            easy_log("INFO", f"Cache da sessão: '{antiga}' descartado para liberar memória.")
+
+    # Mede de novo um resultado que cresceu depois de guardado (ex.: grafo NetworkX ou relatório construídos sob
+    # demanda pela análise) e descarta os menos usados se passar do orçamento; chaves já descartadas são ignoradas
+    def atualizar(self, chave):
+        if chave in self._itens:  # Ainda guardado
+            self.guardar(chave, self._itens[chave][0])  # Mesmo valor, tamanho atual
+
+    # Remove um resultado (se existir)
+    def descartar(self, chave):
+        if chave in self._itens:  # Existe
+            self.ocupado -= self._itens.pop(chave)[1]  # Libera a memória
+
+    # Invalida tudo (ex.: dataset recarregado) e passa a ignorar os novos objetos compartilhados
+    def limpar(self, compartilhados=()):
+        self._itens.clear()  # Remove todos os resultados
+        self.ocupado = 0  # Nada em uso
+        self.compartilhados = {id(objeto) for objeto in compartilhados}  # Novo dataset compartilhado
@@ -1,15 +1,250 @@
-import datetime
-
-def easy_log(status, message):
-    status_list = {
-        "INFO": "[!]",
-        "WARNING": "[?]",
-        "ERROR": "[X]",
-        "SUCCESS": "[✓]",
-        "OPTION": "[>]",
-        "CASE": "[#]",
-    }
-
-    agora = datetime.datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-    
-    print(f"{agora} {status_list.get(status, '[⚪]')} {message}")
\ No newline at end of file
+import atexit
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+# Log com níveis e instrumentação das etapas (tempo real, tempo de CPU e pico de memória),
+# com etapas aninhadas, cProfile opcional de uma etapa e resumo em tabela ou trace JSON no fim
+
+STATUS = {
+    "DEBUG": "[.]",
+    "INFO": "[!]",
+    "WARNING": "[?]",
+    "ERROR": "[X]",
+    "SUCCESS": "[✓]",
+    "OPTION": "[>]",
+    "CASE": "[#]",
+}
+
+# Prioridade de cada status: mensagens abaixo do nível configurado não são formatadas nem impressas
+# OPTION e CASE são os menus interativos e nunca são filtrados
+NIVEIS = {"DEBUG": 10, "INFO": 20, "SUCCESS": 25, "WARNING": 30, "ERROR": 40, "OPTION": 100, "CASE": 100}
+
+_configuracao = {"nivel": NIVEIS.get(os.environ.get("EASY_LOG_NIVEL", "INFO").upper(), 20)}
+_relogio = {"segundo": None, "texto": ""}  # Último horário formatado (refeito só quando o segundo muda)
+
+
+def definir_nivel(nivel):
+    if nivel not in NIVEIS:
+        raise ValueError(f"Nível de log inválido: {nivel!r} (use {', '.join(sorted(NIVEIS, key=NIVEIS.get))}).")
+    _configuracao["nivel"] = NIVEIS[nivel]
+
+
+def habilitado(status):
+    return NIVEIS.get(status, 20) >= _configuracao["nivel"]
+
+
+def _agora():
+    segundo = int(time.time())
+    if segundo != _relogio["segundo"]:  # strftime uma vez por segundo, não a cada mensagem
+        _relogio["segundo"] = segundo
+        _relogio["texto"] = time.strftime("%d/%m/%Y %H:%M:%S", time.localtime(segundo))
+    return _relogio["texto"]
+
+
+# message pode ser um texto, um texto com "%" e argumentos, ou uma função sem argumentos;
+# nos dois últimos casos a formatação só acontece se o status passar pelo nível configurado
+def easy_log(status, message, *argumentos):
+    if not habilitado(status):
+        return
+    if callable(message):
+        message = message()
+    elif argumentos:
+        message = message % argumentos
+
+    print(f"{_agora()} {STATUS.get(status, '[⚪]')} {message}")
+
+
+# ---------------------------------------------------------------------------------------------
+# Instrumentação das etapas
+
+_instrumentacao = {
+    "ativa": False,  # Registra as etapas (desligada: etapa() só mede o tempo para o log DEBUG)
+    "memoria": False,  # Pico de memória pelo tracemalloc
+    "perfil": None,  # Nome da etapa perfilada com cProfile
+    "diretorio_perfil": ".",  # Onde gravar o .prof e o resumo do cProfile
+    "resumo": False,  # Imprime a tabela de resumo no fim do processo
+    "trace": None,  # Arquivo do trace JSON (formato Chrome/Perfetto)
+    "registros": [],  # Etapas concluídas (deste processo e as recebidas dos trabalhadores)
+}
+_pilha = threading.local()  # Etapas abertas (por thread)
+
+
+# Liga a instrumentação; memoria usa o tracemalloc (deixa código Python mais lento),
+# perfil é o nome de uma etapa medida com cProfile, resumo imprime a tabela no fim e trace grava o JSON no fim
+def iniciar_instrumentacao(memoria=False, perfil=None, resumo=True, trace=None, diretorio_perfil="."):
+    _instrumentacao.update(ativa=True, memoria=memoria, perfil=perfil, resumo=resumo, trace=trace, diretorio_perfil=diretorio_perfil)
+    if memoria and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if not _instrumentacao.get("registrado_atexit"):
+        atexit.register(finalizar_instrumentacao)
+        _instrumentacao["registrado_atexit"] = True
+
+
+def instrumentacao_ativa():
+    return _instrumentacao["ativa"]
+
+
+def registros():
+    return list(_instrumentacao["registros"])
+
+
+# Junta as etapas medidas em outro processo (ex.: trabalhadores do modo em lote) às deste
+def incorporar_registros(novos):
+    if _instrumentacao["ativa"]:
+        _instrumentacao["registros"].extend(novos)
+
+
+# Uma etapa medida: use como "with etapa('matriz'):" ou como decorador "@etapa('matriz')"
+# Etapas abertas dentro de outra viram filhas (caminho "carregar/matriz")
+class etapa:
+    __slots__ = ("nome", "detalhes", "_caminho", "_inicio", "_inicio_relogio", "_inicio_cpu", "_memoria_inicial", "_pico_filhas", "_perfil")
+
+    def __init__(self, nome, **detalhes):
+        self.nome = nome
+        self.detalhes = detalhes  # Informações extras guardadas no registro (ex.: quantidade de nós)
+
+    def __call__(self, funcao):  # Uso como decorador: uma etapa nova a cada chamada
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            with etapa(self.nome, **self.detalhes):
+                return funcao(*args, **kwargs)
+        return envolvida
+
+    def __enter__(self):
+        pilha = getattr(_pilha, "etapas", None)
+        if pilha is None:
+            pilha = _pilha.etapas = []
+        self._caminho = f"{pilha[-1]._caminho}/{self.nome}" if pilha else self.nome
+        self._pico_filhas = 0
+        self._perfil = None
+
+        if _instrumentacao["ativa"] and tracemalloc.is_tracing():
+            atual, pico = tracemalloc.get_traced_memory()
+            if pilha:  # O pico da mãe até aqui seria perdido pelo reset_peak
+                pilha[-1]._pico_filhas = max(pilha[-1]._pico_filhas, pico)
+            tracemalloc.reset_peak()
+            self._memoria_inicial = atual
+        else:
+            self._memoria_inicial = None
+
+        if _instrumentacao["ativa"] and _instrumentacao["perfil"] == self.nome and not _instrumentacao.get("perfilando"):
+            self._perfil = cProfile.Profile()
+            _instrumentacao["perfilando"] = True
+            self._perfil.enable()
+
+        pilha.append(self)
+        self._inicio_relogio = time.time()  # Horário absoluto (alinha etapas de processos diferentes no trace)
+        self._inicio_cpu = time.process_time()
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, erro, rastro):
+        segundos = time.perf_counter() - self._inicio
+        segundos_cpu = time.process_time() - self._inicio_cpu
+        pilha = _pilha.etapas
+        pilha.pop()
+
+        if self._perfil is not None:
+            self._perfil.disable()
+            _instrumentacao["perfilando"] = False
+            _salvar_perfil(self._perfil, self.nome)
+
+        if _instrumentacao["ativa"]:
+            registro = {
+                "etapa": self._caminho,
+                "nivel": len(pilha),
+                "processo": os.getpid(),
+                "inicio": self._inicio_relogio,
+                "segundos": segundos,
+                "segundos_cpu": segundos_cpu,
+                "ok": tipo is None,
+            }
+            if self._memoria_inicial is not None and tracemalloc.is_tracing():
+                pico = max(tracemalloc.get_traced_memory()[1], self._pico_filhas)
+                registro["pico_memoria"] = max(0, pico - self._memoria_inicial)
+                if pilha:  # A mãe continua vendo o pico desta filha
+                    pilha[-1]._pico_filhas = max(pilha[-1]._pico_filhas, pico)
+            if self.detalhes:
+                registro["detalhes"] = self.detalhes
+            _instrumentacao["registros"].append(registro)
+
+        easy_log("DEBUG", lambda: f"Etapa '{self._caminho}' concluída em {segundos:.3f} s (CPU {segundos_cpu:.3f} s).")
+        return False  # Não engole exceções
+
+
+def _salvar_perfil(perfil, nome):
+    diretorio = _instrumentacao["diretorio_perfil"]
+    os.makedirs(diretorio, exist_ok=True)
+    caminho = os.path.join(diretorio, f"perfil_{nome}.prof")
+    perfil.dump_stats(caminho)  # Abrir com snakeviz ou "python -m pstats"
+    texto = io.StringIO()
+    pstats.Stats(perfil, stream=texto).sort_stats("cumulative").print_stats(25)
+    with open(os.path.join(diretorio, f"perfil_{nome}.txt"), "w", encoding="utf-8") as arquivo:
+        arquivo.write(texto.getvalue())
+    easy_log("INFO", f"Perfil da etapa '{nome}' gravado em '{caminho}'.")
+
+
+# Agrupa as etapas pelo caminho: chamadas, tempo total, CPU total e maior pico de memória
+def resumo_etapas():
+    agregadas = {}
+    for registro in _instrumentacao["registros"]:
+        atual = agregadas.setdefault(registro["etapa"], {"etapa": registro["etapa"], "nivel": registro["nivel"], "chamadas": 0,
+                                                         "segundos": 0.0, "segundos_cpu": 0.0, "pico_memoria": None,
+                                                         "inicio": registro["inicio"]})
+        atual["inicio"] = min(atual["inicio"], registro["inicio"])
+        atual["chamadas"] += 1
+        atual["segundos"] += registro["segundos"]
+        atual["segundos_cpu"] += registro["segundos_cpu"]
+        if "pico_memoria" in registro:
+            atual["pico_memoria"] = max(atual["pico_memoria"] or 0, registro["pico_memoria"])
+    # Ordem de execução (a mãe começa antes das filhas), com as filhas logo abaixo da mãe
+    primeira = {}
+    for linha in sorted(agregadas.values(), key=lambda linha: linha["inicio"]):
+        primeira.setdefault(linha["etapa"].split("/", 1)[0], linha["inicio"])
+    return sorted(agregadas.values(), key=lambda linha: (primeira.get(linha["etapa"].split("/", 1)[0], linha["inicio"]), linha["etapa"].split("/", 1)[0], linha["inicio"]))
+
+
+def tabela_etapas():
+    linhas = [f"{'Etapa':<50} {'Chamadas':>8} {'Tempo (s)':>10} {'CPU (s)':>10} {'Pico (MiB)':>11}"]
+    for linha in resumo_etapas():
+        nome = "  " * linha["nivel"] + linha["etapa"].rsplit("/", 1)[-1]  # Filhas recuadas sob a mãe
+        pico = f"{linha['pico_memoria'] / 2**20:11.1f}" if linha["pico_memoria"] is not None else f"{'-':>11}"
+        linhas.append(f"{nome:<50} {linha['chamadas']:>8} {linha['segundos']:>10.3f} {linha['segundos_cpu']:>10.3f} {pico}")
+    return "\n".join(linhas)
+
+
+# Trace no formato de eventos do Chrome (abre em chrome://tracing ou ui.perfetto.dev)
+def gravar_trace(caminho):
+    origem = min((registro["inicio"] for registro in _instrumentacao["registros"]), default=0.0)
+    eventos = [{
+        "name": registro["etapa"].rsplit("/", 1)[-1],
+        "cat": registro["etapa"],
+        "ph": "X",
+        "ts": (registro["inicio"] - origem) * 1e6,
+        "dur": registro["segundos"] * 1e6,
+        "pid": registro["processo"],
+        "tid": 0,
+        "args": {chave: valor for chave, valor in registro.items() if chave not in ("inicio", "segundos", "processo")},
+    } for registro in _instrumentacao["registros"]]
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, arquivo, ensure_ascii=False, default=str)
+
+
+# Chamado no fim do processo (atexit): imprime o resumo e grava o trace, uma única vez
+def finalizar_instrumentacao():
+    if not _instrumentacao["ativa"] or not _instrumentacao["registros"]:
+        return
+    if _instrumentacao["resumo"]:
+        print(tabela_etapas(), file=sys.stderr)
+    if _instrumentacao["trace"]:
+        gravar_trace(_instrumentacao["trace"])
+        print(f"Trace das etapas gravado em '{_instrumentacao['trace']}'.", file=sys.stderr)
+    _instrumentacao["ativa"] = False
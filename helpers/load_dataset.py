@@ -1,27 +1,218 @@
+import hashlib  # Importa hashlib para calcular a assinatura do arquivo de origem
 import json  # Importa biblioteca para trabalhar com arquivos JSON
+import os  # Importa os para consultar metadados do arquivo e manipular o diretório de cache
+import shutil  # Importa shutil para remover caches antigos
+from array import array  # Importa array para guardar índices e pesos de forma compacta durante a leitura
+
+import numpy as np  # Importa NumPy para os vetores colunares finais
+
 from .easy_log import easy_log  # Importa função de log do módulo easy_log
 
-def load_dataset():  # Define função para carregar o dataset do arquivo JSON
+TAMANHO_BLOCO_LEITURA = 1 << 20  # Quantidade de caracteres lidos por vez do arquivo (1 MiB)
+TAMANHO_MAXIMO_REGISTRO = 16 << 20  # Um registro maior que isso (16 Mi caracteres) é tratado como arquivo malformado
+MARGEM_TRUNCAMENTO = 8  # Erros a menos que isso do fim do buffer podem ser só um literal cortado pelo bloco ("fals", "\u00e")
+TAMANHO_AMOSTRA_ASSINATURA = 1 << 20  # Bytes do início e do fim do arquivo que entram na assinatura do cache
+VERSAO_CACHE = 1  # Incrementar quando o formato do cache mudar
+
+
+# Interações do dataset em formato colunar: um vetor por campo em vez de uma lista de dicionários
+class Interacoes:
+    __slots__ = ("origem", "destino", "peso")  # Sem dicionário por instância
+
+    def __init__(self, origem, destino, peso):  # Recebe os três vetores alinhados
+        self.origem = origem  # Índice da pessoa (campo "from") de cada interação, int32
+        self.destino = destino  # Índice do gênero (campo "to") de cada interação, int32
+        self.peso = peso  # Peso de cada interação (campo "weight"), int64
+
+    def __len__(self):  # Número de interações
+        return len(self.origem)
+
+
+# Percorre os objetos de um array JSON ("[{...}, {...}]") sem carregar o arquivo inteiro na memória
+def _iterar_array_json(arquivo, inicio):
+    decodificador = json.JSONDecoder()  # Decodificador que aceita começar em qualquer posição do texto
+    buffer = inicio  # Texto já lido e ainda não consumido
+    posicao = buffer.index("[") + 1  # Pula o colchete de abertura do array
+    fim_arquivo = False  # Indica se não há mais texto para ler
+
+    while True:  # Loop que consome um registro por vez
+        # Pula espaços e vírgulas entre os registros
+        while posicao < len(buffer) and buffer[posicao] in " \t\r\n,":  # Enquanto houver separadores
+            posicao += 1  # Avança para o próximo caractere
+
+        if posicao < len(buffer) and buffer[posicao] == "]":  # Fim do array
+            return  # Encerra a iteração
+
+        try:  # Tenta decodificar o próximo registro completo
+            if posicao >= len(buffer):  # Não há texto suficiente no buffer
+                raise json.JSONDecodeError("buffer vazio", buffer, posicao)  # Força a leitura de mais texto
+            registro, posicao = decodificador.raw_decode(buffer, posicao)  # Decodifica um objeto e devolve a posição seguinte
+        except json.JSONDecodeError as erro:  # Registro incompleto (precisa ler mais texto) ou malformado
+            if fim_arquivo:  # Se o arquivo já terminou, o JSON está malformado
+                raise ValueError("Array JSON incompleto ou malformado no dataset.")  # Erro de formato
+            # Texto truncado pelo fim do bloco dá erro no fim do buffer, numa string sem fechamento ou num literal cortado
+            # ("tru", "\u00", "1e"); um erro antes disso é um registro malformado, e o resto do arquivo não é lido
+            if erro.pos < len(buffer) - MARGEM_TRUNCAMENTO and not erro.msg.startswith("Unterminated string"):
+                raise ValueError(f"Registro malformado no dataset: {erro.msg} (caractere {erro.pos - posicao + 1} do registro).")  # Erro de formato
+            if len(buffer) - posicao > TAMANHO_MAXIMO_REGISTRO:  # Registro sem fim: não acumula o arquivo inteiro
+                raise ValueError(f"Registro do dataset maior que {TAMANHO_MAXIMO_REGISTRO} caracteres (array JSON malformado?).")
+            bloco = arquivo.read(TAMANHO_BLOCO_LEITURA)  # Lê o próximo bloco de texto
+            fim_arquivo = not bloco  # Bloco vazio indica fim do arquivo
+            buffer = buffer[posicao:] + bloco  # Descarta o que já foi consumido e anexa o bloco novo
+            posicao = 0  # Reinicia a posição no buffer
+            continue  # Tenta decodificar novamente
+
+        yield registro  # Entrega o registro decodificado
+
+
+# Percorre os objetos de um arquivo JSON Lines (um objeto por linha)
+def _iterar_json_lines(arquivo, inicio):
+    yield json.loads(inicio + arquivo.readline())  # Primeira linha (o primeiro caractere já foi lido)
+    for linha in arquivo:  # Demais linhas lidas sob demanda
+        if linha.strip():  # Ignora linhas em branco
+            yield json.loads(linha)  # Decodifica o objeto da linha
+
+
+# Escolhe o leitor pelo primeiro caractere do arquivo: "[" para array JSON, "{" para JSON Lines
+def iterar_registros(arquivo):
+    inicio = arquivo.read(1)  # Lê o primeiro caractere
+    while inicio and inicio.isspace():  # Pula espaços iniciais
+        inicio = arquivo.read(1)  # Lê o próximo caractere
+
+    if inicio == "[":  # Array JSON
+        return _iterar_array_json(arquivo, inicio)  # Leitor incremental de array
+    if inicio == "{":  # JSON Lines
+        return _iterar_json_lines(arquivo, inicio)  # Leitor linha a linha
+    if not inicio:  # Arquivo vazio
+        return iter(())  # Nenhum registro
+    raise ValueError("Formato de dataset não reconhecido: esperado array JSON ou JSON Lines.")  # Formato desconhecido
+
+
+# Reindexa os ids (atribuídos na ordem de aparição) para a ordem alfabética dos nomes
+def _ordenar_vocabulario(indice_por_nome, ids):
+    nomes = list(indice_por_nome)  # Nomes na ordem de aparição (dicionários preservam a ordem de inserção)
+    ordem = sorted(range(len(nomes)), key=nomes.__getitem__)  # Posições dos nomes em ordem alfabética
+    nova_posicao = np.empty(len(nomes), dtype=np.int32)  # Mapeamento id antigo -> id novo
+    nova_posicao[ordem] = np.arange(len(nomes), dtype=np.int32)  # Id novo é a posição na ordem alfabética
+    ids_ordenados = nova_posicao[np.frombuffer(ids, dtype=np.int32)] if len(ids) else np.zeros(0, dtype=np.int32)  # Aplica o mapeamento a todas as interações de uma vez
+    return ids_ordenados, [nomes[indice] for indice in ordem]  # Retorna ids reindexados e vocabulário ordenado
+
 
-    data = {}  # Inicializa variável que armazenará os dados do JSON
-    pessoas = set()  # Cria conjunto vazio para armazenar pessoas únicas (set remove duplicatas automaticamente)
-    generos = set()  # Cria conjunto vazio para armazenar gêneros únicos (set remove duplicatas automaticamente)
+# Diretório do cache binário, ao lado do arquivo de origem (ex.: dataset.json.cache/)
+def caminho_cache(caminho):
+    return f"{caminho}.cache"  # Mesmo nome do dataset com o sufixo .cache
+
+
+# Assinatura do arquivo de origem: tamanho, data de modificação e hash do início e do fim do conteúdo
+def assinatura_dataset(caminho):
+    estado = os.stat(caminho)  # Metadados do arquivo
+    resumo = hashlib.sha256()  # Hash do conteúdo amostrado
+    with open(caminho, "rb") as arquivo:  # Abre em modo binário
+        resumo.update(arquivo.read(TAMANHO_AMOSTRA_ASSINATURA))  # Início do arquivo
+        if estado.st_size > 2 * TAMANHO_AMOSTRA_ASSINATURA:  # Arquivo grande: amostra também o fim
+            arquivo.seek(-TAMANHO_AMOSTRA_ASSINATURA, os.SEEK_END)  # Posiciona no último bloco
+        resumo.update(arquivo.read())  # Restante (ou fim) do arquivo
+    return {  # Dicionário serializável em JSON
+        "versao": VERSAO_CACHE,  # Versão do formato do cache
+        "tamanho": estado.st_size,  # Tamanho em bytes
+        "modificado_ns": estado.st_mtime_ns,  # Data de modificação em nanossegundos
+        "sha256": resumo.hexdigest(),  # Hash do conteúdo amostrado
+    }
+
+
+# Lê o cache binário com memória mapeada; retorna None se ele não existir ou não corresponder ao arquivo atual
+# Um cache corrompido (índice ilegível, vetor ausente, truncado ou inconsistente) é apagado e refeito a partir do JSON
+def carregar_cache(caminho):
+    diretorio = caminho_cache(caminho)  # Diretório do cache
+    try:  # Tenta ler o índice do cache
+        with open(os.path.join(diretorio, "vocabulario.json"), "r", encoding="utf-8") as arquivo:  # Vocabulários e assinatura
+            vocabulario = json.load(arquivo)  # Carrega o índice do cache
+    except FileNotFoundError:  # Cache inexistente
+        return None  # Sem cache
+    except json.JSONDecodeError:  # Índice corrompido
+        return _invalidar_cache(diretorio)  # Sem cache válido
+
+    if vocabulario.get("assinatura") != assinatura_dataset(caminho):  # Arquivo de origem mudou desde a criação do cache
+        return None  # Cache desatualizado
+
+    try:  # Vetores gravados junto com o índice
+        # mmap_mode="r" mapeia os vetores sem copiá-los para a memória
+        data = Interacoes(  # Vetores colunares lidos do disco sob demanda
+            np.load(os.path.join(diretorio, "origem.npy"), mmap_mode="r"),  # Ids das pessoas
+            np.load(os.path.join(diretorio, "destino.npy"), mmap_mode="r"),  # Ids dos gêneros
+            np.load(os.path.join(diretorio, "peso.npy"), mmap_mode="r"),  # Pesos
+        )
+        pessoas, generos = vocabulario["pessoas"], vocabulario["generos"]  # Vocabulários ordenados
+    except (OSError, ValueError, KeyError):  # Vetor ausente, truncado ou com cabeçalho inválido
+        return _invalidar_cache(diretorio)  # Sem cache válido
+    if not len(data.origem) == len(data.destino) == len(data.peso):  # Vetores de tamanhos diferentes (gravação interrompida)
+        return _invalidar_cache(diretorio)  # Sem cache válido
+    return data, pessoas, generos  # Mesma tupla de load_dataset
+
+
+# Apaga um cache corrompido (será gravado de novo depois da leitura do JSON) e devolve None
+def _invalidar_cache(diretorio):
+    easy_log("WARNING", f"Cache do dataset em '{diretorio}' corrompido; relendo o arquivo de origem.")  # Avisa
+    shutil.rmtree(diretorio, ignore_errors=True)  # Remove o cache inteiro
+    return None  # Sem cache válido
+
+
+# Grava o cache binário (.npy + vocabulário JSON) em um diretório temporário e o troca de uma vez pelo anterior
+def salvar_cache(caminho, data, pessoas, generos):
+    diretorio = caminho_cache(caminho)  # Diretório final do cache
+    temporario = f"{diretorio}.tmp{os.getpid()}"  # Diretório temporário exclusivo deste processo
+    os.makedirs(temporario, exist_ok=True)  # Cria o diretório temporário
+
+    np.save(os.path.join(temporario, "origem.npy"), data.origem)  # Ids das pessoas
+    np.save(os.path.join(temporario, "destino.npy"), data.destino)  # Ids dos gêneros
+    np.save(os.path.join(temporario, "peso.npy"), data.peso)  # Pesos
+    with open(os.path.join(temporario, "vocabulario.json"), "w", encoding="utf-8") as arquivo:  # Índice do cache
+        json.dump({"assinatura": assinatura_dataset(caminho), "pessoas": pessoas, "generos": generos}, arquivo, ensure_ascii=False)  # Assinatura e vocabulários ordenados
+
+    shutil.rmtree(diretorio, ignore_errors=True)  # Remove o cache anterior (se existir)
+    os.replace(temporario, diretorio)  # Publica o cache novo
+
+
+def load_dataset(caminho="dataset.json", usar_cache=True):  # Define função para carregar o dataset (array JSON ou JSON Lines) de forma incremental
+
+    if usar_cache and os.path.exists(caminho):  # Tenta primeiro o cache binário ao lado do arquivo
+        em_cache = carregar_cache(caminho)  # Vetores mapeados em memória (ou None)
+        if em_cache is not None:  # Cache válido para a versão atual do arquivo
+            data, pessoas, generos = em_cache  # Desempacota a tupla
+            easy_log("SUCCESS", f"Arquivo '{caminho}' carregado do cache binário.")  # Exibe mensagem de sucesso
+            easy_log("INFO", f"Carregados: {len(data)} interações, {len(pessoas)} pessoas únicas, {len(generos)} gêneros únicos.")  # Exibe estatísticas do dataset carregado
+            return (data, pessoas, generos)  # Retorna sem reprocessar o JSON
+
+    indice_por_pessoa = {}  # Nome da pessoa -> id inteiro (atribuído na primeira aparição)
+    indice_por_genero = {}  # Nome do gênero -> id inteiro (atribuído na primeira aparição)
+    origem = array("i")  # Id da pessoa de cada interação
+    destino = array("i")  # Id do gênero de cada interação
+    peso = array("q")  # Peso de cada interação
 
     try:  # Tenta executar bloco de código que pode gerar erro
-        with open("dataset.json", "r", encoding="utf-8") as json_file:  # Abre arquivo JSON para leitura com codificação UTF-8
-            data = json.load(json_file)  # Carrega conteúdo do arquivo JSON e converte para estrutura Python
-            easy_log("SUCCESS", "Arquivo 'dataset.json' carregado com sucesso.")  # Exibe mensagem de sucesso
+        with open(caminho, "r", encoding="utf-8") as json_file:  # Abre arquivo para leitura com codificação UTF-8
+            for item in iterar_registros(json_file):  # Loop que percorre cada registro sem manter a lista inteira
+                # setdefault devolve o id existente ou registra o nome com o próximo id livre
+                origem.append(indice_por_pessoa.setdefault(item["from"], len(indice_por_pessoa)))  # Interna a pessoa (campo "from")
+                destino.append(indice_por_genero.setdefault(item["to"], len(indice_por_genero)))  # Interna o gênero (campo "to")
+                peso.append(int(item.get("weight", 1)))  # Peso da relação (ou 1 se não existir)
     except FileNotFoundError:  # Se arquivo não for encontrado
-        easy_log("ERROR", "O arquivo 'dataset.json' não foi encontrado.")  # Exibe mensagem de erro
-        exit()  # Encerra execução do programa
-
-    for item in data:  # Loop que percorre cada item (relação) no dataset
-        pessoas.add(item["from"])  # Adiciona pessoa ao conjunto (campo "from")
-        generos.add(item["to"])  # Adiciona gênero ao conjunto (campo "to")
+        easy_log("ERROR", f"O arquivo '{caminho}' não foi encontrado.")  # Exibe mensagem de erro
+        raise FileNotFoundError(f"O arquivo '{caminho}' não foi encontrado.") from None  # Propaga o erro para quem chamou decidir o que fazer
+    except KeyError as erro:  # Se algum registro não tiver "from" ou "to"
+        raise ValueError(f"Registro do dataset sem o campo obrigatório {erro}.") from None  # Erro de formato
+    easy_log("SUCCESS", f"Arquivo '{caminho}' carregado com sucesso.")  # Exibe mensagem de sucesso
 
-    easy_log("INFO", f"Carregados: {len(data)} interações, {len(pessoas)} pessoas únicas, {len(generos)} gêneros únicos.")  # Exibe estatísticas do dataset carregado
-    return (data, sorted(list(pessoas)), sorted(list(generos)))  # Retorna tupla com: dados brutos, lista ordenada de pessoas, lista ordenada de gêneros
+    # Ids finais seguem a ordem alfabética, a mesma das listas de pessoas e gêneros
+    origem_ordenada, pessoas = _ordenar_vocabulario(indice_por_pessoa, origem)  # Reindexa pessoas
+    destino_ordenado, generos = _ordenar_vocabulario(indice_por_genero, destino)  # Reindexa gêneros
+    data = Interacoes(origem_ordenada, destino_ordenado, np.frombuffer(peso, dtype=np.int64).copy())  # Vetores colunares
 
-    
+    if usar_cache:  # Grava o cache para as próximas execuções
+        try:  # Falha ao gravar o cache não impede o uso do dataset
+            salvar_cache(caminho, data, pessoas, generos)  # Vetores .npy e vocabulários ao lado do arquivo
+        except OSError as erro:  # Ex.: diretório sem permissão de escrita
+            easy_log("WARNING", f"Não foi possível gravar o cache do dataset: {erro}")  # Apenas avisa
 
-    
\ No newline at end of file
+    easy_log("INFO", f"Carregados: {len(data)} interações, {len(pessoas)} pessoas únicas, {len(generos)} gêneros únicos.")  # Exibe estatísticas do dataset carregado
+    return (data, pessoas, generos)  # Retorna tupla com: interações colunares, lista ordenada de pessoas, lista ordenada de gêneros
@@ -0,0 +1,153 @@
+import csv  # Importa csv para as colunas por nó em texto
+import json  # Importa json para as colunas por nó em JSON Lines
+import os  # Importa os para os caminhos do relatório e das colunas
+import shutil  # Importa shutil para reaproveitar relatórios já gravados
+from itertools import islice  # Importa islice para as primeiras entradas sem montar listas inteiras
+
+import numpy as np  # Importa NumPy para os resumos e o top-N
+
+# Relatórios de métricas gravados aos poucos: cada linha vai para o arquivo assim que é produzida (nada de
+# montar o texto inteiro em memória). Grafos pequenos mantêm as listas completas por nó no texto; nos grandes
+# o texto fica com resumos (mínimo, média, máximo) e os N maiores, e os valores de cada nó vão para um
+# arquivo colunar (CSV, JSON Lines ou .npz) ao lado do relatório.
+
+LIMITE_DETALHADO = 1000  # Até esta quantidade de nós o texto lista cada nó (relatórios de sempre)
+TOP_N_PADRAO = 10  # Nós listados nas seções resumidas
+PRIMEIROS_NOMES = 20  # Nomes mostrados na lista de vértices resumida
+LINHAS_POR_LOTE = 65536  # Linhas convertidas de uma vez ao gravar (limita a memória das listas Python)
+FORMATOS_COLUNAS = ("csv", "jsonl", "npz")  # Formatos do arquivo colunar
+
+
+# Caminho do arquivo colunar de um relatório: metricas_x.txt -> metricas_x_nos.csv
+def caminho_colunas(caminho_relatorio, formato):
+    return f"{os.path.splitext(caminho_relatorio)[0]}_nos.{formato}"
+
+
+# Valores por nó gravados em formato colunar, em lotes de linhas; NaN vira campo vazio (CSV) ou null (JSONL)
+def gravar_colunas(caminho, nomes, colunas, formato="csv"):
+    if formato not in FORMATOS_COLUNAS:
+        raise ValueError(f"Formato das colunas inválido: {formato!r} (use {', '.join(FORMATOS_COLUNAS)}).")
+    chaves = sorted(colunas)  # Ordem estável das colunas
+    if formato == "npz":  # Vetores binários (lidos com np.load)
+        np.savez(caminho, nome=np.asarray(nomes, dtype=str), **{chave: np.asarray(colunas[chave]) for chave in chaves})
+        return caminho
+    with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+        escritor = csv.writer(arquivo) if formato == "csv" else None
+        if escritor is not None:
+            escritor.writerow(["nome"] + chaves)
+        for inicio in range(0, len(nomes), LINHAS_POR_LOTE):  # Loop que grava um lote de nós por vez
+            fim = min(inicio + LINHAS_POR_LOTE, len(nomes))
+            lote = [np.asarray(colunas[chave][inicio:fim]).tolist() for chave in chaves]  # Só o lote vira lista Python (inteiros continuam inteiros)
+            for nome, *valores in zip(nomes[inicio:fim], *lote):
+                valores = [None if valor != valor else valor for valor in valores]  # NaN (nó fora da amostra ou indefinido)
+                if escritor is not None:
+                    escritor.writerow([nome] + ["" if valor is None else repr(valor) for valor in valores])
+                else:
+                    arquivo.write(json.dumps({"nome": nome, **dict(zip(chaves, valores))}, ensure_ascii=False) + "\n")
+    return caminho
+
+
+# Modo do relatório de um grafo: (texto detalhado, formato do arquivo colunar ou None)
+# detalhado=None decide pelo tamanho do grafo; formato_colunas="auto" grava o CSV só quando o texto é resumido
+def modo_relatorio(quantidade_nos, detalhado=None, formato_colunas="auto"):
+    detalhado = quantidade_nos <= LIMITE_DETALHADO if detalhado is None else detalhado  # Listas completas por nó
+    if formato_colunas == "auto":  # Valores por nó em arquivo só quando o texto não os lista
+        formato_colunas = None if detalhado else "csv"
+    if formato_colunas is not None and formato_colunas not in FORMATOS_COLUNAS:
+        raise ValueError(f"Formato das colunas inválido: {formato_colunas!r} (use {', '.join(FORMATOS_COLUNAS)}).")
+    return detalhado, formato_colunas
+
+
+# Relatório de texto gravado linha a linha; use como "with EscritorRelatorio(caminho, quantidade_nos) as relatorio:"
+class EscritorRelatorio:
+    def __init__(self, caminho, quantidade_nos, detalhado=None, top_n=TOP_N_PADRAO, formato_colunas="auto"):
+        self.caminho = caminho  # Arquivo do relatório de texto
+        self.detalhado, self.formato_colunas = modo_relatorio(quantidade_nos, detalhado, formato_colunas)  # Listas completas por nó e formato das colunas (None = sem arquivo colunar)
+        self.top_n = top_n  # Nós listados nas seções resumidas
+        self._arquivo = None
+        self._primeira = True  # A primeira linha não tem quebra antes (mesmo texto do "\n".join de antes)
+
+    def __enter__(self):
+        self._arquivo = open(self.caminho, "w", encoding="utf-8")
+        return self
+
+    def __exit__(self, tipo, erro, rastro):
+        self._arquivo.close()
+        return False  # Não engole exceções
+
+    # Caminho do arquivo colunar (None se não houver)
+    def caminho_colunas(self):
+        return caminho_colunas(self.caminho, self.formato_colunas) if self.formato_colunas else None
+
+    # Grava uma linha de texto
+    def linha(self, texto=""):
+        self._arquivo.write(texto if self._primeira else "\n" + texto)
+        self._primeira = False
+
+    # Grava várias linhas de texto
+    def linhas(self, textos):
+        for texto in textos:
+            self.linha(texto)
+
+    # Lista de nomes: completa (repr da lista, como antes) ou os primeiros e quantos faltam
+    def nomes(self, nomes):
+        if self.detalhado:
+            self.linha(str(list(nomes)))
+            return
+        primeiros = list(islice(nomes, PRIMEIROS_NOMES))
+        restantes = len(nomes) - len(primeiros)
+        self.linha(f"{primeiros!r}" + (f" ... e mais {restantes}" if restantes > 0 else ""))
+
+    # Uma métrica por nó: no modo detalhado, uma linha "  nome: valor" por nó (gravadas em lotes); no resumido,
+    # mínimo, média e máximo e os top_n maiores valores. formato: None usa str(valor), senão "{:.4f}" etc.
+    # NaN (ex.: redundância com grau < 2, nós fora de uma amostra) não é listado nem entra no resumo
+    def por_no(self, nomes, valores, formato=None, ignorar_nan=False):
+        valores = np.asarray(valores)
+        formatar = str if formato is None else formato.format
+        if self.detalhado:
+            for inicio in range(0, len(valores), LINHAS_POR_LOTE):  # Loop que grava um lote de nós por vez
+                fim = min(inicio + LINHAS_POR_LOTE, len(valores))
+                for nome, valor in zip(nomes[inicio:fim], valores[inicio:fim].tolist()):
+                    if not (ignorar_nan and valor != valor):
+                        self.linha(f"  {nome}: {formatar(valor)}")
+            return
+        validos = np.flatnonzero(~np.isnan(valores.astype(float)))  # Nós com valor definido
+        if len(validos) == 0:
+            self.linha("  (nenhum valor definido)")
+            return
+        selecionados = valores[validos].astype(float)
+        self.linha(f"  {len(validos)} nós; mínimo {formatar(valores[validos].min().item())}, média {selecionados.mean():.4f}, "
+                   f"máximo {formatar(valores[validos].max().item())}")
+        quantidade = min(self.top_n, len(validos))
+        maiores = validos[np.argpartition(-selecionados, quantidade - 1)[:quantidade]]  # Top-N sem ordenar tudo
+        maiores = maiores[np.lexsort((maiores, -valores[maiores].astype(float)))]  # Maior primeiro; empate pela ordem dos nós
+        self.linha(f"  Maiores ({quantidade}):")
+        for indice, valor in zip(maiores.tolist(), valores[maiores].tolist()):
+            self.linha(f"    {nomes[indice]}: {formatar(valor)}")
+
+    # Fecha o relatório com o arquivo colunar (se houver) e devolve os arquivos gravados
+    def gravar_colunas(self, nomes, colunas):
+        caminho = self.caminho_colunas()
+        if caminho is None:
+            return [self.caminho]
+        gravar_colunas(caminho, nomes, colunas, self.formato_colunas)
+        return [self.caminho, caminho]
+
+
+# Identifica os arquivos gravados (caminho, tamanho e data de modificação) para reaproveitá-los depois
+def registrar_arquivos(caminhos):
+    return [(caminho, os.stat(caminho).st_size, os.stat(caminho).st_mtime_ns) for caminho in caminhos]
+
+
+# Reaproveita um relatório já gravado (copia o texto e o arquivo colunar para o novo caminho); devolve False se
+# algum arquivo registrado sumiu ou mudou desde então (ex.: sobrescrito por outro cálculo) e precisa ser refeito
+def reaproveitar_relatorio(registro, caminho_relatorio):
+    for caminho, tamanho, modificacao in registro:  # Loop que confere os arquivos registrados
+        if not os.path.exists(caminho) or (os.stat(caminho).st_size, os.stat(caminho).st_mtime_ns) != (tamanho, modificacao):
+            return False
+    texto_anterior = registro[0][0]  # O primeiro é o relatório de texto
+    for anterior, _, _ in registro:  # Loop que copia o texto e as colunas para o novo caminho
+        destino = caminho_relatorio if anterior == texto_anterior else caminho_colunas(caminho_relatorio, os.path.splitext(anterior)[1][1:])
+        if os.path.abspath(anterior) != os.path.abspath(destino):
+            shutil.copyfile(anterior, destino)
+    return True
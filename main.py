@@ -1,8 +1,72 @@
+import argparse
+import sys
+
+import matplotlib.pyplot as plt
+
 from helpers.load_dataset import load_dataset
-from helpers.easy_log import easy_log
+from helpers.easy_log import easy_log, etapa, definir_nivel, iniciar_instrumentacao, NIVEIS
+from helpers.cache_sessao import CacheSessao, ORCAMENTO_PADRAO
+from helpers.armazenamento import ArmazemResultados, impressao_digital, DIRETORIO_PADRAO
+from helpers.relatorio import FORMATOS_COLUNAS, LIMITE_DETALHADO, TOP_N_PADRAO
 from grafos.incidencia import gerar_incidencia
 from grafos.coocorrencia import gerar_coocorrencia
 from grafos.similaridade import gerar_similaridade
+from grafos.matrizes import construir_matriz_incidencia, NORMALIZACOES
+from grafos.minhash import METODOS_SIMILARIDADE, TOP_K_PADRAO
+from grafos.lote import executar_lote
+from grafos.bipartido import METRICAS_OPCIONAIS
+from grafos.layout import limpar_cache_posicoes
+
+# Códigos de saída (o argparse já usa 2 para argumentos inválidos)
+CODIGO_SUCESSO = 0
+CODIGO_FALHA_ANALISE = 1
+CODIGO_FALHA_DATASET = 3
+
+def ler_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Análise de matrizes e grafos - categorias de anime")
+    parser.add_argument("--all", dest="todas", action="store_true", help="executa todas as análises sem menus, gravando figuras e métricas em --out")
+    parser.add_argument("--out", dest="saida", default="saida", help="diretório de saída das figuras e relatórios (padrão: saida)")
+    parser.add_argument("--dataset", default="dataset.json", help="arquivo do dataset (padrão: dataset.json)")
+    parser.add_argument("--formatos", nargs="+", default=["png"], choices=["png", "svg", "pdf"], help="formatos das figuras (padrão: png)")
+    parser.add_argument("--processos", type=int, default=None, help="processos usados para desenhar as figuras (padrão: todos os núcleos)")
+    parser.add_argument("--resultados", default=DIRETORIO_PADRAO, help=f"diretório do armazém de matrizes, grafos e métricas do modo em lote (padrão: {DIRETORIO_PADRAO})")
+    parser.add_argument("--coocorrencia-normalizacao", default=None, choices=NORMALIZACOES, help="pesos das arestas de coocorrência normalizados (padrão: contagens)")
+    parser.add_argument("--coocorrencia-limiar", type=float, default=None, help="peso mínimo (já normalizado) das arestas de coocorrência")
+    parser.add_argument("--coocorrencia-minimo", type=int, default=None, help="mínimo de pessoas em comum para manter um par de gêneros")
+    parser.add_argument("--coocorrencia-significancia", type=float, default=None, help="mantém só os pares com valor-p hipergeométrico abaixo deste valor (ex.: 0.01)")
+    parser.add_argument("--similaridade-metodo", default="exato", choices=METODOS_SIMILARIDADE, help="exato (M @ M^T) ou minhash (grafo k-NN aproximado por MinHash/LSH, para muitas pessoas)")
+    parser.add_argument("--similaridade-top-k", type=int, default=None, help=f"vizinhos mantidos por pessoa na similaridade (padrão: todos; no minhash, {TOP_K_PADRAO})")
+    parser.add_argument("--similaridade-hashes", type=int, default=128, help="tamanho da assinatura MinHash (padrão: 128)")
+    parser.add_argument("--similaridade-bandas", type=int, default=64, help="bandas do LSH; mais bandas = maior revocação e mais pares pontuados (padrão: 64; divide --similaridade-hashes)")
+    parser.add_argument("--similaridade-processos", type=int, default=None, help="processos do produto exato da similaridade, dividido em fragmentos de pessoas (padrão: todos os núcleos a partir de 1000 pessoas)")
+    parser.add_argument("--comunidades", action="store_true", help="detecta comunidades (Louvain) na coocorrência e na similaridade: desenha o grafo condensado (uma bolha por comunidade) e acrescenta o resumo das comunidades às métricas")
+    parser.add_argument("--comunidades-resolucao", type=float, default=1.0, help="resolução da modularidade; maior que 1 gera comunidades menores, menor que 1 maiores (padrão: 1.0)")
+    parser.add_argument("--relatorio", default="auto", choices=["auto", "completo", "resumido"], help=f"texto dos relatórios de métricas: completo (um valor por nó), resumido (mínimo, média, máximo e os maiores) ou auto (completo até {LIMITE_DETALHADO} nós)")
+    parser.add_argument("--relatorio-colunas", default="auto", choices=["auto", *FORMATOS_COLUNAS, "nenhum"], help="arquivo com os valores de cada nó gravado ao lado do relatório (metricas_*_nos.csv); auto = CSV só quando o texto é resumido")
+    parser.add_argument("--relatorio-top", type=int, default=TOP_N_PADRAO, help=f"nós listados em cada seção do relatório resumido (padrão: {TOP_N_PADRAO})")
+    parser.add_argument("--intermediacao-amostra", type=int, default=None, metavar="K", help="intermediação (betweenness) da coocorrência e da similaridade aproximada por K pivôs sorteados, para grafos grandes (padrão: exata, O(V·E))")
+    parser.add_argument("--aglomeracao-amostra", type=int, default=None, metavar="K", help="aglomeração média da coocorrência e da similaridade estimada com K nós sorteados, com o erro padrão no relatório (padrão: todos os nós)")
+    parser.add_argument("--semente", type=int, default=42, help="semente dos sorteios das métricas aproximadas (padrão: 42)")
+    parser.add_argument("--incidencia-metricas", nargs="+", default=[], choices=METRICAS_OPCIONAIS, help="métricas bipartidas acrescentadas ao relatório de incidência; proximidade faz BFS de todos os nós e aglomeracao/redundancia percorrem as projeções (padrão: nenhuma, só densidade, graus, forças e centralidade de grau)")
+    parser.add_argument("--apenas-estatisticas", action="store_true", help="relatórios de métricas só com as estatísticas básicas (graus, forças, densidade, arestas e pesos), calculadas nas matrizes sem montar o grafo NetworkX")
+    parser.add_argument("--nivel-log", default=None, choices=[nivel for nivel in NIVEIS if nivel not in ("OPTION", "CASE")], help="mensagens abaixo deste nível não são exibidas (padrão: INFO; DEBUG mostra o tempo de cada etapa)")
+    parser.add_argument("--tempos", action="store_true", help="mede cada etapa (carga, matrizes, grafos, métricas, figuras) e exibe uma tabela de tempos no fim")
+    parser.add_argument("--tempos-memoria", action="store_true", help="com --tempos, mede também o pico de memória de cada etapa (tracemalloc; deixa o programa mais lento)")
+    parser.add_argument("--trace", default=None, help="grava as etapas medidas em um trace JSON (chrome://tracing ou ui.perfetto.dev); implica --tempos")
+    parser.add_argument("--perfil", default=None, metavar="ETAPA", help="executa a etapa informada (ex.: metricas_similaridade) com cProfile e grava perfil_ETAPA.prof/.txt")
+    parser.add_argument("--memoria-cache", type=int, default=ORCAMENTO_PADRAO // (1024 * 1024), help="memória (MiB) para guardar as análises já construídas na sessão (padrão: 512)")
+    argumentos = parser.parse_args(argv)
+    if argumentos.similaridade_bandas < 1 or argumentos.similaridade_hashes % argumentos.similaridade_bandas:
+        parser.error("--similaridade-bandas precisa dividir --similaridade-hashes")
+    if argumentos.comunidades_resolucao <= 0:
+        parser.error("--comunidades-resolucao precisa ser positiva")
+    if argumentos.intermediacao_amostra is not None and argumentos.intermediacao_amostra < 1:
+        parser.error("--intermediacao-amostra precisa ser pelo menos 1")
+    if argumentos.aglomeracao_amostra is not None and argumentos.aglomeracao_amostra < 1:
+        parser.error("--aglomeracao-amostra precisa ser pelo menos 1")
+    if argumentos.relatorio_top < 1:
+        parser.error("--relatorio-top precisa ser pelo menos 1")
+    return argumentos
 
 def menu_principal():
     easy_log("SUCCESS", "ANÁLISE DE MATRIZES E GRAFOS - CATEGORIAS DE ANIME")
@@ -12,6 +76,7 @@ def menu_principal():
     easy_log("CASE", "  2 - Analisar Coocorrência")
     easy_log("CASE", "  3 - Analisar Similaridade")
     easy_log("CASE", "  4 - Executar todas as análises")
+    easy_log("CASE", "  5 - Recarregar dataset")
     easy_log("CASE", "  0 - Sair\n")
 
 def menu_interno(tipo):
@@ -25,29 +90,111 @@ def menu_interno(tipo):
     easy_log("CASE", "  5 - Todas as opções acima")
     easy_log("CASE", "  0 - Voltar ao menu principal\n")
 
+@etapa("carregar")
+def carregar_dados(caminho):
+    easy_log("INFO", "Carregando dataset...")
+    with etapa("dataset"):
+        data, pessoas, generos = load_dataset(caminho)
+    easy_log("SUCCESS", f"Dataset carregado com sucesso: {len(data)} interações, {len(pessoas)} pessoas, {len(generos)} gêneros\n")
+    # Matriz de incidência esparsa construída uma única vez e compartilhada pelas três análises
+    with etapa("matriz_incidencia"):
+        matriz_incidencia = construir_matriz_incidencia(data, pessoas, generos)
+    return data, pessoas, generos, matriz_incidencia
+
+def executar_todas(pessoas, generos, matriz_incidencia, diretorio_saida, formatos, processos=None, armazem=None, opcoes=None, opcoes_relatorio=None, opcoes_metricas=None):
+    easy_log("INFO", f"Executando todas as análises (saída em '{diretorio_saida}')...")
+    arquivos, entradas_armazem, falhas = executar_lote(pessoas, generos, matriz_incidencia, diretorio_saida, formatos, processos, armazem=armazem, opcoes=opcoes, opcoes_relatorio=opcoes_relatorio, opcoes_metricas=opcoes_metricas)
+    for descricao, erro in falhas:
+        easy_log("ERROR", f"Erro em {descricao}: {erro}")
+    gravados = f"{len(arquivos)} arquivo(s) gravado(s) em '{diretorio_saida}'"
+    if armazem is not None:
+        gravados += f" e {len(entradas_armazem)} entrada(s) no armazém de resultados"
+    if falhas:
+        easy_log("WARNING", f"{len(falhas)} etapa(s) falharam; {gravados}.")
+        return CODIGO_FALHA_ANALISE
+    easy_log("SUCCESS", f"Todas as análises foram concluídas com sucesso! {gravados}.")
+    return CODIGO_SUCESSO
+
+
+def main(argv=None):
+    argumentos = ler_argumentos(argv)
+    if argumentos.nivel_log:
+        definir_nivel(argumentos.nivel_log)
+    if argumentos.tempos or argumentos.tempos_memoria or argumentos.trace or argumentos.perfil:
+        # Tabela de tempos (e trace) exibida ao sair do programa
+        iniciar_instrumentacao(
+            memoria=argumentos.tempos_memoria,
+            perfil=argumentos.perfil,
+            resumo=argumentos.tempos or argumentos.tempos_memoria or bool(argumentos.trace),
+            trace=argumentos.trace,
+        )
+    if argumentos.todas:
+        # Modo em lote: sem janelas, apto a rodar pelo cron
+        plt.switch_backend("Agg")
 
-def main():
     easy_log("INFO", "Iniciando aplicação de análise de matrizes e grafos...")
     
     try:
-        easy_log("INFO", "Carregando dataset...")
-        data, pessoas, generos = load_dataset()
-        easy_log("SUCCESS", f"Dataset carregado com sucesso: {len(data)} interações, {len(pessoas)} pessoas, {len(generos)} gêneros\n")
+        data, pessoas, generos, matriz_incidencia = carregar_dados(argumentos.dataset)
     except Exception as e:
         easy_log("ERROR", f"Erro ao carregar dataset: {e}")
-        return
+        return CODIGO_FALHA_DATASET
+
+    # Parâmetros extras de cada análise (os mesmos no menu e no modo em lote)
+    opcoes = {"coocorrencia": {
+        "normalizacao": argumentos.coocorrencia_normalizacao,
+        "limiar": argumentos.coocorrencia_limiar,
+        "minimo_coocorrencias": argumentos.coocorrencia_minimo,
+        "significancia": argumentos.coocorrencia_significancia,
+        "comunidades": argumentos.comunidades,
+        "resolucao_comunidades": argumentos.comunidades_resolucao,
+    }, "similaridade": {
+        "metodo": argumentos.similaridade_metodo,
+        "top_k": argumentos.similaridade_top_k,
+        "quantidade_hashes": argumentos.similaridade_hashes,
+        "bandas": argumentos.similaridade_bandas,
+        "processos": argumentos.similaridade_processos,
+        "comunidades": argumentos.comunidades,
+        "resolucao_comunidades": argumentos.comunidades_resolucao,
+    }}
+    # Texto dos relatórios de métricas (completo ou resumido) e arquivo com os valores de cada nó
+    opcoes_relatorio = {
+        "detalhado": {"auto": None, "completo": True, "resumido": False}[argumentos.relatorio],
+        "top_n": argumentos.relatorio_top,
+        "formato_colunas": None if argumentos.relatorio_colunas == "nenhum" else argumentos.relatorio_colunas,
+        "apenas_estatisticas": argumentos.apenas_estatisticas,
+    }
+    # Métricas calculadas por cada análise (as caras ficam desligadas ou amostradas por padrão)
+    metricas_projecoes = {
+        "amostra_intermediacao": argumentos.intermediacao_amostra,
+        "amostra_aglomeracao": argumentos.aglomeracao_amostra,
+        "semente": argumentos.semente,
+    }
+    opcoes_metricas = {"incidencia": {
+        "metricas_opcionais": tuple(argumentos.incidencia_metricas),
+    }, "coocorrencia": metricas_projecoes, "similaridade": metricas_projecoes}
+
+    if argumentos.todas:
+        # Resultados também gravados em disco, separados pela impressão digital do dataset
+        armazem = ArmazemResultados(impressao_digital(data, pessoas, generos), argumentos.resultados)
+        easy_log("INFO", f"Armazém de resultados: '{armazem.diretorio}'")
+        return executar_todas(pessoas, generos, matriz_incidencia, argumentos.saida, argumentos.formatos, argumentos.processos, armazem, opcoes, opcoes_relatorio, opcoes_metricas)
+
+    # Análises já construídas (matrizes, grafos, layouts e métricas) guardadas entre as idas e voltas nos menus
+    # Cada análise avisa o cache quando cresce (grafo NetworkX, relatórios e comunidades feitos sob demanda) para ser medida de novo
+    cache = CacheSessao(argumentos.memoria_cache * 1024 * 1024, compartilhados=(data, pessoas, generos, matriz_incidencia))
 
     while True:
         menu_principal()
-        opcao = input("Digite a opção desejada (0-4): ").strip()
+        opcao = input("Digite a opção desejada (0-5): ").strip()
 
         if opcao == "1":
             easy_log("INFO", "Abrindo menu de Incidência...")
-            gerar_matriz, gerar_grafo, gerar_matriz_e_grafo, calcular_metricas = gerar_incidencia(data, pessoas, generos)
+            gerar_matriz, gerar_grafo, gerar_matriz_e_grafo, calcular_metricas = cache.obter("incidencia", lambda: gerar_incidencia(data, pessoas, generos, matriz_incidencia, ao_crescer=lambda: cache.atualizar("incidencia")))
             while True:
                 menu_interno("INCIDÊNCIA")
 
-                sub_opcao = input("Digite a opção desejada (0-4): ").strip()
+                sub_opcao = input("Digite a opção desejada (0-5): ").strip()
 
                 if sub_opcao == "1":
                     gerar_matriz()
@@ -56,26 +203,24 @@ def main():
                 elif sub_opcao == "3":
                     gerar_matriz_e_grafo()
                 elif sub_opcao == "4":
-                    calcular_metricas()
+                    calcular_metricas(**opcoes_relatorio, **opcoes_metricas.get("incidencia", {}))
                 elif sub_opcao == "5":
-                    gerar_matriz()
-                    gerar_grafo()
                     gerar_matriz_e_grafo()
-                    calcular_metricas()
+                    calcular_metricas(**opcoes_relatorio, **opcoes_metricas.get("incidencia", {}))
                 elif sub_opcao == "0":
                     break
                 else:
-                    easy_log("WARNING", "Opção inválida! Digite uma opção entre 0 e 4.")
+                    easy_log("WARNING", "Opção inválida! Digite uma opção entre 0 e 5.")
                 
                 input("\nPressione ENTER para continuar...")
 
         elif opcao == "2":
             easy_log("INFO", "Abrindo menu de Coocorrência...")
-            gerar_matriz, gerar_grafo, gerar_matriz_e_grafo, calcular_metricas = gerar_coocorrencia(data, pessoas, generos)
+            gerar_matriz, gerar_grafo, gerar_matriz_e_grafo, calcular_metricas = cache.obter("coocorrencia", lambda: gerar_coocorrencia(data, pessoas, generos, matriz_incidencia, **opcoes["coocorrencia"], ao_crescer=lambda: cache.atualizar("coocorrencia")))
             while True:
                 menu_interno("COOCORRÊNCIA")
 
-                sub_opcao = input("Digite a opção desejada (0-4): ").strip()
+                sub_opcao = input("Digite a opção desejada (0-5): ").strip()
 
                 if sub_opcao == "1":
                     gerar_matriz()
@@ -84,25 +229,23 @@ def main():
                 elif sub_opcao == "3":
                     gerar_matriz_e_grafo()
                 elif sub_opcao == "4":
-                    calcular_metricas()
+                    calcular_metricas(**opcoes_relatorio, **opcoes_metricas.get("coocorrencia", {}))
                 elif sub_opcao == "5":
-                    gerar_matriz()
-                    gerar_grafo()
                     gerar_matriz_e_grafo()
-                    calcular_metricas()
+                    calcular_metricas(**opcoes_relatorio, **opcoes_metricas.get("coocorrencia", {}))
                 elif sub_opcao == "0":
                     break
                 else:
-                    easy_log("WARNING", "Opção inválida! Digite uma opção entre 0 e 4.")
+                    easy_log("WARNING", "Opção inválida! Digite uma opção entre 0 e 5.")
                 
                 input("\nPressione ENTER para continuar...")
 
         elif opcao == "3":
             easy_log("INFO", "Abrindo menu de Similaridade...")
-            gerar_matriz, gerar_grafo, gerar_matriz_e_grafo, calcular_metricas = gerar_similaridade(data, pessoas, generos)
+            gerar_matriz, gerar_grafo, gerar_matriz_e_grafo, calcular_metricas = cache.obter("similaridade", lambda: gerar_similaridade(data, pessoas, generos, matriz_incidencia, **opcoes["similaridade"], ao_crescer=lambda: cache.atualizar("similaridade")))
             while True:
                 menu_interno("SIMILARIDADE")
-                sub_opcao = input("Digite a opção desejada (0-4): ").strip()
+                sub_opcao = input("Digite a opção desejada (0-5): ").strip()
 
                 if sub_opcao == "1":
                     gerar_matriz()
@@ -111,48 +254,40 @@ def main():
                 elif sub_opcao == "3":
                     gerar_matriz_e_grafo()
                 elif sub_opcao == "4":
-                    calcular_metricas()
+                    calcular_metricas(**opcoes_relatorio, **opcoes_metricas.get("similaridade", {}))
                 elif sub_opcao == "5":
-                    gerar_matriz()
-                    gerar_grafo()
                     gerar_matriz_e_grafo()
-                    calcular_metricas()
+                    calcular_metricas(**opcoes_relatorio, **opcoes_metricas.get("similaridade", {}))
                 elif sub_opcao == "0":
                     break
                 else:
-                    easy_log("WARNING", "Opção inválida! Digite uma opção entre 0 e 4.")
+                    easy_log("WARNING", "Opção inválida! Digite uma opção entre 0 e 5.")
                 
                 input("\nPressione ENTER para continuar...")
 
         elif opcao == "4":
-            easy_log("INFO", "Executando todas as análises...")
-            
+            executar_todas(pessoas, generos, matriz_incidencia, argumentos.saida, argumentos.formatos, argumentos.processos, opcoes=opcoes, opcoes_relatorio=opcoes_relatorio, opcoes_metricas=opcoes_metricas)
+
+        elif opcao == "5":
             try:
-                easy_log("INFO", "Executando análise de Incidência...")
-                gerar_incidencia(data, pessoas, generos)
-                easy_log("SUCCESS", "Incidência concluída!")
-                
-                easy_log("INFO", "Executando análise de Coocorrência...")
-                gerar_coocorrencia(data, pessoas, generos)
-                easy_log("SUCCESS", "Coocorrência concluída!")
-                
-                easy_log("INFO", "Executando análise de Similaridade...")
-                gerar_similaridade(data, pessoas, generos)
-                easy_log("SUCCESS", "Similaridade concluída!")
-                
-                easy_log("SUCCESS", "Todas as análises foram concluídas com sucesso!")
+                data, pessoas, generos, matriz_incidencia = carregar_dados(argumentos.dataset)
+                cache.limpar(compartilhados=(data, pessoas, generos, matriz_incidencia))
+                limpar_cache_posicoes()  # Posições dos grafos do dataset anterior
+                easy_log("SUCCESS", "Análises anteriores descartadas; serão reconstruídas com o dataset novo.")
             except Exception as e:
-                easy_log("ERROR", f"Erro ao executar análises: {e}")
+                easy_log("ERROR", f"Erro ao recarregar dataset: {e}")
 
         elif opcao == "0":
             easy_log("INFO", "Encerrando programa...")
             break
 
         else:
-            easy_log("WARNING", "Opção inválida! Digite uma opção entre 0 e 4.")
+            easy_log("WARNING", "Opção inválida! Digite uma opção entre 0 e 5.")
 
         input("\nPressione ENTER para continuar...")
 
+    return CODIGO_SUCESSO
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
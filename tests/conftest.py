@@ -0,0 +1,5 @@
+import os  # Importa os para achar a raiz do repositório
+import sys  # Importa sys para importar os pacotes do projeto nos testes
+
+# Os módulos do projeto (grafos, helpers) são importados a partir da raiz do repositório, como no main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,53 @@
+import networkx as nx  # Importa NetworkX como referência
+import numpy as np  # Importa NumPy para comparar os vetores
+import pytest  # Importa pytest para os testes
+
+from grafos.aglomeracao import _matrizes_triangulos, aglomeracao  # Importa aglomeração e triângulos por produtos esparsos
+from grafos.construcao import adjacencia_de_matriz  # Importa a adjacência CSR
+
+# Aglomeração ponderada, triângulos e média (caminhos esparso e denso) têm de coincidir com o NetworkX
+
+
+# Grafo aleatório com pesos reais; densidade alta o bastante aciona os produtos densos
+def _grafo(semente, nos, arestas):
+    grafo = nx.gnm_random_graph(nos, arestas, seed=semente)
+    gerador = np.random.default_rng(semente)
+    for u, v in grafo.edges:
+        grafo[u][v]["weight"] = float(gerador.uniform(0.1, 5.0))
+    return grafo
+
+
+# Adjacência CSR na ordem dos nós 0..n-1
+def _adjacencia(grafo):
+    nos = list(range(grafo.number_of_nodes()))
+    return adjacencia_de_matriz(nx.to_scipy_sparse_array(grafo, nodelist=nos, format="csr"), nos)
+
+
+@pytest.mark.parametrize("nos, arestas", [(300, 900), (80, 1500)])  # Esparso e denso
+@pytest.mark.parametrize("semente", range(2))
+def test_exata_igual_ao_networkx(semente, nos, arestas):
+    grafo = _grafo(semente, nos, arestas)
+    resultado = aglomeracao(_adjacencia(grafo), processos=1, tamanho_bloco=64)  # Vários blocos
+    esperado = nx.clustering(grafo, weight="weight")
+    triangulos = nx.triangles(grafo)
+    np.testing.assert_allclose(resultado["valores"], [esperado[no] for no in range(nos)], rtol=1e-9, atol=1e-12)
+    np.testing.assert_array_equal(resultado["triangulos"], [triangulos[no] for no in range(nos)])
+    assert resultado["media"] == pytest.approx(nx.average_clustering(grafo, weight="weight"), rel=1e-9)
+    assert not resultado["parametros"]["aproximada"]
+
+
+def test_amostra_estima_a_media():
+    grafo = _grafo(5, 600, 3000)
+    resultado = aglomeracao(_adjacencia(grafo), amostra=200, semente=3, processos=1)
+    calculados = ~np.isnan(resultado["valores"])
+    assert calculados.sum() == 200  # Só os nós sorteados
+    esperado = nx.clustering(grafo, nodes=np.flatnonzero(calculados).tolist(), weight="weight")
+    np.testing.assert_allclose(resultado["valores"][calculados], [esperado[no] for no in np.flatnonzero(calculados)], rtol=1e-9)
+    erro = resultado["parametros"]["erro_padrao"]
+    assert abs(resultado["media"] - nx.average_clustering(grafo, weight="weight")) < 4 * erro  # Dentro da incerteza informada
+
+
+def test_limite_denso_dividido_entre_os_processos():
+    adjacencia = _adjacencia(_grafo(0, 80, 1500))  # Denso: cabe no limite inteiro
+    assert isinstance(_matrizes_triangulos(adjacencia)[0], np.ndarray)
+    assert not isinstance(_matrizes_triangulos(adjacencia, 2 * 8 * 80 ** 2 - 1)[0], np.ndarray)  # Acima da parte do processo: esparso
@@ -0,0 +1,58 @@
+import networkx as nx  # Importa NetworkX como referência
+import numpy as np  # Importa NumPy para comparar os vetores
+import pytest  # Importa pytest para os testes
+import scipy.sparse as sp  # Importa SciPy para a matriz vazia
+
+from grafos.autovetor import centralidade_autovetor  # Importa a centralidade de autovetor esparsa
+
+# A centralidade de autovetor (potência, ARPACK e partida a quente) tem de coincidir com o NetworkX
+
+
+# Grafo conexo com pesos reais
+def _grafo(semente, nos=200):
+    grafo = nx.connected_watts_strogatz_graph(nos, 6, 0.2, seed=semente)
+    gerador = np.random.default_rng(semente)
+    for u, v in grafo.edges:
+        grafo[u][v]["weight"] = float(gerador.uniform(0.5, 3.0))
+    return grafo
+
+
+# Matriz de adjacência e vetor de referência na ordem dos nós 0..n-1
+def _matriz_e_referencia(grafo):
+    nos = list(range(grafo.number_of_nodes()))
+    referencia = nx.eigenvector_centrality(grafo, weight="weight", tol=1e-6, max_iter=1000)
+    return nx.to_scipy_sparse_array(grafo, nodelist=nos, format="csr"), np.array([referencia[no] for no in nos])
+
+
+@pytest.mark.parametrize("semente", range(3))
+def test_potencia_igual_ao_networkx(semente):
+    matriz, referencia = _matriz_e_referencia(_grafo(semente))
+    vetor, iteracoes = centralidade_autovetor(matriz)
+    np.testing.assert_allclose(vetor, referencia, rtol=1e-9, atol=1e-12)  # Mesma iteração, mesmo resultado
+    assert iteracoes >= 1
+
+
+def test_arpack_proximo_do_networkx():
+    matriz, referencia = _matriz_e_referencia(_grafo(1))
+    vetor, _ = centralidade_autovetor(matriz, metodo="arpack")
+    np.testing.assert_allclose(vetor, referencia, atol=1e-4)
+
+
+def test_partida_a_quente_converge_mais_rapido():
+    grafo = _grafo(2)
+    matriz, _ = _matriz_e_referencia(grafo)
+    anterior, _ = centralidade_autovetor(matriz, tolerancia=1e-9)
+
+    # Pequena mudança no grafo: o vetor anterior (por nome) é um bom ponto de partida
+    grafo[0][next(iter(grafo[0]))]["weight"] += 0.5
+    matriz, _ = _matriz_e_referencia(grafo)
+    nomes = [f"n{no}" for no in range(grafo.number_of_nodes())]
+    frio, iteracoes_frio = centralidade_autovetor(matriz, tolerancia=1e-9)
+    quente, iteracoes_quente = centralidade_autovetor(matriz, tolerancia=1e-9, vetor_inicial=dict(zip(nomes, anterior)), nomes=nomes)
+    np.testing.assert_allclose(quente, frio, atol=1e-6)  # Mesmo autovetor (dentro da tolerância)
+    assert iteracoes_quente < iteracoes_frio
+
+
+def test_grafo_vazio():
+    with pytest.raises(nx.NetworkXPointlessConcept):
+        centralidade_autovetor(sp.csr_matrix((0, 0)))
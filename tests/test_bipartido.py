@@ -0,0 +1,79 @@
+import networkx as nx  # Importa NetworkX como referência
+import numpy as np  # Importa NumPy para comparar os vetores
+import pytest  # Importa pytest para os testes
+import scipy.sparse as sp  # Importa SciPy para a matriz de incidência
+from networkx.algorithms import bipartite  # Importa as métricas bipartidas de referência
+
+from grafos.bipartido import (  # Importa as métricas bipartidas calculadas na matriz esparsa
+    METRICAS_OPCIONAIS,
+    aglomeracao_bipartida,
+    densidade_bipartida,
+    metricas_bipartidas,
+    proximidade_bipartida,
+    redundancia_bipartida,
+)
+
+# As métricas bipartidas da matriz de incidência têm de coincidir com o networkx.algorithms.bipartite
+
+
+# Incidência pessoas × gêneros aleatória com pessoas e gêneros isolados e uma componente separada do resto
+def _incidencia(semente, pessoas=40, generos=15):
+    gerador = np.random.default_rng(semente)
+    matriz = (gerador.random((pessoas, generos)) < 0.15) * gerador.integers(1, 4, (pessoas, generos))
+    matriz[-3:] = 0  # Pessoas sem gêneros
+    matriz[:, -2:] = 0  # Gêneros sem pessoas
+    matriz[-8:-3] = 0  # Componente separada: 5 pessoas ligadas só aos gêneros 10 a 12
+    matriz[:-8, 10:13] = 0
+    matriz[-8:-3, 10:13] = gerador.integers(0, 2, (5, 3))
+    matriz[-8, 10] = matriz[-7, 11] = matriz[-6, 12] = matriz[-8, 11] = matriz[-7, 12] = 1  # Mantém a componente conexa
+    return sp.csr_matrix(matriz)
+
+
+# Grafo bipartido de referência: pessoas 0..p-1 e gêneros p..p+g-1 (a ordem dos vetores por nó)
+def _grafo(matriz):
+    pessoas, generos = matriz.shape
+    grafo = nx.Graph()
+    grafo.add_nodes_from(range(pessoas), bipartite=0)
+    grafo.add_nodes_from(range(pessoas, pessoas + generos), bipartite=1)
+    coo = matriz.tocoo()
+    grafo.add_weighted_edges_from(zip(coo.row.tolist(), (coo.col + pessoas).tolist(), coo.data.tolist()))
+    return grafo
+
+
+@pytest.mark.parametrize("semente", range(3))
+def test_igual_ao_networkx(semente):
+    matriz = _incidencia(semente)
+    grafo = _grafo(matriz)
+    pessoas = range(matriz.shape[0])
+    assert nx.number_connected_components(grafo) > 1 + 5  # Componente separada e nós isolados
+
+    assert densidade_bipartida(matriz) == pytest.approx(bipartite.density(grafo, pessoas))
+
+    esperada = bipartite.latapy_clustering(grafo, mode="dot")
+    np.testing.assert_allclose(np.r_[aglomeracao_bipartida(matriz, tamanho_bloco=7)], [esperada[no] for no in grafo])
+
+    redundancia = np.r_[redundancia_bipartida(matriz, tamanho_bloco=4)]
+    com_pares = [no for no in grafo if grafo.degree(no) >= 2]  # A redundância só é definida com dois ou mais vizinhos
+    esperada = bipartite.node_redundancy(grafo, com_pares)
+    np.testing.assert_allclose(redundancia[com_pares], [esperada[no] for no in com_pares])
+    assert np.isnan(np.delete(redundancia, com_pares)).all()
+
+    esperada = bipartite.closeness_centrality(grafo, pessoas, normalized=True)
+    np.testing.assert_allclose(np.r_[proximidade_bipartida(matriz)], [esperada[no] for no in grafo])
+
+
+def test_padrao_so_metricas_em_o_nnz():
+    matriz = _incidencia(0)
+    padrao = metricas_bipartidas(matriz)
+    assert set(padrao["colunas"]) == {"grau", "forca", "centralidade_grau"}
+    esperada = bipartite.degree_centrality(_grafo(matriz), range(matriz.shape[0]))
+    np.testing.assert_allclose(padrao["colunas"]["centralidade_grau"], [esperada[no] for no in range(sum(matriz.shape))])
+
+    completas = metricas_bipartidas(matriz, opcionais=METRICAS_OPCIONAIS)
+    assert set(completas["colunas"]) == {"grau", "forca", "centralidade_grau", *METRICAS_OPCIONAIS}
+    assert completas["aglomeracao_media"] == pytest.approx(bipartite.average_clustering(_grafo(matriz), mode="dot"))
+
+
+def test_metrica_opcional_invalida():
+    with pytest.raises(ValueError):
+        metricas_bipartidas(_incidencia(0), opcionais=("intermediacao",))
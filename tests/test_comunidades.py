@@ -0,0 +1,78 @@
+import networkx as nx  # Importa NetworkX como referência
+import numpy as np  # Importa NumPy para comparar as partições
+import pytest  # Importa pytest para os testes
+import scipy.sparse as sp  # Importa SciPy para a matriz sem arestas
+
+from grafos.comunidades import colunas_comunidades, linhas_relatorio_comunidades, louvain, modularidade, resumo_comunidades  # Importa Louvain, modularidade e o relatório das comunidades
+
+# A modularidade do Louvain tem de ser a mesma de networkx.community.modularity e ficar perto da do NetworkX
+
+
+# Grafo com comunidades plantadas e pesos inteiros
+def _grafo(semente, tamanhos=(40, 30, 30, 20, 20), dentro=0.3, fora=0.02):
+    grafo = nx.random_partition_graph(list(tamanhos), dentro, fora, seed=semente)
+    gerador = np.random.default_rng(semente)
+    for u, v in grafo.edges:
+        grafo[u][v]["weight"] = int(gerador.integers(1, 5))
+    return grafo
+
+
+# Matriz de adjacência na ordem dos nós 0..n-1
+def _matriz(grafo):
+    return nx.to_scipy_sparse_array(grafo, nodelist=range(grafo.number_of_nodes()), format="csr")
+
+
+# Partição de rótulos como lista de conjuntos de nós (formato do NetworkX)
+def _conjuntos(rotulos):
+    return [set(np.flatnonzero(rotulos == rotulo).tolist()) for rotulo in np.unique(rotulos)]
+
+
+@pytest.mark.parametrize("semente", range(3))
+@pytest.mark.parametrize("resolucao", [0.5, 1.0, 2.0])
+def test_modularidade_igual_ao_networkx(semente, resolucao):
+    grafo = _grafo(semente)
+    rotulos, valor = louvain(_matriz(grafo), resolucao=resolucao, semente=semente)
+    esperado = nx.community.modularity(grafo, _conjuntos(rotulos), weight="weight", resolution=resolucao)
+    assert valor == pytest.approx(esperado, abs=1e-9)  # Valor devolvido é o da partição devolvida
+    assert modularidade(_matriz(grafo), rotulos, resolucao) == pytest.approx(esperado, abs=1e-9)
+
+    # Qualidade: perto do Louvain do NetworkX
+    referencia = nx.community.louvain_communities(grafo, weight="weight", resolution=resolucao, seed=semente)
+    assert valor >= nx.community.modularity(grafo, referencia, weight="weight", resolution=resolucao) - 0.02
+
+
+def test_rotulos_ordenados_e_comunidades_plantadas():
+    grafo = _grafo(4, dentro=0.5, fora=0.005)
+    rotulos, _ = louvain(_matriz(grafo))
+    tamanhos = np.bincount(rotulos)
+    assert np.all(np.diff(tamanhos) <= 0)  # 0 = maior comunidade
+    plantadas = [set(bloco) for bloco in grafo.graph["partition"]]
+    assert sorted(map(sorted, _conjuntos(rotulos))) == sorted(map(sorted, plantadas))
+
+
+def test_reprodutivel_e_sem_arestas():
+    matriz = _matriz(_grafo(5))
+    primeira, _ = louvain(matriz, semente=9)
+    segunda, _ = louvain(matriz, semente=9)
+    np.testing.assert_array_equal(primeira, segunda)
+
+    rotulos, valor = louvain(sp.csr_matrix((4, 4)))
+    np.testing.assert_array_equal(rotulos, np.arange(4))
+    assert valor == 0.0
+
+
+def test_relatorio_lista_so_as_maiores_e_colunas_trazem_todas():
+    matriz = _matriz(_grafo(4, dentro=0.5, fora=0.005))
+    rotulos, valor = louvain(matriz)
+    nomes = list(range(matriz.shape[0]))
+    linhas = linhas_relatorio_comunidades(matriz, rotulos, valor, nomes, top_n=2)
+    assert [linha.split(":")[0] for linha in linhas if linha.startswith("  C")] == ["  C0", "  C1"]  # As duas maiores
+    assert len([linha for linha in linhas_relatorio_comunidades(matriz, rotulos, valor, nomes) if linha.startswith("  C")]) == 5
+
+    colunas = colunas_comunidades(matriz, rotulos, nomes)
+    for linha in resumo_comunidades(matriz, rotulos, nomes):  # Cada membro traz os valores da sua comunidade
+        membros = rotulos == linha["comunidade"]
+        assert np.all(colunas["membros_comunidade"][membros] == linha["membros"])
+        assert np.all(colunas["condutancia_comunidade"][membros] == linha["condutancia"])
+        assert set(linha["principais"]) <= set(np.flatnonzero(membros).tolist())  # Principais só da própria comunidade
+    assert [linha["principais"] for linha in resumo_comunidades(sp.csr_matrix((3, 3)), np.arange(3), list("abc"))] == [["a"], ["b"], ["c"]]
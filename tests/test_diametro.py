@@ -0,0 +1,46 @@
+import networkx as nx  # Importa NetworkX como referência
+import pytest  # Importa pytest para os testes
+import scipy.sparse as sp  # Importa SciPy para a matriz vazia
+
+from grafos.diametro import diametro_maior_componente, diametro_por_componente  # Importa o diâmetro por componente
+
+# O diâmetro por componente (iFUB nas grandes, lotes nas pequenas) tem de coincidir com o NetworkX
+
+
+# Lista (tamanho, diâmetro) de referência, da maior componente para a menor
+def _referencia(grafo):
+    componentes = [grafo.subgraph(nos) for nos in nx.connected_components(grafo)]
+    return sorted(((c.number_of_nodes(), nx.diameter(c)) for c in componentes), key=lambda par: -par[0])
+
+
+# Matriz de adjacência esparsa do grafo
+def _matriz(grafo):
+    return nx.to_scipy_sparse_array(grafo, nodelist=sorted(grafo.nodes), format="csr")
+
+
+@pytest.mark.parametrize("semente", range(4))
+def test_grafo_aleatorio_com_varias_componentes(semente):
+    # Uma componente grande, várias pequenas (caminhos, ciclos, estrelas), pares e nós isolados
+    partes = [nx.gnm_random_graph(300, 420, seed=semente)]
+    partes += [nx.path_graph(tamanho) for tamanho in range(1, 40)]
+    partes += [nx.cycle_graph(tamanho) for tamanho in range(3, 70, 7)]
+    partes += [nx.star_graph(tamanho) for tamanho in (3, 30, 80)]
+    grafo = nx.disjoint_union_all(partes)
+    grafo = nx.relabel_nodes(grafo, dict(zip(grafo.nodes, nx.utils.create_random_state(semente).permutation(grafo.number_of_nodes()))))
+
+    obtido = diametro_por_componente(_matriz(grafo))
+    esperado = _referencia(grafo)
+    assert [tamanho for tamanho, _ in obtido] == [tamanho for tamanho, _ in esperado]
+    assert sorted(obtido) == sorted(esperado)  # Empates de tamanho podem vir em outra ordem
+
+
+def test_muitas_componentes_minusculas():
+    # Milhares de componentes pequenas ocupam vários lotes
+    grafo = nx.disjoint_union_all([nx.path_graph(4 + indice % 5) for indice in range(3000)])
+    assert sorted(diametro_por_componente(_matriz(grafo))) == sorted(_referencia(grafo))
+
+
+def test_grafo_conexo_e_vazio():
+    grafo = nx.connected_watts_strogatz_graph(500, 4, 0.05, seed=1)
+    assert diametro_maior_componente(_matriz(grafo)) == nx.diameter(grafo)
+    assert diametro_maior_componente(sp.csr_matrix((0, 0))) is None
@@ -0,0 +1,109 @@
+import networkx as nx  # Importa NetworkX para comparar os grafos
+import numpy as np  # Importa NumPy para sortear interações
+import pytest  # Importa pytest para os testes
+import scipy.sparse as sp  # Importa SciPy para montar as matrizes de referência
+
+from grafos.bipartido import densidade_bipartida  # Importa densidade do grafo bipartido
+from grafos.construcao import grafo_bipartido, grafo_de_matriz  # Importa construtores de grafos
+from grafos.incremental import AnaliseIncremental  # Importa a atualização incremental
+from grafos.matrizes import projecao_sem_diagonal  # Importa projeção esparsa sem diagonal
+
+# Lotes aplicados pela AnaliseIncremental têm de dar o mesmo resultado de reconstruir tudo do zero
+
+
+# Interações sorteadas ({"from", "to", "weight"}) entre pessoas p0.. e gêneros g0..
+def _interacoes(gerador, quantidade, pessoas, generos):
+    return [
+        {"from": f"p{gerador.integers(pessoas)}", "to": f"g{gerador.integers(generos)}", "weight": int(gerador.integers(1, 3))}
+        for _ in range(quantidade)
+    ]
+
+
+# Incidência somada das interações, na ordem dos vocabulários
+def _incidencia(pesos, pessoas, generos):
+    indice_pessoa = {nome: indice for indice, nome in enumerate(pessoas)}
+    indice_genero = {nome: indice for indice, nome in enumerate(generos)}
+    celulas = [(indice_pessoa[pessoa], indice_genero[genero], peso) for (pessoa, genero), peso in pesos.items() if peso]
+    linhas, colunas, valores = zip(*celulas) if celulas else ((), (), ())
+    return sp.csr_matrix((valores, (linhas, colunas)), shape=(len(pessoas), len(generos)), dtype=np.int64)
+
+
+# Acumula os pesos das interações por (pessoa, gênero); sinal -1 para remoções
+def _somar(pesos, interacoes, sinal):
+    for registro in interacoes:
+        chave = (registro["from"], registro["to"])
+        pesos[chave] = pesos.get(chave, 0) + sinal * registro["weight"]
+
+
+# Mesma forma e mesmas células
+def _mesma_matriz(a, b):
+    return (a != b).nnz == 0 and a.shape == b.shape
+
+
+# Mesmos nós e mesmas arestas com os mesmos pesos
+def _mesmo_grafo(a, b):
+    arestas = lambda grafo: sorted((min(u, v), max(u, v), dados["weight"]) for u, v, dados in grafo.edges(data=True))
+    return set(a.nodes) == set(b.nodes) and arestas(a) == arestas(b)
+
+
+@pytest.mark.parametrize("montar_grafos", [False, True])
+def test_lotes_iguais_a_reconstrucao(montar_grafos):
+    gerador = np.random.default_rng(7)
+    iniciais = _interacoes(gerador, 300, 40, 12)
+    pesos = {}
+    _somar(pesos, iniciais, 1)
+    pessoas = sorted({pessoa for pessoa, _ in pesos})
+    generos = sorted({genero for _, genero in pesos})
+    analise = AnaliseIncremental(pessoas, generos, _incidencia(pesos, pessoas, generos))
+    if montar_grafos:  # Grafos montados antes dos lotes: corrigidos aresta a aresta
+        for nome in ("incidencia", "coocorrencia", "similaridade"):
+            analise.grafo(nome)
+
+    for _ in range(5):  # Lotes com adições (inclusive nomes novos) e remoções de células existentes
+        adicionadas = _interacoes(gerador, 20, 50, 15)
+        existentes = [chave for chave, peso in pesos.items() if peso > 0]
+        escolhidas = gerador.choice(len(existentes), size=10, replace=False)
+        removidas = [{"from": existentes[i][0], "to": existentes[i][1], "weight": pesos[existentes[i]]} for i in escolhidas.tolist()]
+        analise.aplicar(adicionadas=adicionadas, removidas=removidas)
+        _somar(pesos, adicionadas, 1)
+        _somar(pesos, removidas, -1)
+
+    incidencia = _incidencia(pesos, analise.pessoas, analise.generos)
+    coocorrencia = projecao_sem_diagonal(incidencia.T, incidencia)
+    similaridade = projecao_sem_diagonal(incidencia, incidencia.T)
+    assert _mesma_matriz(analise.incidencia, incidencia)
+    assert _mesma_matriz(analise.coocorrencia, coocorrencia)
+    assert _mesma_matriz(analise.similaridade, similaridade)
+
+    assert _mesmo_grafo(analise.grafo("incidencia"), grafo_bipartido(incidencia, analise.pessoas, analise.generos))
+    assert _mesmo_grafo(analise.grafo("coocorrencia"), grafo_de_matriz(coocorrencia, analise.generos, tipo="genero"))
+    assert _mesmo_grafo(analise.grafo("similaridade"), grafo_de_matriz(similaridade, analise.pessoas, tipo="pessoa"))
+
+    basicas = analise.metricas_basicas()
+    assert basicas["incidencia"]["densidade"] == pytest.approx(densidade_bipartida(incidencia))
+    assert list(basicas["incidencia"]["graus"].values()) == np.diff(incidencia.indptr).tolist() + np.bincount(incidencia.indices, minlength=incidencia.shape[1]).tolist()
+    grafo = grafo_de_matriz(similaridade, analise.pessoas, tipo="pessoa")
+    assert basicas["similaridade"]["graus"] == dict(grafo.degree())
+    assert basicas["similaridade"]["forcas"] == pytest.approx(dict(grafo.degree(weight="weight")))
+    assert basicas["similaridade"]["densidade"] == pytest.approx(nx.density(grafo))
+    grafo = grafo_de_matriz(coocorrencia, analise.generos, tipo="genero")
+    assert basicas["coocorrencia"]["graus"] == dict(grafo.degree())
+    assert basicas["coocorrencia"]["densidade"] == pytest.approx(nx.density(grafo))
+
+
+def test_grafos_montados_sob_demanda():
+    analise = AnaliseIncremental(["a", "b"], ["x"], sp.csr_matrix(np.array([[1], [2]])))
+    assert analise._grafos == {}  # Nada montado na construção
+    analise.aplicar(adicionadas=[{"from": "c", "to": "x", "weight": 1}])
+    assert analise._grafos == {}  # Nem pelo lote
+    assert set(analise.grafo("similaridade").nodes) == {"a", "b", "c"}
+    with pytest.raises(ValueError):
+        analise.grafo("outra")
+
+
+def test_remocao_maior_que_o_peso_desfaz_o_lote():
+    analise = AnaliseIncremental(["a", "b"], ["x"], sp.csr_matrix(np.array([[1], [2]])))
+    with pytest.raises(ValueError):
+        analise.aplicar(adicionadas=[{"from": "novo", "to": "x"}], removidas=[{"from": "a", "to": "x", "weight": 5}])
+    assert analise.pessoas == ["a", "b"]  # Vocabulário restaurado
+    assert _mesma_matriz(analise.incidencia, sp.csr_matrix(np.array([[1], [2]])))
@@ -0,0 +1,54 @@
+import networkx as nx  # Importa NetworkX como referência
+import numpy as np  # Importa NumPy para comparar os vetores
+import pytest  # Importa pytest para os testes
+
+from grafos.construcao import adjacencia_de_matriz  # Importa a adjacência CSR
+from grafos.intermediacao import intermediacao  # Importa a intermediação (Brandes) sobre a adjacência CSR
+
+# A intermediação exata e a aproximada por pivôs têm de coincidir com o networkx.betweenness_centrality
+
+
+# Grafo aleatório com pesos inteiros (empates de distância exercitam a contagem de caminhos mínimos)
+def _grafo(semente, nos=120, arestas=300):
+    grafo = nx.gnm_random_graph(nos, arestas, seed=semente)
+    gerador = np.random.default_rng(semente)
+    for u, v in grafo.edges:
+        grafo[u][v]["weight"] = int(gerador.integers(1, 4))
+    return grafo
+
+
+# Adjacência CSR e vetor de referência na ordem dos nós 0..n-1
+def _comparar(grafo, referencia, **opcoes):
+    nos = list(range(grafo.number_of_nodes()))
+    adjacencia = adjacencia_de_matriz(nx.to_scipy_sparse_array(grafo, nodelist=nos, format="csr"), nos)
+    valores, parametros = intermediacao(adjacencia, **opcoes)
+    np.testing.assert_allclose(valores, [referencia[no] for no in nos], rtol=1e-9, atol=1e-12)
+    return parametros
+
+
+@pytest.mark.parametrize("semente", range(3))
+@pytest.mark.parametrize("ponderado", [True, False])
+def test_exata_igual_ao_networkx(semente, ponderado):
+    grafo = _grafo(semente)
+    referencia = nx.betweenness_centrality(grafo, weight="weight" if ponderado else None)
+    parametros = _comparar(grafo, referencia, ponderado=ponderado, processos=1)
+    assert not parametros["aproximada"]
+
+
+def test_pivos_iguais_ao_networkx():
+    # Mesmos pivôs sorteados com a mesma semente e a mesma reescala
+    grafo = _grafo(7)
+    referencia = nx.betweenness_centrality(grafo, k=30, weight="weight", seed=42)
+    parametros = _comparar(grafo, referencia, amostra=30, semente=42, processos=1)
+    assert parametros["aproximada"] and parametros["amostra"] == 30
+
+
+def test_varios_processos_somam_o_mesmo():
+    grafo = _grafo(3)
+    referencia = nx.betweenness_centrality(grafo, weight="weight")
+    _comparar(grafo, referencia, processos=2)
+
+
+def test_amostra_invalida():
+    with pytest.raises(ValueError):
+        _comparar(_grafo(0), {}, amostra=0, processos=1)
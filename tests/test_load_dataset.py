@@ -0,0 +1,62 @@
+import io  # Importa io para simular arquivos em memória
+import json  # Importa json para montar os datasets
+import os  # Importa os para estragar os arquivos do cache
+
+import numpy as np  # Importa NumPy para comparar os vetores
+import pytest  # Importa pytest para os testes
+
+import helpers.load_dataset as load_dataset  # Importa o leitor incremental do dataset
+
+REGISTROS = [  # Strings com escapes, literais e números que o fim de um bloco pode cortar ao meio
+    {"from": f"pessoa é \"{indice}\"", "to": ["Ação", "Drama"][indice % 2], "weight": [1, -2.5e-3, True, None][indice % 4]}
+    for indice in range(40)
+]
+
+
+@pytest.mark.parametrize("tamanho_bloco", [1, 2, 3, 5, 8, 64])
+def test_array_json_lido_em_blocos_de_qualquer_tamanho(monkeypatch, tamanho_bloco):
+    monkeypatch.setattr(load_dataset, "TAMANHO_BLOCO_LEITURA", tamanho_bloco)
+    assert list(load_dataset.iterar_registros(io.StringIO(json.dumps(REGISTROS)))) == REGISTROS
+
+
+def test_registro_malformado_no_meio_para_sem_ler_o_resto(monkeypatch):
+    monkeypatch.setattr(load_dataset, "TAMANHO_BLOCO_LEITURA", 16)
+    texto = json.dumps(REGISTROS[:2])[:-1] + ', {"from" "x"}, ' + json.dumps(REGISTROS)[1:]
+    arquivo = io.StringIO(texto)
+    with pytest.raises(ValueError, match="Registro malformado"):
+        list(load_dataset.iterar_registros(arquivo))
+    assert arquivo.tell() < len(texto) // 4  # O erro aparece logo depois do registro, não no fim do arquivo
+
+
+def test_array_truncado_no_fim():
+    with pytest.raises(ValueError, match="incompleto"):
+        list(load_dataset.iterar_registros(io.StringIO('[{"from": "a", "to": "b"}, {"from": "c", "to": tru')))
+
+
+# Dataset pequeno gravado em disco, carregado uma vez para criar o cache binário ao lado dele
+@pytest.fixture
+def dataset_com_cache(tmp_path):
+    caminho = tmp_path / "dataset.json"
+    caminho.write_text(json.dumps([{"from": "b", "to": "y", "weight": 2}, {"from": "a", "to": "x"}, {"from": "a", "to": "y"}]), encoding="utf-8")
+    esperado = load_dataset.load_dataset(str(caminho))
+    return str(caminho), esperado
+
+
+@pytest.mark.parametrize("vetor", ["origem.npy", "destino.npy", "peso.npy"])
+@pytest.mark.parametrize("estrago", ["apagado", "truncado", "lixo"])
+def test_cache_corrompido_e_refeito(dataset_com_cache, vetor, estrago):
+    caminho, (data, pessoas, generos) = dataset_com_cache
+    arquivo = os.path.join(load_dataset.caminho_cache(caminho), vetor)
+    if estrago == "apagado":
+        os.remove(arquivo)
+    else:
+        conteudo = open(arquivo, "rb").read()
+        with open(arquivo, "wb") as saida:
+            saida.write(conteudo[: len(conteudo) - 4] if estrago == "truncado" else b"nao e um npy")
+
+    assert load_dataset.carregar_cache(caminho) is None  # Cache inválido é descartado
+    assert not os.path.exists(load_dataset.caminho_cache(caminho))
+    novo, novas_pessoas, novos_generos = load_dataset.load_dataset(caminho)  # Relido do JSON e gravado de novo
+    assert (novas_pessoas, novos_generos) == (pessoas, generos)
+    assert np.array_equal(novo.origem, data.origem) and np.array_equal(novo.peso, data.peso)
+    assert load_dataset.carregar_cache(caminho) is not None
@@ -0,0 +1,66 @@
+import numpy as np  # Importa NumPy para sortear a incidência
+import pytest  # Importa pytest para os testes
+import scipy.sparse as sp  # Importa SciPy para a matriz de incidência
+
+from grafos.matrizes import similaridade_em_blocos  # Importa a similaridade exata em blocos
+from grafos.minhash import avaliar_minhash, projecao_similaridade, similaridade_minhash  # Importa o k-NN aproximado
+
+# O k-NN por MinHash/LSH só pode devolver pares com o peso exato e tem de encontrar quase todo o top-k exato
+
+
+# Incidência com grupos de gosto: cada pessoa escolhe quase todos os gêneros de um grupo e alguns ao acaso
+def _incidencia(semente=0, pessoas=600, grupos=20, generos_por_grupo=8, ruido=3):
+    gerador = np.random.default_rng(semente)
+    quantidade_generos = grupos * generos_por_grupo
+    linhas, colunas = [], []
+    for pessoa in range(pessoas):
+        grupo = gerador.integers(grupos)
+        escolhidos = grupo * generos_por_grupo + np.flatnonzero(gerador.random(generos_por_grupo) < 0.8)
+        escolhidos = np.union1d(escolhidos, gerador.integers(quantidade_generos, size=ruido))
+        linhas += [pessoa] * len(escolhidos)
+        colunas += escolhidos.tolist()
+    valores = gerador.integers(1, 3, size=len(linhas))
+    return sp.csr_matrix((valores, (linhas, colunas)), shape=(pessoas, quantidade_generos), dtype=np.int64)
+
+
+# Matriz simétrica, sem diagonal
+def _simetrica_sem_diagonal(matriz):
+    return (matriz != matriz.T).nnz == 0 and not matriz.diagonal().any()
+
+
+def test_pesos_exatos_e_revocacao():
+    incidencia = _incidencia()
+    aproximada = similaridade_minhash(incidencia, top_k=10)
+    assert _simetrica_sem_diagonal(aproximada)
+
+    completa = similaridade_em_blocos(incidencia).tocsr()  # Todos os pares com peso exato
+    linhas, colunas = aproximada.nonzero()
+    np.testing.assert_array_equal(aproximada[linhas, colunas].A1, completa[linhas, colunas].A1)  # Nenhum peso estimado
+
+    avaliacao = avaliar_minhash(incidencia, aproximada, top_k=10)
+    assert avaliacao["revocacao_com_empates"] >= 0.9
+    assert avaliacao["precisao_com_empates"] >= 0.9
+
+
+def test_jaccard_e_limiar():
+    incidencia = _incidencia(1)
+    aproximada = similaridade_minhash(incidencia, top_k=None, peso="jaccard", limiar=0.5)
+    linhas, colunas = aproximada.nonzero()
+    assert len(linhas)
+    binaria = (incidencia > 0).astype(np.int64)
+    compartilhados = (binaria @ binaria.T).tocsr()[linhas, colunas].A1
+    tamanhos = np.diff(binaria.indptr)
+    np.testing.assert_allclose(aproximada[linhas, colunas].A1, compartilhados / (tamanhos[linhas] + tamanhos[colunas] - compartilhados))
+    assert aproximada.data.min() >= 0.5
+
+
+def test_reprodutivel_com_a_semente():
+    incidencia = _incidencia(2)
+    primeira = similaridade_minhash(incidencia, top_k=5, semente=7)
+    segunda = similaridade_minhash(incidencia, top_k=5, semente=7)
+    assert (primeira != segunda).nnz == 0
+
+
+def test_metodo_invalido():
+    with pytest.raises(ValueError):
+        projecao_similaridade(_incidencia(), metodo="aproximado")
@@ -0,0 +1,43 @@
+import numpy as np  # Importa NumPy para sortear a incidência
+import pytest  # Importa pytest para os testes
+import scipy.sparse as sp  # Importa SciPy para a matriz de incidência
+
+from grafos.matrizes import similaridade_em_blocos  # Importa a similaridade exata em blocos
+from grafos.similaridade_paralela import similaridade_paralela  # Importa a similaridade em fragmentos no pool
+
+# A similaridade calculada em fragmentos no pool de processos tem de ser idêntica à sequencial em blocos
+
+
+# Incidência pessoas × gêneros aleatória, com alguns gêneros populares (pessoas de custo desigual) e pessoas sem gênero
+def _incidencia(semente, pessoas=400, generos=60, densidade=0.05):
+    gerador = np.random.default_rng(semente)
+    matriz = sp.random(pessoas, generos, density=densidade, format="lil", random_state=semente, data_rvs=lambda n: gerador.integers(1, 4, n))
+    matriz[:, :3] = (gerador.random((pessoas, 3)) < 0.4).astype(int)  # Gêneros populares
+    matriz[:10] = 0  # Pessoas sem gênero
+    return sp.csr_matrix(matriz, dtype=np.int64)
+
+
+# Mesma forma, mesmas arestas e mesmos pesos
+def _identicas(a, b):
+    return a.shape == b.shape and a.nnz == b.nnz and (a != b).nnz == 0
+
+
+@pytest.mark.parametrize("top_k, limiar", [(None, None), (5, None), (None, 2), (3, 2)])
+def test_igual_a_sequencial(top_k, limiar):
+    incidencia = _incidencia(top_k or 0)
+    esperada = similaridade_em_blocos(incidencia, tamanho_bloco=64, top_k=top_k, limiar=limiar)
+    obtida = similaridade_paralela(incidencia, tamanho_bloco=64, top_k=top_k, limiar=limiar, processos=2)
+    assert _identicas(obtida, esperada)
+
+
+def test_fragmentos_gravados_em_disco(tmp_path):
+    incidencia = _incidencia(1)
+    esperada = similaridade_em_blocos(incidencia, top_k=4)
+    obtida = similaridade_paralela(incidencia, top_k=4, processos=2, diretorio_fragmentos=str(tmp_path / "fragmentos"))
+    assert _identicas(obtida, esperada)
+    assert any((tmp_path / "fragmentos").iterdir())  # As arestas passaram pelos arquivos
+
+
+def test_um_processo_usa_a_versao_sequencial():
+    incidencia = _incidencia(2)
+    assert _identicas(similaridade_paralela(incidencia, processos=1), similaridade_em_blocos(incidencia))